@@ -0,0 +1,97 @@
+"""Memory and latency of counting rows: ORM hydration vs SELECT count(*).
+
+Also compares page + total for a paginated listing done as page query plus
+len(all()) against paginate_with_total's count(*) OVER ().
+
+    python -m benchmarks.bench_aggregates [rows ...]   (default 10000 100000 1000000)
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import desc, insert
+from sqlmodel import select
+
+from benchmarks.common import bench_engine, session_factory
+from unisphere.models.event_model import Event, EventRegistration
+from unisphere.models.user_place_model import UserPlace
+from unisphere.services.aggregates import count_where, paginate_with_total
+
+CHUNK = 10_000
+
+
+async def seed(sessions, rows: int) -> None:
+    now = datetime.now()
+    async with sessions() as session:
+        session.add(Event(title="Big event", date=now, created_by=1))
+        await session.commit()
+        for start in range(0, rows, CHUNK):
+            end = min(rows, start + CHUNK)
+            await session.exec(insert(EventRegistration), params=[
+                {"event_id": 1, "user_id": i, "registered_at": now}
+                for i in range(start, end)
+            ])
+            await session.exec(insert(UserPlace), params=[
+                {"user_id": 1, "name": f"Place {i}", "latitude": 0.0, "longitude": 0.0,
+                 "category": "spot", "is_favorite": True, "created_at": now, "updated_at": now}
+                for i in range(start, end)
+            ])
+        await session.commit()
+
+
+async def measure(sessions, work) -> tuple[float, float]:
+    """Return (milliseconds, peak MiB) for one run of work(session)."""
+    async with sessions() as session:
+        tracemalloc.start()
+        start = time.perf_counter()
+        await work(session)
+        elapsed = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+async def hydrate_count(session) -> int:
+    result = await session.exec(
+        select(EventRegistration).where(EventRegistration.event_id == 1))
+    return len(result.all())
+
+
+async def sql_count(session) -> int:
+    return await count_where(session, EventRegistration, EventRegistration.event_id == 1)
+
+
+def places_query():
+    return select(UserPlace).where(UserPlace.user_id == 1).order_by(desc(UserPlace.updated_at))
+
+
+async def page_then_hydrate(session):
+    page = (await session.exec(places_query().limit(50))).all()
+    total = len((await session.exec(select(UserPlace).where(UserPlace.user_id == 1))).all())
+    return page, total
+
+
+async def page_with_window(session):
+    return await paginate_with_total(session, places_query(), 50)
+
+
+async def main(sizes: list[int]) -> None:
+    print(f"{'rows':>9}  {'strategy':<22}{'ms':>10}{'peak MiB':>10}")
+    for rows in sizes:
+        async with bench_engine() as engine:
+            sessions = session_factory(engine)
+            await seed(sessions, rows)
+            for name, work in (
+                ("count: len(all())", hydrate_count),
+                ("count: count(*)", sql_count),
+                ("page: + len(all())", page_then_hydrate),
+                ("page: count(*) OVER()", page_with_window),
+            ):
+                elapsed, peak = await measure(sessions, work)
+                print(f"{rows:>9}  {name:<22}{elapsed:>10.1f}{peak:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]))
@@ -0,0 +1,90 @@
+"""Per-request cost of authentication.
+
+Compares get_current_user with the principal cache disabled (one user
+SELECT per request), with the in-process cache, and get_current_principal,
+which reads id and role from the token claims alone.
+
+    python -m benchmarks.bench_auth_overhead [requests]   (default 2000)
+"""
+import asyncio
+import sys
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from benchmarks.common import QueryCounter, Timer, bench_engine, session_factory
+from unisphere.models import get_session
+from unisphere.routes.v1.auth_router import (get_current_principal,
+                                             get_current_user)
+from unisphere.routes.v1.auth_router import router as auth_router
+from unisphere.services.auth_service.PrincipalCache import (PrincipalCache,
+                                                            get_principal_cache,
+                                                            local_principals)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth_router)
+
+    @app.get("/user")
+    async def user(current_user=Depends(get_current_user)):
+        return {"id": current_user.id}
+
+    @app.get("/principal")
+    async def principal(current_user=Depends(get_current_principal)):
+        return {"id": current_user.id}
+
+    return app
+
+
+async def run(client: httpx.AsyncClient, engine, path: str, headers: dict, requests: int):
+    timer = Timer()
+    with QueryCounter(engine) as counter:
+        for _ in range(requests):
+            async with timer.measure():
+                r = await client.get(path, headers=headers)
+            r.raise_for_status()
+    return timer, counter.count / requests
+
+
+async def main(requests: int) -> None:
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+        app = build_app()
+
+        async def bench_session():
+            async with sessions() as session:
+                yield session
+
+        async def no_cache():
+            yield PrincipalCache(local=None)
+
+        app.dependency_overrides[get_session] = bench_session
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            r = await client.post("/auth/register", json={
+                "personal_info": {"first_name": "Bench", "last_name": "User"},
+                "education_info": {},
+                "account_info": {"email": "bench@example.com", "password": "pass1234",
+                                 "confirm_password": "pass1234"},
+            })
+            r.raise_for_status()
+            headers = {"Authorization": f"Bearer {r.json()['token']['access_token']}"}
+
+            print(f"{'strategy':<26}{'queries/req':>12}{'mean ms':>10}{'p95 ms':>10}")
+            for name, path, override in (
+                ("user SELECT per request", "/user", no_cache),
+                ("principal cache", "/user", None),
+                ("token claims only", "/principal", None),
+            ):
+                local_principals.clear()
+                if override:
+                    app.dependency_overrides[get_principal_cache] = override
+                else:
+                    app.dependency_overrides.pop(get_principal_cache, None)
+                timer, queries = await run(client, engine, path, headers, requests)
+                print(f"{name:<26}{queries:>12.2f}{timer.mean:>10.3f}{timer.percentile(95):>10.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
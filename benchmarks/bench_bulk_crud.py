@@ -0,0 +1,79 @@
+"""Seeding a faculty tree: single-row create calls vs the bulk endpoints' services.
+
+Each faculty gets ten branches and each branch twenty courses. The single-row
+path calls create_faculty / create_branch / create_course once per row, one
+commit and refresh each; the bulk path sends the same rows through
+bulk_create in batches of BULK_MAX_ITEMS.
+
+    python -m benchmarks.bench_bulk_crud [faculties]   (default 20)
+"""
+import asyncio
+import sys
+import time
+from datetime import date
+
+from benchmarks.common import QueryCounter, bench_engine, session_factory
+from unisphere.models.semester_model import SemesterModel
+from unisphere.schemas.branch_schema import BranchCreateSchema
+from unisphere.schemas.bulk_schema import BULK_MAX_ITEMS
+from unisphere.schemas.course_schema import CourseCreateSchema
+from unisphere.schemas.faculty_schema import FacultyCreateSchema
+from unisphere.services.branch_service.DBBranchService import DBBranchService
+from unisphere.services.course_service.DBCourseService import DBCourseService
+from unisphere.services.faculty_service.DBFacultyService import DBFacultyService
+
+BRANCHES_PER_FACULTY = 10
+COURSES_PER_BRANCH = 20
+
+
+def batches(items: list) -> list:
+    return [items[i:i + BULK_MAX_ITEMS] for i in range(0, len(items), BULK_MAX_ITEMS)]
+
+
+async def one_by_one(session, prefix: str, faculties: int) -> None:
+    for f in range(faculties):
+        faculty = await DBFacultyService(session).create_faculty(FacultyCreateSchema(faculty_code=f"{prefix}F{f}"))
+        for b in range(BRANCHES_PER_FACULTY):
+            branch = await DBBranchService(session).create_branch(
+                BranchCreateSchema(faculty_id=faculty.faculty_id, branch_code=f"{prefix}B{f}.{b}"))
+            for c in range(COURSES_PER_BRANCH):
+                await DBCourseService(session).create_course(CourseCreateSchema(
+                    branch_id=branch.branch_id, semester_id=1, course_code=f"{prefix}C{f}.{b}.{c}"))
+
+
+async def bulk(session, prefix: str, faculties: int) -> None:
+    faculty_ids = []
+    for batch in batches([FacultyCreateSchema(faculty_code=f"{prefix}F{f}") for f in range(faculties)]):
+        faculty_ids += [r.id for r in (await DBFacultyService(session).bulk_create(batch)).results]
+    branch_ids = []
+    for batch in batches([
+            BranchCreateSchema(faculty_id=faculty_id, branch_code=f"{prefix}B{f}.{b}")
+            for f, faculty_id in enumerate(faculty_ids) for b in range(BRANCHES_PER_FACULTY)]):
+        branch_ids += [r.id for r in (await DBBranchService(session).bulk_create(batch)).results]
+    for batch in batches([
+            CourseCreateSchema(branch_id=branch_id, semester_id=1, course_code=f"{prefix}C{b}.{c}")
+            for b, branch_id in enumerate(branch_ids) for c in range(COURSES_PER_BRANCH)]):
+        await DBCourseService(session).bulk_create(batch)
+
+
+async def main(faculties: int) -> None:
+    rows = faculties * (1 + BRANCHES_PER_FACULTY * (1 + COURSES_PER_BRANCH))
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+        async with sessions() as session:
+            session.add(SemesterModel(semester_code="2025/2", start_date=date(2025, 1, 6), end_date=date(2025, 5, 4)))
+            await session.commit()
+
+        print(f"{faculties} faculties, {rows} rows")
+        print(f"{'strategy':<14}{'statements':>12}{'seconds':>10}{'rows/s':>10}")
+        for name, prefix, work in (("one by one", "a", one_by_one), ("bulk", "b", bulk)):
+            with QueryCounter(engine) as counter:
+                async with sessions() as session:
+                    start = time.perf_counter()
+                    await work(session, prefix, faculties)
+                    elapsed = time.perf_counter() - start
+            print(f"{name:<14}{counter.count:>12}{elapsed:>10.2f}{rows / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
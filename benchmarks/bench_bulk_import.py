@@ -0,0 +1,114 @@
+"""Rows per second loading enrollments: one call per row vs the bulk import.
+
+The per-row path is DBCourseService.enroll_user_to_course, what a client
+looping over POST /v1/courses/{id}/enroll costs without HTTP; it is timed
+on a sample and reported as a rate. The bulk import reads the same rows as
+CSV, once by id, once by email and section code, and once more to show a
+rerun that finds every row already there.
+
+    python -m benchmarks.bench_bulk_import [rows]   (default 100000)
+"""
+import asyncio
+import sys
+import time
+from datetime import date
+
+from sqlalchemy import delete, insert
+
+from benchmarks.common import bench_engine, session_factory
+from unisphere.models.branch_model import BranchModel
+from unisphere.models.course_model import CourseModel
+from unisphere.models.faculty_model import FacultyModel
+from unisphere.models.section_model import SectionModel
+from unisphere.models.semester_model import SemesterModel
+from unisphere.models.user_enroll_model import UserEnrollModel
+from unisphere.models.user_model import User
+from unisphere.services.bulk_import_service import BulkImportService, read_records
+from unisphere.services.course_service.DBCourseService import DBCourseService
+
+SECTIONS_PER_COURSE = 5
+SECTIONS_PER_STUDENT = 5
+PER_ROW_SAMPLE = 2000
+
+
+async def seed(sessions, rows: int) -> None:
+    students = rows // SECTIONS_PER_STUDENT
+    sections = max(rows // 50, SECTIONS_PER_STUDENT)
+    async with sessions() as session:
+        session.add(FacultyModel(faculty_code="ENG"))
+        session.add(SemesterModel(semester_code="2025/2", start_date=date(2025, 1, 6), end_date=date(2025, 5, 4)))
+        await session.commit()
+        session.add(BranchModel(faculty_id=1, branch_code="CPE"))
+        await session.commit()
+        await session.exec(insert(CourseModel), params=[
+            {"branch_id": 1, "semester_id": 1, "course_code": f"C{i}", "status": "active"}
+            for i in range(sections // SECTIONS_PER_COURSE)])
+        await session.exec(insert(SectionModel), params=[
+            {"course_id": i // SECTIONS_PER_COURSE + 1, "section_code": f"S{i % SECTIONS_PER_COURSE}",
+             "student_limit": 60, "status": "active"}
+            for i in range(sections)])
+        await session.exec(insert(User), params=[
+            {"first_name": "S", "last_name": str(i), "email": f"s{i}@example.com", "password_hash": "x",
+             "role": "user", "is_active": True, "token_version": 0}
+            for i in range(students)])
+        await session.commit()
+
+
+def enrollments(rows: int) -> list[tuple[int, int]]:
+    sections = max(rows // 50, SECTIONS_PER_STUDENT)
+    return [(row // SECTIONS_PER_STUDENT + 1, (row * 7 + row // SECTIONS_PER_STUDENT) % sections + 1)
+            for row in range(rows)]
+
+
+def by_id(pairs) -> bytes:
+    return ("user_id,section_id\n" + "".join(f"{u},{s}\n" for u, s in pairs)).encode()
+
+
+def by_natural_key(pairs) -> bytes:
+    return ("email,course_id,section_code\n" + "".join(
+        f"s{u - 1}@example.com,{(s - 1) // SECTIONS_PER_COURSE + 1},S{(s - 1) % SECTIONS_PER_COURSE}\n"
+        for u, s in pairs)).encode()
+
+
+async def chunks(data: bytes, size: int = 64 * 1024):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def main(rows: int) -> None:
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+        await seed(sessions, rows)
+        pairs = enrollments(rows)
+        print(f"{rows:,} enrollment rows, {engine.dialect.name} ({engine.dialect.driver})")
+        print(f"{'path':<30}{'seconds':>10}{'rows/s':>12}{'written':>10}{'failed':>8}")
+
+        async with sessions() as session:
+            service = DBCourseService(session)
+            start = time.perf_counter()
+            for user_id, section_id in pairs[:PER_ROW_SAMPLE]:
+                course_id = (section_id - 1) // SECTIONS_PER_COURSE + 1
+                await service.enroll_user_to_course(user_id, course_id, section_id)
+            elapsed = time.perf_counter() - start
+            await session.exec(delete(UserEnrollModel))
+            await session.commit()
+        print(f"{f'one call per row ({PER_ROW_SAMPLE:,})':<30}{elapsed:>10.2f}"
+              f"{PER_ROW_SAMPLE / elapsed:>12,.0f}{PER_ROW_SAMPLE:>10,}{0:>8}")
+
+        for name, data in (("bulk import, ids", by_id(pairs)),
+                           ("bulk import, natural keys", by_natural_key(pairs)),
+                           ("bulk import, rerun", by_id(pairs))):
+            if name.endswith("natural keys"):
+                async with sessions() as session:
+                    await session.exec(delete(UserEnrollModel))
+                    await session.commit()
+            async with sessions() as session:
+                start = time.perf_counter()
+                report = await BulkImportService(session).run("enrollments", read_records(chunks(data), "csv"))
+                elapsed = time.perf_counter() - start
+            print(f"{name:<30}{elapsed:>10.2f}{report.rows / elapsed:>12,.0f}"
+                  f"{report.written:>10,}{report.failed:>8,}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,128 @@
+"""Validating a whole semester for room and student clashes.
+
+Compares comparing every pair of slots in a group with the sweep line in
+services.clash_service, then times ClashService.check_semester end to end
+and a single check_conflicts call for one student.
+
+    python -m benchmarks.bench_clash_detection [sections]   (default 5000)
+"""
+import asyncio
+import itertools
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+from datetime import time as clock
+
+from sqlalchemy import insert
+from sqlmodel import select
+
+from benchmarks.common import bench_engine, session_factory
+from unisphere.models.branch_model import BranchModel
+from unisphere.models.course_model import CourseModel
+from unisphere.models.day_of_week_model import DayModel
+from unisphere.models.faculty_model import FacultyModel
+from unisphere.models.schedule_model import SectionScheduleModel
+from unisphere.models.section_model import SectionModel
+from unisphere.models.semester_model import SemesterModel
+from unisphere.models.user_enroll_model import UserEnrollModel
+from unisphere.models.user_model import User
+from unisphere.services.clash_service import SLOT_COLUMNS, ClashService, Slot, sweep
+
+ROOMS = 400
+SECTIONS_PER_STUDENT = 8
+
+
+async def seed(sessions, sections: int) -> None:
+    students = sections * 4
+    async with sessions() as session:
+        session.add_all([DayModel(day_code=code) for code in ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")])
+        session.add(FacultyModel(faculty_code="ENG"))
+        session.add(SemesterModel(semester_code="2025/2", start_date=date(2025, 1, 6), end_date=date(2025, 5, 4)))
+        await session.commit()
+        session.add(BranchModel(faculty_id=1, branch_code="CPE"))
+        await session.commit()
+        await session.exec(insert(CourseModel), params=[
+            {"branch_id": 1, "semester_id": 1, "course_code": f"C{i}", "status": "active"}
+            for i in range(sections // 5)])
+        await session.exec(insert(SectionModel), params=[
+            {"course_id": i // 5 + 1, "section_code": str(i % 5), "student_limit": 40, "status": "active"}
+            for i in range(sections)])
+        # Two 90-minute meetings a week, each in its own room and period,
+        # except every 47th which is pushed an hour late into the next booking
+        await session.exec(insert(SectionScheduleModel), params=[
+            {"section_id": j // 2 + 1, "room": f"R{j % ROOMS}", "day_id": j // ROOMS % 5 + 1,
+             "start_time": clock(8 + 2 * (j // (ROOMS * 5) % 5) + (j % 47 == 0)),
+             "end_time": clock(9 + 2 * (j // (ROOMS * 5) % 5) + (j % 47 == 0), 30)}
+            for j in range(sections * 2)])
+        await session.exec(insert(User), params=[
+            {"first_name": "S", "last_name": str(i), "email": f"s{i}@example.com", "password_hash": "x",
+             "role": "user", "is_active": True, "token_version": 0}
+            for i in range(students)])
+        # Section i meets in period i // 1000 on day i // 200 % 5, and every
+        # student takes one section per (period, day) they pick
+        per_block = sections // 25
+        await session.exec(insert(UserEnrollModel), params=[
+            {"user_id": student + 1,
+             "section_id": k % 5 * per_block * 5 + (k // 5 + student) % 5 * per_block + student % per_block + 1}
+            for student in range(students) for k in range(SECTIONS_PER_STUDENT)])
+        await session.commit()
+
+
+def pairwise(groups) -> int:
+    """The obvious check: compare every two slots in a group"""
+    return sum(
+        1
+        for slots in groups
+        for a, b in itertools.combinations(slots, 2)
+        if a.day_id == b.day_id and a.section_id != b.section_id
+        and a.start_time < b.end_time and b.start_time < a.end_time)
+
+
+def swept(groups) -> int:
+    return sum(1 for slots in groups for _ in sweep(slots))
+
+
+def timed(work) -> tuple[int, float]:
+    start = time.perf_counter()
+    result = work()
+    return result, (time.perf_counter() - start) * 1000
+
+
+async def main(sections: int) -> None:
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+        await seed(sessions, sections)
+
+        async with sessions() as session:
+            slots = [Slot(*row) for row in (await session.exec(select(*SLOT_COLUMNS))).all()]
+        by_room = defaultdict(list)
+        for slot in slots:
+            by_room[slot.room].append(slot)
+
+        print(f"{sections} sections, {len(slots)} weekly slots in {ROOMS} rooms")
+        count, elapsed = timed(lambda: pairwise(by_room.values()))
+        print(f"{'rooms: every pair':<34}{elapsed:>10.1f} ms  {count} clashes")
+        count, elapsed = timed(lambda: swept(by_room.values()))
+        print(f"{'rooms: sweep line':<34}{elapsed:>10.1f} ms  {count} clashes")
+        count, elapsed = timed(lambda: pairwise([slots]))
+        print(f"{'one group of every slot: pairs':<34}{elapsed:>10.1f} ms  {count} overlaps")
+        count, elapsed = timed(lambda: swept([slots]))
+        print(f"{'one group of every slot: sweep':<34}{elapsed:>10.1f} ms  {count} overlaps")
+
+        async with sessions() as session:
+            start = time.perf_counter()
+            report = await ClashService(session).check_semester(1)
+            elapsed = (time.perf_counter() - start) * 1000
+        print(f"{'check_semester':<34}{elapsed:>10.1f} ms  {len(report.room_clashes)} room, "
+              f"{len(report.student_clashes)} student clashes over {report.enrollments_checked} enrollments")
+
+        async with sessions() as session:
+            start = time.perf_counter()
+            clashes = await ClashService(session).check_conflicts(1, sections // 2)
+            elapsed = (time.perf_counter() - start) * 1000
+        print(f"{'check_conflicts, one student':<34}{elapsed:>10.1f} ms  {len(clashes)} clashes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
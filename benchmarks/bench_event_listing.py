@@ -0,0 +1,75 @@
+"""Queries per page for GET /v1/events.
+
+Compares the old per-event lookups (is_user_registered + is_event_full for
+every row) with EventService.get_events_with_user_state.
+
+    python -m benchmarks.bench_event_listing
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from benchmarks.common import QueryCounter, Timer, bench_engine, session_factory
+from unisphere.models.event_model import Event, EventRegistration
+from unisphere.models.user_model import User
+from unisphere.services.event_service import EventService
+
+TOTAL_EVENTS = 500
+PAGE_SIZES = (10, 50, 100)
+ROUNDS = 20
+
+
+async def seed(sessions) -> int:
+    async with sessions() as session:
+        user = User(first_name="Bench", last_name="User",
+                    email="bench@example.com", password_hash="x")
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+
+        events = [
+            Event(title=f"Event {i}", date=datetime.now() + timedelta(days=i),
+                  max_capacity=50, created_by=user.id)
+            for i in range(TOTAL_EVENTS)
+        ]
+        session.add_all(events)
+        await session.commit()
+
+        session.add_all(
+            EventRegistration(event_id=event.id, user_id=user.id)
+            for event in events[::3]
+        )
+        await session.commit()
+        return user.id
+
+
+async def per_event_listing(service: EventService, user_id: int, limit: int) -> None:
+    events, _ = await service.get_events(0, limit)
+    for event in events:
+        await service.is_user_registered(event.id, user_id)
+        await service.is_event_full(event.id)
+
+
+async def batched_listing(service: EventService, user_id: int, limit: int) -> None:
+    await service.get_events_with_user_state(user_id, 0, limit)
+
+
+async def main() -> None:
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+        user_id = await seed(sessions)
+
+        print(f"{'strategy':<12}{'page':>6}{'queries':>10}{'mean ms':>10}{'p95 ms':>10}")
+        for name, listing in (("per-event", per_event_listing), ("batched", batched_listing)):
+            for limit in PAGE_SIZES:
+                timer = Timer()
+                with QueryCounter(engine) as counter:
+                    for _ in range(ROUNDS):
+                        async with sessions() as session, timer.measure():
+                            await listing(EventService(session), user_id, limit)
+                queries = counter.count // ROUNDS
+                print(f"{name:<12}{limit:>6}{queries:>10}"
+                      f"{timer.mean:>10.2f}{timer.percentile(95):>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""Latency of shallow and deep event pages: OFFSET versus cursor.
+
+Seeds the events table with ROWS rows (1,000,000 by default) and times
+page 1 and page 1,000 of EventService.get_events through both paths.
+
+    python -m benchmarks.bench_keyset_pagination [rows]
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from benchmarks.common import Timer, bench_engine, session_factory
+from unisphere.models.event_model import Event
+from unisphere.models.user_model import User
+from unisphere.services.aggregates import encode_cursor
+from unisphere.services.event_service import EventService
+
+PAGE_SIZE = 20
+DEEP_PAGE = 1000
+ROUNDS = 20
+BATCH = 20_000
+
+
+async def seed(sessions, rows: int) -> None:
+    async with sessions() as session:
+        user = User(first_name="Bench", last_name="User",
+                    email="bench@example.com", password_hash="x")
+        session.add(user)
+        await session.commit()
+
+        start = datetime(2025, 1, 1)
+        for offset in range(0, rows, BATCH):
+            await session.exec(insert(Event), params=[
+                # Several events share each timestamp, so the id tie-breaker matters
+                {"title": f"Event {i}", "date": start + timedelta(minutes=i // 4),
+                 "created_by": user.id, "status": "upcoming", "registration_count": 0,
+                 "created_at": start, "updated_at": start}
+                for i in range(offset, min(offset + BATCH, rows))
+            ])
+        await session.commit()
+
+
+async def cursor_before(sessions, page: int) -> str | None:
+    """Cursor a client would hold after walking to the given page"""
+    if page == 1:
+        return None
+    async with sessions() as session:
+        events, _ = await EventService(session).get_events((page - 1) * PAGE_SIZE - 1, 1)
+        return encode_cursor([events[0].date, events[0].id])
+
+
+async def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+        await seed(sessions, rows)
+        print(f"{rows} events, {PAGE_SIZE} per page")
+
+        print(f"{'page':>6}{'strategy':>10}{'mean ms':>10}{'p95 ms':>10}")
+        for page in (1, DEEP_PAGE):
+            cursor = await cursor_before(sessions, page)
+            for name, kwargs in (("offset", {"skip": (page - 1) * PAGE_SIZE}),
+                                 ("cursor", {"cursor": cursor})):
+                timer = Timer()
+                for _ in range(ROUNDS):
+                    async with sessions() as session, timer.measure():
+                        events, _ = await EventService(session).get_events(limit=PAGE_SIZE, **kwargs)
+                assert len(events) == PAGE_SIZE
+                print(f"{page:>6}{name:>10}{timer.mean:>10.2f}{timer.percentile(95):>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
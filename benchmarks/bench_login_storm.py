@@ -0,0 +1,90 @@
+"""Latency of an unrelated endpoint while logins are hashing passwords.
+
+Fires N concurrent logins and, at the same time, polls GET / (no database,
+no auth). With bcrypt on the event loop every login stalls the poll; with
+the bounded hashing pool the poll keeps its usual latency.
+
+    python -m benchmarks.bench_login_storm [logins]   (default 50)
+"""
+import asyncio
+import sys
+from unittest import mock
+
+import bcrypt
+import httpx
+
+from benchmarks.common import Timer, bench_engine, session_factory
+from unisphere.core.password_hasher import PasswordHasher
+from unisphere.main import app
+from unisphere.models import get_session
+from unisphere.services.auth_service import DBAuthService
+
+PASSWORD = "pass1234"
+
+
+class InlineHasher(PasswordHasher):
+    """The old behaviour: bcrypt called directly on the event loop."""
+
+    async def _run(self, fn, *args):
+        return fn(*args)
+
+
+async def poll(client: httpx.AsyncClient, timer: Timer, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        async with timer.measure():
+            r = await client.get("/")
+        r.raise_for_status()
+        await asyncio.sleep(0.005)
+
+
+async def storm(client: httpx.AsyncClient, logins: int) -> tuple[Timer, Timer]:
+    login_timer, poll_timer = Timer(), Timer()
+    stop = asyncio.Event()
+
+    async def login():
+        async with login_timer.measure():
+            r = await client.post("/v1/auth/login", json={"email": "storm@example.com", "password": PASSWORD})
+        r.raise_for_status()
+
+    poller = asyncio.create_task(poll(client, poll_timer, stop))
+    await asyncio.gather(*(login() for _ in range(logins)))
+    stop.set()
+    await poller
+    return login_timer, poll_timer
+
+
+async def main(logins: int) -> None:
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+
+        async def bench_session():
+            async with sessions() as session:
+                yield session
+
+        app.dependency_overrides[get_session] = bench_session
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            r = await client.post("/v1/auth/register", json={
+                "personal_info": {"first_name": "Storm", "last_name": "User"},
+                "education_info": {},
+                "account_info": {"email": "storm@example.com", "password": PASSWORD,
+                                 "confirm_password": PASSWORD},
+            })
+            r.raise_for_status()
+
+            print(f"{logins} concurrent logins, bcrypt cost {bcrypt.gensalt().decode()[4:6]}")
+            print(f"{'hashing':<22}{'GET / p50':>11}{'GET / p99':>11}{'login p99':>11}")
+            for name, hasher in (
+                ("on the event loop", InlineHasher(1)),
+                ("pool of 4 threads", PasswordHasher(4)),
+            ):
+                with mock.patch.object(DBAuthService, "password_hasher", hasher):
+                    login_timer, poll_timer = await storm(client, logins)
+                hasher.shutdown()
+                print(f"{name:<22}{poll_timer.percentile(50):>11.1f}"
+                      f"{poll_timer.percentile(99):>11.1f}{login_timer.percentile(99):>11.1f}")
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
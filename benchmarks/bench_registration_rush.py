@@ -0,0 +1,66 @@
+"""Registration rush: many simultaneous registrants on a small event.
+
+Every registrant uses its own session, as concurrent requests would, and the
+run fails loudly if more seats are handed out than the event has.
+
+    python -m benchmarks.bench_registration_rush [registrants] [seats]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime
+
+from sqlmodel import func, select
+
+from benchmarks.common import Timer, bench_engine, session_factory
+from unisphere.models.event_model import Event, EventRegistration
+from unisphere.models.user_model import User
+from unisphere.services.event_service import EventService
+
+
+async def main(registrants: int = 1000, seats: int = 100) -> None:
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+        async with sessions() as session:
+            session.add_all(
+                User(first_name="Rush", last_name=str(i),
+                     email=f"rush{i}@example.com", password_hash="x")
+                for i in range(registrants)
+            )
+            await session.commit()
+            event = Event(title="Launch", date=datetime.now(),
+                          max_capacity=seats, created_by=1)
+            session.add(event)
+            await session.commit()
+            event_id = event.id
+
+        timer = Timer()
+
+        async def register(user_id: int) -> bool:
+            async with sessions() as session, timer.measure():
+                registration = await EventService(session).register_user_for_event(event_id, user_id)
+                return registration is not None
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(register(i) for i in range(1, registrants + 1)))
+        elapsed = time.perf_counter() - start
+
+        async with sessions() as session:
+            event = await session.get(Event, event_id)
+            stored = (await session.exec(
+                select(func.count()).select_from(EventRegistration)
+                .where(EventRegistration.event_id == event_id)
+            )).one()
+
+        print(f"registrants={registrants} seats={seats}")
+        print(f"admitted={sum(results)} stored_rows={stored} "
+              f"registration_count={event.registration_count}")
+        print(f"elapsed={elapsed:.2f}s p50={timer.percentile(50):.1f}ms "
+              f"p99={timer.percentile(99):.1f}ms")
+
+        if not sum(results) == stored == event.registration_count == seats:
+            raise SystemExit("overbooking or lost registration detected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:3])))
@@ -0,0 +1,127 @@
+"""Expanding a full semester of section schedules and RRULEs into occurrences.
+
+Compares a day-by-day walk over the semester with the ordinal arithmetic
+in services.recurrence, then times materializing every section with
+OccurrenceService.refresh_semester and the incremental refresh of one slot.
+
+    python -m benchmarks.bench_timetable_expansion [sections]   (default 5000)
+"""
+import asyncio
+import sys
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as clock
+
+from sqlalchemy import func, insert
+from sqlmodel import select
+
+from benchmarks.common import bench_engine, session_factory
+from unisphere.models.branch_model import BranchModel
+from unisphere.models.course_model import CourseModel
+from unisphere.models.day_of_week_model import DayModel
+from unisphere.models.faculty_model import FacultyModel
+from unisphere.models.schedule_model import (SectionOccurrenceModel,
+                                             SectionRRuleModel,
+                                             SectionScheduleModel)
+from unisphere.models.section_model import SectionModel
+from unisphere.models.semester_model import SemesterModel
+from unisphere.services import recurrence
+from unisphere.services.occurrence_service import OccurrenceService
+
+START, END = date(2025, 1, 6), date(2025, 5, 4)
+DAY_CODES = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+# Every fifth section also meets on an irregular rule
+RRULE = "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=SA;BYHOUR=9;BYMINUTE=0\nDURATION:PT3H"
+
+
+async def seed(sessions, sections: int) -> None:
+    async with sessions() as session:
+        session.add_all([DayModel(day_code=code) for code in DAY_CODES])
+        session.add(FacultyModel(faculty_code="ENG"))
+        session.add(SemesterModel(semester_code="2025/2", start_date=START, end_date=END))
+        await session.commit()
+        session.add(BranchModel(faculty_id=1, branch_code="CPE"))
+        await session.commit()
+        await session.exec(insert(CourseModel), params=[
+            {"branch_id": 1, "semester_id": 1, "course_code": f"C{i}", "status": "active"}
+            for i in range(sections // 10)
+        ])
+        await session.exec(insert(SectionModel), params=[
+            {"course_id": i % (sections // 10) + 1, "section_code": str(i), "student_limit": 40, "status": "active"}
+            for i in range(sections)
+        ])
+        await session.exec(insert(SectionScheduleModel), params=[
+            {"section_id": i + 1, "day_id": (i + slot * 2) % 5 + 1,
+             "start_time": clock(8 + i % 8), "end_time": clock(9 + i % 8, 30)}
+            for i in range(sections)
+            for slot in range(2)
+        ])
+        await session.exec(insert(SectionRRuleModel), params=[
+            {"section_id": i + 1, "rrule": RRULE} for i in range(0, sections, 5)
+        ])
+        await session.commit()
+
+
+def day_walk(slots) -> int:
+    """The obvious expansion: visit every day of the semester for every slot"""
+    count = 0
+    for weekday, start_time, end_time in slots:
+        day = START
+        while day <= END:
+            if day.weekday() == weekday:
+                datetime.combine(day, start_time), datetime.combine(day, end_time)
+                count += 1
+            day += timedelta(days=1)
+    return count
+
+
+def ordinal_arithmetic(slots) -> int:
+    return sum(len(recurrence.weekly_slot(*slot).between(START, END)) for slot in slots)
+
+
+def timed(work) -> tuple[int, float]:
+    start = time.perf_counter()
+    result = work()
+    return result, (time.perf_counter() - start) * 1000
+
+
+async def main(sections: int) -> None:
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+        await seed(sessions, sections)
+
+        async with sessions() as session:
+            rows = (await session.exec(
+                select(SectionScheduleModel.start_time, SectionScheduleModel.end_time, DayModel.day_code)
+                .join(DayModel, DayModel.day_id == SectionScheduleModel.day_id))).all()
+        slots = [(recurrence.weekday_of(code), start, end) for start, end, code in rows]
+
+        print(f"{sections} sections, {len(slots)} weekly slots, {START} to {END}")
+        count, elapsed = timed(lambda: day_walk(slots))
+        print(f"{'expand: day-by-day walk':<36}{elapsed:>10.1f} ms  {count} occurrences")
+        recurrence.weekly_slot.cache_clear()
+        count, elapsed = timed(lambda: ordinal_arithmetic(slots))
+        print(f"{'expand: ordinal arithmetic (cold)':<36}{elapsed:>10.1f} ms  {count} occurrences")
+        count, elapsed = timed(lambda: ordinal_arithmetic(slots))
+        print(f"{'expand: ordinal arithmetic (warm)':<36}{elapsed:>10.1f} ms  {count} occurrences")
+
+        async with sessions() as session:
+            start = time.perf_counter()
+            written = await OccurrenceService(session).refresh_semester(1)
+            await session.commit()
+            elapsed = (time.perf_counter() - start) * 1000
+        print(f"{'materialize: refresh_semester':<36}{elapsed:>10.1f} ms  {written} rows")
+
+        async with sessions() as session:
+            schedule = (await session.exec(select(SectionScheduleModel).limit(1))).one()
+            schedule.start_time = clock(7)
+            start = time.perf_counter()
+            written = await OccurrenceService(session).refresh_schedule(schedule)
+            await session.commit()
+            elapsed = (time.perf_counter() - start) * 1000
+            total = (await session.exec(select(func.count()).select_from(SectionOccurrenceModel))).one()
+        print(f"{'materialize: refresh one slot':<36}{elapsed:>10.1f} ms  {written} of {total} rows")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,121 @@
+"""Latency of a 10-course student's week: client fan-out vs GET /v1/me/timetable.
+
+The fan-out is what the app did before: the student's courses, then every
+course's sections, then each section's schedules and the course and day
+translations. The timetable is TimetableService.get_week, uncached and
+from the catalog cache. The target is a p95 under 20 ms.
+
+    python -m benchmarks.bench_timetable_week [students]   (default 1000)
+"""
+import asyncio
+import sys
+from datetime import date
+from datetime import time as clock
+
+from sqlalchemy import insert
+
+from benchmarks.common import QueryCounter, Timer, bench_engine, session_factory
+from unisphere.core.cache import LocalTTLCache, TaggedCache
+from unisphere.models.branch_model import BranchModel
+from unisphere.models.course_model import CourseModel, CourseTranslationModel
+from unisphere.models.day_of_week_model import DayModel, DayTranslationModel
+from unisphere.models.faculty_model import FacultyModel
+from unisphere.models.schedule_model import SectionScheduleModel
+from unisphere.models.section_model import SectionModel
+from unisphere.models.semester_model import SemesterModel
+from unisphere.models.user_enroll_model import UserEnrollModel
+from unisphere.models.user_model import User
+from unisphere.services.course_service.DBCourseService import DBCourseService
+from unisphere.services.dayofweek_service.DBDayOfWeekService import DBDayOfWeekService
+from unisphere.services.occurrence_service import OccurrenceService
+from unisphere.services.schedule_service.DBScheduleService import DBScheduleService
+from unisphere.services.section_service.DBSectionService import DBSectionService
+from unisphere.services.timetable_service import TimetableService
+
+COURSES = 200
+SECTIONS_PER_COURSE = 5
+COURSES_PER_STUDENT = 10
+ROUNDS = 200
+WEEK = date(2025, 2, 3)
+
+
+async def seed(sessions, students: int) -> None:
+    async with sessions() as session:
+        session.add_all([DayModel(day_code=code) for code in ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")])
+        session.add(FacultyModel(faculty_code="ENG"))
+        session.add(SemesterModel(semester_code="2025/2", start_date=date(2025, 1, 6), end_date=date(2025, 5, 4)))
+        await session.commit()
+        session.add(BranchModel(faculty_id=1, branch_code="CPE"))
+        await session.commit()
+        await session.exec(insert(DayTranslationModel), params=[
+            {"day_id": day_id, "language_code": "en", "day_name": f"Day {day_id}"} for day_id in range(1, 8)])
+        await session.exec(insert(CourseModel), params=[
+            {"branch_id": 1, "semester_id": 1, "course_code": f"C{i}", "status": "active"} for i in range(COURSES)])
+        await session.exec(insert(CourseTranslationModel), params=[
+            {"course_id": i + 1, "language_code": "en", "subject_name": f"Subject {i}"} for i in range(COURSES)])
+        sections = COURSES * SECTIONS_PER_COURSE
+        await session.exec(insert(SectionModel), params=[
+            {"course_id": i // SECTIONS_PER_COURSE + 1, "section_code": str(i % SECTIONS_PER_COURSE),
+             "student_limit": 40, "status": "active"}
+            for i in range(sections)])
+        # Two lectures and a lab a week per section
+        await session.exec(insert(SectionScheduleModel), params=[
+            {"section_id": i + 1, "day_id": (i + slot) % 5 + 1,
+             "start_time": clock(8 + 3 * slot), "end_time": clock(10 + 3 * slot)}
+            for i in range(sections) for slot in range(3)])
+        await session.exec(insert(User), params=[
+            {"first_name": "S", "last_name": str(i), "email": f"s{i}@example.com", "password_hash": "x",
+             "role": "user", "is_active": True, "token_version": 0}
+            for i in range(students)])
+        await session.exec(insert(UserEnrollModel), params=[
+            {"user_id": student + 1,
+             "section_id": ((student * 7 + k * 13) % COURSES) * SECTIONS_PER_COURSE + student % SECTIONS_PER_COURSE + 1}
+            for student in range(students) for k in range(COURSES_PER_STUDENT)])
+        await session.commit()
+        await OccurrenceService(session).refresh_semester(1)
+        await session.commit()
+
+
+async def fan_out(session, user_id: int) -> int:
+    courses = DBCourseService(session)
+    sections = DBSectionService(session)
+    schedules = DBScheduleService(session)
+    days = DBDayOfWeekService(session)
+    meetings = 0
+    for course in await courses.get_user_courses(user_id):
+        await courses.get_translation(course.course_id, "en")
+        for section in await sections.list_sections(course.course_id):
+            for schedule in await schedules.list_schedules(section.section_id):
+                await days.get_translation(schedule.day_id, "en")
+                meetings += 1
+    return meetings
+
+
+async def main(students: int) -> None:
+    async with bench_engine() as engine:
+        sessions = session_factory(engine)
+        await seed(sessions, students)
+        cache = TaggedCache(LocalTTLCache(maxsize=students * 2, ttl=600))
+
+        async def uncached(session, user_id):
+            return len((await TimetableService(session).get_week(user_id, WEEK, "en")).entries)
+
+        async def from_cache(session, user_id):
+            return len((await TimetableService(session, cache).get_week(user_id, WEEK, "en")).entries)
+
+        print(f"{students} students, {COURSES_PER_STUDENT} courses each, week of {WEEK}")
+        print(f"{'strategy':<22}{'queries':>9}{'rows':>7}{'mean ms':>10}{'p95 ms':>10}")
+        for name, work in (("client fan-out", fan_out), ("timetable", uncached), ("timetable, cached", from_cache)):
+            timer = Timer()
+            with QueryCounter(engine) as counter:
+                for round_ in range(ROUNDS):
+                    # Cycle through a few students so the cached run has warm entries to hit
+                    user_id = round_ % 20 + 1
+                    async with sessions() as session, timer.measure():
+                        rows = await work(session, user_id)
+            print(f"{name:<22}{counter.count / ROUNDS:>9.1f}{rows:>7}"
+                  f"{timer.mean:>10.2f}{timer.percentile(95):>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -0,0 +1,76 @@
+"""Peak memory of concurrent image uploads.
+
+Saves N concurrent uploads of SIZE MiB each with the old read-it-all
+approach (two full copies per request) and with UploadService.save_image's
+chunked streaming. Sources are spooled to disk, as Starlette does for
+multipart bodies over 1 MiB, so only the service's own buffering is measured.
+
+    python -m benchmarks.bench_upload_memory [uploads] [size_mib]   (default 50 10)
+"""
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+import aiofiles
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from unisphere.services.upload_service import UploadService
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+async def read_it_all(service: UploadService, file: UploadFile, max_size: int) -> str:
+    """The previous save_image: read to check the size, then read again to write."""
+    content = await file.read()
+    if len(content) > max_size:
+        raise ValueError("too large")
+    await file.seek(0)
+    path = service.images_dir / f"{uuid.uuid4()}.png"
+    async with aiofiles.open(path, "wb") as f:
+        content = await file.read()
+        await f.write(content)
+    return str(path)
+
+
+async def streaming(service: UploadService, file: UploadFile, max_size: int) -> str:
+    return await service.save_image(file, max_size=max_size)
+
+
+def make_uploads(source: Path, count: int) -> list[UploadFile]:
+    headers = Headers({"content-type": "image/png"})
+    return [UploadFile(open(source, "rb"), filename="photo.png", headers=headers)
+            for _ in range(count)]
+
+
+async def main(uploads: int, size_mib: int) -> None:
+    size = size_mib * 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source.png"
+        with open(source, "wb") as f:
+            f.write(PNG_HEADER)
+            f.write(b"\0" * (size - len(PNG_HEADER)))
+
+        print(f"{uploads} concurrent uploads of {size_mib} MiB")
+        print(f"{'strategy':<14}{'peak MiB':>10}{'seconds':>10}")
+        for name, save in (("read it all", read_it_all), ("streaming", streaming)):
+            service = UploadService(str(Path(tmp) / name.replace(" ", "_")))
+            files = make_uploads(source, uploads)
+            tracemalloc.start()
+            start = time.perf_counter()
+            await asyncio.gather(*(save(service, file, size) for file in files))
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            for file in files:
+                file.file.close()
+            print(f"{name:<14}{peak / (1024 * 1024):>10.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(main(*(args or [50, 10])))
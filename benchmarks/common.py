@@ -0,0 +1,86 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite file by default. Set
+BENCH_DATABASE_URL to an async Postgres URL to measure the production driver.
+"""
+import os
+import statistics
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import unisphere.models  # noqa: F401  (registers every table)
+
+
+@asynccontextmanager
+async def bench_engine() -> AsyncIterator[AsyncEngine]:
+    """Yield an engine on a freshly created schema."""
+    database_url = os.getenv("BENCH_DATABASE_URL")
+    with tempfile.TemporaryDirectory() as tmp:
+        if database_url:
+            engine = create_async_engine(database_url)
+        else:
+            # Generous busy timeout: concurrent writers queue on SQLite's single write lock
+            engine = create_async_engine(
+                f"sqlite+aiosqlite:///{tmp}/bench.db", connect_args={"timeout": 60})
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+        try:
+            yield engine
+        finally:
+            await engine.dispose()
+
+
+def session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class QueryCounter:
+    """Count statements executed on an engine."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine.sync_engine,
+                     "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine.sync_engine,
+                     "before_cursor_execute", self._on_execute)
+
+
+class Timer:
+    """Collect wall-clock samples in milliseconds."""
+
+    def __init__(self):
+        self.samples: list[float] = []
+
+    @asynccontextmanager
+    async def measure(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.append((time.perf_counter() - start) * 1000)
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
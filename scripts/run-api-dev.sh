@@ -1,2 +1,2 @@
 #!/bin/bash
-poetry run fastapi dev unisphere/main.py --host 0.0.0.0 --port 8000
+poetry run python -m unisphere.migrations upgrade && poetry run fastapi dev unisphere/main.py --host 0.0.0.0 --port 8000
@@ -1,2 +1,2 @@
 #!/bin/bash
-poetry run uvicorn unisphere.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+poetry run python -m unisphere.migrations upgrade && poetry run uvicorn unisphere.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
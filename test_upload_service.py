@@ -81,7 +81,7 @@ async def test_upload_service():
 
             # Test deletion
             print("4. Testing image deletion...")
-            delete_success = upload_service.delete_image(result_path)
+            delete_success = await upload_service.delete_image(result_path)
             if delete_success:
                 print("✅ Deletion successful")
 
@@ -1,9 +1,11 @@
 import os
+from datetime import date, datetime, timedelta
 
 import httpx
 import pytest_asyncio
 from dotenv import load_dotenv
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
@@ -11,6 +13,17 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from unisphere.main import app
 from unisphere.models import get_session
+from unisphere.models.branch_model import BranchModel
+from unisphere.models.course_model import CourseModel
+from unisphere.models.day_of_week_model import DayModel
+from unisphere.models.event_model import Event
+from unisphere.models.faculty_model import FacultyModel
+from unisphere.models.section_model import SectionModel
+from unisphere.models.semester_model import SemesterModel
+from unisphere.services.auth_service.PrincipalCache import local_principals
+from unisphere.services.auth_service.TokenStore import memory_token_store
+from unisphere.services.catalog_cache import catalog_cache
+from unisphere.services.recurrence import WEEKDAYS
 
 
 @pytest_asyncio.fixture
@@ -40,9 +53,28 @@ async def session_fixture(engine_fixture):
         yield db_session
 
 
+@pytest_asyncio.fixture
+async def query_counter(engine_fixture):
+    """Count SQL statements sent to the test database."""
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine_fixture.sync_engine,
+                 "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine_fixture.sync_engine,
+                 "before_cursor_execute", before_cursor_execute)
+
+
 @pytest_asyncio.fixture
 async def client(session_fixture):
     """Create test client with dependency override."""
+    # User ids restart with every fresh schema
+    local_principals.clear()
+    memory_token_store.clear()
+    catalog_cache.clear()
 
     async def get_session_override():
         yield session_fixture
@@ -57,3 +89,62 @@ async def client(session_fixture):
         yield http_client
 
     app.dependency_overrides.clear()
+
+
+async def register_and_login(client: AsyncClient, email: str) -> tuple[int, dict]:
+    registration_data = {
+        "personal_info": {"first_name": "Event", "last_name": "Goer"},
+        "education_info": {"student_id": email.split("@")[0]},
+        "account_info": {"email": email, "password": "pass1234", "confirm_password": "pass1234"}
+    }
+    r = await client.post("/v1/auth/register", json=registration_data)
+    assert r.status_code == 201
+    data = r.json()
+    return data["user"]["id"], {"Authorization": f"Bearer {data['token']['access_token']}"}
+
+
+async def create_events(session, created_by: int, count: int, **fields) -> list[Event]:
+    events = [
+        Event(
+            title=f"Event {i}",
+            date=datetime.now() + timedelta(days=i),
+            created_by=created_by,
+            **fields
+        )
+        for i in range(count)
+    ]
+    session.add_all(events)
+    await session.commit()
+    return events
+
+
+async def seed_sections(session, count: int = 1, start=date(2025, 1, 6), end=date(2025, 4, 27)) -> dict:
+    """A semester with one course and count sections, plus MON..SUN day rows"""
+    days = [DayModel(day_code=code) for code in ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")]
+    faculty = FacultyModel(faculty_code="ENG")
+    semester = SemesterModel(semester_code="2025/2", start_date=start, end_date=end)
+    session.add_all([*days, faculty, semester])
+    await session.commit()
+    branch = BranchModel(faculty_id=faculty.faculty_id, branch_code="CPE")
+    session.add(branch)
+    await session.commit()
+    course = CourseModel(branch_id=branch.branch_id, semester_id=semester.semester_id, course_code="CPE101")
+    session.add(course)
+    await session.commit()
+    sections = [SectionModel(course_id=course.course_id, section_code=f"{i:02}", student_limit=40)
+                for i in range(count)]
+    session.add_all(sections)
+    await session.commit()
+    return {
+        "days": {WEEKDAYS[i]: d.day_id for i, d in enumerate(days)},
+        "semester_id": semester.semester_id,
+        "course_id": course.course_id,
+        "section_ids": [s.section_id for s in sections],
+    }
+
+
+async def add_slot(client: AsyncClient, section_id: int, day_id: int, start: str, end: str) -> int:
+    r = await client.post("/v1/schedules/", json={
+        "section_id": section_id, "day_id": day_id, "start_time": start, "end_time": end})
+    assert r.status_code == 201
+    return r.json()["schedule_id"]
@@ -1,6 +1,20 @@
+import asyncio
+import time
+from datetime import datetime
+
 import pytest
 from httpx import AsyncClient
 
+from tests.conftest import register_and_login
+from unisphere.core.cache import LocalTTLCache
+from unisphere.core.config import Settings, check_settings
+from unisphere.core.password_hasher import PasswordHasher
+from unisphere.models.user_model import User
+from unisphere.schemas.user_schema import User as SchemaUser
+from unisphere.services.auth_service.MockAuthService import MockAuthService
+from unisphere.services.auth_service.PrincipalCache import PrincipalCache
+from unisphere.services.auth_service.TokenStore import RedisTokenStore
+
 
 @pytest.mark.asyncio
 async def test_register_user(client: AsyncClient):
@@ -219,3 +233,197 @@ async def test_get_education_options(client: AsyncClient):
     assert "ปริญญาตรี" in data["education_levels"]
     assert "วิทยาเขตรังสิต" in data["campuses"]
     assert "คณะวิศวกรรมศาสตร์" in data["faculties"]
+
+
+@pytest.mark.asyncio
+async def test_authenticated_requests_use_the_principal_cache(client: AsyncClient, query_counter):
+    """Only the first request after login looks the user up"""
+    _, headers = await register_and_login(client, "cached@example.com")
+
+    assert (await client.get("/v1/auth/me", headers=headers)).status_code == 200
+    query_counter.clear()
+    r = await client.get("/v1/auth/me", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["email"] == "cached@example.com"
+    assert query_counter == []
+
+
+@pytest.mark.asyncio
+async def test_profile_update_invalidates_cached_user(client: AsyncClient):
+    """A profile update is visible on the next request"""
+    _, headers = await register_and_login(client, "rename@example.com")
+    await client.get("/v1/auth/me", headers=headers)
+
+    r = await client.put("/v1/auth/profile", json={"first_name": "Renamed"}, headers=headers)
+    assert r.status_code == 200
+    r = await client.get("/v1/auth/me", headers=headers)
+    assert r.json()["first_name"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_deactivation_revokes_tokens(client: AsyncClient, session_fixture):
+    """Deactivating a user rejects their cached token"""
+    user_id, headers = await register_and_login(client, "leaver@example.com")
+    admin_id, admin_headers = await register_and_login(client, "admin@example.com")
+    admin = await session_fixture.get(User, admin_id)
+    admin.role = "admin"
+    session_fixture.add(admin)
+    await session_fixture.commit()
+
+    await client.get("/v1/auth/me", headers=headers)
+    r = await client.post(f"/v1/auth/users/{user_id}/deactivate", headers=admin_headers)
+    assert r.status_code == 200
+
+    r = await client.get("/v1/auth/me", headers=headers)
+    assert r.status_code == 401
+    r = await client.get("/v1/user-places/", headers=headers)
+    assert r.status_code == 200  # claims-only endpoints honour the token until it expires
+
+    r = await client.post(f"/v1/auth/users/{user_id}/deactivate", headers=headers)
+    assert r.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_between_workers():
+    """A second worker's cache is filled from Redis and dropped on invalidate"""
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    worker_a = PrincipalCache(LocalTTLCache(10, 30), redis_client)
+    worker_b = PrincipalCache(LocalTTLCache(10, 30), redis_client)
+    user = SchemaUser(id=1, first_name="Shared", last_name="User", email="shared@example.com",
+                      created_at=datetime.now(), updated_at=datetime.now())
+
+    await worker_a.set(user, 3)
+    assert await worker_b.get(1, 3) == user
+    assert await worker_b.get(1, 2) is None
+
+    await worker_a.invalidate(1)
+    assert await worker_a.get(1, 3) is None
+    await redis_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_is_bounded_and_off_the_loop():
+    """Hashes beyond the concurrency limit queue instead of blocking the loop"""
+    hasher = PasswordHasher(max_workers=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        hashes = await asyncio.gather(*(hasher.hash(f"pw{i}") for i in range(6)))
+    finally:
+        task.cancel()
+    assert ticks > 0
+    metrics = hasher.metrics()
+    assert metrics["completed"] == 6
+    assert metrics["max_queued"] > hasher.max_workers
+    assert metrics["queued"] == metrics["active"] == 0
+    assert await hasher.verify("pw3", hashes[3])
+    assert not await hasher.verify("pw3", hashes[4])
+    hasher.shutdown()
+
+
+async def register_for_tokens(client: AsyncClient, email: str) -> dict:
+    await register_and_login(client, email)
+    r = await client.post("/v1/auth/login", json={"email": email, "password": "pass1234"})
+    return r.json()["token"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_and_detects_reuse(client: AsyncClient):
+    """A refresh token works once; replaying it revokes the rotated one too"""
+    tokens = await register_for_tokens(client, "rotate@example.com")
+
+    r = await client.post("/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert r.status_code == 200
+    rotated = r.json()
+    headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+    assert (await client.get("/v1/auth/me", headers=headers)).status_code == 200
+
+    r = await client.post("/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert r.status_code == 401
+    r = await client.post("/v1/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert r.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_an_access_token(client: AsyncClient):
+    tokens = await register_for_tokens(client, "mixup@example.com")
+    headers = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    assert (await client.get("/v1/auth/me", headers=headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_and_refresh_tokens(client: AsyncClient, query_counter):
+    tokens = await register_for_tokens(client, "bye@example.com")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    await client.get("/v1/auth/me", headers=headers)
+
+    r = await client.post("/v1/auth/logout", headers=headers,
+                          json={"refresh_token": tokens["refresh_token"]})
+    assert r.status_code == 200
+
+    query_counter.clear()
+    assert (await client.get("/v1/auth/me", headers=headers)).status_code == 401
+    assert query_counter == []
+    r = await client.post("/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert r.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_redis_token_store():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    store = RedisTokenStore(redis_client)
+    expires_at = time.time() + 60
+
+    await store.revoke("access-1", expires_at)
+    assert await store.is_revoked("access-1")
+    assert not await store.is_revoked("access-2")
+    assert 0 < await redis_client.ttl("auth:revoked:access-1") <= 61
+
+    await store.issue_refresh("refresh-1", "family", expires_at)
+    await store.issue_refresh("refresh-2", "family", expires_at)
+    assert await store.consume_refresh("refresh-1", "family")
+    assert not await store.consume_refresh("refresh-1", "family")
+    await store.revoke_family("family", expires_at)
+    assert not await store.consume_refresh("refresh-2", "family")
+    await redis_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_mock_refresh_after_token_version_bump_revokes_family():
+    service = MockAuthService()
+    user = User(id=1, first_name="M", last_name="Ock", email="mock@example.com",
+                password_hash="x", role="user", is_active=True, token_version=0)
+    service.users[user.email] = user
+    tokens = await service.create_tokens(user)
+    family = (await service.verify_token(tokens["refresh_token"]))["fam"]
+
+    user.token_version += 1
+    with pytest.raises(ValueError):
+        await service.refresh_tokens(tokens["refresh_token"])
+    user.token_version -= 1
+    sibling = await service.create_tokens(user, family=family)
+    with pytest.raises(ValueError):
+        await service.refresh_tokens(sibling["refresh_token"])
+
+
+def test_memory_token_store_needs_a_single_worker():
+    check_settings(Settings(WEB_CONCURRENCY=1, AUTH_TOKEN_STORE_BACKEND="memory"))
+    check_settings(Settings(WEB_CONCURRENCY=4, AUTH_TOKEN_STORE_BACKEND="redis", CATALOG_CACHE_BACKEND="redis"))
+    with pytest.raises(RuntimeError):
+        check_settings(Settings(WEB_CONCURRENCY=2, AUTH_TOKEN_STORE_BACKEND="memory", CATALOG_CACHE_BACKEND="redis"))
+
+
+def test_memory_catalog_cache_needs_a_single_worker():
+    check_settings(Settings(WEB_CONCURRENCY=1, CATALOG_CACHE_BACKEND="memory"))
+    check_settings(Settings(WEB_CONCURRENCY=4, AUTH_TOKEN_STORE_BACKEND="redis", CATALOG_CACHE_BACKEND="none"))
+    with pytest.raises(RuntimeError):
+        check_settings(Settings(WEB_CONCURRENCY=2, AUTH_TOKEN_STORE_BACKEND="redis", CATALOG_CACHE_BACKEND="memory"))
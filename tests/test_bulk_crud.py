@@ -0,0 +1,97 @@
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import add_slot, seed_sections
+
+
+def statuses(body: dict) -> list:
+    return [r["status"] for r in body["results"]]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_each_item(client: AsyncClient, query_counter):
+    r = await client.post("/v1/faculties/", json={"faculty_code": "SCI"})
+    faculty_id = r.json()["faculty_id"]
+
+    query_counter.clear()
+    r = await client.post("/v1/faculties/bulk", json=[
+        {"faculty_code": f"F{i}"} for i in range(50)] + [{"faculty_code": "SCI"}, {"faculty_code": "F0"}])
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["succeeded"], body["failed"]) == (50, 2)
+    assert statuses(body)[-2:] == ["conflict", "conflict"]
+    assert body["results"][0]["data"]["faculty_code"] == "F0"
+    assert body["results"][-1]["error"] == "faculty_code 'F0' already exists"
+    # One INSERT for the whole batch
+    assert sum(1 for s in query_counter if s.lstrip().upper().startswith("INSERT")) == 1
+
+    r = await client.post("/v1/branches/bulk", json=[
+        {"faculty_id": faculty_id, "branch_code": "MTH"},
+        {"faculty_id": 999, "branch_code": "PHY"},
+    ])
+    body = r.json()
+    assert statuses(body) == ["created", "invalid"]
+    assert body["results"][1]["error"] == "faculties 999 not found (faculty_id)"
+
+    r = await client.post("/v1/faculties/bulk", json=[{"faculty_code": "X"}] * 1001)
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_checks_ids_and_codes(client: AsyncClient):
+    r = await client.post("/v1/faculties/bulk", json=[{"faculty_code": c} for c in ("A", "B", "C")])
+    a, b, c = [x["id"] for x in r.json()["results"]]
+
+    r = await client.put("/v1/faculties/bulk", json=[
+        {"id": a, "data": {"status": "inactive"}},
+        {"id": b, "data": {"faculty_code": "C"}},
+        {"id": c, "data": {"faculty_code": "D"}},
+        {"id": 999, "data": {"status": "inactive"}},
+        {"id": a, "data": {"faculty_code": "E"}},
+    ])
+    body = r.json()
+    assert statuses(body) == ["updated", "conflict", "updated", "not_found", "conflict"]
+    assert body["results"][0]["data"]["status"] == "inactive"
+
+    r = await client.get("/v1/faculties/")
+    assert sorted((f["faculty_code"], f["status"]) for f in r.json()) == [
+        ("A", "inactive"), ("B", "active"), ("D", "active")]
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_leaves_referenced_rows(client: AsyncClient, session_fixture):
+    seed = await seed_sections(session_fixture, count=3)
+    first, second, third = seed["section_ids"]
+    await add_slot(client, first, seed["days"]["MO"], "09:00", "10:00")
+
+    r = await client.request("DELETE", "/v1/sections/bulk", json=[first, second, second, 999])
+    body = r.json()
+    assert statuses(body) == ["conflict", "deleted", "not_found", "not_found"]
+    assert body["results"][0]["error"] == "Still referenced by section_schedules"
+    r = await client.get("/v1/sections/", params={"course_id": seed["course_id"]})
+    assert sorted(s["section_id"] for s in r.json()) == [first, third]
+
+    # Moving a section to a code its course already has is refused
+    r = await client.put("/v1/sections/bulk", json=[{"id": third, "data": {"section_code": "00"}}])
+    assert statuses(r.json()) == ["conflict"]
+
+    r = await client.get("/v1/faculties/")
+    faculty_id = r.json()[0]["faculty_id"]
+    r = await client.request("DELETE", "/v1/faculties/bulk", json=[faculty_id])
+    assert statuses(r.json()) == ["conflict"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_writes_drop_cached_lists(client: AsyncClient):
+    await client.post("/v1/faculties/", json={"faculty_code": "ENG"})
+    r = await client.get("/v1/faculties/")
+    assert len(r.json()) == 1
+
+    r = await client.post("/v1/faculties/bulk", json=[{"faculty_code": "ART"}])
+    (art,) = [x["id"] for x in r.json()["results"]]
+    r = await client.get("/v1/faculties/")
+    assert len(r.json()) == 2
+
+    await client.request("DELETE", "/v1/faculties/bulk", json=[art])
+    r = await client.get("/v1/faculties/")
+    assert [f["faculty_code"] for f in r.json()] == ["ENG"]
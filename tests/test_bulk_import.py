@@ -0,0 +1,124 @@
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+
+from tests.conftest import register_and_login, seed_sections
+from unisphere.models.section_instructor import SectionInstructorModel
+from unisphere.models.section_model import SectionModel
+from unisphere.models.user_enroll_model import UserEnrollModel
+from unisphere.models.user_model import User
+from unisphere.services.bulk_import_service import BulkImportService, read_records
+
+
+async def admin_headers(client: AsyncClient, session) -> dict:
+    admin_id, _ = await register_and_login(client, "registrar@example.com")
+    admin = await session.get(User, admin_id)
+    admin.role = "admin"
+    session.add(admin)
+    await session.commit()
+    r = await client.post("/v1/auth/login", json={"email": "registrar@example.com", "password": "pass1234"})
+    return {"Authorization": f"Bearer {r.json()['token']['access_token']}"}
+
+
+async def stream(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_csv_sections_upsert_and_report(client: AsyncClient, session_fixture):
+    seed = await seed_sections(session_fixture)
+    headers = await admin_headers(client, session_fixture)
+    course_id = seed["course_id"]
+    body = (
+        "course_id,section_code,student_limit,status\n"
+        f"{course_id},00,60,active\n"
+        f'{course_id},"L1",30,\n'
+        f"{course_id},L2,-5,active\n"
+        f"{course_id + 100},L3,30,active\n"
+        f"{course_id},L4\n"
+    )
+    r = await client.post("/v1/imports/sections", content=body.encode(),
+                          headers={**headers, "Content-Type": "text/csv"})
+    assert r.status_code == 200
+    report = r.json()
+    assert (report["rows"], report["written"], report["unchanged"], report["failed"]) == (5, 2, 0, 3)
+    assert [(e["line"], e["error"].split(":")[0]) for e in report["errors"]] == [
+        (4, "student_limit"), (5, f"Course {course_id + 100} not found"), (6, "Expected 4 values, got 2")]
+
+    sections = (await session_fixture.exec(
+        select(SectionModel.section_code, SectionModel.student_limit).order_by(SectionModel.section_code))).all()
+    assert sections == [("00", 60), ("L1", 30)]
+
+    # Sending it again changes nothing
+    r = await client.post("/v1/imports/sections", params={"format": "csv"}, content=body.encode(), headers=headers)
+    assert (r.json()["written"], r.json()["unchanged"]) == (0, 2)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_enrollments_by_id_or_natural_key(client: AsyncClient, session_fixture):
+    seed = await seed_sections(session_fixture, count=2)
+    first, second = seed["section_ids"]
+    student_id, _ = await register_and_login(client, "student@example.com")
+    headers = await admin_headers(client, session_fixture)
+    lines = [
+        f'{{"user_id": {student_id}, "section_id": {first}}}',
+        f'{{"email": "student@example.com", "course_id": {seed["course_id"]}, "section_code": "01"}}',
+        f'{{"user_id": {student_id}, "section_id": {first}}}',
+        '{"email": "nobody@example.com", "section_id": 1}',
+        f'{{"user_id": {student_id}}}',
+        "not json",
+        "",
+    ]
+    r = await client.post("/v1/imports/enrollments", content="\n".join(lines).encode(),
+                          headers={**headers, "Content-Type": "application/x-ndjson"})
+    report = r.json()
+    assert (report["rows"], report["written"], report["unchanged"], report["failed"]) == (6, 2, 1, 3)
+    assert [e["line"] for e in report["errors"]] == [4, 5, 6]
+
+    enrolled = (await session_fixture.exec(
+        select(UserEnrollModel.section_id).where(UserEnrollModel.user_id == student_id))).all()
+    assert sorted(enrolled) == [first, second]
+
+
+@pytest.mark.asyncio
+async def test_chunks_commit_and_progress(session_fixture):
+    seed = await seed_sections(session_fixture, count=3)
+    users = [User(first_name="T", last_name=str(i), email=f"t{i}@example.com", password_hash="x") for i in range(3)]
+    session_fixture.add_all(users)
+    await session_fixture.commit()
+    body = "user_id,section_id\n" + "".join(
+        f"{user.id},{section_id}\n" for user in users for section_id in seed["section_ids"])
+
+    progress = []
+    service = BulkImportService(session_fixture, chunk_size=4, max_errors=0)
+    # Chunks that end mid-line
+    data = body.encode()
+    report = await service.run("instructors", read_records(stream(data[:7], data[7:30], data[30:]), "csv"),
+                               progress.append)
+    assert (report.rows, report.written, report.failed) == (9, 9, 0)
+    assert [(p.rows, p.written) for p in progress] == [(4, 4), (8, 8), (9, 9)]
+    count = (await session_fixture.exec(select(SectionInstructorModel))).all()
+    assert len(count) == 9
+
+
+@pytest.mark.asyncio
+async def test_import_needs_admin_and_a_format(client: AsyncClient, session_fixture):
+    _, headers = await register_and_login(client, "student@example.com")
+    r = await client.post("/v1/imports/enrollments", content=b"", headers={**headers, "Content-Type": "text/csv"})
+    assert r.status_code == 403
+    headers = await admin_headers(client, session_fixture)
+    r = await client.post("/v1/imports/enrollments", content=b"{}", headers={**headers, "Content-Type": "text/plain"})
+    assert r.status_code == 415
+
+    # A deactivated admin is refused at once, not when their token expires
+    registrar = (await session_fixture.exec(select(User).where(User.email == "registrar@example.com"))).one()
+    dean_id, other = await register_and_login(client, "dean@example.com")
+    dean = await session_fixture.get(User, dean_id)
+    dean.role = "admin"
+    session_fixture.add(dean)
+    await session_fixture.commit()
+    r = await client.post(f"/v1/auth/users/{registrar.id}/deactivate", headers=other)
+    assert r.status_code == 200
+    r = await client.post("/v1/imports/enrollments", content=b"", headers={**headers, "Content-Type": "text/csv"})
+    assert r.status_code == 401
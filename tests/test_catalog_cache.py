@@ -0,0 +1,92 @@
+import pytest
+from httpx import AsyncClient
+
+from unisphere.core.cache import LocalTTLCache, TaggedCache, cached, invalidates
+from unisphere.services.catalog_cache import catalog_cache
+
+
+def selects(statements: list[str], table: str) -> int:
+    return sum(1 for s in statements if s.lstrip().upper().startswith("SELECT") and f"FROM {table}" in s)
+
+
+@pytest.mark.asyncio
+async def test_faculty_list_is_cached_until_a_write(client: AsyncClient, query_counter):
+    r = await client.post("/v1/faculties/", json={"faculty_code": "SCI"})
+    assert r.status_code == 201
+    query_counter.clear()
+
+    for _ in range(3):
+        r = await client.get("/v1/faculties/")
+        assert [f["faculty_code"] for f in r.json()] == ["SCI"]
+    assert selects(query_counter, "faculties") == 1
+    assert catalog_cache.stats.local_hits >= 2
+
+    r = await client.post("/v1/faculties/", json={"faculty_code": "ENG"})
+    assert r.status_code == 201
+    query_counter.clear()
+    r = await client.get("/v1/faculties/")
+    assert sorted(f["faculty_code"] for f in r.json()) == ["ENG", "SCI"]
+    assert selects(query_counter, "faculties") == 1
+
+    r = await client.get("/health/cache")
+    assert r.status_code == 200
+    assert r.json()["invalidations"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_arguments_are_part_of_the_key(client: AsyncClient):
+    await client.post("/v1/faculties/", json={"faculty_code": "SCI"})
+    await client.post("/v1/faculties/", json={"faculty_code": "OLD", "status": "archived"})
+
+    r = await client.get("/v1/faculties/", params={"status": "archived"})
+    assert [f["faculty_code"] for f in r.json()] == ["OLD"]
+    r = await client.get("/v1/faculties/")
+    assert len(r.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_days_router_uses_the_cached_service(client: AsyncClient, query_counter):
+    r = await client.post("/v1/days/", json={"day_code": "MON"})
+    assert r.status_code == 201
+    query_counter.clear()
+    for _ in range(2):
+        r = await client.get("/v1/days/")
+        assert r.status_code == 200
+        assert [d["day_code"] for d in r.json()] == ["MON"]
+    assert selects(query_counter, "day_of_weeks") == 1
+
+
+class Catalog:
+    def __init__(self, cache: TaggedCache):
+        self.cache = cache
+        self.loads = 0
+
+    @cached("items", ttl=60)
+    async def list_items(self, kind: str = "all") -> list[str]:
+        self.loads += 1
+        return [kind]
+
+    @invalidates("items")
+    async def add_item(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_between_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    worker_a = Catalog(TaggedCache(LocalTTLCache(10, 60), redis_client))
+    worker_b = Catalog(TaggedCache(LocalTTLCache(10, 60), redis_client))
+
+    assert await worker_a.list_items() == ["all"]
+    assert await worker_a.list_items(kind="all") == ["all"]
+    assert await worker_b.list_items("all") == ["all"]
+    assert (worker_a.loads, worker_b.loads) == (1, 0)
+    assert worker_b.cache.stats.redis_hits == 1
+
+    # Redis is dropped for everyone; worker_b's LRU still holds its copy until local_ttl
+    await worker_a.add_item()
+    assert await worker_a.list_items() == ["all"]
+    assert worker_a.loads == 2
+    assert await redis_client.keys("cache:tag:*") == ["cache:tag:items"]
+    await redis_client.aclose()
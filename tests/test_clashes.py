@@ -0,0 +1,133 @@
+from datetime import date, time
+
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import add_slot, register_and_login, seed_sections
+from unisphere.models.course_model import CourseModel
+from unisphere.models.section_model import SectionModel
+from unisphere.models.semester_model import SemesterModel
+from unisphere.models.user_enroll_model import UserEnrollModel
+from unisphere.services.clash_service import Slot, sweep
+
+
+def test_sweep_reports_each_overlapping_pair_once():
+    slots = [
+        Slot(1, time(9), time(12), 1, 1),
+        Slot(1, time(10), time(11), 2, 2),
+        Slot(1, time(11), time(13), 3, 3),
+        # Touches section 3 but does not overlap it
+        Slot(1, time(13), time(14), 4, 4),
+        # Same times on another day
+        Slot(2, time(9), time(12), 2, 5),
+        # Two meetings of one section never clash with each other, and 6 only touches 2
+        Slot(1, time(9), time(10), 1, 6),
+    ]
+    pairs = {(a.schedule_id, b.schedule_id) for a, b in sweep(slots)}
+    assert pairs == {(1, 2), (1, 3)}
+
+
+@pytest.mark.asyncio
+async def test_enroll_and_conflicts_endpoint(client: AsyncClient, session_fixture):
+    user_id, headers = await register_and_login(client, "clash@example.com")
+    seed = await seed_sections(session_fixture, count=3)
+    first, second, third = seed["section_ids"]
+    await add_slot(client, first, seed["days"]["MO"], "09:00", "12:00")
+    await add_slot(client, second, seed["days"]["MO"], "11:00", "13:00")
+    await add_slot(client, third, seed["days"]["MO"], "12:00", "14:00")
+
+    r = await client.post(f"/v1/courses/{seed['course_id']}/enroll", params={"user_id": user_id, "section_id": first})
+    assert r.status_code == 200
+
+    r = await client.get("/v1/me/timetable/conflicts", params={"section_id": second}, headers=headers)
+    assert [(c["first"]["section_id"], c["second"]["section_id"]) for c in r.json()] == [(first, second)]
+    r = await client.get("/v1/me/timetable/conflicts", params={"section_id": third}, headers=headers)
+    assert r.json() == []
+
+    r = await client.post(f"/v1/courses/{seed['course_id']}/enroll", params={"user_id": user_id, "section_id": second})
+    assert r.status_code == 409
+    assert r.json()["detail"]["clashes"][0]["kind"] == "student"
+    r = await client.post(f"/v1/courses/{seed['course_id']}/enroll", params={"user_id": user_id, "section_id": third})
+    assert r.status_code == 200
+    # The cached slots were dropped when the student enrolled
+    r = await client.get("/v1/me/timetable/conflicts", params={"section_id": second}, headers=headers)
+    assert len(r.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_sections_of_other_semesters_do_not_clash(client: AsyncClient, session_fixture):
+    user_id, headers = await register_and_login(client, "semesters@example.com")
+    seed = await seed_sections(session_fixture)
+    spring = seed["section_ids"][0]
+    course = await session_fixture.get(CourseModel, seed["course_id"])
+    fall = SemesterModel(semester_code="2025/1", start_date=date(2025, 8, 4), end_date=date(2025, 12, 7))
+    session_fixture.add(fall)
+    await session_fixture.commit()
+    fall_course = CourseModel(branch_id=course.branch_id, semester_id=fall.semester_id, course_code="CPE102")
+    session_fixture.add(fall_course)
+    await session_fixture.commit()
+    fall_section = SectionModel(course_id=fall_course.course_id, section_code="00", student_limit=40)
+    session_fixture.add(fall_section)
+    await session_fixture.commit()
+    for section_id in (spring, fall_section.section_id):
+        await add_slot(client, section_id, seed["days"]["MO"], "09:00", "12:00")
+
+    r = await client.post(f"/v1/courses/{seed['course_id']}/enroll", params={"user_id": user_id, "section_id": spring})
+    assert r.status_code == 200
+    r = await client.get("/v1/me/timetable/conflicts", params={"section_id": fall_section.section_id}, headers=headers)
+    assert r.json() == []
+    r = await client.post(f"/v1/courses/{fall_course.course_id}/enroll",
+                          params={"user_id": user_id, "section_id": fall_section.section_id})
+    assert r.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_room_double_booking_is_rejected(client: AsyncClient, session_fixture):
+    seed = await seed_sections(session_fixture, count=2)
+    first, second = seed["section_ids"]
+    monday = seed["days"]["MO"]
+    r = await client.post("/v1/schedules/", json={
+        "section_id": first, "day_id": monday, "start_time": "09:00", "end_time": "11:00", "room": "E-201"})
+    assert r.status_code == 201
+
+    r = await client.post("/v1/schedules/", json={
+        "section_id": second, "day_id": monday, "start_time": "10:00", "end_time": "12:00", "room": "E-201"})
+    assert r.status_code == 409
+    assert r.json()["detail"]["clashes"][0]["room"] == "E-201"
+
+    r = await client.post("/v1/schedules/", json={
+        "section_id": second, "day_id": monday, "start_time": "11:00", "end_time": "12:00", "room": "E-201"})
+    assert r.status_code == 201
+    r = await client.put(f"/v1/schedules/{r.json()['schedule_id']}", json={"start_time": "10:30"})
+    assert r.status_code == 409
+    # Moving a slot within its own booking is fine
+    r = await client.put(f"/v1/schedules/{r.json()['detail']['clashes'][0]['first']['schedule_id']}",
+                         json={"end_time": "10:45"})
+    assert r.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_semester_report(client: AsyncClient, session_fixture):
+    user_id, _ = await register_and_login(client, "report@example.com")
+    seed = await seed_sections(session_fixture, count=3)
+    first, second, third = seed["section_ids"]
+    monday = seed["days"]["MO"]
+    for section_id, start, end, room in ((first, "09:00", "11:00", "A"), (second, "10:00", "12:00", "B"),
+                                         (third, "10:00", "11:00", None)):
+        r = await client.post("/v1/schedules/", json={
+            "section_id": section_id, "day_id": monday, "start_time": start, "end_time": end, "room": room})
+        assert r.status_code == 201
+    for section_id in (first, third):
+        r = await client.post(f"/v1/courses/{seed['course_id']}/enroll",
+                              params={"user_id": user_id, "section_id": section_id})
+    # Enrollment checks would have refused this one, so plant it like an import would
+    assert r.status_code == 409
+    session_fixture.add(UserEnrollModel(user_id=user_id, section_id=third))
+    await session_fixture.commit()
+
+    r = await client.get(f"/v1/semesters/{seed['semester_id']}/clashes")
+    report = r.json()
+    assert (report["slots_checked"], report["enrollments_checked"]) == (3, 2)
+    assert report["room_clashes"] == []
+    assert [(c["user_id"], c["first"]["section_id"], c["second"]["section_id"])
+            for c in report["student_clashes"]] == [(user_id, first, third)]
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import create_events, register_and_login
+from unisphere.models.announcement_model import Announcement
+
+
+def selects(statements: list[str], table: str) -> int:
+    return sum(1 for s in statements if s.lstrip().upper().startswith("SELECT") and f"FROM {table}" in s)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_event_feed_is_not_modified(client: AsyncClient, session_fixture, query_counter):
+    user_id, headers = await register_and_login(client, "poller@example.com")
+    first, second = await create_events(session_fixture, user_id, 2, max_capacity=5)
+
+    r = await client.get("/v1/events", headers=headers)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert etag.startswith('W/"')
+    assert r.headers["last-modified"].endswith(" GMT")
+    assert r.headers["cache-control"] == "private, no-cache"
+
+    query_counter.clear()
+    r = await client.get("/v1/events", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+    # Only the version key was read, never the page itself
+    assert selects(query_counter, "events") == 1
+    assert not any("is_registered" in s for s in query_counter)
+
+    # Other filters and pages have their own tags
+    r = await client.get("/v1/events", params={"limit": 1}, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_event_feed_tag_follows_registrations(client: AsyncClient, session_fixture):
+    user_id, headers = await register_and_login(client, "joiner@example.com")
+    _, other_headers = await register_and_login(client, "watcher@example.com")
+    event, = await create_events(session_fixture, user_id, 1, max_capacity=1)
+
+    mine = (await client.get("/v1/events", headers=headers)).headers["etag"]
+    theirs = (await client.get("/v1/events", headers=other_headers)).headers["etag"]
+
+    r = await client.post(f"/v1/events/{event.id}/register", json={}, headers=headers)
+    assert r.status_code == 200
+
+    # is_registered changed for me, is_full for everyone
+    r = await client.get("/v1/events", headers={**headers, "If-None-Match": mine})
+    assert r.status_code == 200
+    assert r.json()[0]["is_registered"] is True
+    r = await client.get("/v1/events", headers={**other_headers, "If-None-Match": theirs})
+    assert r.status_code == 200
+    assert r.json()[0]["is_full"] is True
+
+
+@pytest.mark.asyncio
+async def test_announcement_feed_tag_changes_on_delete(client: AsyncClient, session_fixture):
+    user_id, headers = await register_and_login(client, "reader@example.com")
+    announcements = [
+        Announcement(title=f"News {i}", content="...", category="general", date=datetime.now(), created_by=user_id)
+        for i in range(2)
+    ]
+    session_fixture.add_all(announcements)
+    await session_fixture.commit()
+
+    r = await client.get("/v1/announcements", headers=headers)
+    assert r.status_code == 200
+    etag, last_modified = r.headers["etag"], r.headers["last-modified"]
+    r = await client.get("/v1/announcements", headers={**headers, "If-None-Match": f'"x", {etag}'})
+    assert r.status_code == 304
+
+    # The newest updated_at is unchanged by a delete; the count is not
+    await session_fixture.delete(announcements[0])
+    await session_fixture.commit()
+    r = await client.get("/v1/announcements", headers={
+        **headers, "If-None-Match": etag, "If-Modified-Since": last_modified})
+    assert r.status_code == 200
+    assert len(r.json()) == 1
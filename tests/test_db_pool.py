@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from unisphere import models
+from unisphere.core.db_metrics import InstrumentedAsyncQueuePool, pool_metrics
+
+
+def test_engine_options_for_postgres(monkeypatch):
+    monkeypatch.setattr(models.settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(models.settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    options = models.engine_options("postgresql+asyncpg://user:pass@db/app")
+
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["pool_size"] == 7
+    assert options["connect_args"] == {
+        "statement_cache_size": models.settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "server_settings": {"statement_timeout": "5000"},
+    }
+
+
+def test_engine_options_for_sqlite_skip_pool_sizing():
+    options = models.engine_options("sqlite+aiosqlite:///:memory:")
+    assert "pool_size" not in options
+    assert "connect_args" not in options
+
+
+@pytest.mark.asyncio
+async def test_session_factory_is_built_once(client: AsyncClient, monkeypatch, tmp_path):
+    monkeypatch.setattr(models.settings, "DATABASE_URL",
+                        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    monkeypatch.setattr(models.settings, "DB_MIGRATE_ON_STARTUP", True)
+    await models.init_db()
+    try:
+        factory = models.session_factory
+        checkouts = pool_metrics.checkouts
+        for _ in range(3):
+            async for session in models.get_session():
+                await session.connection()
+        assert models.session_factory is factory
+        assert pool_metrics.checkouts == checkouts + 3
+
+        r = await client.get("/health/db-pool")
+        assert r.status_code == 200
+        assert r.json()["checkouts"] == pool_metrics.checkouts
+    finally:
+        await models.close_db()
+    assert models.session_factory is None
+
+
+@pytest.mark.asyncio
+async def test_only_blocked_checkouts_count_as_waits(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'waits.db'}",
+                                 poolclass=InstrumentedAsyncQueuePool, pool_size=1, max_overflow=0)
+    waits, checkouts = pool_metrics.waits, pool_metrics.checkouts
+    pool_metrics.attach(engine)
+    try:
+        for _ in range(3):
+            async with engine.connect():
+                pass
+        assert pool_metrics.waits == waits
+
+        async def hold():
+            async with engine.connect():
+                await asyncio.sleep(0.05)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        async with engine.connect():
+            pass
+        await holder
+        assert pool_metrics.waits == waits + 1
+        assert pool_metrics.wait_seconds_max >= 0.03
+        assert pool_metrics.checkouts == checkouts + 5
+    finally:
+        await engine.dispose()
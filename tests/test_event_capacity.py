@@ -0,0 +1,140 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlmodel import select
+
+from tests.conftest import create_events, register_and_login
+from unisphere.main import app
+from unisphere.models.event_model import Event, EventRegistration
+from unisphere.schemas.event_schema import EventUpdate
+from unisphere.services.event_capacity_service import (AdmissionResult,
+                                                       RedisCapacityEngine,
+                                                       get_capacity_engine)
+from unisphere.services.event_service import EventService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest_asyncio.fixture
+async def capacity_engine():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield RedisCapacityEngine(redis_client)
+    await redis_client.flushall()
+    await redis_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_admission_waitlist_and_write_behind(session_fixture, capacity_engine):
+    event, = await create_events(session_fixture, 1, 1, max_capacity=2)
+    event_id = event.id
+    service = EventService(session_fixture, capacity_engine)
+
+    results = [await service.admit_user_to_event(event_id, user_id) for user_id in (1, 2, 3, 4)]
+    assert results == [
+        AdmissionResult.ADMITTED,
+        AdmissionResult.ADMITTED,
+        AdmissionResult.WAITLISTED,
+        AdmissionResult.WAITLISTED,
+    ]
+    assert await service.admit_user_to_event(event_id, 1) is AdmissionResult.ALREADY_REGISTERED
+    assert await capacity_engine.waitlist_position(event_id, 4) == 2
+
+    # Nothing touches the database until the write-behind runs
+    stored = await session_fixture.exec(select(EventRegistration))
+    assert stored.all() == []
+
+    assert await capacity_engine.flush_pending(session_fixture) == 2
+    stored = await session_fixture.exec(
+        select(EventRegistration.user_id).where(EventRegistration.event_id == event_id))
+    assert sorted(stored.all()) == [1, 2]
+    event = await session_fixture.get(Event, event_id)
+    await session_fixture.refresh(event)
+    assert event.registration_count == 2
+
+    # Leaving frees the seat for the head of the waitlist
+    assert await service.unregister_user_from_event(event_id, 1)
+    assert await capacity_engine.waitlist_position(event_id, 4) == 1
+    assert await capacity_engine.flush_pending(session_fixture) == 1
+    stored = await session_fixture.exec(
+        select(EventRegistration.user_id).where(EventRegistration.event_id == event_id))
+    assert sorted(stored.all()) == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_release_before_flush_skips_database(session_fixture, capacity_engine):
+    event, = await create_events(session_fixture, 1, 1)
+    event_id = event.id
+    service = EventService(session_fixture, capacity_engine)
+
+    assert await service.admit_user_to_event(event_id, 7) is AdmissionResult.ADMITTED
+    assert await service.unregister_user_from_event(event_id, 7)
+    assert await capacity_engine.flush_pending(session_fixture) == 0
+    assert await service.admit_user_to_event(9999, 7) is None
+
+
+@pytest.mark.asyncio
+async def test_capacity_increase_promotes_the_waitlist(session_fixture, capacity_engine):
+    event, = await create_events(session_fixture, 1, 1, max_capacity=1)
+    event_id = event.id
+    service = EventService(session_fixture, capacity_engine)
+    for user_id in (1, 2, 3):
+        await service.admit_user_to_event(event_id, user_id)
+
+    await service.update_event(event_id, EventUpdate(max_capacity=2))
+    assert await capacity_engine.waitlist_position(event_id, 2) is None
+    assert await capacity_engine.waitlist_position(event_id, 3) == 1
+    assert await service.admit_user_to_event(event_id, 4) is AdmissionResult.WAITLISTED
+
+    await capacity_engine.flush_pending(session_fixture)
+    stored = await session_fixture.exec(
+        select(EventRegistration.user_id).where(EventRegistration.event_id == event_id))
+    assert sorted(stored.all()) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_release_during_flush_undoes_the_write(session_fixture, capacity_engine):
+    event, = await create_events(session_fixture, 1, 1)
+    event_id = event.id
+    service = EventService(session_fixture, capacity_engine)
+    await service.admit_user_to_event(event_id, 7)
+    await service.admit_user_to_event(event_id, 8)
+
+    write = capacity_engine._write_registrations
+    releases = []
+
+    async def write_then_release(session, pairs):
+        # The registration is committed but the flush has not settled the batch yet
+        await write(session, pairs)
+        releases.append(await capacity_engine.release(event_id, 7))
+
+    capacity_engine._write_registrations = write_then_release
+    assert await capacity_engine.flush_pending(session_fixture) == 2
+    assert releases == [(True, True, None)]
+    stored = await session_fixture.exec(
+        select(EventRegistration.user_id).where(EventRegistration.event_id == event_id))
+    assert stored.all() == [8]
+    event = await session_fixture.get(Event, event_id)
+    await session_fixture.refresh(event)
+    assert event.registration_count == 1
+    assert await capacity_engine.redis.llen("event:registrations:processing") == 0
+
+
+@pytest.mark.asyncio
+async def test_register_endpoint_accepts_through_redis(client: AsyncClient, session_fixture, capacity_engine):
+    user_id, headers = await register_and_login(client, "redis@example.com")
+    event, = await create_events(session_fixture, user_id, 1, max_capacity=1)
+    event_id = event.id
+    app.dependency_overrides[get_capacity_engine] = lambda: capacity_engine
+
+    r = await client.post(f"/v1/events/{event_id}/register", json={"notes": "hi"}, headers=headers)
+    assert r.status_code == 202
+    assert r.json() == {"status": "admitted", "waitlist_position": None}
+
+    r = await client.post(f"/v1/events/{event_id}/register", json={}, headers=headers)
+    assert r.status_code == 400
+
+    await capacity_engine.flush_pending(session_fixture)
+    stored = await session_fixture.exec(
+        select(EventRegistration).where(EventRegistration.event_id == event_id))
+    registration, = stored.all()
+    assert registration.notes == "hi"
@@ -0,0 +1,179 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from tests.conftest import create_events, register_and_login
+from unisphere.models.event_model import Event, EventRegistration
+from unisphere.services.event_service import EventService
+
+
+@pytest.mark.asyncio
+async def test_list_events_reports_user_state(client: AsyncClient, session_fixture):
+    user_id, headers = await register_and_login(client, "lister@example.com")
+    registered, full, open_event = await create_events(session_fixture, user_id, 3)
+
+    full.max_capacity = 1
+    full.registration_count = 1
+    session_fixture.add(EventRegistration(
+        event_id=registered.id, user_id=user_id))
+    session_fixture.add(full)
+    await session_fixture.commit()
+
+    r = await client.get("/v1/events", headers=headers)
+    assert r.status_code == 200
+    by_id = {e["id"]: e for e in r.json()}
+
+    assert by_id[registered.id]["is_registered"] is True
+    assert by_id[registered.id]["is_full"] is False
+    assert by_id[full.id]["is_registered"] is False
+    assert by_id[full.id]["is_full"] is True
+    assert by_id[open_event.id]["is_registered"] is False
+    assert by_id[open_event.id]["is_full"] is False
+
+
+@pytest.mark.asyncio
+async def test_list_events_query_count_is_constant(client: AsyncClient, session_fixture, query_counter):
+    user_id, headers = await register_and_login(client, "counter@example.com")
+    events = await create_events(session_fixture, user_id, 60, max_capacity=10)
+    for event in events[::2]:
+        session_fixture.add(EventRegistration(
+            event_id=event.id, user_id=user_id))
+    await session_fixture.commit()
+
+    counts = []
+    for limit in (1, 10, 60):
+        query_counter.clear()
+        r = await client.get(f"/v1/events?limit={limit}", headers=headers)
+        assert r.status_code == 200
+        assert len(r.json()) == limit
+        counts.append(len(query_counter))
+
+    assert len(set(counts)) == 1
+
+
+@pytest.mark.asyncio
+async def test_only_known_statuses_are_inlined(client: AsyncClient, session_fixture, query_counter):
+    user_id, headers = await register_and_login(client, "filter@example.com")
+    await create_events(session_fixture, user_id, 2)
+
+    query_counter.clear()
+    r = await client.get("/v1/events", params={"event_status": "upcoming"}, headers=headers)
+    assert len(r.json()) == 2
+    assert any("status = 'upcoming'" in statement for statement in query_counter)
+
+    hostile = "upcoming' OR '1'='1"
+    query_counter.clear()
+    r = await client.get("/v1/events", params={"event_status": hostile}, headers=headers)
+    assert r.json() == []
+    assert not any(hostile in statement for statement in query_counter)
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_duplicates_and_full_events(client: AsyncClient, session_fixture):
+    user_id, headers = await register_and_login(client, "rush@example.com")
+    _, other_headers = await register_and_login(client, "late@example.com")
+    event, = await create_events(session_fixture, user_id, 1, max_capacity=1)
+    event_id = event.id
+
+    r = await client.post(f"/v1/events/{event_id}/register", json={}, headers=headers)
+    assert r.status_code == 200
+    assert r.json()["user_id"] == user_id
+
+    r = await client.post(f"/v1/events/{event_id}/register", json={}, headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Already registered for this event"
+
+    r = await client.post(f"/v1/events/{event_id}/register", json={}, headers=other_headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Event is full"
+
+    r = await client.post("/v1/events/9999/register", json={}, headers=headers)
+    assert r.status_code == 404
+
+    r = await client.delete(f"/v1/events/{event_id}/register", headers=headers)
+    assert r.status_code == 200
+    await session_fixture.refresh(event)
+    assert event.registration_count == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_registrations_never_overbook(engine_fixture, session_fixture):
+    event, = await create_events(session_fixture, 1, 1, max_capacity=20)
+    sessions = async_sessionmaker(
+        engine_fixture, class_=AsyncSession, expire_on_commit=False)
+
+    async def register(user_id: int) -> bool:
+        async with sessions() as session:
+            service = EventService(session)
+            return await service.register_user_for_event(event.id, user_id) is not None
+
+    results = await asyncio.gather(*(register(user_id) for user_id in range(1, 201)))
+
+    assert sum(results) == 20
+    await session_fixture.refresh(event)
+    assert event.registration_count == 20
+    stored = await session_fixture.exec(
+        select(func.count()).select_from(EventRegistration)
+        .where(EventRegistration.event_id == event.id)
+    )
+    assert stored.one() == 20
+
+
+@pytest.mark.asyncio
+async def test_reconcile_registration_counts_returns_drifted_events(session_fixture):
+    events = await create_events(session_fixture, 1, 5)
+    event_ids = [event.id for event in events]
+    session_fixture.add_all([
+        EventRegistration(event_id=event_ids[0], user_id=1),
+        EventRegistration(event_id=event_ids[0], user_id=2),
+        EventRegistration(event_id=event_ids[3], user_id=1),
+    ])
+    events[3].registration_count = 1  # already correct
+    events[4].registration_count = 7  # no registrations at all
+    await session_fixture.commit()
+
+    service = EventService(session_fixture)
+    drifted = await service.reconcile_registration_counts(chunk_size=2)
+
+    assert sorted(drifted) == [event_ids[0], event_ids[4]]
+    counts = await session_fixture.exec(
+        select(Event.id, Event.registration_count).order_by(Event.id))
+    assert dict(counts.all()) == dict(zip(event_ids, [2, 0, 0, 1, 0]))
+    assert await service.reconcile_registration_counts() == []
+
+
+@pytest.mark.asyncio
+async def test_event_cursor_pages_cover_every_event_once(client: AsyncClient, session_fixture):
+    user_id, headers = await register_and_login(client, "pager@example.com")
+    same_day = datetime(2030, 1, 1, 9, 0)
+    session_fixture.add_all(
+        Event(title=f"Tied {i}", date=same_day, created_by=user_id) for i in range(5))
+    await session_fixture.commit()
+    await create_events(session_fixture, user_id, 4)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        r = await client.get("/v1/events", headers=headers, params=params)
+        assert r.status_code == 200
+        seen += [(e["date"], e["id"]) for e in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == 9
+    assert seen == sorted(seen)
+
+    r = await client.get("/v1/events", headers=headers, params={"skip": 3, "limit": 3})
+    assert [(e["date"], e["id"]) for e in r.json()] == seen[3:6]
+
+    # Malformed, and the right length with the wrong types ([1, 1], ["soon", 1])
+    for cursor in ("not-a-cursor", "WzEsIDFd", "WyJzb29uIiwgMV0"):
+        for path in ("/v1/events", "/v1/announcements", "/v1/user-places/"):
+            r = await client.get(path, headers=headers, params={"cursor": cursor})
+            assert r.status_code == 400, (path, cursor)
@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+import unisphere.models  # noqa: F401  (registers every table)
+from unisphere.migrations.runner import (SchemaVersionError, applied_revisions, head,
+                                         load_revisions, stamp, upgrade, verify)
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine_ = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'migrations.db'}")
+    yield engine_
+    await engine_.dispose()
+
+
+async def index_names(engine, table: str) -> set[str]:
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(lambda c: inspect(c).get_indexes(table))
+    return {i["name"] for i in indexes}
+
+
+@pytest.mark.asyncio
+async def test_fresh_database_is_created_at_head(engine):
+    applied = await upgrade(engine)
+    assert applied == [r.revision for r in load_revisions()]
+    assert applied[-1] == head()
+
+    async with engine.connect() as conn:
+        tables = await conn.run_sync(lambda c: inspect(c).get_table_names())
+    assert set(SQLModel.metadata.tables) <= set(tables)
+    assert "ix_events_upcoming_date_id" in await index_names(engine, "events")
+
+    assert await upgrade(engine) == []
+    await verify(engine)
+
+
+@pytest.mark.asyncio
+async def test_verify_refuses_unmigrated_database(engine):
+    with pytest.raises(SchemaVersionError):
+        await verify(engine)
+
+    await stamp(engine, "0002")
+    with pytest.raises(SchemaVersionError, match="0003"):
+        await verify(engine)
+
+
+@pytest.mark.asyncio
+async def test_legacy_database_is_brought_to_head(engine):
+    # A database as create_all and the old scripts left it
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(text("ALTER TABLE users DROP COLUMN token_version"))
+        await conn.execute(text("DROP INDEX ix_events_upcoming_date_id"))
+        await conn.execute(text("CREATE INDEX idx_announcements_priority ON announcements (priority)"))
+        await conn.execute(text("DROP TABLE event_registrations"))
+        await conn.execute(text(
+            "CREATE TABLE event_registrations (id INTEGER PRIMARY KEY, event_id INTEGER NOT NULL, "
+            "user_id INTEGER NOT NULL, registered_at DATETIME NOT NULL, notes VARCHAR)"))
+        await conn.execute(text(
+            "INSERT INTO users (id, first_name, last_name, email, password_hash, role, is_active, "
+            "created_at, updated_at) VALUES (1, 'a', 'b', 'a@example.com', 'x', 'user', 1, :now, :now)"),
+            {"now": datetime.now()})
+        await conn.execute(text(
+            "INSERT INTO events (id, title, description, category, date, location, status, created_by, "
+            "registration_count, created_at, updated_at) "
+            "VALUES (1, 'Fair', '', 'general', :now, 'Hall', 'upcoming', 1, 5, :now, :now)"),
+            {"now": datetime.now()})
+        for registration_id in (1, 2, 3):
+            await conn.execute(text(
+                "INSERT INTO event_registrations (id, event_id, user_id, registered_at) "
+                "VALUES (:id, 1, 1, :now)"), {"id": registration_id, "now": datetime.now()})
+
+    await upgrade(engine)
+    await verify(engine)
+
+    async with engine.connect() as conn:
+        columns = await conn.run_sync(lambda c: inspect(c).get_columns("users"))
+        registrations = (await conn.execute(text("SELECT id FROM event_registrations"))).scalars().all()
+        count = (await conn.execute(text("SELECT registration_count FROM events"))).scalar()
+        assert await applied_revisions(conn) == {r.revision for r in load_revisions()}
+    assert "token_version" in {c["name"] for c in columns}
+    assert registrations == [1]
+    assert count == 1
+    assert "ix_events_upcoming_date_id" in await index_names(engine, "events")
+    assert "idx_announcements_priority" not in await index_names(engine, "announcements")
+    assert "uq_event_registrations_event_user" in await index_names(engine, "event_registrations")
+
+
+@pytest.mark.asyncio
+async def test_duplicate_enrollments_are_merged_before_the_unique_key(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(text("DROP TABLE user_enrolls"))
+        await conn.execute(text(
+            "CREATE TABLE user_enrolls (enroll_id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+            "section_id INTEGER NOT NULL, created_at DATETIME NOT NULL)"))
+        await conn.execute(text("CREATE INDEX ix_user_enrolls_user_section ON user_enrolls (user_id, section_id)"))
+        for enroll_id, section_id in ((1, 1), (2, 1), (3, 2)):
+            await conn.execute(text(
+                "INSERT INTO user_enrolls (enroll_id, user_id, section_id, created_at) "
+                "VALUES (:id, 1, :section_id, :now)"), {"id": enroll_id, "section_id": section_id, "now": datetime.now()})
+    await stamp(engine, "0008")
+
+    assert await upgrade(engine) == ["0009", "0010"]
+    async with engine.connect() as conn:
+        kept = (await conn.execute(text("SELECT enroll_id FROM user_enrolls ORDER BY enroll_id"))).scalars().all()
+    assert kept == [1, 3]
+    indexes = await index_names(engine, "user_enrolls")
+    assert "uq_user_enrolls_user_section" in indexes
+    assert "ix_user_enrolls_user_section" not in indexes
@@ -0,0 +1,138 @@
+"""Query-plan regression tests
+
+Each case runs a service query against the test schema, then asks SQLite how
+it would execute every SELECT that was sent. A case fails if a table is read
+by a full scan, if the expected index is not used, or, for paged listings,
+if the rows have to be sorted instead of being read in index order.
+"""
+from datetime import date, datetime, time
+
+import pytest
+from sqlalchemy import event
+
+from unisphere.services.aggregates import encode_cursor
+from unisphere.services.announcement_service import AnnouncementService
+from unisphere.services.clash_service import ClashService
+from unisphere.services.course_service.DBCourseService import DBCourseService
+from unisphere.services.event_service import EventService
+from unisphere.services.occurrence_service import OccurrenceService
+from unisphere.services.schedule_service.DBScheduleService import DBScheduleService
+from unisphere.services.section_service.DBSectionService import DBSectionService
+from unisphere.services.timetable_service import TimetableService
+from unisphere.services.user_place_service.DBUserPlaceService import DBUserPlaceService
+
+CURSOR = encode_cursor([datetime(2025, 1, 1), 1])
+
+# (name, service call, index the plan must use, whether rows must come out in index order)
+CASES = [
+    ("events", lambda s: EventService(s).get_events(limit=20),
+     "ix_events_date_id", True),
+    ("events by category", lambda s: EventService(s).get_events(limit=20, category="workshop"),
+     "ix_events_category_date_id", True),
+    ("upcoming events", lambda s: EventService(s).get_events(limit=20, status="upcoming"),
+     "ix_events_upcoming_date_id", True),
+    ("events after cursor", lambda s: EventService(s).get_events(limit=20, cursor=CURSOR),
+     "ix_events_date_id", True),
+    ("events with user state", lambda s: EventService(s).get_events_with_user_state(1, limit=20),
+     "sqlite_autoindex_event_registrations_1", True),
+    ("events version", lambda s: EventService(s).get_events_version(1),
+     "ix_events_updated_at", False),
+    ("events by category version", lambda s: EventService(s).get_events_version(1, category="workshop"),
+     "ix_events_category_date_id", False),
+    ("events version of user", lambda s: EventService(s).get_events_version(1),
+     "ix_event_registrations_user_id", False),
+    ("registration count", lambda s: EventService(s).get_event_registration_count(1),
+     "sqlite_autoindex_event_registrations_1", False),
+    ("is user registered", lambda s: EventService(s).is_user_registered(1, 1),
+     "sqlite_autoindex_event_registrations_1", False),
+    ("announcements", lambda s: AnnouncementService(s).get_announcements_with_creators(limit=20),
+     "ix_announcements_date_id", True),
+    ("announcements by category",
+     lambda s: AnnouncementService(s).get_announcements_by_category("general", limit=20),
+     "ix_announcements_category_date_id", True),
+    ("announcements by category after cursor",
+     lambda s: AnnouncementService(s).get_announcements_with_creators(
+         limit=20, category="general", cursor=CURSOR),
+     "ix_announcements_category_date_id", True),
+    ("announcements version", lambda s: AnnouncementService(s).get_announcements_version(),
+     "ix_announcements_updated_at_created_by", False),
+    ("high priority announcements version",
+     lambda s: AnnouncementService(s).get_announcements_version(priority="high"),
+     "ix_announcements_high_priority_date_id", False),
+    ("high priority announcements",
+     lambda s: AnnouncementService(s).get_high_priority_announcements(),
+     "ix_announcements_high_priority_date_id", True),
+    # count(*) OVER () reads every matching row before the page is cut, so it sorts
+    ("my places", lambda s: DBUserPlaceService(s).list_my_places(1, 20, 0),
+     "ix_user_places_user_updated_id", False),
+    ("my places after cursor", lambda s: DBUserPlaceService(s).list_my_places(1, 20, 0, CURSOR),
+     "ix_user_places_user_updated_id", True),
+    ("section schedules", lambda s: DBScheduleService(s).list_schedules(1),
+     "ix_section_schedules_section_id", False),
+    ("section rrules", lambda s: DBSectionService(s).list_rrules(1),
+     "ix_section_rrules_section_id", False),
+    ("section instructors", lambda s: DBSectionService(s).list_instructors(1),
+     "sqlite_autoindex_section_instructors_1", False),
+    ("sections of course", lambda s: DBSectionService(s).list_sections(1),
+     "sqlite_autoindex_sections_1", False),
+    ("section occurrences",
+     lambda s: DBSectionService(s).list_occurrences(1, datetime(2025, 1, 1), datetime(2025, 2, 1)),
+     "ix_section_occurrences_section_starts", False),
+    ("sections of semester", lambda s: OccurrenceService(s).refresh_semester(1),
+     "ix_courses_semester_id", False),
+    ("timetable week", lambda s: TimetableService(s).get_week(1, date(2025, 1, 6)),
+     "ix_section_occurrences_section_starts", False),
+    ("timetable enrollments", lambda s: TimetableService(s).get_week(1, date(2025, 1, 6)),
+     "sqlite_autoindex_user_enrolls_1", False),
+    ("clash slots of user", lambda s: ClashService(s).user_slots(1, 1),
+     "sqlite_autoindex_user_enrolls_1", False),
+    ("room bookings", lambda s: ClashService(s).check_room("E-201", 1, time(9), time(11), 1),
+     "ix_section_schedules_room_day", False),
+    ("semester clashes", lambda s: ClashService(s).check_semester(1),
+     "ix_courses_semester_id", False),
+    ("courses of user", lambda s: DBCourseService(s).get_user_courses(1),
+     "sqlite_autoindex_user_enrolls_1", False),
+    ("courses of semester", lambda s: DBCourseService(s).get_courses_by_semester(1),
+     "ix_courses_semester_id", False),
+    ("course translations", lambda s: DBCourseService(s).list_translations(1),
+     "sqlite_autoindex_course_translations_1", False),
+]
+
+
+async def capture_selects(engine, call) -> list[tuple[str, tuple]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await call()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+async def explain(engine, statement: str, parameters: tuple) -> list[str]:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in result.all()]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "call,index,ordered", [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+async def test_service_query_uses_index(engine_fixture, session_fixture, call, index, ordered):
+    statements = await capture_selects(engine_fixture, lambda: call(session_fixture))
+    assert statements
+
+    plans = [await explain(engine_fixture, statement, parameters) for statement, parameters in statements]
+    steps = [step for plan in plans for step in plan]
+
+    full_scans = [step for step in steps
+                  if step.startswith("SCAN ") and " USING " not in step and "(subquery" not in step]
+    assert not full_scans, f"full table scan in {steps}"
+    assert any(index in step for step in steps), f"{index} not used in {steps}"
+    if ordered:
+        assert not any("TEMP B-TREE" in step for step in plans[0]), f"sort step in {plans[0]}"
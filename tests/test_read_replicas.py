@@ -0,0 +1,112 @@
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from tests.conftest import register_and_login
+from unisphere import models
+from unisphere.models.announcement_model import Announcement
+from unisphere.models.user_model import User
+
+
+async def seed_replica(url: str, user_id: int, title: str) -> None:
+    """Give a stand-in replica its own copy of the user and one announcement."""
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        session.add(User(id=user_id, first_name="Replica", last_name="Reader",
+                         email=f"{title}@example.com", password_hash="x"))
+        session.add(Announcement(title=title, content="from replica", category="general",
+                                 date=datetime.now(), created_by=user_id))
+        await session.commit()
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def fake_redis(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(models, "redis_client", client)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def replica_urls(monkeypatch, tmp_path, fake_redis):
+    urls = [f"sqlite+aiosqlite:///{tmp_path / name}.db" for name in ("replica_a", "replica_b")]
+    monkeypatch.setattr(models.settings, "DATABASE_URL",
+                        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setattr(models.settings, "DB_MIGRATE_ON_STARTUP", True)
+    monkeypatch.setattr(models.settings, "DATABASE_REPLICA_URLS", ",".join(urls))
+    return urls
+
+
+async def listed_titles(client: AsyncClient, headers: dict) -> list[str]:
+    r = await client.get("/v1/announcements", headers=headers)
+    assert r.status_code == 200
+    return [a["title"] for a in r.json()]
+
+
+@pytest.mark.asyncio
+async def test_reads_round_robin_across_replicas(client: AsyncClient, replica_urls):
+    user_id, headers = await register_and_login(client, "reader@example.com")
+    for url, title in zip(replica_urls, ("replica_a", "replica_b")):
+        await seed_replica(url, user_id, title)
+
+    await models.init_db()
+    try:
+        seen = [await listed_titles(client, headers) for _ in range(4)]
+    finally:
+        await models.close_db()
+
+    assert sorted(map(tuple, seen)) == [("replica_a",), ("replica_a",), ("replica_b",), ("replica_b",)]
+    assert seen[0] != seen[1]
+
+
+@pytest.mark.asyncio
+async def test_reads_stay_on_primary_after_a_write(client: AsyncClient, replica_urls, fake_redis):
+    user_id, headers = await register_and_login(client, "writer@example.com")
+    for url, title in zip(replica_urls, ("replica_a", "replica_b")):
+        await seed_replica(url, user_id, title)
+
+    await models.init_db()
+    try:
+        r = await client.post("/v1/user-places/", headers=headers, json={
+            "name": "Library", "latitude": 13.7, "longitude": 100.5, "category": "study"})
+        assert r.status_code == 201
+        assert "set-cookie" not in r.headers
+
+        # The primary (test session) has the new place; the replicas do not,
+        # and the stickiness follows the token rather than a cookie
+        client.cookies.clear()
+        r = await client.get("/v1/user-places/", headers=headers)
+        assert r.json()["total"] == 1
+        assert await listed_titles(client, headers) == []
+        assert 0 < await fake_redis.ttl(models.READ_PRIMARY_KEY.format(user_id)) <= 5
+
+        # Other users keep reading from the replicas
+        _, other = await register_and_login(client, "bystander@example.com")
+        assert await listed_titles(client, other) in (["replica_a"], ["replica_b"])
+    finally:
+        await models.close_db()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replicas_fall_back_to_primary(client: AsyncClient, monkeypatch, tmp_path, fake_redis):
+    monkeypatch.setattr(models.settings, "DATABASE_URL",
+                        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setattr(models.settings, "DB_MIGRATE_ON_STARTUP", True)
+    monkeypatch.setattr(models.settings, "DATABASE_REPLICA_URLS",
+                        f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    _, headers = await register_and_login(client, "fallback@example.com")
+
+    await models.init_db()
+    try:
+        assert await listed_titles(client, headers) == []
+    finally:
+        await models.close_db()
@@ -0,0 +1,66 @@
+from datetime import date, datetime, time
+
+import pytest
+
+from unisphere.services.recurrence import (RecurrenceError, compile_rule,
+                                           weekday_of, weekly_slot)
+
+TERM = (date(2025, 1, 6), date(2025, 4, 27))
+
+
+def starts(rule, window=TERM) -> list[datetime]:
+    return [s for s, _ in rule.between(*window)]
+
+
+def test_weekly_slot_covers_the_window():
+    occurrences = weekly_slot(weekday_of("WED"), time(9), time(10, 30)).between(*TERM)
+    assert len(occurrences) == 16
+    assert occurrences[0] == (datetime(2025, 1, 8, 9), datetime(2025, 1, 8, 10, 30))
+    assert occurrences[-1][0] == datetime(2025, 4, 23, 9)
+
+
+def test_rules_are_compiled_once():
+    text = "FREQ=WEEKLY;BYDAY=MO,TH;BYHOUR=13;BYMINUTE=0"
+    assert compile_rule(text) is compile_rule(text)
+
+
+@pytest.mark.parametrize("text,expected", [
+    # Every other week from the week of DTSTART, which itself is a Wednesday
+    ("DTSTART:20250108T130000\nRRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;UNTIL=20250131",
+     [datetime(2025, 1, 9, 13), datetime(2025, 1, 21, 13), datetime(2025, 1, 23, 13)]),
+    # COUNT is counted from DTSTART, not from the window
+    ("DTSTART:20241230T080000\nRRULE:FREQ=WEEKLY;BYDAY=MO;COUNT=3",
+     [datetime(2025, 1, 6, 8), datetime(2025, 1, 13, 8)]),
+    ("DTSTART:20250106T080000\nRRULE:FREQ=DAILY;INTERVAL=3;BYDAY=MO;UNTIL=20250310",
+     [datetime(2025, 1, 6, 8), datetime(2025, 1, 27, 8), datetime(2025, 2, 17, 8), datetime(2025, 3, 10, 8)]),
+    ("DTSTART:20250106T100000\nRRULE:FREQ=WEEKLY;BYDAY=MO;COUNT=3\nEXDATE:20250113T100000",
+     [datetime(2025, 1, 6, 10), datetime(2025, 1, 20, 10)]),
+    # A date-only EXDATE drops every meeting that day, whatever its time
+    ("DTSTART:20250106T090000\nRRULE:FREQ=WEEKLY;BYDAY=MO,WE;BYHOUR=9,13;COUNT=8\nEXDATE;VALUE=DATE:20250108",
+     [datetime(2025, 1, 6, 9), datetime(2025, 1, 6, 13), datetime(2025, 1, 13, 9), datetime(2025, 1, 13, 13),
+      datetime(2025, 1, 15, 9), datetime(2025, 1, 15, 13)]),
+])
+def test_rule_expansion(text, expected):
+    assert starts(compile_rule(text)) == expected
+
+
+def test_duration_and_byminute():
+    rule = compile_rule("RRULE:FREQ=WEEKLY;BYDAY=FR;BYHOUR=9;BYMINUTE=0,30\nDURATION:PT25M")
+    occurrences = rule.between(date(2025, 1, 6), date(2025, 1, 12))
+    assert occurrences == [
+        (datetime(2025, 1, 10, 9), datetime(2025, 1, 10, 9, 25)),
+        (datetime(2025, 1, 10, 9, 30), datetime(2025, 1, 10, 9, 55)),
+    ]
+
+
+@pytest.mark.parametrize("text", [
+    "FREQ=MONTHLY",
+    "FREQ=WEEKLY;BYDAY=1MO",
+    "FREQ=WEEKLY;COUNT=2;UNTIL=20250101",
+    "FREQ=WEEKLY;BYSETPOS=1",
+    "DTSTART:20250106T100000\nDTEND:20250106T090000\nRRULE:FREQ=DAILY",
+    "SUMMARY:Lecture",
+])
+def test_unsupported_rules_are_rejected(text):
+    with pytest.raises(RecurrenceError):
+        compile_rule(text)
@@ -0,0 +1,100 @@
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import add_slot, seed_sections
+
+
+@pytest.mark.asyncio
+async def test_schedule_changes_refresh_only_their_occurrences(client: AsyncClient, session_fixture):
+    seed = await seed_sections(session_fixture)
+    section_id = seed["section_ids"][0]
+
+    r = await client.post("/v1/schedules/", json={
+        "section_id": section_id, "day_id": seed["days"]["MO"], "start_time": "09:00", "end_time": "10:30"})
+    assert r.status_code == 201
+    schedule_id = r.json()["schedule_id"]
+    r = await client.post(f"/v1/sections/{section_id}/rrules", json={
+        "section_id": section_id, "rrule": "RRULE:FREQ=WEEKLY;BYDAY=TH;BYHOUR=13;BYMINUTE=0\nDURATION:PT2H"})
+    assert r.status_code == 201
+    rrule_id = r.json()["rrule_id"]
+
+    r = await client.get(f"/v1/sections/{section_id}/occurrences")
+    occurrences = r.json()
+    assert len(occurrences) == 32
+    assert occurrences[0]["starts_at"] == "2025-01-06T09:00:00"
+    assert occurrences[0]["ends_at"] == "2025-01-06T10:30:00"
+    assert occurrences[1]["ends_at"] == "2025-01-09T15:00:00"
+    rrule_rows = {o["occurrence_id"] for o in occurrences if o["rrule_id"] == rrule_id}
+
+    r = await client.put(f"/v1/schedules/{schedule_id}", json={"start_time": "08:00"})
+    assert r.status_code == 200
+    r = await client.get(f"/v1/sections/{section_id}/occurrences",
+                         params={"start": "2025-01-06T00:00:00", "end": "2025-01-07T00:00:00"})
+    assert [(o["starts_at"], o["ends_at"]) for o in r.json()] == [("2025-01-06T08:00:00", "2025-01-06T10:30:00")]
+    # The rule's rows were left alone
+    r = await client.get(f"/v1/sections/{section_id}/occurrences")
+    assert {o["occurrence_id"] for o in r.json() if o["rrule_id"] == rrule_id} == rrule_rows
+
+    r = await client.delete(f"/v1/schedules/{schedule_id}")
+    assert r.json() is True
+    r = await client.delete(f"/v1/sections/rrules/{rrule_id}")
+    assert r.json() is True
+    r = await client.get(f"/v1/sections/{section_id}/occurrences")
+    assert r.json() == []
+
+
+@pytest.mark.asyncio
+async def test_invalid_rrule_is_rejected(client: AsyncClient, session_fixture):
+    seed = await seed_sections(session_fixture)
+    section_id = seed["section_ids"][0]
+    r = await client.post(f"/v1/sections/{section_id}/rrules", json={
+        "section_id": section_id, "rrule": "FREQ=MONTHLY;BYMONTHDAY=1"})
+    assert r.status_code == 400
+    assert "MONTHLY" in r.json()["detail"]
+    r = await client.get(f"/v1/sections/{section_id}/rrules")
+    assert r.json() == []
+
+
+@pytest.mark.asyncio
+async def test_semester_dates_reshape_the_occurrences(client: AsyncClient, session_fixture):
+    seed = await seed_sections(session_fixture, count=2)
+    for section_id in seed["section_ids"]:
+        r = await client.post("/v1/schedules/", json={
+            "section_id": section_id, "day_id": seed["days"]["FR"], "start_time": "10:00", "end_time": "12:00"})
+        assert r.status_code == 201
+
+    r = await client.put(f"/v1/semesters/{seed['semester_id']}", json={"end_date": "2025-01-31T00:00:00"})
+    assert r.status_code == 200
+    for section_id in seed["section_ids"]:
+        r = await client.get(f"/v1/sections/{section_id}/occurrences")
+        assert [o["starts_at"][:10] for o in r.json()] == ["2025-01-10", "2025-01-17", "2025-01-24", "2025-01-31"]
+
+    r = await client.post(f"/v1/semesters/{seed['semester_id']}/occurrences/refresh")
+    assert r.json() == 8
+
+
+@pytest.mark.asyncio
+async def test_moving_a_course_to_another_semester_moves_its_occurrences(client: AsyncClient, session_fixture):
+    seed = await seed_sections(session_fixture, start=date(2025, 1, 6), end=date(2025, 1, 19))
+    section_id = seed["section_ids"][0]
+    await add_slot(client, section_id, seed["days"]["MO"], "09:00", "10:00")
+    r = await client.post("/v1/semesters/", json={
+        "semester_code": "2025/1", "start_date": "2025-08-04T00:00:00", "end_date": "2025-08-17T00:00:00"})
+    assert r.status_code == 200
+    autumn = r.json()["semester_id"]
+
+    async def meeting_days() -> list[str]:
+        r = await client.get(f"/v1/sections/{section_id}/occurrences")
+        return [o["starts_at"][:10] for o in r.json()]
+
+    assert await meeting_days() == ["2025-01-06", "2025-01-13"]
+    r = await client.put(f"/v1/courses/{seed['course_id']}", json={"semester_id": autumn})
+    assert r.status_code == 200
+    assert await meeting_days() == ["2025-08-04", "2025-08-11"]
+
+    r = await client.put("/v1/courses/bulk", json=[
+        {"id": seed["course_id"], "data": {"semester_id": seed["semester_id"]}}])
+    assert r.json()["results"][0]["status"] == "updated"
+    assert await meeting_days() == ["2025-01-06", "2025-01-13"]
@@ -0,0 +1,72 @@
+import hashlib
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from unisphere.core import static_files
+from unisphere.core.static_files import IMMUTABLE_CACHE_CONTROL, UploadStaticFiles
+
+BODY = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+DIGEST = hashlib.sha256(BODY).hexdigest()
+
+
+@pytest_asyncio.fixture
+async def uploads_client(tmp_path):
+    images = tmp_path / "images"
+    (images / DIGEST[:2] / DIGEST[2:4]).mkdir(parents=True)
+    (images / DIGEST[:2] / DIGEST[2:4] / f"{DIGEST}.png").write_bytes(BODY)
+    (images / "legacy.png").write_bytes(BODY)
+    (images / ".in-progress.part").write_bytes(b"partial")
+
+    app = Starlette(routes=[Mount("/uploads", UploadStaticFiles(directory=tmp_path))])
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_content_addressed_upload_is_immutable_and_revalidates(uploads_client: AsyncClient):
+    url = f"/uploads/images/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST}.png"
+
+    r = await uploads_client.get(url)
+    assert r.status_code == 200
+    assert r.content == BODY
+    assert r.headers["etag"] == f'"{DIGEST}"'
+    assert r.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    r = await uploads_client.get(url, headers={"If-None-Match": f'"{DIGEST}"'})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == f'"{DIGEST}"'
+
+
+@pytest.mark.asyncio
+async def test_other_uploads_get_hashed_etag_and_ranges(uploads_client: AsyncClient):
+    r = await uploads_client.get("/uploads/images/legacy.png")
+    assert r.headers["etag"] == f'"{DIGEST}"'
+    assert "immutable" not in r.headers["cache-control"]
+
+    r = await uploads_client.get("/uploads/images/legacy.png", headers={"Range": "bytes=8-15"})
+    assert r.status_code == 206
+    assert r.content == BODY[8:16]
+    assert r.headers["content-range"] == f"bytes 8-15/{len(BODY)}"
+
+
+@pytest.mark.asyncio
+async def test_partial_uploads_are_not_served(uploads_client: AsyncClient):
+    r = await uploads_client.get("/uploads/images/.in-progress.part")
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_accel_redirect_hands_file_to_nginx(uploads_client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(static_files.settings, "UPLOAD_ACCEL_REDIRECT_PREFIX", "/protected-uploads/")
+
+    r = await uploads_client.get("/uploads/images/legacy.png")
+    assert r.status_code == 200
+    assert r.content == b""
+    assert r.headers["x-accel-redirect"] == "/protected-uploads/images/legacy.png"
+    assert r.headers["content-type"] == "image/png"
+    assert r.headers["etag"] == f'"{DIGEST}"'
@@ -0,0 +1,174 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import register_and_login
+from unisphere.main import app
+from unisphere.models.stored_file_model import StoredFile
+from unisphere.routes.v1.upload_router import get_upload_service
+from unisphere.services.image_derivative_service import ImageDerivativeService, get_image_derivative_service
+from unisphere.services.storage_service.LocalStorageBackend import LocalStorageBackend
+from unisphere.services.storage_service.MemoryStorageBackend import MemoryStorageBackend
+from unisphere.services.upload_service import UploadService, get_storage_backend
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 5000
+
+
+@pytest.fixture
+def memory_storage(tmp_path):
+    storage = MemoryStorageBackend()
+    app.dependency_overrides[get_storage_backend] = lambda: storage
+    # Completed uploads get derivatives, which cache originals on local disk
+    derivatives = ImageDerivativeService(str(tmp_path / "uploads"), executor=ThreadPoolExecutor(max_workers=1))
+    app.dependency_overrides[get_image_derivative_service] = lambda: derivatives
+    yield storage
+    derivatives.shutdown()
+
+
+async def put(client: AsyncClient, presigned: dict, body: bytes):
+    return await client.request(presigned["method"], presigned["url"], content=body,
+                                headers=presigned["headers"])
+
+
+@pytest.mark.asyncio
+async def test_direct_upload_goes_to_storage(client: AsyncClient, memory_storage):
+    _, headers = await register_and_login(client, "direct@example.com")
+
+    r = await client.post("/v1/upload/direct", headers=headers, json={
+        "filename": "poster.png", "content_type": "image/png", "size": len(PNG)})
+    assert r.status_code == 200
+    ticket = r.json()
+    assert ticket["upload_id"] is None
+
+    assert (await put(client, ticket["upload"], PNG)).status_code == 200
+    assert memory_storage.objects[ticket["key"]][0] == PNG
+    final_key = f"images/{ticket['key'].rsplit('/', 1)[1]}"
+
+    r = await client.post("/v1/upload/direct/complete", headers=headers, json={"key": ticket["key"]})
+    assert r.status_code == 200
+    assert r.json()["url"].endswith(f"/uploads/{final_key}")
+    assert list(memory_storage.objects) == [final_key]
+
+
+@pytest.mark.asyncio
+async def test_checked_direct_upload_cannot_be_replaced(client: AsyncClient, memory_storage):
+    _, headers = await register_and_login(client, "replace@example.com")
+    r = await client.post("/v1/upload/direct", headers=headers, json={
+        "filename": "poster.png", "content_type": "image/png", "size": len(PNG)})
+    ticket = r.json()
+    final_key = f"images/{ticket['key'].rsplit('/', 1)[1]}"
+
+    assert (await put(client, ticket["upload"], PNG)).status_code == 200
+    assert (await put(client, ticket["upload"], b"<html>")).status_code == 409
+    r = await client.post("/v1/upload/direct/complete", headers=headers, json={"key": ticket["key"]})
+    assert r.status_code == 200
+
+    # The URL is still within its expiry, but only reaches the staging prefix
+    assert (await put(client, ticket["upload"], PNG[:8] + b"<html>")).status_code == 200
+    r = await client.post("/v1/upload/direct/complete", headers=headers, json={"key": ticket["key"]})
+    assert r.status_code == 400
+    assert memory_storage.objects[final_key][0] == PNG
+    assert ticket["key"] not in memory_storage.objects
+
+
+@pytest.mark.asyncio
+async def test_garbage_collector_removes_unfinished_direct_uploads(client: AsyncClient, memory_storage):
+    _, headers = await register_and_login(client, "abandon@example.com")
+    r = await client.post("/v1/upload/direct", headers=headers, json={
+        "filename": "poster.png", "content_type": "image/png", "size": len(PNG)})
+    ticket = r.json()
+    await put(client, ticket["upload"], PNG)
+    service = UploadService(storage_mode="uuid", storage=memory_storage)
+
+    assert await service.collect_garbage(grace_seconds=3600) == 0
+    data, _ = memory_storage.objects[ticket["key"]]
+    memory_storage.objects[ticket["key"]] = (data, time.time() - 7200)
+    assert await service.collect_garbage(grace_seconds=3600) == 1
+    assert memory_storage.objects == {}
+
+
+@pytest.mark.asyncio
+async def test_direct_uploads_share_content_addressed_files(client: AsyncClient, memory_storage, session_fixture):
+    service = UploadService(session=session_fixture, storage_mode="content", storage=memory_storage)
+    app.dependency_overrides[get_upload_service] = lambda: service
+    digest = hashlib.sha256(PNG).hexdigest()
+
+    for email in ("dedup@example.com", "dedup2@example.com"):
+        _, headers = await register_and_login(client, email)
+        r = await client.post("/v1/upload/direct", headers=headers, json={
+            "filename": "poster.png", "content_type": "image/png", "size": len(PNG)})
+        ticket = r.json()
+        await put(client, ticket["upload"], PNG)
+        r = await client.post("/v1/upload/direct/complete", headers=headers, json={"key": ticket["key"]})
+        assert r.status_code == 200
+        assert r.json()["url"].endswith(f"/uploads/images/{digest[:2]}/{digest[2:4]}/{digest}.png")
+
+    assert list(memory_storage.objects) == [f"images/{digest[:2]}/{digest[2:4]}/{digest}.png"]
+    assert (await session_fixture.get(StoredFile, digest)).ref_count == 2
+
+
+@pytest.mark.asyncio
+async def test_multipart_direct_upload(client: AsyncClient, memory_storage, monkeypatch):
+    monkeypatch.setenv("UPLOAD_MULTIPART_PART_SIZE", "2000")
+    _, headers = await register_and_login(client, "multipart@example.com")
+
+    r = await client.post("/v1/upload/direct", headers=headers, json={
+        "filename": "poster.png", "content_type": "image/png", "size": len(PNG)})
+    ticket = r.json()
+    assert [part["part_number"] for part in ticket["parts"]] == [1, 2, 3]
+
+    completed = []
+    for part in ticket["parts"]:
+        start = (part["part_number"] - 1) * ticket["part_size"]
+        r = await put(client, part["request"], PNG[start:start + ticket["part_size"]])
+        assert r.status_code == 200
+        completed.append({"part_number": part["part_number"], "etag": r.headers["etag"]})
+
+    r = await client.post("/v1/upload/direct/complete", headers=headers, json={
+        "key": ticket["key"], "upload_id": ticket["upload_id"], "parts": completed})
+    assert r.status_code == 200
+    assert memory_storage.objects[f"images/{ticket['key'].rsplit('/', 1)[1]}"][0] == PNG
+    assert memory_storage.uploads == {}
+
+
+@pytest.mark.asyncio
+async def test_direct_upload_rejects_tampering_and_bad_content(client: AsyncClient, memory_storage):
+    _, headers = await register_and_login(client, "tamper@example.com")
+    r = await client.post("/v1/upload/direct", headers=headers, json={
+        "filename": "poster.png", "content_type": "image/png", "size": 100})
+    ticket = r.json()
+
+    forged = dict(ticket["upload"], url=ticket["upload"]["url"] + "x")
+    assert (await put(client, forged, PNG)).status_code == 403
+
+    assert (await put(client, ticket["upload"], b"<?php echo 1; ?>")).status_code == 200
+    r = await client.post("/v1/upload/direct/complete", headers=headers, json={"key": ticket["key"]})
+    assert r.status_code == 400
+    assert ticket["key"] not in memory_storage.objects
+
+    r = await client.post("/v1/upload/direct/complete", headers=headers, json={"key": "images/../secret.png"})
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_local_backend_multipart_and_listing(tmp_path):
+    storage = LocalStorageBackend(str(tmp_path))
+
+    async def body(data: bytes):
+        yield data
+
+    upload_id = await storage.create_multipart("images/big.png", "image/png")
+    etags = [await storage.write_part("images/big.png", upload_id, number, body(chunk))
+             for number, chunk in ((2, b"world"), (1, b"hello "))]
+    await storage.complete_multipart("images/big.png", upload_id, [(2, etags[0]), (1, etags[1])])
+
+    assert await storage.read("images/big.png") == b"hello world"
+    assert await storage.read("images/big.png", 6, 3) == b"wor"
+    assert [item.key async for item in storage.list("images/")] == ["images/big.png"]
+    assert not (tmp_path / ".multipart" / upload_id).exists()
+
+    with pytest.raises(ValueError):
+        storage.path("../outside.png")
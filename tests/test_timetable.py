@@ -0,0 +1,120 @@
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+
+import unisphere.models as models
+from tests.conftest import add_slot, register_and_login, seed_sections
+from unisphere.core.cache import LocalTTLCache, TaggedCache
+from unisphere.core.config import Settings
+from unisphere.models.course_model import CourseTranslationModel
+from unisphere.models.day_of_week_model import DayTranslationModel
+from unisphere.routes.v1.me_router import get_timetable_service
+from unisphere.services.catalog_cache import user_entry_ttl
+
+
+def occurrence_selects(statements: list[str]) -> int:
+    return sum(1 for s in statements if s.lstrip().upper().startswith("SELECT") and "section_occurrences" in s)
+
+
+@pytest.mark.asyncio
+async def test_week_is_one_cached_query(client: AsyncClient, session_fixture, query_counter):
+    user_id, headers = await register_and_login(client, "timetable@example.com")
+    seed = await seed_sections(session_fixture, count=2)
+    first, second = seed["section_ids"]
+    session_fixture.add(CourseTranslationModel(
+        course_id=seed["course_id"], language_code="th", subject_name="การเขียนโปรแกรม"))
+    session_fixture.add(DayTranslationModel(day_id=seed["days"]["TU"], language_code="th", day_name="อังคาร"))
+    await session_fixture.commit()
+    await add_slot(client, first, seed["days"]["TU"], "09:00", "12:00")
+    await add_slot(client, second, seed["days"]["WE"], "13:00", "16:00")
+    r = await client.post(f"/v1/sections/{first}/rrules", json={
+        "section_id": first, "rrule": "DTSTART:20250111T090000\nRRULE:FREQ=WEEKLY;COUNT=2\nDURATION:PT3H"})
+    assert r.status_code == 201
+
+    r = await client.post(f"/v1/courses/{seed['course_id']}/enroll",
+                          params={"user_id": user_id, "section_id": first})
+    assert r.status_code == 200
+
+    query_counter.clear()
+    for _ in range(2):
+        r = await client.get("/v1/me/timetable", params={"week": "2025-W02", "language_code": "th"}, headers=headers)
+        assert r.status_code == 200
+    assert occurrence_selects(query_counter) == 1
+
+    week = r.json()
+    assert (week["week"], week["start_date"], week["end_date"]) == ("2025-W02", "2025-01-06", "2025-01-12")
+    assert [(e["starts_at"], e["day_name"], e["subject_name"]) for e in week["entries"]] == [
+        ("2025-01-07T09:00:00", "อังคาร", "การเขียนโปรแกรม"),
+        ("2025-01-11T09:00:00", None, "การเขียนโปรแกรม"),
+    ]
+    assert week["entries"][0]["day_code"] == "TUE"
+    assert week["entries"][1]["schedule_id"] is None
+
+    # Enrolling drops this student's cached weeks
+    r = await client.post(f"/v1/courses/{seed['course_id']}/enroll",
+                          params={"user_id": user_id, "section_id": second})
+    assert r.status_code == 200
+    r = await client.get("/v1/me/timetable", params={"week": "2025-W02", "language_code": "th"}, headers=headers)
+    assert len(r.json()["entries"]) == 3
+    assert occurrence_selects(query_counter) == 2
+
+
+@pytest.mark.asyncio
+async def test_schedule_and_withdraw_invalidate(client: AsyncClient, session_fixture):
+    user_id, headers = await register_and_login(client, "withdraw@example.com")
+    seed = await seed_sections(session_fixture)
+    section_id = seed["section_ids"][0]
+    schedule_id = await add_slot(client, section_id, seed["days"]["MO"], "08:00", "10:00")
+    await client.post(f"/v1/courses/{seed['course_id']}/enroll", params={"user_id": user_id, "section_id": section_id})
+
+    r = await client.get("/v1/me/timetable", params={"week": "2025-W03"}, headers=headers)
+    assert [e["starts_at"] for e in r.json()["entries"]] == ["2025-01-13T08:00:00"]
+
+    await client.put(f"/v1/schedules/{schedule_id}", json={"start_time": "08:30"})
+    r = await client.get("/v1/me/timetable", params={"week": "2025-W03"}, headers=headers)
+    assert [e["starts_at"] for e in r.json()["entries"]] == ["2025-01-13T08:30:00"]
+
+    r = await client.delete(f"/v1/courses/{seed['course_id']}/withdraw", params={"user_id": user_id})
+    assert r.json() is True
+    r = await client.get("/v1/me/timetable", params={"week": "2025-W03"}, headers=headers)
+    assert r.json()["entries"] == []
+
+    r = await client.get("/v1/courses/user/" + str(user_id))
+    assert r.json() == []
+
+
+@pytest.mark.asyncio
+async def test_enroll_checks_the_section_belongs_to_the_course(client: AsyncClient, session_fixture):
+    user_id, headers = await register_and_login(client, "wrong@example.com")
+    seed = await seed_sections(session_fixture)
+    r = await client.post(f"/v1/courses/{seed['course_id'] + 1}/enroll",
+                          params={"user_id": user_id, "section_id": seed["section_ids"][0]})
+    assert r.status_code == 404
+    r = await client.get("/v1/me/timetable", params={"week": "2025-53"}, headers=headers)
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_do_not_fill_the_cache(session_fixture, query_counter):
+    cache = TaggedCache(LocalTTLCache(maxsize=10, ttl=60))
+    models.replica_engines.append(session_fixture.bind)
+    try:
+        service = get_timetable_service(session_fixture, cache)
+    finally:
+        models.replica_engines.remove(session_fixture.bind)
+    for _ in range(2):
+        await service.get_week(1, date(2025, 1, 6))
+    assert occurrence_selects(query_counter) == 2
+    assert len(cache.local) == 0
+
+    # The primary fills it as before
+    await get_timetable_service(session_fixture, cache).get_week(1, date(2025, 1, 6))
+    assert len(cache.local) == 1
+
+
+def test_per_user_entries_are_short_lived_across_memory_workers():
+    assert user_entry_ttl(Settings(CATALOG_CACHE_BACKEND="memory", WEB_CONCURRENCY=1)) is None
+    assert user_entry_ttl(Settings(CATALOG_CACHE_BACKEND="redis", WEB_CONCURRENCY=4)) is None
+    assert user_entry_ttl(Settings(
+        CATALOG_CACHE_BACKEND="memory", WEB_CONCURRENCY=2, CATALOG_CACHE_LOCAL_TTL_SECONDS=5)) == 5
@@ -0,0 +1,220 @@
+import hashlib
+import io
+import os
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+
+from tests.conftest import register_and_login
+from unisphere.main import app
+from unisphere.models.stored_file_model import StoredFile, StoredFileRef
+from unisphere.routes.v1.upload_router import get_upload_service
+from unisphere.services.upload_service import UploadService
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    service = UploadService(str(tmp_path / "uploads"))
+    app.dependency_overrides[get_upload_service] = lambda: service
+    return service.images_dir
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_image_to_disk(client: AsyncClient, upload_dir):
+    _, headers = await register_and_login(client, "uploader@example.com")
+    body = PNG_HEADER + b"\0" * 200_000
+
+    r = await client.post("/v1/upload/image", headers=headers,
+                          files={"file": ("photo.png", body, "image/png")})
+    assert r.status_code == 200
+    saved, = upload_dir.iterdir()
+    assert saved.suffix == ".png"
+    assert saved.read_bytes() == body
+    assert r.json()["url"].endswith(f"uploads/images/{saved.name}")
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_content_that_is_not_an_image(client: AsyncClient, upload_dir):
+    _, headers = await register_and_login(client, "spoofer@example.com")
+
+    r = await client.post("/v1/upload/image", headers=headers,
+                          files={"file": ("photo.png", b"<?php echo 1; ?>", "image/png")})
+    assert r.status_code == 400
+    assert list(upload_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_upload_aborts_past_size_limit(client: AsyncClient, upload_dir, monkeypatch):
+    monkeypatch.setenv("MAX_FILE_SIZE", str(1024 * 1024))
+    _, headers = await register_and_login(client, "bigfile@example.com")
+    body = PNG_HEADER + b"\0" * (2 * 1024 * 1024)
+
+    r = await client.post("/v1/upload/image", headers=headers,
+                          files={"file": ("photo.png", body, "image/png")})
+    assert r.status_code == 413
+    assert list(upload_dir.iterdir()) == []
+
+
+@pytest.fixture
+def content_store(tmp_path, session_fixture):
+    service = UploadService(str(tmp_path / "uploads"), session=session_fixture, storage_mode="content")
+    app.dependency_overrides[get_upload_service] = lambda: service
+    return service
+
+
+async def upload(client: AsyncClient, headers: dict, body: bytes) -> str:
+    r = await client.post("/v1/upload/image", headers=headers,
+                          files={"file": ("poster.png", body, "image/png")})
+    assert r.status_code == 200
+    return r.json()["url"].split("/uploads/images/", 1)[1]
+
+
+@pytest.mark.asyncio
+async def test_content_addressed_uploads_share_one_file(client: AsyncClient, content_store, session_fixture):
+    _, owner = await register_and_login(client, "poster@example.com")
+    _, other = await register_and_login(client, "reposter@example.com")
+    _, stranger = await register_and_login(client, "stranger@example.com")
+    body = PNG_HEADER + b"poster" * 1000
+    digest = hashlib.sha256(body).hexdigest()
+
+    names = [await upload(client, headers, body) for headers in (owner, owner, other)]
+    assert names == [f"{digest[:2]}/{digest[2:4]}/{digest}.png"] * 3
+    stored = await session_fixture.get(StoredFile, digest)
+    assert stored.ref_count == 2
+
+    # Only holders release a reference, and each only once
+    file_path = content_store.images_dir / names[0]
+    for headers, status_code in ((stranger, 404), (stranger, 404), (owner, 200), (owner, 404)):
+        r = await client.delete(f"/v1/upload/image/{names[0]}", headers=headers)
+        assert r.status_code == status_code
+    assert file_path.exists()
+    await session_fixture.refresh(stored)
+    assert stored.ref_count == 1
+
+    r = await client.delete(f"/v1/upload/image/{names[0]}", headers=other)
+    assert r.status_code == 200
+    assert not file_path.exists()
+    session_fixture.expunge_all()
+    assert await session_fixture.get(StoredFile, digest) is None
+    assert (await session_fixture.exec(select(StoredFileRef))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_garbage_collector_removes_orphans(content_store, session_fixture):
+    images = content_store.images_dir
+    orphan = images / "ab" / "cd" / f"{'ab' * 32}.png"
+    orphan.parent.mkdir(parents=True)
+    orphan.write_bytes(PNG_HEADER)
+    abandoned = images / ".abandoned.part"
+    abandoned.write_bytes(b"partial")
+    session_fixture.add(StoredFile(digest="cd" * 32, path="uploads/images/cd/cd/unused.png", size=1))
+    await session_fixture.commit()
+
+    assert await content_store.collect_garbage(grace_seconds=3600) == 0
+    old = time.time() - 7200
+    for path in (orphan, abandoned):
+        os.utime(path, (old, old))
+
+    assert await content_store.collect_garbage(grace_seconds=3600) == 2
+    assert not orphan.exists() and not abandoned.exists()
+    assert (await session_fixture.exec(select(StoredFile))).all() == []
+
+
+@pytest.fixture
+def derivatives(tmp_path, upload_dir):
+    pil = pytest.importorskip("PIL.Image")
+    from concurrent.futures import ProcessPoolExecutor
+
+    from unisphere.services.image_derivative_service import (
+        ImageDerivativeService, get_image_derivative_service)
+
+    service = ImageDerivativeService(
+        str(tmp_path / "uploads"), widths=[320, 960], max_bytes=10 * 1024 * 1024,
+        executor=ProcessPoolExecutor(max_workers=1))
+    app.dependency_overrides[get_image_derivative_service] = lambda: service
+    yield service, pil
+    service.shutdown()
+
+
+def png_bytes(pil, width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    pil.new("RGB", (width, height), (200, 40, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_upload_renders_derivatives_served_by_width(client: AsyncClient, derivatives):
+    service, pil = derivatives
+    _, headers = await register_and_login(client, "thumbs@example.com")
+    name = await upload(client, headers, png_bytes(pil, 1200, 600))
+
+    rendered = sorted(p.relative_to(service.derivatives_dir).as_posix()
+                      for p in service.derivatives_dir.rglob("*.webp"))
+    stem = name.rsplit(".", 1)[0]
+    assert rendered == [f"320/{stem}.webp", f"960/{stem}.webp"]
+
+    r = await client.get(f"/v1/upload/image/{name}?w=200")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "image/webp"
+    assert pil.open(io.BytesIO(r.content)).size == (320, 160)
+    etag = r.headers["etag"]
+    r = await client.get(f"/v1/upload/image/{name}?w=300", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+    r = await client.get(f"/v1/upload/image/{name}?w=2000")
+    assert r.headers["content-type"] == "image/png"
+    assert pil.open(io.BytesIO(r.content)).size == (1200, 600)
+
+    r = await client.get("/v1/upload/image/missing.png?w=200")
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_missing_derivatives_render_lazily_and_evict_oldest(client: AsyncClient, derivatives):
+    service, pil = derivatives
+    names = []
+    for index in range(3):
+        name = f"{index}.png"
+        (service.upload_dir / "images" / name).write_bytes(png_bytes(pil, 800, 800))
+        names.append(name)
+
+    first = await client.get(f"/v1/upload/image/{names[0]}?w=300")
+    assert first.status_code == 200
+    size = len(first.content)
+    service.max_bytes = int(size * 2.5)
+
+    for name in names[1:]:
+        assert (await client.get(f"/v1/upload/image/{name}?w=300")).status_code == 200
+
+    remaining = sorted(p.name for p in service.derivatives_dir.rglob("*.webp"))
+    assert remaining == ["1.webp", "2.webp"]
+
+
+@pytest.mark.asyncio
+async def test_derivatives_fetch_originals_from_remote_storage(client: AsyncClient, derivatives, tmp_path):
+    from unisphere.services.storage_service.MemoryStorageBackend import MemoryStorageBackend
+
+    service, pil = derivatives
+    storage = MemoryStorageBackend()
+    remote = UploadService(str(tmp_path / "uploads"), storage=storage)
+    app.dependency_overrides[get_upload_service] = lambda: remote
+
+    async def body():
+        yield png_bytes(pil, 800, 400)
+
+    await storage.write("images/remote.png", body(), "image/png")
+    assert not (service.upload_dir / "images" / "remote.png").exists()
+
+    r = await client.get("/v1/upload/image/remote.png?w=300")
+    assert r.status_code == 200
+    assert pil.open(io.BytesIO(r.content)).size == (320, 160)
+    assert (service.originals_dir / "images" / "remote.png").exists()
+
+    await storage.delete("images/remote.png")
+    await service.discard_orphans("uploads/images/remote.png", storage)
+    assert not (service.originals_dir / "images" / "remote.png").exists()
+    assert (await client.get("/v1/upload/image/remote.png?w=300")).status_code == 404
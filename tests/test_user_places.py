@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 
+from tests.conftest import register_and_login
+
 
 @pytest.mark.asyncio
 async def test_create_and_list_user_places(client: AsyncClient):
@@ -121,3 +123,48 @@ async def test_delete_place(client: AsyncClient):
     r = await client.get("/v1/user-places/", headers=headers)
     names = [x["name"] for x in r.json()["places"]]
     assert p["name"] not in names
+
+
+@pytest.mark.asyncio
+async def test_list_places_reports_total_for_every_page(client: AsyncClient):
+    _, headers = await register_and_login(client, "four@example.com")
+
+    for i in range(5):
+        p = {"name": f"Spot {i}", "latitude": 13.0,
+             "longitude": 100.0, "category": "spot"}
+        r = await client.post("/v1/user-places/", json=p, headers=headers)
+        assert r.status_code == 201
+
+    r = await client.get("/v1/user-places/?limit=2&offset=2", headers=headers)
+    body = r.json()
+    assert body["total"] == 5
+    assert len(body["places"]) == 2
+
+    r = await client.get("/v1/user-places/?limit=2&offset=10", headers=headers)
+    body = r.json()
+    assert body["total"] == 5
+    assert body["places"] == []
+
+
+@pytest.mark.asyncio
+async def test_user_places_cursor_pagination(client: AsyncClient):
+    _, headers = await register_and_login(client, "collector@example.com")
+    for i in range(5):
+        r = await client.post("/v1/user-places/", headers=headers, json={
+            "name": f"Place {i}", "latitude": 13.0, "longitude": 100.0, "category": "cafe"})
+        assert r.status_code == 201
+
+    r = await client.get("/v1/user-places/", headers=headers, params={"limit": 2})
+    first = r.json()
+    assert first["total"] == 5
+    names = [p["name"] for p in first["places"]]
+
+    cursor = first["next_cursor"]
+    while cursor:
+        r = await client.get("/v1/user-places/", headers=headers, params={"limit": 2, "cursor": cursor})
+        page = r.json()
+        assert page["total"] == 5
+        names += [p["name"] for p in page["places"]]
+        cursor = page["next_cursor"]
+
+    assert names == [f"Place {i}" for i in reversed(range(5))]
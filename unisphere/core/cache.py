@@ -0,0 +1,215 @@
+import base64
+import copy
+import functools
+import hashlib
+import inspect
+import pickle
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Hashable, Iterable, List, Optional
+
+import redis.asyncio as redis
+
+_MISSING = object()
+
+
+class LocalTTLCache:
+    """In-process LRU cache whose entries also expire after ttl seconds
+
+    Not shared between worker processes; pair it with a Redis tier when
+    entries must be invalidated everywhere at once.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class CacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+class TaggedCache:
+    """Service method results, in process and optionally in Redis, dropped by tag
+
+    Every entry carries the tags of the data it was built from. Invalidating
+    a tag drops its entries from this worker's LRU and from Redis at once;
+    other workers' LRUs catch up within local_ttl, so keep that short when
+    several workers share the Redis tier.
+    """
+
+    def __init__(
+        self,
+        local: LocalTTLCache,
+        redis_client: Optional[redis.Redis] = None,
+        prefix: str = "cache",
+        local_ttl: Optional[float] = None,
+    ):
+        self.local = local
+        self.redis = redis_client
+        self.prefix = prefix
+        self.local_ttl = local_ttl
+        self.writable = True
+        self.stats = CacheStats()
+        # Keys of the local entries per tag; evicted keys linger until the tag is dropped
+        self._tagged: defaultdict[str, set[str]] = defaultdict(set)
+
+    def with_redis(self, redis_client: redis.Redis, local_ttl: Optional[float] = None) -> "TaggedCache":
+        """Same local tier, tag index and counters, plus a Redis tier"""
+        view = copy.copy(self)
+        view.redis = redis_client
+        view.local_ttl = local_ttl
+        return view
+
+    def read_only(self) -> "TaggedCache":
+        """Same tiers, but misses are not stored; for results read from a lagging replica"""
+        view = copy.copy(self)
+        view.writable = False
+        return view
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.prefix}:{hashlib.sha1(key.encode()).hexdigest()}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def get(self, key: str) -> Any:
+        """Cached value for key, or _MISSING"""
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self.stats.local_hits += 1
+            return value
+        if self.redis is not None:
+            raw = await self.redis.get(self._redis_key(key))
+            if raw is not None:
+                self.stats.redis_hits += 1
+                value = pickle.loads(base64.b64decode(raw))
+                self.local.set(key, value, self.local_ttl)
+                return value
+        self.stats.misses += 1
+        return _MISSING
+
+    async def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]) -> None:
+        if not self.writable:
+            return
+        local_ttl = ttl if self.local_ttl is None else min(ttl, self.local_ttl)
+        self.local.set(key, value, local_ttl)
+        for tag in tags:
+            self._tagged[tag].add(key)
+        if self.redis is not None:
+            redis_key = self._redis_key(key)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                # Base64 because the shared client decodes responses as text
+                pipe.set(redis_key, base64.b64encode(pickle.dumps(value)), ex=int(ttl))
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), redis_key)
+                    pipe.expire(self._tag_key(tag), int(ttl))
+                await pipe.execute()
+
+    async def invalidate(self, *tags: str) -> None:
+        for tag in tags:
+            for key in self._tagged.pop(tag, ()):
+                self.local.pop(key)
+        self.stats.invalidations += 1
+        if self.redis is not None:
+            for tag in tags:
+                members = await self.redis.smembers(self._tag_key(tag))
+                await self.redis.delete(self._tag_key(tag), *members)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self._tagged.clear()
+
+    def snapshot(self) -> dict:
+        return {**asdict(self.stats), "local_entries": len(self.local)}
+
+
+def _format_tags(tags: Iterable[str], bound: inspect.BoundArguments) -> List[str]:
+    return [tag.format(**bound.arguments) if "{" in tag else tag for tag in tags]
+
+
+def cached(*tags: str, ttl: Optional[float] = None):
+    """Cache a service method's result in self.cache under the given tags
+
+    The key is the method plus its bound arguments, so f(1) and f(x=1)
+    share an entry; ttl defaults to the local tier's. Tags may name
+    arguments, as in "timetable:user:{user_id}". Cached values are
+    shared between requests and must not be mutated. Services built
+    without a cache call straight through.
+    """
+    def decorator(method: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            cache: Optional[TaggedCache] = getattr(self, "cache", None)
+            if cache is None:
+                return await method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = list(bound.arguments.items())[1:]
+            key = f"{method.__qualname__}{arguments!r}"
+
+            value = await cache.get(key)
+            if value is _MISSING:
+                value = await method(self, *args, **kwargs)
+                await cache.set(key, value, cache.local.ttl if ttl is None else ttl,
+                                _format_tags(tags, bound))
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates(*tags: str):
+    """Drop the given tags, formatted as in cached, from self.cache after the method succeeds"""
+    def decorator(method: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            result = await method(self, *args, **kwargs)
+            cache: Optional[TaggedCache] = getattr(self, "cache", None)
+            if cache is not None:
+                bound = signature.bind(self, *args, **kwargs)
+                bound.apply_defaults()
+                await cache.invalidate(*_format_tags(tags, bound))
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,72 @@
+"""Conditional GET for JSON listings
+
+A listing's ETag is derived from a version key (row count plus the newest
+updated_at under the same filters) that a single aggregate query can read,
+so a client polling an unchanged feed gets a 304 before the page is
+queried or serialized.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+# Listings depend on who is asking, so shared caches must not store them,
+# and clients revalidate on every use
+LIST_CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class ListVersion:
+    """Changes whenever a listing under the same filters would change"""
+    count: int
+    last_modified: Optional[datetime]
+    # Anything else the rendered page depends on, e.g. the caller's own registrations
+    extra: tuple = ()
+
+    def etag(self, *params: Any) -> str:
+        """Weak ETag for the page selected by params (pagination and filters)"""
+        key = repr((self.count, self.last_modified, self.extra, params))
+        return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(request_headers: Headers, etag: str) -> bool:
+    """Weak comparison of If-None-Match against etag, as RFC 9110 requires for GET"""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def http_date(value: datetime) -> str:
+    # Naive timestamps are the server's local time, as written by datetime.now()
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict[str, str]:
+    headers = {
+        "etag": etag,
+        "cache-control": LIST_CACHE_CONTROL,
+        "vary": "Authorization",
+    }
+    if last_modified is not None:
+        headers["last-modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    """Attach ETag, Last-Modified and Cache-Control to a 200 listing
+
+    Last-Modified is informational only: a deleted row lowers the count but
+    not the newest updated_at, so If-Modified-Since alone is never answered
+    with 304.
+    """
+    response.headers.update(validator_headers(etag, last_modified))
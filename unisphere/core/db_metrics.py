@@ -0,0 +1,83 @@
+import time
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+@dataclass
+class PoolMetrics:
+    """Connection pool counters for sizing pools across workers
+
+    waits counts only checkouts that had to queue for a connection, so
+    wait_seconds_avg is the delay of those, not of every checkout.
+    """
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    invalidations: int = 0
+    waits: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.waits += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Count pool events on an engine"""
+        pool = engine.sync_engine.pool
+
+        def on_connect(*_):
+            self.connects += 1
+
+        def on_checkout(*_):
+            self.checkouts += 1
+
+        def on_checkin(*_):
+            self.checkins += 1
+
+        def on_invalidate(*_):
+            self.invalidations += 1
+
+        event.listen(pool, "connect", on_connect)
+        event.listen(pool, "checkout", on_checkout)
+        event.listen(pool, "checkin", on_checkin)
+        event.listen(pool, "invalidate", on_invalidate)
+
+    def snapshot(self, engine: AsyncEngine) -> dict:
+        """Counters plus the pool's current occupancy"""
+        pool = engine.sync_engine.pool
+        data = asdict(self)
+        data["wait_seconds_avg"] = (
+            self.wait_seconds_total / self.waits if self.waits else 0.0)
+        if isinstance(pool, QueuePool):
+            data.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long blocked checkouts waited"""
+
+    def _exhausted(self) -> bool:
+        """No idle connection and no room to open another one"""
+        return self.checkedin() == 0 and -1 < self._max_overflow <= self._overflow
+
+    def _do_get(self):
+        if not self._exhausted():
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
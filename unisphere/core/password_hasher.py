@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, TypeVar
+
+import bcrypt
+
+from . import config
+
+T = TypeVar("T")
+
+settings = config.get_settings()
+
+
+@dataclass
+class HashingMetrics:
+    queued: int = 0
+    active: int = 0
+    max_queued: int = 0
+    completed: int = 0
+    wait_seconds_total: float = 0.0
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded thread pool instead of on the event loop
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism;
+    max_workers caps how many hashes run at once and the rest wait in the
+    pool's queue, visible through metrics().
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._metrics = HashingMetrics()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with a fresh salt"""
+        hashed = await self._run(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt())
+        return hashed.decode('utf-8')
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Check a password against a bcrypt hash"""
+        return await self._run(
+            bcrypt.checkpw, plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        submitted = time.perf_counter()
+        with self._lock:
+            self._metrics.queued += 1
+            self._metrics.max_queued = max(self._metrics.max_queued, self._metrics.queued)
+
+        def work() -> T:
+            with self._lock:
+                self._metrics.queued -= 1
+                self._metrics.active += 1
+                self._metrics.wait_seconds_total += time.perf_counter() - submitted
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._metrics.active -= 1
+                    self._metrics.completed += 1
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, work)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            data = asdict(self._metrics)
+        data["max_workers"] = self.max_workers
+        return data
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_CONCURRENCY)
@@ -0,0 +1,106 @@
+import hashlib
+import mimetypes
+import os
+import stat
+from pathlib import PurePosixPath
+from urllib.parse import quote
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from unisphere.core.cache import LocalTTLCache
+from unisphere.core.conditional import etag_matches
+from unisphere.core.config import get_settings
+from unisphere.services.upload_service import CHUNK_SIZE, CONTENT_ADDRESSED_NAME
+
+settings = get_settings()
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# sha256 of files whose name does not carry it, keyed by path, size and mtime
+content_etags = LocalTTLCache(maxsize=10000, ttl=24 * 3600)
+
+
+def _sha256_file(full_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(full_path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def strong_etag(full_path: str, stat_result: os.stat_result, relative_path: str) -> str:
+    """ETag derived from the file's sha256 digest"""
+    parts = PurePosixPath(relative_path).parts
+    match = CONTENT_ADDRESSED_NAME.match(parts[-1])
+    if match and parts[0] == "images":
+        return f'"{match.group(1)}"'
+
+    key = (full_path, stat_result.st_size, stat_result.st_mtime_ns)
+    etag = content_etags.get(key)
+    if etag is None:
+        etag = f'"{await anyio.to_thread.run_sync(_sha256_file, full_path)}"'
+        content_etags.set(key, etag)
+    return etag
+
+
+def cache_control(relative_path: str) -> str:
+    # A content-addressed name always refers to the same bytes
+    if CONTENT_ADDRESSED_NAME.match(PurePosixPath(relative_path).name):
+        return IMMUTABLE_CACHE_CONTROL
+    return f"public, max-age={settings.UPLOAD_CACHE_MAX_AGE_SECONDS}"
+
+
+async def upload_file_response(
+    full_path: str,
+    stat_result: os.stat_result,
+    relative_path: str,
+    request_headers: Headers
+) -> Response:
+    """
+    Response for a file under the uploads directory
+
+    Answers If-None-Match with 304. Otherwise the bytes come from a
+    FileResponse, which also handles Range and If-Range, or, when
+    UPLOAD_ACCEL_REDIRECT_PREFIX is set, from nginx via X-Accel-Redirect.
+    """
+    headers = {
+        "etag": await strong_etag(full_path, stat_result, relative_path),
+        "cache-control": cache_control(relative_path),
+    }
+    if etag_matches(request_headers, headers["etag"]):
+        return NotModifiedResponse(Headers(headers))
+
+    prefix = settings.UPLOAD_ACCEL_REDIRECT_PREFIX
+    if prefix:
+        headers["x-accel-redirect"] = f"{prefix.rstrip('/')}/{quote(relative_path)}"
+        media_type = mimetypes.guess_type(relative_path)[0] or "application/octet-stream"
+        return Response(headers=headers, media_type=media_type)
+    return FileResponse(full_path, stat_result=stat_result, headers=headers)
+
+
+class UploadStaticFiles(StaticFiles):
+    """StaticFiles for the uploads directory with strong ETags and long-lived caching"""
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        # Temporary files of uploads in progress are never served
+        if any(part.startswith(".") for part in PurePosixPath(path).parts):
+            raise HTTPException(status_code=404)
+
+        try:
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path)
+        except PermissionError:
+            raise HTTPException(status_code=401)
+        except OSError:
+            raise HTTPException(status_code=404)
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            raise HTTPException(status_code=404)
+
+        return await upload_file_response(
+            full_path, stat_result, PurePosixPath(path).as_posix(), Headers(scope=scope))
@@ -0,0 +1,5 @@
+"""Bulk imports from the command line
+
+The work is done by services.bulk_import_service, which also backs
+POST /v1/imports/{kind}; this package only adds the CLI in __main__.
+"""
@@ -0,0 +1,84 @@
+"""Command line for bulk imports
+
+    python -m unisphere.imports sections sections.csv
+    python -m unisphere.imports enrollments enrollments.ndjson
+    python -m unisphere.imports instructors - --format csv < instructors.csv
+
+The format follows the file extension unless --format is given. Progress
+goes to stderr after every chunk; the exit status is 1 if any row failed.
+With CATALOG_CACHE_BACKEND=redis the imported students' cached timetables
+are dropped for every worker; the in-process "memory" backend cannot be
+reached from here, so the API may show them for up to
+CATALOG_CACHE_TTL_SECONDS unless the workers are restarted.
+"""
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator, BinaryIO
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import unisphere.models as models
+from unisphere.services.bulk_import_service import (FORMATS, TARGETS, BulkImportService, ImportProgress,
+                                                    read_records)
+from unisphere.services.catalog_cache import get_catalog_cache
+
+READ_SIZE = 64 * 1024
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    while chunk := await asyncio.to_thread(file.read, READ_SIZE):
+        yield chunk
+
+
+def print_progress(progress: ImportProgress) -> None:
+    print(f"\r{progress.rows:,} rows, {progress.written:,} written, {progress.failed:,} failed, "
+          f"{progress.rows_per_second:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m unisphere.imports")
+    parser.add_argument("kind", choices=list(TARGETS))
+    parser.add_argument("path", help="CSV or NDJSON file, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--chunk-size", type=int)
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson" if args.path != "-" else None)
+    if format is None:
+        parser.error("--format is required when reading stdin")
+
+    settings = models.settings
+    url = settings.DATABASE_URL
+    engine = create_async_engine(url, **models.engine_options(url))
+    try:
+        file = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+        with file:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                async for cache in get_catalog_cache():
+                    # Only the Redis tier is shared with the API workers
+                    shared = cache if settings.CATALOG_CACHE_BACKEND == "redis" else None
+                    service = BulkImportService(session, shared, chunk_size=args.chunk_size)
+                    report = await service.run(
+                        args.kind, read_records(read_chunks(file), format), print_progress)
+    finally:
+        await engine.dispose()
+        await models.close_redis()
+
+    print(file=sys.stderr)
+    if report.written and settings.CATALOG_CACHE_BACKEND == "memory":
+        print(f"note: API workers may serve cached timetables from before this import for up to "
+              f"{settings.CATALOG_CACHE_TTL_SECONDS:.0f} s; restart them or use CATALOG_CACHE_BACKEND=redis",
+              file=sys.stderr)
+    for error in report.errors:
+        print(f"line {error.line}: {error.error}")
+    if report.errors_truncated:
+        print(f"... and {report.failed - len(report.errors):,} more")
+    print(f"{report.rows:,} rows: {report.written:,} written, {report.unchanged:,} unchanged, "
+          f"{report.failed:,} failed in {report.elapsed_ms / 1000:.1f} s")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
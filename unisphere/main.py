@@ -1,35 +1,92 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 import unisphere.models as models
 import unisphere.routes as routers
-from unisphere.core.config import get_settings
+from unisphere.core.config import check_settings, get_settings
+from unisphere.core.password_hasher import password_hasher
+from unisphere.core.static_files import UploadStaticFiles
+from unisphere.services.event_capacity_service import run_write_behind
+from unisphere.services.image_derivative_service import image_derivatives
+from unisphere.services.upload_service import run_upload_gc
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     """Application lifespan manager."""
     # Startup
+    check_settings(settings)
     await models.init_db()
+    background_tasks = []
+    if settings.EVENT_CAPACITY_BACKEND == "redis":
+        background_tasks.append(asyncio.create_task(run_write_behind(
+            settings.EVENT_CAPACITY_FLUSH_INTERVAL_SECONDS,
+            settings.EVENT_CAPACITY_FLUSH_BATCH_SIZE,
+        )))
+    background_tasks.append(asyncio.create_task(run_upload_gc(
+        settings.UPLOAD_GC_INTERVAL_SECONDS,
+        settings.UPLOAD_GC_GRACE_SECONDS,
+    )))
     yield
     # Shutdown
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
     await models.close_db()
     await models.close_redis()
+    password_hasher.shutdown()
+    image_derivatives.shutdown()
+
+
+class ReadYourWritesMiddleware:
+    """Pin a user's reads to the primary for a moment after they write.
+
+    Keyed on the bearer token's user, so it works for clients that drop
+    cookies. Plain ASGI, so response bodies (file streams included) pass
+    through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in ("GET", "HEAD", "OPTIONS")
+            or not models.replica_session_factories
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+        user_id = models.token_subject(authorization)
+
+        async def send_marked(message: Message) -> None:
+            # Record the write before the client can see the response and read again
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await models.mark_write(user_id)
+            await send(message)
+
+        await self.app(scope, receive, send_marked if user_id is not None else send)
+
 
 app = FastAPI(lifespan=lifespan)
 
+settings = get_settings()
+
 # Mount static files for uploaded images
-uploads_dir = Path("uploads")
+uploads_dir = Path(settings.UPLOAD_DIR)
 uploads_dir.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", UploadStaticFiles(directory=uploads_dir), name="uploads")
 
 # Include API routes
 app.include_router(routers.router)
-
-settings = get_settings()
+app.add_middleware(ReadYourWritesMiddleware)
 
 
 @app.get("/")
@@ -0,0 +1,7 @@
+"""Versioned schema migrations
+
+Each module in versions/ is one revision: a `revision` id, a `description`,
+an async `upgrade(conn)` and optionally `transactional = False` for DDL
+that cannot run in a transaction. Migrations run once per deploy through
+`python -m unisphere.migrations upgrade`; workers only verify the version.
+"""
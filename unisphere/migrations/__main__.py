@@ -0,0 +1,45 @@
+"""Command line for the migration runner
+
+    python -m unisphere.migrations upgrade        # apply pending revisions
+    python -m unisphere.migrations current        # list applied revisions
+    python -m unisphere.migrations stamp <rev>    # mark revisions as applied
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import unisphere.models as models
+from unisphere.migrations.runner import applied_revisions, head, stamp, upgrade
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m unisphere.migrations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("upgrade", help="apply pending revisions")
+    commands.add_parser("current", help="list applied revisions")
+    stamp_parser = commands.add_parser("stamp", help="mark revisions up to one as applied")
+    stamp_parser.add_argument("revision")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    url = models.settings.DATABASE_URL
+    engine = create_async_engine(url, **models.engine_options(url))
+    try:
+        if args.command == "upgrade":
+            applied = await upgrade(engine)
+            print(f"Applied {', '.join(applied)}" if applied else "Already at head")
+        elif args.command == "current":
+            async with engine.connect() as conn:
+                applied = await applied_revisions(conn)
+            print(", ".join(sorted(applied)) if applied else "No migrations applied")
+            print(f"Head is {head()}")
+        else:
+            await stamp(engine, args.revision)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
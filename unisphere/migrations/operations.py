@@ -0,0 +1,73 @@
+"""Schema operations shared by the revisions
+
+Revisions that reach back before this subsystem existed meet databases in
+whatever state create_all and the old one-off scripts left them, so these
+helpers check before they change anything.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def has_table(conn: AsyncConnection, table: str) -> bool:
+    return await conn.run_sync(lambda c: inspect(c).has_table(table))
+
+
+async def has_column(conn: AsyncConnection, table: str, column: str) -> bool:
+    columns = await conn.run_sync(lambda c: inspect(c).get_columns(table))
+    return any(c["name"] == column for c in columns)
+
+
+async def has_unique(conn: AsyncConnection, table: str, name: str) -> bool:
+    """Whether a unique constraint or unique index with this name exists"""
+    def check(c) -> bool:
+        inspector = inspect(c)
+        return (
+            any(u["name"] == name for u in inspector.get_unique_constraints(table))
+            or any(i["name"] == name for i in inspector.get_indexes(table))
+        )
+    return await conn.run_sync(check)
+
+
+async def add_column(conn: AsyncConnection, table: str, column: str, ddl: str) -> None:
+    """ALTER TABLE ... ADD COLUMN unless the column is already there"""
+    if not await has_column(conn, table, column):
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+async def create_index(
+    conn: AsyncConnection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    where: Optional[str] = None,
+) -> None:
+    """Create an index without blocking writes to the table
+
+    On PostgreSQL this is CREATE INDEX CONCURRENTLY, so the revision must
+    be marked non-transactional. A concurrent build that failed half way
+    leaves an INVALID index behind, which is dropped and rebuilt here.
+    """
+    concurrently = ""
+    if conn.dialect.name == "postgresql":
+        concurrently = "CONCURRENTLY "
+        result = await conn.execute(text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name"), {"name": name})
+        valid = result.scalar()
+        if valid is False:
+            await drop_index(conn, name)
+    sql = (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX {concurrently}IF NOT EXISTS {name} "
+        f"ON {table} ({', '.join(columns)})"
+    )
+    if where:
+        sql += f" WHERE {where}"
+    await conn.execute(text(sql))
+
+
+async def drop_index(conn: AsyncConnection, name: str) -> None:
+    concurrently = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    await conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {name}"))
@@ -0,0 +1,177 @@
+import importlib
+import logging
+import pkgutil
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel import SQLModel
+
+from unisphere.migrations import versions
+
+logger = logging.getLogger(__name__)
+
+# Any constant works as long as every runner uses the same one ("unis")
+MIGRATION_LOCK_KEY = 0x756E6973
+
+# Kept out of SQLModel.metadata so create_all never creates or drops it
+version_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    version_metadata,
+    Column("revision", String(32), primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class SchemaVersionError(RuntimeError):
+    """The database has not been migrated to the revision this code expects"""
+
+
+@dataclass(frozen=True)
+class Revision:
+    revision: str
+    description: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    transactional: bool = True
+
+
+def load_revisions() -> List[Revision]:
+    """Revisions from unisphere/migrations/versions, in revision order"""
+    revisions = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        revisions.append(Revision(
+            revision=module.revision,
+            description=module.description,
+            upgrade=module.upgrade,
+            transactional=getattr(module, "transactional", True),
+        ))
+    revisions.sort(key=lambda r: r.revision)
+    names = [r.revision for r in revisions]
+    if len(set(names)) != len(names):
+        raise RuntimeError(f"Duplicate migration revisions: {names}")
+    return revisions
+
+
+def head() -> str:
+    return load_revisions()[-1].revision
+
+
+async def applied_revisions(conn: AsyncConnection) -> Optional[set[str]]:
+    """Revisions recorded in the database, or None before the first migration"""
+    has_table = await conn.run_sync(lambda c: inspect(c).has_table(schema_migrations.name))
+    if not has_table:
+        return None
+    result = await conn.execute(select(schema_migrations.c.revision))
+    return set(result.scalars().all())
+
+
+async def verify(engine: AsyncEngine) -> None:
+    """Check that every known revision has been applied
+
+    Costs the same two catalog/table reads however large the schema grows.
+
+    Revisions the code does not know about are tolerated, so workers still
+    running the previous release keep booting during a rolling deploy.
+    """
+    expected = {r.revision for r in load_revisions()}
+    async with engine.connect() as conn:
+        applied = await applied_revisions(conn)
+    missing = sorted(expected - (applied or set()))
+    if missing:
+        raise SchemaVersionError(
+            f"Database is missing migrations {', '.join(missing)}; "
+            "run `python -m unisphere.migrations upgrade`")
+    unknown = sorted((applied or set()) - expected)
+    if unknown:
+        logger.warning("Database has migrations this release does not know: %s", ", ".join(unknown))
+
+
+async def _record(conn: AsyncConnection, revision: Revision) -> None:
+    await conn.execute(schema_migrations.insert().values(
+        revision=revision.revision, description=revision.description, applied_at=datetime.utcnow()))
+
+
+async def _is_empty_besides_versions(conn: AsyncConnection) -> bool:
+    tables = await conn.run_sync(lambda c: inspect(c).get_table_names())
+    return set(tables) <= {schema_migrations.name}
+
+
+class _MigrationLock:
+    """Session-level advisory lock so only one process migrates at a time
+
+    Held on its own autocommit connection, because the migrations themselves
+    switch between transactional and autocommit connections. Backends
+    without advisory locks (SQLite in development and tests) are assumed to
+    have a single runner.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+        self.conn: Optional[AsyncConnection] = None
+
+    async def __aenter__(self):
+        if self.engine.dialect.name == "postgresql":
+            self.conn = await self.engine.connect()
+            await self.conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.conn is not None:
+            try:
+                await self.conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            finally:
+                await self.conn.close()
+
+
+async def upgrade(engine: AsyncEngine) -> List[str]:
+    """Apply pending revisions under the migration lock; returns those applied
+
+    An empty database is built straight from the models and stamped with
+    every revision, so a fresh install does not replay history. The models
+    must already be imported (importing unisphere.models does that).
+    """
+    revisions = load_revisions()
+    autocommit = engine.execution_options(isolation_level="AUTOCOMMIT")
+    async with _MigrationLock(engine):
+        # Read after taking the lock: another runner may have just finished
+        async with engine.begin() as conn:
+            await conn.run_sync(version_metadata.create_all)
+            applied = await applied_revisions(conn) or set()
+            if not applied and await _is_empty_besides_versions(conn):
+                await conn.run_sync(SQLModel.metadata.create_all)
+                for revision in revisions:
+                    await _record(conn, revision)
+                logger.info("Created schema at revision %s", revisions[-1].revision)
+                return [r.revision for r in revisions]
+
+        done = []
+        for revision in revisions:
+            if revision.revision in applied:
+                continue
+            logger.info("Applying migration %s: %s", revision.revision, revision.description)
+            async with (engine if revision.transactional else autocommit).begin() as conn:
+                await revision.upgrade(conn)
+                await _record(conn, revision)
+            done.append(revision.revision)
+        return done
+
+
+async def stamp(engine: AsyncEngine, target: str) -> None:
+    """Record revisions up to target as applied without running them"""
+    revisions = load_revisions()
+    if target not in {r.revision for r in revisions}:
+        raise ValueError(f"Unknown revision {target}")
+    async with _MigrationLock(engine), engine.begin() as conn:
+        await conn.run_sync(version_metadata.create_all)
+        applied = await applied_revisions(conn) or set()
+        for revision in revisions:
+            if revision.revision > target:
+                break
+            if revision.revision not in applied:
+                await _record(conn, revision)
@@ -0,0 +1,15 @@
+"""Baseline: every table the models declare
+
+Databases created before versioned migrations were built by create_all at
+startup and may predate some tables (announcements, stored_files). Missing
+tables are created here; existing ones are left for the revisions below.
+"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import SQLModel
+
+revision = "0001"
+description = "baseline schema"
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    await conn.run_sync(SQLModel.metadata.create_all)
@@ -0,0 +1,23 @@
+"""Event capacity columns, backfilled from the registrations
+
+Replaces update_event_schema.py and migrate_event_capacity.py.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from unisphere.migrations.operations import add_column
+
+revision = "0002"
+description = "events.max_capacity and events.registration_count"
+
+RECOUNT_REGISTRATIONS = text("""
+    UPDATE events SET registration_count = (
+        SELECT COUNT(*) FROM event_registrations WHERE event_registrations.event_id = events.id
+    )
+""")
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    await add_column(conn, "events", "max_capacity", "INTEGER NULL")
+    await add_column(conn, "events", "registration_count", "INTEGER NOT NULL DEFAULT 0")
+    await conn.execute(RECOUNT_REGISTRATIONS)
@@ -0,0 +1,11 @@
+"""users.token_version, bumped to revoke every token a user holds"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from unisphere.migrations.operations import add_column
+
+revision = "0003"
+description = "users.token_version"
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    await add_column(conn, "users", "token_version", "INTEGER NOT NULL DEFAULT 0")
@@ -0,0 +1,37 @@
+"""One registration per (event, user)
+
+Duplicates left by the old check-then-insert registration are removed,
+keeping the earliest, and the counters are recounted before the unique
+index is built. Each statement commits on its own, so a duplicate that
+slips in meanwhile fails the build and a rerun picks it up.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from unisphere.migrations.operations import create_index, has_unique
+from unisphere.migrations.versions.v0002_event_capacity import RECOUNT_REGISTRATIONS
+
+revision = "0004"
+description = "unique (event_id, user_id) on event_registrations"
+transactional = False
+
+NAME = "uq_event_registrations_event_user"
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    if not await has_unique(conn, "event_registrations", NAME):
+        await conn.execute(text("""
+            DELETE FROM event_registrations WHERE id NOT IN (
+                SELECT MIN(id) FROM event_registrations GROUP BY event_id, user_id
+            )
+        """))
+        await conn.execute(RECOUNT_REGISTRATIONS)
+        await create_index(conn, NAME, "event_registrations", ["event_id", "user_id"], unique=True)
+
+    if conn.dialect.name == "postgresql":
+        constraints = await conn.run_sync(
+            lambda c: inspect(c).get_unique_constraints("event_registrations"))
+        if not any(u["name"] == NAME for u in constraints):
+            # Promotes the index to the constraint the model declares, without a rebuild
+            await conn.execute(text(
+                f"ALTER TABLE event_registrations ADD CONSTRAINT {NAME} UNIQUE USING INDEX {NAME}"))
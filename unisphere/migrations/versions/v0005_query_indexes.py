@@ -0,0 +1,44 @@
+"""Composite and partial indexes for the service queries
+
+Built concurrently so the tables stay writable. The single-column indexes
+from create_announcements_table.py and user_places.user_id are covered by
+the composites and dropped.
+"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from unisphere.migrations.operations import create_index, drop_index
+
+revision = "0005"
+description = "composite and partial query indexes"
+transactional = False
+
+INDEXES = [
+    ("ix_events_date_id", "events", ["date", "id"], None),
+    ("ix_events_category_date_id", "events", ["category", "date", "id"], None),
+    ("ix_events_upcoming_date_id", "events", ["date", "id"], "status = 'upcoming'"),
+    ("ix_announcements_date_id", "announcements", ["date", "id"], None),
+    ("ix_announcements_category_date_id", "announcements", ["category", "date", "id"], None),
+    ("ix_announcements_high_priority_date_id", "announcements", ["date", "id"], "priority = 'high'"),
+    ("ix_user_places_user_updated_id", "user_places", ["user_id", "updated_at", "id"], None),
+    ("ix_user_enrolls_user_section", "user_enrolls", ["user_id", "section_id"], None),
+    ("ix_user_enrolls_section_id", "user_enrolls", ["section_id"], None),
+    ("ix_section_schedules_section_id", "section_schedules", ["section_id"], None),
+    ("ix_section_rrules_section_id", "section_rrules", ["section_id"], None),
+    ("ix_sections_course_id", "sections", ["course_id"], None),
+    ("ix_section_instructors_section_id", "section_instructors", ["section_id"], None),
+    ("ix_courses_semester_id", "courses", ["semester_id"], None),
+]
+
+SUPERSEDED = [
+    "idx_announcements_category",
+    "idx_announcements_priority",
+    "idx_announcements_date",
+    "ix_user_places_user_id",
+]
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for name, table, columns, where in INDEXES:
+        await create_index(conn, name, table, columns, where=where)
+    for name in SUPERSEDED:
+        await drop_index(conn, name)
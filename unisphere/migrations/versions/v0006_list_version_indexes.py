@@ -0,0 +1,23 @@
+"""Indexes behind the version keys of the event and announcement feeds
+
+The conditional GET on both listings reads count(*) and max(updated_at)
+on every poll; these keep that read off the table itself.
+"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from unisphere.migrations.operations import create_index
+
+revision = "0006"
+description = "indexes for listing version keys"
+transactional = False
+
+INDEXES = [
+    ("ix_events_updated_at", "events", ["updated_at"]),
+    ("ix_announcements_updated_at_created_by", "announcements", ["updated_at", "created_by"]),
+    ("ix_event_registrations_user_id", "event_registrations", ["user_id", "id"]),
+]
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for name, table, columns in INDEXES:
+        await create_index(conn, name, table, columns)
@@ -0,0 +1,17 @@
+"""Materialized section occurrences
+
+The table starts empty; fill it for existing semesters with
+POST /v1/semesters/{semester_id}/occurrences/refresh.
+"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from unisphere.migrations.operations import has_table
+from unisphere.models.schedule_model import SectionOccurrenceModel
+
+revision = "0007"
+description = "section_occurrences table"
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    if not await has_table(conn, SectionOccurrenceModel.__tablename__):
+        await conn.run_sync(lambda c: SectionOccurrenceModel.__table__.create(c))
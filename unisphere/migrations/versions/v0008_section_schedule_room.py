@@ -0,0 +1,13 @@
+"""section_schedules.room, for room double-booking checks"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from unisphere.migrations.operations import add_column, create_index
+
+revision = "0008"
+description = "section_schedules.room"
+transactional = False
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    await add_column(conn, "section_schedules", "room", "VARCHAR(50)")
+    await create_index(conn, "ix_section_schedules_room_day", "section_schedules", ["room", "day_id"])
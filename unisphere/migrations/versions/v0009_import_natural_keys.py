@@ -0,0 +1,52 @@
+"""Unique natural keys for the bulk import upserts
+
+Enrollments and instructor assignments are deduplicated, keeping the
+earliest row. Duplicate section codes within a course are not merged,
+since rows elsewhere point at both; the revision stops and names them so
+they can be fixed by hand. Each unique index supersedes the plain index
+on its leading columns, which is dropped.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from unisphere.migrations.operations import create_index, drop_index, has_unique
+
+revision = "0009"
+description = "unique natural keys on sections, user_enrolls and section_instructors"
+transactional = False
+
+# (table, constraint, columns, superseded index, primary key to keep on duplicates)
+KEYS = [
+    ("sections", "uq_sections_course_section_code", ["course_id", "section_code"],
+     "ix_sections_course_id", None),
+    ("user_enrolls", "uq_user_enrolls_user_section", ["user_id", "section_id"],
+     "ix_user_enrolls_user_section", "enroll_id"),
+    ("section_instructors", "uq_section_instructors_section_user", ["section_id", "user_id"],
+     "ix_section_instructors_section_id", "enroll_id"),
+]
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    for table, name, columns, superseded, primary_key in KEYS:
+        key = ", ".join(columns)
+        if not await has_unique(conn, table, name):
+            if primary_key:
+                await conn.execute(text(f"""
+                    DELETE FROM {table} WHERE {primary_key} NOT IN (
+                        SELECT MIN({primary_key}) FROM {table} GROUP BY {key}
+                    )
+                """))
+            else:
+                duplicates = (await conn.execute(text(
+                    f"SELECT {key} FROM {table} GROUP BY {key} HAVING COUNT(*) > 1"))).all()
+                if duplicates:
+                    raise RuntimeError(
+                        f"{table} has duplicate ({key}): {[tuple(row) for row in duplicates[:20]]}")
+            await create_index(conn, name, table, columns, unique=True)
+
+        if conn.dialect.name == "postgresql":
+            constraints = await conn.run_sync(lambda c, t=table: inspect(c).get_unique_constraints(t))
+            if not any(u["name"] == name for u in constraints):
+                await conn.execute(text(
+                    f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}"))
+        await drop_index(conn, superseded)
@@ -0,0 +1,17 @@
+"""Per-owner references to content-addressed uploads
+
+References counted before this revision have no owner, so nobody can
+release them and their files stay until removed by hand.
+"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from unisphere.migrations.operations import has_table
+from unisphere.models.stored_file_model import StoredFileRef
+
+revision = "0010"
+description = "stored_file_refs table"
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    if not await has_table(conn, StoredFileRef.__tablename__):
+        await conn.run_sync(lambda c: StoredFileRef.__table__.create(c))
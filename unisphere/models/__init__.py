@@ -1,12 +1,19 @@
-from typing import AsyncIterator
+import itertools
+import logging
+from typing import Any, AsyncIterator, Optional
 
+import jwt
 import redis.asyncio as redis
+from fastapi import Depends, Request
+from sqlalchemy import make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (AsyncEngine, async_sessionmaker,
                                     create_async_engine)
-from sqlmodel import SQLModel, select, text
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from unisphere.core.config import get_settings
+from unisphere.core.db_metrics import InstrumentedAsyncQueuePool, pool_metrics
+from unisphere.migrations import runner as migrations
 from unisphere.models.announcement_model import Announcement  # noqa: F401
 from unisphere.models.event_model import Event, EventRegistration  # noqa: F401
 from unisphere.models.greeting_model import Greeting  # noqa: F401
@@ -24,57 +31,194 @@ from .schedule_model import *
 from .section_instructor import *
 from .section_model import *
 from .semester_model import *
+from .stored_file_model import *
 from .user_enroll_model import *
 from .user_model import *
 from .user_place_model import *
 
+logger = logging.getLogger(__name__)
+
 engine: AsyncEngine | None = None
+session_factory: async_sessionmaker[AsyncSession] | None = None
+replica_engines: list[AsyncEngine] = []
+replica_session_factories: list[async_sessionmaker[AsyncSession]] = []
+_replica_cursor = itertools.count()
 redis_client: redis.Redis | None = None
 settings = get_settings()
 
+# Set for a user after a successful write; while present, their reads stay on the primary
+READ_PRIMARY_KEY = "read_primary:user:{}"
+
+
+def engine_options(database_url: str) -> dict[str, Any]:
+    """Pool and driver options for create_async_engine, from settings."""
+    url = make_url(database_url)
+    options: dict[str, Any] = {
+        "echo": False,
+        "future": True,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if url.get_backend_name() == "sqlite":
+        # SQLite picks its own pool (StaticPool for :memory:)
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    if url.get_driver_name() == "asyncpg":
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+            }
+        options["connect_args"] = connect_args
+    return options
+
 
 async def init_db():
-    """Initialize the database engine and create tables."""
-    global engine  # noqa: PLW0603,RUF100
+    """Initialize the database engine and session factory, and check the schema."""
+    global engine, session_factory  # noqa: PLW0603,RUF100
 
     # Use configured DATABASE_URL; must be an async driver URL (e.g., sqlite+aiosqlite, postgresql+asyncpg)
     engine = create_async_engine(
-        settings.DATABASE_URL,
-        echo=False,
-        future=True,
+        settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+    pool_metrics.attach(engine)
+    # Built once per process; creating a sessionmaker per request is wasted work
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
     )
-    await create_db_and_tables()
+    for url in settings.database_replica_urls:
+        replica_engine = create_async_engine(url, **engine_options(url))
+        replica_engines.append(replica_engine)
+        replica_session_factories.append(async_sessionmaker(
+            bind=replica_engine, class_=AsyncSession, expire_on_commit=False
+        ))
+    await check_schema()
 
-async def create_db_and_tables():
-    """Create database tables."""
+
+async def check_schema():
+    """Verify the schema version, or migrate when DB_MIGRATE_ON_STARTUP is set.
+
+    Migrations normally run once per deploy (`python -m unisphere.migrations
+    upgrade`), so workers only read the version table instead of racing each
+    other on DDL.
+    """
     if engine is None:
         raise RuntimeError("Database engine is not initialized. Call init_db() first.")
 
-    async with engine.begin() as conn:
-        # await conn.run_sync(SQLModel.metadata.drop_all)
-        # for table in reversed(SQLModel.metadata.sorted_tables):
-        #     await conn.execute(text(f'DROP TABLE IF EXISTS "{table.name}" CASCADE'))
-        await conn.run_sync(SQLModel.metadata.create_all)
+    if settings.DB_MIGRATE_ON_STARTUP:
+        await migrations.upgrade(engine)
+    else:
+        await migrations.verify(engine)
 
 
 async def get_session() -> AsyncIterator[AsyncSession]:
     """Get async database session."""
-    if engine is None:
+    if session_factory is None:
         raise RuntimeError("Database engine is not initialized. Call init_db() first.")
 
-    async_session = async_sessionmaker(
-        bind=engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session() as session:
+    async with session_factory() as session:
+        yield session
+
+
+async def get_read_session(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> AsyncIterator[AsyncSession]:
+    """Get async session for read-only queries.
+
+    Replicas are tried round-robin. The primary session is used instead for
+    requests that write, for users that wrote recently (read-your-writes),
+    and when no replica accepts a connection.
+    """
+    if (
+        not replica_session_factories
+        or request.method not in ("GET", "HEAD")
+        or await wrote_recently(token_subject(request.headers.get("authorization")))
+    ):
         yield session
+        return
+
+    for _ in range(len(replica_session_factories)):
+        index = next(_replica_cursor) % len(replica_session_factories)
+        async with replica_session_factories[index]() as replica_session:
+            try:
+                await replica_session.connection()
+            except DBAPIError:
+                logger.warning("Read replica %d unavailable, trying the next one", index)
+                continue
+            yield replica_session
+            return
+
+    yield session
+
+
+def token_subject(authorization: Optional[str]) -> Optional[str]:
+    """User id of a bearer token, or None.
+
+    Only used to route reads; the routes still authorize the token themselves.
+    Reads the key the way the auth service does, so both always agree.
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    auth_settings = get_settings()
+    try:
+        payload = jwt.decode(token, auth_settings.JWT_SECRET_KEY, algorithms=[auth_settings.JWT_ALGORITHM])
+    except jwt.PyJWTError:
+        return None
+    return payload.get("sub")
+
+
+async def mark_write(user_id: Optional[str]) -> None:
+    """Keep the user's reads on the primary for REPLICA_READ_YOUR_WRITES_SECONDS."""
+    if user_id is None:
+        return
+    async for client in get_redis():
+        try:
+            await client.set(READ_PRIMARY_KEY.format(user_id), 1,
+                             ex=settings.REPLICA_READ_YOUR_WRITES_SECONDS)
+        except redis.RedisError:
+            logger.warning("Could not record a write for user %s; reads may lag", user_id)
+
+
+async def wrote_recently(user_id: Optional[str]) -> bool:
+    """Whether the user wrote within REPLICA_READ_YOUR_WRITES_SECONDS.
+
+    Without Redis the answer is yes, so reads fall back to the primary.
+    """
+    if user_id is None:
+        return False
+    async for client in get_redis():
+        try:
+            return bool(await client.exists(READ_PRIMARY_KEY.format(user_id)))
+        except redis.RedisError:
+            logger.warning("Could not check recent writes for user %s; reading the primary", user_id)
+    return True
+
+
+def is_replica(session: AsyncSession) -> bool:
+    """Whether get_read_session handed out a replica session, which may lag the primary"""
+    return session.bind in replica_engines
 
 
 async def close_db():
     """Close database connection."""
-    global engine  # noqa: PLW0603,RUF100
+    global engine, session_factory  # noqa: PLW0603,RUF100
     if engine is not None:
         await engine.dispose()
         engine = None
+        session_factory = None
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
+    replica_engines.clear()
+    replica_session_factories.clear()
 
 
 async def get_redis() -> AsyncIterator[redis.Redis]:
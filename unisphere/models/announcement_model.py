@@ -1,11 +1,14 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
     from unisphere.models.user_model import User
 
+ANNOUNCEMENT_PRIORITIES = ("low", "medium", "high")
+
 # Announcement Models
 
 
@@ -19,6 +22,17 @@ class AnnouncementBase(SQLModel):
 
 class Announcement(AnnouncementBase, table=True):
     __tablename__ = "announcements"
+    __table_args__ = (
+        # Keyset pagination of the announcement feed, unfiltered and by category
+        Index("ix_announcements_date_id", "date", "id"),
+        Index("ix_announcements_category_date_id", "category", "date", "id"),
+        # High priority announcements are pinned on the home screen
+        Index("ix_announcements_high_priority_date_id", "date", "id",
+              postgresql_where=text("priority = 'high'"),
+              sqlite_where=text("priority = 'high'")),
+        # Version key of the feed for conditional GET, creators included
+        Index("ix_announcements_updated_at_created_by", "updated_at", "created_by"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     created_by: int = Field(foreign_key="users.id")
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -14,6 +15,9 @@ class CourseBaseModel(SQLModel):
 
 class CourseModel(CourseBaseModel, table=True):
     __tablename__ = "courses"
+    __table_args__ = (
+        Index("ix_courses_semester_id", "semester_id"),
+    )
     course_id: Optional[int] = Field(default=None, primary_key=True)
 
 
@@ -1,12 +1,16 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
+from sqlalchemy import Index, UniqueConstraint, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
     from unisphere.models.user_model import User
 
 
+EVENT_STATUSES = ("upcoming", "ongoing", "completed")
+
+
 # Event Models
 class EventBase(SQLModel):
     title: str = Field(min_length=1, max_length=255)
@@ -25,6 +29,17 @@ class EventBase(SQLModel):
 
 class Event(EventBase, table=True):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination of the event feed, unfiltered and by category
+        Index("ix_events_date_id", "date", "id"),
+        Index("ix_events_category_date_id", "category", "date", "id"),
+        # The default feed only shows upcoming events
+        Index("ix_events_upcoming_date_id", "date", "id",
+              postgresql_where=text("status = 'upcoming'"),
+              sqlite_where=text("status = 'upcoming'")),
+        # Version key of the feed for conditional GET
+        Index("ix_events_updated_at", "updated_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     created_by: int = Field(foreign_key="users.id")
@@ -44,6 +59,12 @@ class EventRegistrationBase(SQLModel):
 
 class EventRegistration(EventRegistrationBase, table=True):
     __tablename__ = "event_registrations"
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id",
+                         name="uq_event_registrations_event_user"),
+        # A user's own registrations, for the feed's version key
+        Index("ix_event_registrations_user_id", "user_id", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     event_id: int = Field(foreign_key="events.id")
@@ -1,6 +1,7 @@
-from datetime import time
+from datetime import datetime, time
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -10,10 +11,16 @@ class SectionScheduleBaseModel(SQLModel):
     start_time: time
     end_time: time
     note: Optional[str] = None
+    room: Optional[str] = Field(default=None, max_length=50)
 
 
 class SectionScheduleModel(SectionScheduleBaseModel, table=True):
     __tablename__ = 'section_schedules'
+    __table_args__ = (
+        Index("ix_section_schedules_section_id", "section_id"),
+        # Room double-booking checks
+        Index("ix_section_schedules_room_day", "room", "day_id"),
+    )
     schedule_id: Optional[int] = Field(default=None, primary_key=True)
 
 
@@ -24,4 +31,23 @@ class SectionRRuleBaseModel(SQLModel):
 
 class SectionRRuleModel(SectionRRuleBaseModel, table=True):
     __tablename__ = 'section_rrules'
+    __table_args__ = (
+        Index("ix_section_rrules_section_id", "section_id"),
+    )
     rrule_id: Optional[int] = Field(default=None, primary_key=True)
+
+
+class SectionOccurrenceModel(SQLModel, table=True):
+    """A dated meeting of a section, expanded from one schedule slot or RRULE"""
+    __tablename__ = 'section_occurrences'
+    __table_args__ = (
+        # Timetables read a section's meetings inside a date window
+        Index("ix_section_occurrences_section_starts", "section_id", "starts_at"),
+    )
+    occurrence_id: Optional[int] = Field(default=None, primary_key=True)
+    section_id: int = Field(foreign_key="sections.section_id")
+    # Exactly one source is set
+    schedule_id: Optional[int] = Field(default=None, foreign_key="section_schedules.schedule_id")
+    rrule_id: Optional[int] = Field(default=None, foreign_key="section_rrules.rrule_id")
+    starts_at: datetime
+    ends_at: datetime
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, SQLModel
 
 
@@ -13,4 +14,8 @@ class SectionInstructorBaseModel(SQLModel):
 
 class SectionInstructorModel(SectionInstructorBaseModel, table=True):
     __tablename__ = 'section_instructors'
+    __table_args__ = (
+        # A section's instructors
+        UniqueConstraint("section_id", "user_id", name="uq_section_instructors_section_user"),
+    )
     enroll_id: Optional[int] = Field(default=None, primary_key=True)
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, SQLModel
 
 
@@ -14,4 +15,8 @@ class SectionBaseModel(SQLModel):
 
 class SectionModel(SectionBaseModel, table=True):
     __tablename__ = "sections"
+    __table_args__ = (
+        # Natural key for imports; also serves a course's sections
+        UniqueConstraint("course_id", "section_code", name="uq_sections_course_section_code"),
+    )
     section_id: Optional[int] = Field(default=None, primary_key=True)
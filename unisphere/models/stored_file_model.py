@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class StoredFile(SQLModel, table=True):
+    """A content-addressed upload and how many uploads point at it."""
+
+    __tablename__ = "stored_files"
+
+    # sha256 hex digest of the file content
+    digest: str = Field(primary_key=True, max_length=64)
+    # Relative path served under /uploads, e.g. uploads/images/ab/cd/<digest>.png
+    path: str = Field(max_length=500, unique=True)
+    size: int
+    # Rows in stored_file_refs, plus any references counted before owners were recorded
+    ref_count: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class StoredFileRef(SQLModel, table=True):
+    """One user's reference to a content-addressed upload.
+
+    Only the owner can release it, so nobody can drive another user's file
+    to zero references.
+    """
+
+    __tablename__ = "stored_file_refs"
+    __table_args__ = (
+        UniqueConstraint("digest", "owner_id", name="uq_stored_file_refs_digest_owner"),
+    )
+
+    ref_id: Optional[int] = Field(default=None, primary_key=True)
+    digest: str = Field(foreign_key="stored_files.digest", max_length=64)
+    owner_id: int = Field(foreign_key="users.id", index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field, SQLModel
 
 
@@ -13,4 +14,9 @@ class UserEnrollBaseModel(SQLModel):
 
 class UserEnrollModel(UserEnrollBaseModel, table=True):
     __tablename__ = 'user_enrolls'
+    __table_args__ = (
+        # A student's timetable, and a section's roster
+        UniqueConstraint("user_id", "section_id", name="uq_user_enrolls_user_section"),
+        Index("ix_user_enrolls_section_id", "section_id"),
+    )
     enroll_id: Optional[int] = Field(default=None, primary_key=True)
@@ -35,6 +35,8 @@ class User(UserBase, table=True):
     id: int = Field(default=None, primary_key=True)
     password_hash: str = Field(max_length=255)
     is_active: bool = Field(default=True)
+    # Bumped to revoke every token issued so far
+    token_version: int = Field(default=0)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, SQLModel
 
 
@@ -9,11 +9,15 @@ class UserPlace(SQLModel, table=True):
     """A place saved by a specific user into their collection (คลัง)."""
 
     __tablename__ = "user_places"
+    __table_args__ = (
+        # Keyset pagination of a user's collection
+        Index("ix_user_places_user_updated_id", "user_id", "updated_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
 
-    # Owner
-    user_id: int = Field(foreign_key="users.id", index=True)
+    # Owner; indexed by ix_user_places_user_updated_id
+    user_id: int = Field(foreign_key="users.id")
 
     # Place core
     name: str = Field(max_length=255)
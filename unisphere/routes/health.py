@@ -3,6 +3,9 @@ from sqlalchemy import text
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from unisphere import models
+from unisphere.core.db_metrics import pool_metrics
+from unisphere.core.password_hasher import password_hasher
+from unisphere.services.catalog_cache import catalog_cache
 
 router = APIRouter(prefix="/health")
 
@@ -23,3 +26,33 @@ async def health_check(
         raise HTTPException(
             status_code=500, detail=f"Health check failed: {str(e)}") from e
     return {"status": "ok", "message": "Application is healthy"}
+
+
+@router.get(
+    "/db-pool",
+    summary="Database pool metrics",
+    description="Connection pool occupancy, checkout counts and checkout wait times for this worker.",
+)
+async def db_pool_metrics() -> dict:
+    if models.engine is None:
+        raise HTTPException(
+            status_code=503, detail="Database engine is not initialized")
+    return pool_metrics.snapshot(models.engine)
+
+
+@router.get(
+    "/password-hashing",
+    summary="Password hashing metrics",
+    description="bcrypt pool queue depth, active hashes and completed hashes for this worker.",
+)
+async def password_hashing_metrics() -> dict:
+    return password_hasher.metrics()
+
+
+@router.get(
+    "/cache",
+    summary="Catalog cache metrics",
+    description="Hits per tier, misses and invalidations of the catalog cache for this worker.",
+)
+async def catalog_cache_metrics() -> dict:
+    return catalog_cache.snapshot()
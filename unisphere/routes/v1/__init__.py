@@ -9,6 +9,8 @@ from . import (
     event_router,
     faculty_router,
     greeting_router,
+    import_router,
+    me_router,
     schedule_router,
     section_router,
     semester_router,
@@ -33,3 +35,5 @@ router.include_router(faculty_router.router)
 router.include_router(day_of_week_router.router)
 router.include_router(section_router.router)
 router.include_router(schedule_router.router)
+router.include_router(me_router.router)
+router.include_router(import_router.router)
@@ -1,39 +1,67 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (APIRouter, Depends, HTTPException, Query, Request,
+                     Response, status)
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from unisphere.models import get_session
-from unisphere.routes.v1.auth_router import get_current_user
+from unisphere.core.conditional import (etag_matches, not_modified,
+                                        set_validators)
+from unisphere.models import get_read_session, get_session
+from unisphere.routes.v1.auth_router import (get_current_principal,
+                                             get_current_user)
 from unisphere.schemas.announcement_schema import (
     AnnouncementCreate,
     AnnouncementResponse,
     AnnouncementUpdate,
 )
+from unisphere.schemas.user_schema import Principal
 from unisphere.schemas.user_schema import User as SchemaUser
 from unisphere.services.announcement_service import AnnouncementService
 
 router = APIRouter(prefix="/announcements", tags=["announcements"])
 
 
-def get_announcement_service(session: AsyncSession = Depends(get_session)) -> AnnouncementService:
-    return AnnouncementService(session)
+def get_announcement_service(
+    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session)
+) -> AnnouncementService:
+    return AnnouncementService(session, read_session)
 
 
 @router.get("", response_model=List[AnnouncementResponse])
 async def get_announcements(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     category: Optional[str] = None,
     priority: Optional[str] = None,
-    current_user: SchemaUser = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; skip is ignored"),
+    current_user: Principal = Depends(get_current_principal),
     announcement_service: AnnouncementService = Depends(
         get_announcement_service)
 ):
-    """Get all announcements (public access for logged in users)"""
-    announcements_with_creators = await announcement_service.get_announcements_with_creators(
-        skip, limit, category, priority
-    )
+    """Get all announcements (public access for logged in users)
+
+    Answers If-None-Match with 304 from the listing's version key alone.
+    """
+    version = await announcement_service.get_announcements_version(category, priority)
+    etag = version.etag(skip, limit, category, priority, cursor)
+    if etag_matches(request.headers, etag):
+        return not_modified(etag, version.last_modified)
+
+    try:
+        announcements_with_creators, next_cursor = await announcement_service.get_announcements_with_creators(
+            skip, limit, category, priority, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    set_validators(response, etag, version.last_modified)
 
     result = []
     for announcement, creator in announcements_with_creators:
@@ -72,7 +100,7 @@ async def create_announcement(
 @router.get("/{announcement_id}", response_model=AnnouncementResponse)
 async def get_announcement(
     announcement_id: int,
-    current_user: SchemaUser = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     announcement_service: AnnouncementService = Depends(
         get_announcement_service)
 ):
@@ -150,7 +178,7 @@ async def delete_announcement(
 async def get_announcements_by_category(
     category: str,
     limit: int = Query(50, ge=1, le=100),
-    current_user: SchemaUser = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     announcement_service: AnnouncementService = Depends(
         get_announcement_service)
 ):
@@ -178,7 +206,7 @@ async def get_announcements_by_category(
 @router.get("/priority/high", response_model=List[AnnouncementResponse])
 async def get_high_priority_announcements(
     limit: int = Query(10, ge=1, le=50),
-    current_user: SchemaUser = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     announcement_service: AnnouncementService = Depends(
         get_announcement_service)
 ):
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -6,6 +8,10 @@ from unisphere.core.config import get_settings
 from unisphere.models import get_session
 from unisphere.schemas.user_schema import User as SchemaUser
 from unisphere.schemas.user_schema import (
+    LogoutRequest,
+    Principal,
+    RefreshTokenRequest,
+    Token,
     UserCreate,
     UserLogin,
     UserRegister,
@@ -15,53 +21,111 @@ from unisphere.schemas.user_schema import (
 from unisphere.services.auth_service.AuthServiceInterface import AuthServiceInterface
 from unisphere.services.auth_service.DBAuthService import DBAuthService
 from unisphere.services.auth_service.MockAuthService import MockAuthService
+from unisphere.services.auth_service.PrincipalCache import (PrincipalCache,
+                                                            get_principal_cache)
+from unisphere.services.auth_service.TokenStore import (TokenStore,
+                                                        get_token_store)
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 # Dependency to get auth service (mock or DB)
-def get_auth_service(session: AsyncSession = Depends(get_session)) -> AuthServiceInterface:
+def get_auth_service(
+    session: AsyncSession = Depends(get_session),
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
+    token_store: TokenStore = Depends(get_token_store)
+) -> AuthServiceInterface:
     settings = get_settings()
     if settings.USE_MOCK:
         return MockAuthService()
-    return DBAuthService(session=session)
+    return DBAuthService(session=session, principal_cache=principal_cache, token_store=token_store)
 
 
-# Dependency to get current user from token
-async def get_current_user(
+async def get_token_payload(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    auth_service: AuthServiceInterface = Depends(get_auth_service)
-) -> SchemaUser:
-    """Get current authenticated user"""
-    token = credentials.credentials
-
-    # Verify token
-    payload = await auth_service.verify_token(token)
-    if payload is None:
+    auth_service: AuthServiceInterface = Depends(get_auth_service),
+    token_store: TokenStore = Depends(get_token_store)
+) -> dict:
+    """Verify the bearer token and return its claims
+
+    A logged-out token is refused by a single denylist lookup on its jti,
+    never by a database query.
+    """
+    payload = await auth_service.verify_token(credentials.credentials)
+    if payload is None or payload.get("type", "access") != "access":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-
-    # Get user
-    user_id_str = payload.get("sub")
-    if user_id_str is None:
+    if payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
+    if "jti" in payload and await token_store.is_revoked(payload["jti"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+# Dependency to get current user from token
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    auth_service: AuthServiceInterface = Depends(get_auth_service),
+    principal_cache: PrincipalCache = Depends(get_principal_cache)
+) -> SchemaUser:
+    """Get current authenticated user
+
+    Served from the principal cache when the token carries a version claim;
+    only a miss costs a database lookup.
+    """
+    user_id = int(payload["sub"])
+    token_version = payload.get("ver")
+    if token_version is not None:
+        cached = await principal_cache.get(user_id, token_version)
+        if cached is not None:
+            return cached
 
-    user_id = int(user_id_str)
     user = await auth_service.get_user_by_id(user_id)
-    if user is None:
+    if user is None or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    if token_version is not None and token_version != user.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    current_user = SchemaUser.model_validate(user)
+    if token_version is not None:
+        await principal_cache.set(current_user, user.token_version)
+    return current_user
 
-    return SchemaUser.model_validate(user)
+
+async def get_current_principal(
+    payload: dict = Depends(get_token_payload),
+    auth_service: AuthServiceInterface = Depends(get_auth_service),
+    principal_cache: PrincipalCache = Depends(get_principal_cache)
+) -> Principal:
+    """Get id and role straight from the token claims, without any lookup
+
+    Revocation reaches these endpoints only when the token expires, so use
+    get_current_user wherever a deactivated user must be refused at once.
+    """
+    if "role" in payload:
+        return Principal(id=int(payload["sub"]), role=payload["role"])
+    # Tokens issued before the role claim existed
+    user = await get_current_user(payload, auth_service, principal_cache)
+    return Principal(id=user.id, role=user.role)
 
 
 @router.post(
@@ -134,13 +198,43 @@ async def login_user(
         ) from e
 
 
+@router.post(
+    "/refresh",
+    summary="Refresh tokens",
+    description="Exchange a refresh token for a new access and refresh token pair. Each refresh token works once.",
+    response_model=Token
+)
+async def refresh_tokens(
+    refresh_data: RefreshTokenRequest,
+    auth_service: AuthServiceInterface = Depends(get_auth_service)
+):
+    """Rotate a refresh token"""
+    try:
+        return await auth_service.refresh_tokens(refresh_data.refresh_token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+
+
 @router.post(
     "/logout",
     summary="Logout user",
-    description="Logout current user (client-side token invalidation)"
+    description="Revoke the current access token and, when given, the refresh token's whole rotation family"
 )
-async def logout_user():
-    """Logout user (client should delete the token)"""
+async def logout_user(
+    logout_data: Optional[LogoutRequest] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    auth_service: AuthServiceInterface = Depends(get_auth_service)
+):
+    """Logout user"""
+    access_payload = None
+    if credentials is not None:
+        access_payload = await auth_service.verify_token(credentials.credentials)
+    await auth_service.revoke_tokens(
+        access_payload, logout_data.refresh_token if logout_data else None)
     return {"message": "Successfully logged out"}
 
 
@@ -252,3 +346,28 @@ async def update_profile(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update profile: {str(e)}"
         ) from e
+
+
+@router.post(
+    "/users/{user_id}/deactivate",
+    summary="Deactivate user",
+    description="Deactivate a user account and revoke its tokens (Admin only)"
+)
+async def deactivate_user(
+    user_id: int,
+    current_user: SchemaUser = Depends(get_current_user),
+    auth_service: AuthServiceInterface = Depends(get_auth_service)
+):
+    """Deactivate a user (Admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin can deactivate users"
+        )
+
+    if not await auth_service.deactivate_user(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return {"message": "User deactivated successfully"}
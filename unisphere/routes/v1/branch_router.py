@@ -1,22 +1,53 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache
 from unisphere.models import get_session  # your AsyncSession dependency
+from unisphere.schemas.bulk_schema import BULK_MAX_ITEMS, BulkResult, BulkUpdateItem
 from unisphere.schemas.branch_schema import (BranchCreateSchema, BranchSchema,
                                              BranchUpdateSchema)
 from unisphere.schemas.branch_translation_schema import (
     BranchTranslationCreateSchema, BranchTranslationSchema,
     BranchTranslationUpdateSchema)
 from unisphere.services.branch_service.DBBranchService import DBBranchService
+from unisphere.services.catalog_cache import get_catalog_cache
 
 router = APIRouter(prefix="/branches", tags=["branches"])
 
 # Dependency
-async def get_branch_service(session: AsyncSession = Depends(get_session)) -> DBBranchService:
-    return DBBranchService(session)
-
+async def get_branch_service(
+    session: AsyncSession = Depends(get_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> DBBranchService:
+    return DBBranchService(session, cache)
+
+
+# Bulk endpoints, ahead of the /{id} routes so "bulk" is not read as an id
+@router.post("/bulk", response_model=BulkResult[BranchSchema])
+async def bulk_create_branches(
+    items: List[BranchCreateSchema] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: DBBranchService = Depends(get_branch_service),
+):
+    """Create many branches in one transaction; each item reports created, conflict or invalid"""
+    return await service.bulk_create(items)
+
+@router.put("/bulk", response_model=BulkResult[BranchSchema])
+async def bulk_update_branches(
+    items: List[BulkUpdateItem[BranchUpdateSchema]] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: DBBranchService = Depends(get_branch_service),
+):
+    """Update many branches in one transaction"""
+    return await service.bulk_update(items)
+
+@router.delete("/bulk", response_model=BulkResult[BranchSchema])
+async def bulk_delete_branches(
+    ids: List[int] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: DBBranchService = Depends(get_branch_service),
+):
+    """Delete many branches in one transaction; rows still referenced are left as conflicts"""
+    return await service.bulk_delete(ids)
 
 # ==============================
 # Branch Endpoints
@@ -1,15 +1,18 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache
 from unisphere.models import get_session
+from unisphere.schemas.bulk_schema import BULK_MAX_ITEMS, BulkResult, BulkUpdateItem
 from unisphere.schemas.course_schema import (CourseCreateSchema, CourseSchema,
                                              CourseUpdateSchema)
 from unisphere.schemas.course_translation_schema import (
     CourseTranslationCreateSchema, CourseTranslationSchema,
     CourseTranslationUpdateSchema)
 from unisphere.schemas.user_enroll_schema import UserEnrollSchema
+from unisphere.services.catalog_cache import get_catalog_cache
 from unisphere.services.course_service.CourseServiceInterface import \
     CourseServiceInterface
 from unisphere.services.course_service.DBCourseService import DBCourseService
@@ -19,8 +22,36 @@ router = APIRouter(prefix="/courses", tags=["courses"])
 # ----------------------
 # Dependencies
 # ----------------------
-def get_course_service(session: AsyncSession = Depends(get_session)) -> CourseServiceInterface:
-    return DBCourseService(session=session)
+def get_course_service(
+    session: AsyncSession = Depends(get_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> CourseServiceInterface:
+    return DBCourseService(session=session, cache=cache)
+
+# Bulk endpoints, ahead of the /{id} routes so "bulk" is not read as an id
+@router.post("/bulk", response_model=BulkResult[CourseSchema])
+async def bulk_create_courses(
+    items: List[CourseCreateSchema] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: CourseServiceInterface = Depends(get_course_service),
+):
+    """Create many courses in one transaction; each item reports created, conflict or invalid"""
+    return await service.bulk_create(items)
+
+@router.put("/bulk", response_model=BulkResult[CourseSchema])
+async def bulk_update_courses(
+    items: List[BulkUpdateItem[CourseUpdateSchema]] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: CourseServiceInterface = Depends(get_course_service),
+):
+    """Update many courses in one transaction"""
+    return await service.bulk_update(items)
+
+@router.delete("/bulk", response_model=BulkResult[CourseSchema])
+async def bulk_delete_courses(
+    ids: List[int] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: CourseServiceInterface = Depends(get_course_service),
+):
+    """Delete many courses in one transaction; rows still referenced are left as conflicts"""
+    return await service.bulk_delete(ids)
 
 # ----------------------
 # Course Endpoints
@@ -46,9 +77,10 @@ async def get_user_courses(
 async def enroll_user(
     course_id: int,
     user_id: int = Query(..., description="User ID to enroll"),
+    section_id: int = Query(..., description="Section of the course to enroll in"),
     service: CourseServiceInterface = Depends(get_course_service),
 ):
-    return await service.enroll_user_to_course(user_id, course_id)
+    return await service.enroll_user_to_course(user_id, course_id, section_id)
 
 
 @router.delete("/{course_id}/withdraw", response_model=bool)
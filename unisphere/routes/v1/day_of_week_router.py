@@ -1,23 +1,55 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache
 from unisphere.models import get_session
+from unisphere.schemas.bulk_schema import BULK_MAX_ITEMS, BulkResult, BulkUpdateItem
 from unisphere.schemas.day_of_week_schema import (DayOfWeekCreateSchema,
                                                   DayOfWeekSchema,
                                                   DayOfWeekUpdateSchema)
 from unisphere.schemas.day_of_week_translation_schema import (
     DayTranslationCreateSchema, DayTranslationSchema,
     DayTranslationUpdateSchema)
-from unisphere.services.dayofweek_service import DBDayOfWeekService
+from unisphere.services.catalog_cache import get_catalog_cache
+from unisphere.services.dayofweek_service.DBDayOfWeekService import \
+    DBDayOfWeekService
 from unisphere.services.dayofweek_service.DayOfWeekService import \
     DayOfWeekServiceInterface
 
 router = APIRouter(prefix="/days", tags=["days"])
 
-def get_day_service(session: AsyncSession = Depends(get_session)) -> DayOfWeekServiceInterface:
-    return DBDayOfWeekService(session)
+def get_day_service(
+    session: AsyncSession = Depends(get_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> DayOfWeekServiceInterface:
+    return DBDayOfWeekService(session, cache)
+
+# Bulk endpoints, ahead of the /{id} routes so "bulk" is not read as an id
+@router.post("/bulk", response_model=BulkResult[DayOfWeekSchema])
+async def bulk_create_days(
+    items: List[DayOfWeekCreateSchema] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: DayOfWeekServiceInterface = Depends(get_day_service),
+):
+    """Create many days in one transaction; each item reports created, conflict or invalid"""
+    return await service.bulk_create(items)
+
+@router.put("/bulk", response_model=BulkResult[DayOfWeekSchema])
+async def bulk_update_days(
+    items: List[BulkUpdateItem[DayOfWeekUpdateSchema]] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: DayOfWeekServiceInterface = Depends(get_day_service),
+):
+    """Update many days in one transaction"""
+    return await service.bulk_update(items)
+
+@router.delete("/bulk", response_model=BulkResult[DayOfWeekSchema])
+async def bulk_delete_days(
+    ids: List[int] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: DayOfWeekServiceInterface = Depends(get_day_service),
+):
+    """Delete many days in one transaction; rows still referenced are left as conflicts"""
+    return await service.bulk_delete(ids)
 
 # ----------------------
 # Day CRUD
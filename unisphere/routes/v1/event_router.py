@@ -1,55 +1,85 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (APIRouter, BackgroundTasks, Depends, HTTPException,
+                     Query, Request, Response, status)
+from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from unisphere.models import get_session
-from unisphere.routes.v1.auth_router import get_current_user
+from unisphere.core.conditional import (etag_matches, not_modified,
+                                        set_validators)
+from unisphere.models import get_read_session, get_session
+from unisphere.routes.v1.auth_router import (get_current_principal,
+                                             get_current_user)
 from unisphere.schemas.event_schema import (
+    EventAdmission,
     EventCreate,
     EventRegistration,
     EventRegistrationCreate,
     EventResponse,
     EventUpdate,
 )
+from unisphere.schemas.user_schema import Principal
 from unisphere.schemas.user_schema import User as SchemaUser
-from unisphere.services.event_service import EventService
+from unisphere.services.event_capacity_service import (AdmissionResult,
+                                                       RedisCapacityEngine,
+                                                       get_capacity_engine)
+from unisphere.services.event_service import (EventService,
+                                              reconcile_registration_counts_job)
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
-def get_event_service(session: AsyncSession = Depends(get_session)) -> EventService:
-    return EventService(session)
+def get_event_service(
+    session: AsyncSession = Depends(get_session),
+    capacity_engine: Optional[RedisCapacityEngine] = Depends(
+        get_capacity_engine),
+    read_session: AsyncSession = Depends(get_read_session)
+) -> EventService:
+    return EventService(session, capacity_engine, read_session)
 
 
 @router.get("", response_model=List[EventResponse])
 async def get_events(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     category: Optional[str] = None,
     event_status: Optional[str] = None,
-    current_user: SchemaUser = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; skip is ignored"),
+    current_user: Principal = Depends(get_current_principal),
     event_service: EventService = Depends(get_event_service)
 ):
-    """Get all events (public access for logged in users)"""
-    events = await event_service.get_events(skip, limit, category, event_status)
-
-    # Add registration info for each event
-    result = []
-    for event in events:
-        if event.id is None:
-            continue
-        is_registered = await event_service.is_user_registered(event.id, current_user.id)
-        is_full = await event_service.is_event_full(event.id)
-
-        event_response = EventResponse(
+    """Get all events (public access for logged in users)
+
+    Answers If-None-Match with 304 from the listing's version key alone.
+    """
+    version = await event_service.get_events_version(current_user.id, category, event_status)
+    etag = version.etag(skip, limit, category, event_status, cursor)
+    if etag_matches(request.headers, etag):
+        return not_modified(etag, version.last_modified)
+
+    try:
+        events, next_cursor = await event_service.get_events_with_user_state(
+            current_user.id, skip, limit, category, event_status, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    set_validators(response, etag, version.last_modified)
+
+    return [
+        EventResponse(
             **event.model_dump(),
             is_registered=is_registered,
             is_full=is_full
         )
-        result.append(event_response)
-
-    return result
+        for event, is_registered, is_full in events
+    ]
 
 
 @router.post("", response_model=EventResponse)
@@ -77,7 +107,7 @@ async def create_event(
 @router.get("/{event_id}", response_model=EventResponse)
 async def get_event(
     event_id: int,
-    current_user: SchemaUser = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     event_service: EventService = Depends(get_event_service)
 ):
     """Get event details"""
@@ -135,26 +165,34 @@ async def register_for_event(
     current_user: SchemaUser = Depends(get_current_user),
     event_service: EventService = Depends(get_event_service)
 ):
-    """Register for an event"""
-    # Check if event exists
-    event = await event_service.get_event_by_id(event_id)
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
+    """Register for an event
+
+    With the Redis capacity backend the seat is taken in Redis and the
+    registration is written behind, so the response is 202 with the
+    admission status (admitted or waitlisted) instead of the stored row.
+    """
+    if event_service.capacity_engine:
+        admission = await event_service.admit_user_to_event(
+            event_id, current_user.id, registration.notes
         )
-
-    # Sync registration count to ensure accuracy
-    await event_service.sync_registration_count(event_id)
-
-    # Re-fetch event after sync
-    event = await event_service.get_event_by_id(event_id)
-
-    # Check if event is full
-    if await event_service.is_event_full(event_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Event is full"
+        if admission is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        if admission is AdmissionResult.ALREADY_REGISTERED:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Already registered for this event"
+            )
+        position = None
+        if admission is AdmissionResult.WAITLISTED:
+            position = await event_service.capacity_engine.waitlist_position(
+                event_id, current_user.id)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=EventAdmission(
+                status=admission.value, waitlist_position=position).model_dump()
         )
 
     registration_result = await event_service.register_user_for_event(
@@ -162,17 +200,21 @@ async def register_for_event(
     )
 
     if not registration_result:
-        # Could be already registered or became full during registration
-        if await event_service.is_user_registered(event_id, current_user.id):
+        # The reservation failed; work out why only on this slow path
+        if not await event_service.get_event_by_id(event_id):
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Already registered for this event"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
             )
-        else:
+        if await event_service.is_user_registered(event_id, current_user.id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Event is full"
+                detail="Already registered for this event"
             )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event is full"
+        )
 
     return EventRegistration.model_validate(registration_result)
 
@@ -259,6 +301,10 @@ async def sync_event_registration_count(
 
 @router.post("/sync-all-registration-counts")
 async def sync_all_registration_counts(
+    background_tasks: BackgroundTasks,
+    background: bool = Query(
+        False, description="Run as a background job and return immediately"),
+    chunk_size: int = Query(5000, ge=1, le=100000),
     current_user: SchemaUser = Depends(get_current_user),
     event_service: EventService = Depends(get_event_service)
 ):
@@ -269,9 +315,15 @@ async def sync_all_registration_counts(
             detail="Only admin can sync registration counts"
         )
 
-    synced_count = await event_service.sync_all_registration_counts()
+    if background:
+        background_tasks.add_task(
+            reconcile_registration_counts_job, chunk_size)
+        return {"message": "Registration count reconciliation started"}
+
+    drifted = await event_service.reconcile_registration_counts(chunk_size)
 
     return {
-        "message": f"Synced registration counts for {synced_count} events",
-        "synced_events": synced_count
+        "message": f"Corrected registration counts for {len(drifted)} events",
+        "synced_events": len(drifted),
+        "drifted_event_ids": drifted
     }
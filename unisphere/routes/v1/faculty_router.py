@@ -1,24 +1,55 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache
 from unisphere.models import get_session
+from unisphere.schemas.bulk_schema import BULK_MAX_ITEMS, BulkResult, BulkUpdateItem
 from unisphere.schemas.faculty_schema import (FacultyCreateSchema,
                                               FacultySchema,
                                               FacultyUpdateSchema)
 from unisphere.schemas.faculty_translation_schema import (
     FacultyTranslationCreateSchema, FacultyTranslationSchema,
     FacultyTranslationUpdateSchema)
+from unisphere.services.catalog_cache import get_catalog_cache
 from unisphere.services.faculty_service.DBFacultyService import \
     DBFacultyService
 
 router = APIRouter(prefix="/faculties", tags=["faculties"])
 
 # Dependency
-async def get_faculty_service(session: AsyncSession = Depends(get_session)) -> DBFacultyService:
-    return DBFacultyService(session)
-
+async def get_faculty_service(
+    session: AsyncSession = Depends(get_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> DBFacultyService:
+    return DBFacultyService(session, cache)
+
+
+# Bulk endpoints, ahead of the /{id} routes so "bulk" is not read as an id
+@router.post("/bulk", response_model=BulkResult[FacultySchema])
+async def bulk_create_faculties(
+    items: List[FacultyCreateSchema] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: DBFacultyService = Depends(get_faculty_service),
+):
+    """Create many faculties in one transaction; each item reports created, conflict or invalid"""
+    return await service.bulk_create(items)
+
+@router.put("/bulk", response_model=BulkResult[FacultySchema])
+async def bulk_update_faculties(
+    items: List[BulkUpdateItem[FacultyUpdateSchema]] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: DBFacultyService = Depends(get_faculty_service),
+):
+    """Update many faculties in one transaction"""
+    return await service.bulk_update(items)
+
+@router.delete("/bulk", response_model=BulkResult[FacultySchema])
+async def bulk_delete_faculties(
+    ids: List[int] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: DBFacultyService = Depends(get_faculty_service),
+):
+    """Delete many faculties in one transaction; rows still referenced are left as conflicts"""
+    return await service.bulk_delete(ids)
 
 # Faculty Endpoints
 @router.post("/", response_model=FacultySchema, status_code=status.HTTP_201_CREATED)
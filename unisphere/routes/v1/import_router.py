@@ -0,0 +1,54 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere.core.cache import TaggedCache
+from unisphere.models import get_session
+from unisphere.routes.v1.auth_router import get_current_user
+from unisphere.schemas.import_schema import ImportReportSchema
+from unisphere.schemas.user_schema import User as SchemaUser
+from unisphere.services.bulk_import_service import BulkImportService, log_progress, read_records
+from unisphere.services.catalog_cache import get_catalog_cache
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def get_import_service(
+    session: AsyncSession = Depends(get_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> BulkImportService:
+    return BulkImportService(session, cache)
+
+
+@router.post("/{kind}", response_model=ImportReportSchema)
+async def import_rows(
+    request: Request,
+    kind: Literal["sections", "enrollments", "instructors"] = Path(...),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Defaults to the Content-Type"),
+    # Loaded from the database, so a demoted or deactivated admin is refused at once
+    current_user: SchemaUser = Depends(get_current_user),
+    service: BulkImportService = Depends(get_import_service),
+):
+    """Stream a CSV or NDJSON file of rows into sections, enrollments or instructors (Admin only)
+
+    Rows already present are left alone (sections take the new limit and
+    status), so a failed import can simply be sent again. Invalid rows are
+    skipped and listed in the report by line number.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admin can import")
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        format = CONTENT_TYPES.get(content_type)
+        if format is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Send text/csv or application/x-ndjson, or pass ?format=")
+    return await service.run(kind, read_records(request.stream(), format), log_progress(kind))
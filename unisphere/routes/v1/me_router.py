@@ -0,0 +1,62 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere.core.cache import TaggedCache
+from unisphere.models import get_read_session, is_replica
+from unisphere.routes.v1.auth_router import get_current_principal
+from unisphere.schemas.clash_schema import ClashSchema
+from unisphere.schemas.timetable_schema import TimetableWeekSchema
+from unisphere.schemas.user_schema import Principal
+from unisphere.services.catalog_cache import get_catalog_cache
+from unisphere.services.clash_service import ClashService
+from unisphere.services.timetable_service import TimetableService, week_start
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+
+def read_cache(session: AsyncSession, cache: Optional[TaggedCache]) -> Optional[TaggedCache]:
+    """The catalog cache, read-only when a lagging replica could fill it with a week from before an enrollment"""
+    if cache is not None and is_replica(session):
+        return cache.read_only()
+    return cache
+
+
+def get_timetable_service(
+    session: AsyncSession = Depends(get_read_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> TimetableService:
+    return TimetableService(session, read_cache(session, cache))
+
+
+def get_clash_service(
+    session: AsyncSession = Depends(get_read_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> ClashService:
+    return ClashService(session, read_cache(session, cache))
+
+
+@router.get("/timetable", response_model=TimetableWeekSchema)
+async def get_my_timetable(
+    week: Optional[str] = Query(None, description="ISO week, e.g. 2025-W03; defaults to the current week"),
+    language_code: str = Query("en", max_length=10),
+    current_user: Principal = Depends(get_current_principal),
+    service: TimetableService = Depends(get_timetable_service),
+):
+    """The signed-in student's meetings for one week"""
+    try:
+        monday = week_start(week)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    return await service.get_week(current_user.id, monday, language_code)
+
+
+@router.get("/timetable/conflicts", response_model=List[ClashSchema])
+async def get_my_conflicts(
+    section_id: int = Query(..., description="Section the student wants to enroll in"),
+    current_user: Principal = Depends(get_current_principal),
+    service: ClashService = Depends(get_clash_service),
+):
+    """Meetings of a section that would clash with the signed-in student's timetable"""
+    return await service.check_conflicts(current_user.id, section_id)
@@ -1,12 +1,14 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache
 from unisphere.models import get_session
 from unisphere.schemas.schedule_schema import (SectionScheduleCreateSchema,
                                                SectionScheduleSchema,
                                                SectionScheduleUpdateSchema)
+from unisphere.services.catalog_cache import get_catalog_cache
 from unisphere.services.schedule_service.DBScheduleService import \
     DBScheduleService
 from unisphere.services.schedule_service.ScheduleServiceInterface import \
@@ -14,8 +16,11 @@ from unisphere.services.schedule_service.ScheduleServiceInterface import \
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
-def get_schedule_service(session: AsyncSession = Depends(get_session)) -> ScheduleServiceInterface:
-    return DBScheduleService(session)
+def get_schedule_service(
+    session: AsyncSession = Depends(get_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> ScheduleServiceInterface:
+    return DBScheduleService(session, cache)
 
 # ----------------------
 # CRUD Endpoints
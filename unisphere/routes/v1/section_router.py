@@ -1,9 +1,13 @@
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Body, Depends, Query, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache
 from unisphere.models import get_session
+from unisphere.schemas.bulk_schema import BULK_MAX_ITEMS, BulkResult, BulkUpdateItem
+from unisphere.schemas.schedule_schema import SectionOccurrenceSchema
 from unisphere.schemas.section_instructor_schema import (
     SectionInstructorCreateSchema, SectionInstructorSchema)
 from unisphere.schemas.section_rrule_schema import (SectionRRuleCreateSchema,
@@ -12,6 +16,7 @@ from unisphere.schemas.section_rrule_schema import (SectionRRuleCreateSchema,
 from unisphere.schemas.section_schema import (SectionCreateSchema,
                                               SectionSchema,
                                               SectionUpdateSchema)
+from unisphere.services.catalog_cache import get_catalog_cache
 from unisphere.services.section_service.DBSectionService import \
     DBSectionService
 from unisphere.services.section_service.SectionServiceInterface import \
@@ -19,8 +24,36 @@ from unisphere.services.section_service.SectionServiceInterface import \
 
 router = APIRouter(prefix="/sections", tags=["sections"])
 
-def get_section_service(session: AsyncSession = Depends(get_session)) -> SectionServiceInterface:
-    return DBSectionService(session)
+def get_section_service(
+    session: AsyncSession = Depends(get_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> SectionServiceInterface:
+    return DBSectionService(session, cache)
+
+# Bulk endpoints, ahead of the /{id} routes so "bulk" is not read as an id
+@router.post("/bulk", response_model=BulkResult[SectionSchema])
+async def bulk_create_sections(
+    items: List[SectionCreateSchema] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: SectionServiceInterface = Depends(get_section_service),
+):
+    """Create many sections in one transaction; each item reports created, conflict or invalid"""
+    return await service.bulk_create(items)
+
+@router.put("/bulk", response_model=BulkResult[SectionSchema])
+async def bulk_update_sections(
+    items: List[BulkUpdateItem[SectionUpdateSchema]] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: SectionServiceInterface = Depends(get_section_service),
+):
+    """Update many sections in one transaction"""
+    return await service.bulk_update(items)
+
+@router.delete("/bulk", response_model=BulkResult[SectionSchema])
+async def bulk_delete_sections(
+    ids: List[int] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: SectionServiceInterface = Depends(get_section_service),
+):
+    """Delete many sections in one transaction; rows still referenced are left as conflicts"""
+    return await service.bulk_delete(ids)
 
 # ----------------------
 # Section CRUD
@@ -81,4 +114,16 @@ async def update_rrule(rrule_id: int, data: SectionRRuleUpdateSchema, service: S
 
 @router.delete("/rrules/{rrule_id}", response_model=bool)
 async def delete_rrule(rrule_id: int, service: SectionServiceInterface = Depends(get_section_service)):
-    return await service.delete_rrule(rrule_id)
\ No newline at end of file
+    return await service.delete_rrule(rrule_id)
+
+# ----------------------
+# Section occurrences
+# ----------------------
+@router.get("/{section_id}/occurrences", response_model=List[SectionOccurrenceSchema])
+async def list_occurrences(
+    section_id: int,
+    start: Optional[datetime] = Query(None, description="Only occurrences starting at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only occurrences starting before this time"),
+    service: SectionServiceInterface = Depends(get_section_service),
+):
+    return await service.list_occurrences(section_id, start, end)
@@ -1,13 +1,18 @@
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from unisphere.models import get_session
+from unisphere.core.cache import TaggedCache
+from unisphere.models import get_read_session, get_session
+from unisphere.schemas.bulk_schema import BULK_MAX_ITEMS, BulkResult, BulkUpdateItem
+from unisphere.schemas.clash_schema import SemesterClashReportSchema
 from unisphere.schemas.semester_schema import (SemesterCreateSchema,
                                                SemesterSchema,
                                                SemesterUpdateSchema)
+from unisphere.services.catalog_cache import get_catalog_cache
+from unisphere.services.clash_service import ClashService
 from unisphere.services.semester_service.DBSemesterService import \
     DBSemesterService
 from unisphere.services.semester_service.SemesterServiceInterface import \
@@ -15,15 +20,47 @@ from unisphere.services.semester_service.SemesterServiceInterface import \
 
 
 # Dependency injection
-def get_semester_service(session: AsyncSession = Depends(get_session)) -> SemesterServiceInterface:
+def get_semester_service(
+    session: AsyncSession = Depends(get_session),
+    cache: Optional[TaggedCache] = Depends(get_catalog_cache),
+) -> SemesterServiceInterface:
     # settings = get_settings()
     # if settings.USE_MOCK:
     #     return MockCourseService()
-    return DBSemesterService(session=session)
+    return DBSemesterService(session=session, cache=cache)
+
+
+def get_clash_service(session: AsyncSession = Depends(get_read_session)) -> ClashService:
+    return ClashService(session)
 
 router = APIRouter(prefix="/semesters", tags=["semesters"])
 
 
+# Bulk endpoints, ahead of the /{id} routes so "bulk" is not read as an id
+@router.post("/bulk", response_model=BulkResult[SemesterSchema])
+async def bulk_create_semesters(
+    items: List[SemesterCreateSchema] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: SemesterServiceInterface = Depends(get_semester_service),
+):
+    """Create many semesters in one transaction; each item reports created, conflict or invalid"""
+    return await service.bulk_create(items)
+
+@router.put("/bulk", response_model=BulkResult[SemesterSchema])
+async def bulk_update_semesters(
+    items: List[BulkUpdateItem[SemesterUpdateSchema]] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: SemesterServiceInterface = Depends(get_semester_service),
+):
+    """Update many semesters in one transaction"""
+    return await service.bulk_update(items)
+
+@router.delete("/bulk", response_model=BulkResult[SemesterSchema])
+async def bulk_delete_semesters(
+    ids: List[int] = Body(..., max_length=BULK_MAX_ITEMS),
+    service: SemesterServiceInterface = Depends(get_semester_service),
+):
+    """Delete many semesters in one transaction; rows still referenced are left as conflicts"""
+    return await service.bulk_delete(ids)
+
 @router.get("/", response_model=List[SemesterSchema])
 async def list_semesters(
     include_archived: bool = Query(False, description="Include archived semesters"),
@@ -90,3 +127,21 @@ async def archive_semester(
     if not archived:
         raise HTTPException(status_code=404, detail="Semester not found")
     return archived
+
+
+@router.post("/{semester_id}/occurrences/refresh", response_model=int)
+async def refresh_occurrences(
+    semester_id: int,
+    service: SemesterServiceInterface = Depends(get_semester_service),
+):
+    """Rebuild the dated occurrences of every section in a semester."""
+    return await service.refresh_occurrences(semester_id)
+
+
+@router.get("/{semester_id}/clashes", response_model=SemesterClashReportSchema)
+async def get_semester_clashes(
+    semester_id: int,
+    service: ClashService = Depends(get_clash_service),
+):
+    """Every room double-booking and student timetable clash in a semester."""
+    return await service.check_semester(semester_id)
@@ -1,25 +1,49 @@
+import asyncio
+import os
 from pathlib import Path
+from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+import jwt
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from starlette.datastructures import Headers
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere.core.cache import LocalTTLCache
+from unisphere.core.config import get_settings
+from unisphere.core.static_files import upload_file_response
+from unisphere.models import get_session
 
 from unisphere.routes.v1.auth_router import get_current_user
-from unisphere.schemas.upload_schema import UploadResponse
+from unisphere.schemas.upload_schema import (DirectUploadComplete, DirectUploadRequest, DirectUploadResponse,
+                                              UploadResponse)
 from unisphere.schemas.user_schema import User as SchemaUser
-from unisphere.services.upload_service import UploadService
+from unisphere.services.image_derivative_service import ImageDerivativeService, get_image_derivative_service
+from unisphere.services.storage_service.SignedUploadBackend import (SignedUploadBackend, UploadAlreadyUsedError,
+                                                                   UploadTooLargeError)
+from unisphere.services.storage_service.StorageBackendInterface import StorageBackend
+from unisphere.services.upload_service import FileTooLargeError, UploadService, get_storage_backend
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
+# Images recently seen on disk, so repeated lookups skip the stat
+existing_images = LocalTTLCache(maxsize=10000, ttl=60)
+
 
-def get_upload_service() -> UploadService:
-    return UploadService()
+def get_upload_service(
+    session: AsyncSession = Depends(get_session),
+    storage: StorageBackend = Depends(get_storage_backend)
+) -> UploadService:
+    return UploadService(get_settings().UPLOAD_DIR, session=session, storage=storage)
 
 
 @router.post("/image", response_model=UploadResponse)
 async def upload_image(
     request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     upload_service: UploadService = Depends(get_upload_service),
-    _: SchemaUser = Depends(get_current_user)  # Just for authentication
+    derivatives: ImageDerivativeService = Depends(get_image_derivative_service),
+    current_user: SchemaUser = Depends(get_current_user)
 ):
     """Upload an image file"""
     try:
@@ -30,19 +54,12 @@ async def upload_image(
                 detail="File must be an image"
             )
 
-        # Check file size (10MB limit)
-        if file.size and file.size > 10 * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File size must be less than 10MB"
-            )
-
-        # Save the file
-        file_path = await upload_service.save_image(file)
+        # Save the file; size and content are checked while streaming
+        file_path = await upload_service.save_image(file, owner_id=current_user.id)
+        background_tasks.add_task(derivatives.generate_all, file_path, upload_service.storage)
 
         # Generate full URL
-        base_url = str(request.base_url).rstrip('/')
-        file_url = f"{base_url}/{file_path}"
+        file_url = upload_service.get_image_url(file_path, str(request.base_url))
 
         return UploadResponse(
             message="File uploaded successfully",
@@ -52,6 +69,16 @@ async def upload_image(
 
     except HTTPException:
         raise
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(e)
+        ) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -59,26 +86,46 @@ async def upload_image(
         ) from e
 
 
-@router.get("/image/{filename}")
+@router.get("/image/{filename:path}")
 async def get_image(
     filename: str,
-    request: Request
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=4096, description="Width the client will display"),
+    upload_service: UploadService = Depends(get_upload_service),
+    derivatives: ImageDerivativeService = Depends(get_image_derivative_service)
 ):
-    """Get an uploaded image"""
+    """Get an uploaded image, or with ?w= the smallest resized copy at least that wide"""
     try:
         # Check if file exists in the images directory
         image_path = f"uploads/images/{filename}"
-        file_path = Path(image_path)
+        if w is not None:
+            derivative = await derivatives.derivative_for(image_path, w, upload_service.storage)
+            if derivative is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="File not found"
+                )
+            stat_result = await asyncio.to_thread(os.stat, derivative)
+            relative_path = derivative.resolve().relative_to(derivatives.upload_dir.resolve())
+            return await upload_file_response(
+                str(derivative), stat_result, relative_path.as_posix(), Headers(scope=request.scope))
 
-        if not file_path.exists():
+        key = f"images/{filename}"
+        if ".." in Path(key).parts:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="File not found"
             )
+        if existing_images.get(image_path) is None:
+            if not await upload_service.storage.exists(key):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="File not found"
+                )
+            existing_images.set(image_path, True)
 
-        # Return the static file URL
-        base_url = str(request.base_url).rstrip('/')
-        return {"url": f"{base_url}/{image_path}"}
+        # Return the file URL
+        return {"url": upload_service.get_image_url(image_path, str(request.base_url))}
 
     except HTTPException:
         raise
@@ -89,25 +136,28 @@ async def get_image(
         ) from e
 
 
-@router.delete("/image/{filename}")
+@router.delete("/image/{filename:path}")
 async def delete_image(
     filename: str,
     upload_service: UploadService = Depends(get_upload_service),
-    _: SchemaUser = Depends(get_current_user)  # Just for authentication
+    derivatives: ImageDerivativeService = Depends(get_image_derivative_service),
+    current_user: SchemaUser = Depends(get_current_user)
 ):
-    """Delete an uploaded image"""
+    """Delete an uploaded image, or release the caller's reference to a shared one"""
     try:
         # Construct the image path
         image_path = f"uploads/images/{filename}"
 
         # Use the upload service to delete the image
-        success = upload_service.delete_image(image_path)
+        success = await upload_service.delete_image(image_path, owner_id=current_user.id)
 
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="File not found or could not be deleted"
             )
+        existing_images.pop(image_path)
+        await derivatives.discard_orphans(image_path, upload_service.storage)
 
         return {"message": "File deleted successfully"}
 
@@ -118,3 +168,105 @@ async def delete_image(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete file: {str(e)}"
         ) from e
+
+
+@router.post("/direct", response_model=DirectUploadResponse)
+async def start_direct_upload(
+    request: Request,
+    body: DirectUploadRequest,
+    upload_service: UploadService = Depends(get_upload_service),
+    _: SchemaUser = Depends(get_current_user)  # Just for authentication
+):
+    """Presign an image upload that goes straight to storage"""
+    try:
+        response = await upload_service.start_direct_upload(body.filename, body.content_type, body.size)
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(e)
+        ) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
+
+    # Backends that presign through this app return paths on it
+    base_url = str(request.base_url).rstrip('/')
+    for presigned in [response.upload] + [part.request for part in response.parts]:
+        if presigned is not None and presigned.url.startswith("/"):
+            presigned.url = f"{base_url}{presigned.url}"
+    return response
+
+
+@router.post("/direct/complete", response_model=UploadResponse)
+async def complete_direct_upload(
+    request: Request,
+    body: DirectUploadComplete,
+    background_tasks: BackgroundTasks,
+    upload_service: UploadService = Depends(get_upload_service),
+    derivatives: ImageDerivativeService = Depends(get_image_derivative_service),
+    current_user: SchemaUser = Depends(get_current_user)
+):
+    """Finish a direct upload and check its content"""
+    try:
+        file_path = await upload_service.finish_direct_upload(
+            body.key, body.upload_id, body.parts, owner_id=current_user.id)
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(e)
+        ) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
+    background_tasks.add_task(derivatives.generate_all, file_path, upload_service.storage)
+
+    return UploadResponse(
+        message="File uploaded successfully",
+        url=upload_service.get_image_url(file_path, str(request.base_url)),
+        filename=file_path.rsplit("/", 1)[1]
+    )
+
+
+@router.put("/storage/{token}")
+async def receive_direct_upload(
+    token: str,
+    request: Request,
+    storage: StorageBackend = Depends(get_storage_backend)
+):
+    """Accept the bytes of a presigned upload for backends that cannot presign natively"""
+    if not isinstance(storage, SignedUploadBackend):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not found"
+        )
+    try:
+        claims = storage.verify_upload_token(token)
+    except jwt.InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired upload URL"
+        ) from e
+
+    try:
+        etag = await storage.receive(
+            claims, request.stream(), request.headers.get("content-type", "application/octet-stream"))
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(e)
+        ) from e
+    except UploadAlreadyUsedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        ) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
+    return Response(headers={"ETag": etag} if etag else None)
@@ -1,20 +1,26 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from unisphere.models import get_session
+from unisphere.models import get_read_session, get_session
 from unisphere.schemas.user_place_schema import (UserPlaceCreate,
                                                  UserPlaceListResponse,
                                                  UserPlaceResponse)
+from unisphere.schemas.user_schema import Principal
 from unisphere.services.user_place_service.DBUserPlaceService import \
     DBUserPlaceService
 
-from .auth_router import get_current_user
+from .auth_router import get_current_principal, get_current_user
 
 router = APIRouter(prefix="/user-places", tags=["user-places"])
 
 
-def get_user_place_service(session: AsyncSession = Depends(get_session)) -> DBUserPlaceService:
-    return DBUserPlaceService(session)
+def get_user_place_service(
+    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
+) -> DBUserPlaceService:
+    return DBUserPlaceService(session, read_session)
 
 
 @router.post("/", response_model=UserPlaceResponse, status_code=status.HTTP_201_CREATED)
@@ -33,11 +39,17 @@ async def save_place_to_collection(
 async def get_my_places(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; offset is ignored"),
     service: DBUserPlaceService = Depends(get_user_place_service),
-    current_user=Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    places, total = await service.list_my_places(user_id=current_user.id, limit=limit, offset=offset)
-    return UserPlaceListResponse(places=places, total=total, limit=limit, offset=offset)
+    try:
+        places, total, next_cursor = await service.list_my_places(
+            user_id=current_user.id, limit=limit, offset=offset, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return UserPlaceListResponse(
+        places=places, total=total, limit=limit, offset=offset, next_cursor=next_cursor)
 
 
 @router.delete("/{place_id}")
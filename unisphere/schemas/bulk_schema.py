@@ -0,0 +1,29 @@
+from typing import Generic, List, Literal, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+# Most items one bulk request may carry
+BULK_MAX_ITEMS = 1000
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+class BulkUpdateItem(BaseModel, Generic[U]):
+    id: int
+    data: U
+
+
+class BulkItemResult(BaseModel, Generic[T]):
+    # Position of the item in the request
+    index: int
+    id: Optional[int] = None
+    status: Literal["created", "updated", "deleted", "not_found", "conflict", "invalid"]
+    error: Optional[str] = None
+    data: Optional[T] = None
+
+
+class BulkResult(BaseModel, Generic[T]):
+    succeeded: int = 0
+    failed: int = 0
+    results: List[BulkItemResult[T]] = Field(default_factory=list)
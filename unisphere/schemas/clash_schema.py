@@ -0,0 +1,30 @@
+from datetime import time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ClashSlotSchema(BaseModel):
+    schedule_id: int
+    section_id: int
+    day_id: int
+    start_time: time
+    end_time: time
+    room: Optional[str] = None
+
+
+class ClashSchema(BaseModel):
+    # "student": one student is enrolled in both; "room": both are booked into the same room
+    kind: str
+    user_id: Optional[int] = None
+    room: Optional[str] = None
+    first: ClashSlotSchema
+    second: ClashSlotSchema
+
+
+class SemesterClashReportSchema(BaseModel):
+    semester_id: int
+    slots_checked: int
+    enrollments_checked: int
+    room_clashes: List[ClashSchema]
+    student_clashes: List[ClashSchema]
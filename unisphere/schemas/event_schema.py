@@ -58,3 +58,9 @@ class EventRegistration(BaseModel):
     registered_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class EventAdmission(BaseModel):
+    """Outcome of a registration admitted through the Redis capacity engine"""
+    status: str  # admitted, waitlisted
+    waitlist_position: Optional[int] = None
@@ -0,0 +1,49 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class SectionImportRow(BaseModel):
+    course_id: int
+    section_code: str = Field(min_length=1, max_length=50)
+    student_limit: int = Field(ge=0)
+    status: str = Field(default="active", max_length=20)
+
+
+class MembershipImportRow(BaseModel):
+    """One enrollment or instructor assignment
+
+    The user is given by user_id or email, the section by section_id or
+    by course_id and section_code.
+    """
+    user_id: Optional[int] = None
+    email: Optional[str] = Field(default=None, max_length=255)
+    section_id: Optional[int] = None
+    course_id: Optional[int] = None
+    section_code: Optional[str] = Field(default=None, max_length=50)
+
+    @model_validator(mode="after")
+    def check_keys(self) -> "MembershipImportRow":
+        if self.user_id is None and not self.email:
+            raise ValueError("user_id or email is required")
+        if self.section_id is None and (self.course_id is None or not self.section_code):
+            raise ValueError("section_id, or course_id and section_code, is required")
+        return self
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReportSchema(BaseModel):
+    kind: str
+    rows: int
+    written: int
+    # Valid rows that were already in the database as given
+    unchanged: int
+    failed: int
+    errors: List[ImportRowError]
+    # More rows failed than are listed in errors
+    errors_truncated: bool = False
+    elapsed_ms: float
@@ -1,7 +1,7 @@
-from datetime import time
+from datetime import datetime, time
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SectionScheduleBaseSchema(BaseModel):
@@ -10,6 +10,7 @@ class SectionScheduleBaseSchema(BaseModel):
     start_time: time
     end_time: time
     note: Optional[str] = None
+    room: Optional[str] = Field(default=None, max_length=50)
 
 
 class SectionScheduleCreateSchema(SectionScheduleBaseSchema):
@@ -20,9 +21,21 @@ class SectionScheduleUpdateSchema(BaseModel):
     start_time: Optional[time] = None
     end_time: Optional[time] = None
     note: Optional[str] = None
+    room: Optional[str] = Field(default=None, max_length=50)
 
 
 class SectionScheduleSchema(SectionScheduleBaseSchema):
     schedule_id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SectionOccurrenceSchema(BaseModel):
+    occurrence_id: int
+    section_id: int
+    schedule_id: Optional[int] = None
+    rrule_id: Optional[int] = None
+    starts_at: datetime
+    ends_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
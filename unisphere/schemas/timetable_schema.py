@@ -0,0 +1,30 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class TimetableEntrySchema(BaseModel):
+    occurrence_id: int
+    starts_at: datetime
+    ends_at: datetime
+    section_id: int
+    section_code: str
+    course_id: int
+    course_code: str
+    # Null when the course has no translation in the requested language
+    subject_name: Optional[str] = None
+    # Set for meetings of a weekly slot, null for those of an RRULE
+    schedule_id: Optional[int] = None
+    day_id: Optional[int] = None
+    day_code: Optional[str] = None
+    day_name: Optional[str] = None
+    note: Optional[str] = None
+
+
+class TimetableWeekSchema(BaseModel):
+    week: str
+    start_date: date
+    end_date: date
+    language_code: str
+    entries: List[TimetableEntrySchema]
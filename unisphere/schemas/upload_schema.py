@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class UploadResponse(BaseModel):
@@ -8,3 +8,44 @@ class UploadResponse(BaseModel):
     message: str
     url: str
     filename: Optional[str] = None
+
+
+class PresignedRequest(BaseModel):
+    """HTTP request a client sends to upload bytes straight to storage"""
+    url: str
+    method: str
+    fields: Dict[str, str] = {}
+    headers: Dict[str, str] = {}
+
+
+class PresignedPart(BaseModel):
+    part_number: int
+    request: PresignedRequest
+
+
+class DirectUploadRequest(BaseModel):
+    """Client's description of the file it is about to upload"""
+    filename: str
+    content_type: str
+    size: int = Field(gt=0)
+
+
+class DirectUploadResponse(BaseModel):
+    """Where to send the bytes: one request, or one per part for large files"""
+    key: str
+    expires_in: int
+    upload: Optional[PresignedRequest] = None
+    upload_id: Optional[str] = None
+    part_size: Optional[int] = None
+    parts: List[PresignedPart] = []
+
+
+class CompletedPart(BaseModel):
+    part_number: int
+    etag: str
+
+
+class DirectUploadComplete(BaseModel):
+    key: str
+    upload_id: Optional[str] = None
+    parts: List[CompletedPart] = []
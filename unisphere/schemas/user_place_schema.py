@@ -44,3 +44,5 @@ class UserPlaceListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    # Pass back as ?cursor= for the next page; None on the last page
+    next_cursor: Optional[str] = None
@@ -103,6 +103,12 @@ class User(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class Principal(BaseModel):
+    """Identity carried in the access token claims"""
+    id: int
+    role: str
+
+
 # Personal info for step 1 registration
 
 
@@ -112,6 +118,14 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
 class TokenData(BaseModel):
     email: Optional[str] = None
     user_id: Optional[int] = None
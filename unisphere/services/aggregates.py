@@ -0,0 +1,128 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Collection, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import func, literal, tuple_
+from sqlalchemy.engine import Row
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+
+def inline(value: Any, known: Optional[Collection[Any]] = None) -> Any:
+    """Render a value into the SQL text instead of binding it
+
+    Partial indexes such as WHERE status = 'upcoming' are only chosen when
+    the planner sees the literal, which a bound parameter hides. Use it for
+    small enumerations only, since every distinct value is a new statement.
+    Pass the enumeration as known for values that come from a request:
+    anything outside it is bound as usual instead of written into the SQL.
+    """
+    if known is not None and value not in known:
+        return value
+    return literal(value, literal_execute=True)
+
+
+async def count_where(session: AsyncSession, model: Type[SQLModel], *criteria: Any) -> int:
+    """Count rows with SELECT count(*) instead of loading them"""
+    statement = select(func.count()).select_from(model).where(*criteria)
+    result = await session.exec(statement)
+    return result.one()
+
+
+async def paginate_with_total(
+    session: AsyncSession,
+    statement: SelectOfScalar,
+    limit: int,
+    offset: int = 0
+) -> Tuple[List[Any], int]:
+    """Fetch one page of a statement together with the total row count
+
+    The total comes from count(*) OVER () on the page query itself, so the
+    page and the total share a single round trip. Only when the page is
+    empty (offset past the end) is a separate count needed.
+    """
+    paged = (
+        statement
+        .add_columns(func.count().over().label("total_count"))
+        .offset(offset)
+        .limit(limit)
+    )
+    # execute() rather than exec(): the extra column must not be scalarized
+    result = await session.execute(paged)
+    rows = result.all()
+    if rows:
+        return [row[0] for row in rows], rows[0][-1]
+
+    count_statement = select(func.count()).select_from(
+        statement.order_by(None).subquery())
+    total = await session.exec(count_statement)
+    return [], total.one()
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for the sort key of the last row on a page"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Sort key values from a cursor; raises ValueError if it is malformed"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise ValueError("Invalid cursor")
+    values = []
+    for value, column in zip(payload, columns):
+        if column.type.python_type is datetime:
+            if not isinstance(value, str):
+                raise ValueError("Invalid cursor")
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError as e:
+                raise ValueError("Invalid cursor") from e
+        elif not isinstance(value, column.type.python_type):
+            raise ValueError("Invalid cursor")
+        values.append(value)
+    return values
+
+
+async def paginate_keyset(
+    session: AsyncSession,
+    statement: SelectOfScalar,
+    order_by: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    offset: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page ordered by order_by and the cursor of the next page
+
+    order_by must end in a unique column (normally the id) so the order is
+    total. With a cursor the page starts right after the row it encodes,
+    through a row-value comparison that a composite index on the same
+    columns answers without scanning skipped rows; offset is only applied
+    when there is no cursor. The next cursor is None on the last page.
+    """
+    if cursor is not None:
+        key = tuple_(*order_by)
+        bound = tuple_(*(
+            literal(value, column.type)
+            for value, column in zip(decode_cursor(cursor, order_by), order_by)
+        ))
+        statement = statement.where(key < bound if descending else key > bound)
+    elif offset:
+        statement = statement.offset(offset)
+
+    ordering = [column.desc() if descending else column.asc() for column in order_by]
+    result = await session.exec(statement.order_by(*ordering).limit(limit + 1))
+    rows = list(result.all())
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1][0] if isinstance(rows[-1], Row) else rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in order_by])
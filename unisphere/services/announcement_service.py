@@ -1,17 +1,25 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from unisphere.models.announcement_model import Announcement
+from unisphere.core.conditional import ListVersion
+from unisphere.models.announcement_model import ANNOUNCEMENT_PRIORITIES, Announcement
 from unisphere.models.user_model import User
 from unisphere.schemas.announcement_schema import AnnouncementCreate, AnnouncementUpdate
+from unisphere.services.aggregates import inline, paginate_keyset
+
+# Listing order, newest first; matches the ix_announcements_date_id index
+ANNOUNCEMENT_ORDER = (Announcement.date, Announcement.id)
 
 
 class AnnouncementService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
         self.session = session
+        # Listings may be served by a read replica
+        self.read_session = read_session or session
 
     async def get_announcements(
         self,
@@ -26,12 +34,34 @@ class AnnouncementService:
         if category:
             query = query.where(Announcement.category == category)
         if priority:
-            query = query.where(Announcement.priority == priority)
+            query = query.where(Announcement.priority == inline(priority, ANNOUNCEMENT_PRIORITIES))
 
         query = query.offset(skip).limit(limit)
-        result = await self.session.exec(query)
+        result = await self.read_session.exec(query)
         return list(result.all())
 
+    async def get_announcements_version(
+        self,
+        category: Optional[str] = None,
+        priority: Optional[str] = None
+    ) -> ListVersion:
+        """Version key of get_announcements_with_creators under the same filters
+
+        The creators' updated_at is included because their names are part
+        of each item.
+        """
+        query = (
+            select(func.count(Announcement.id), func.max(Announcement.updated_at), func.max(User.updated_at))
+            .join(User, Announcement.created_by == User.id)
+        )
+        if category:
+            query = query.where(Announcement.category == category)
+        if priority:
+            query = query.where(Announcement.priority == inline(priority, ANNOUNCEMENT_PRIORITIES))
+
+        count, last_modified, creators_modified = (await self.read_session.exec(query)).one()
+        return ListVersion(count, last_modified, (creators_modified,))
+
     async def get_announcement_by_id(self, announcement_id: int) -> Optional[Announcement]:
         """Get announcement by ID"""
         statement = select(Announcement).where(
@@ -90,18 +120,18 @@ class AnnouncementService:
             .order_by(Announcement.date.desc())
             .limit(limit)
         )
-        result = await self.session.exec(statement)
+        result = await self.read_session.exec(statement)
         return list(result.all())
 
     async def get_high_priority_announcements(self, limit: int = 10) -> List[Announcement]:
         """Get high priority announcements"""
         statement = (
             select(Announcement)
-            .where(Announcement.priority == "high")
+            .where(Announcement.priority == inline("high"))
             .order_by(Announcement.date.desc())
             .limit(limit)
         )
-        result = await self.session.exec(statement)
+        result = await self.read_session.exec(statement)
         return list(result.all())
 
     async def get_announcement_with_creator(self, announcement_id: int) -> Optional[tuple[Announcement, User]]:
@@ -119,20 +149,19 @@ class AnnouncementService:
         skip: int = 0,
         limit: int = 100,
         category: Optional[str] = None,
-        priority: Optional[str] = None
-    ) -> List[tuple[Announcement, User]]:
-        """Get announcements with creator information"""
+        priority: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[tuple[Announcement, User]], Optional[str]]:
+        """Get announcements with creator information and the next page's cursor"""
         query = (
             select(Announcement, User)
             .join(User, Announcement.created_by == User.id)
-            .order_by(Announcement.date.desc())
         )
 
         if category:
             query = query.where(Announcement.category == category)
         if priority:
-            query = query.where(Announcement.priority == priority)
+            query = query.where(Announcement.priority == inline(priority, ANNOUNCEMENT_PRIORITIES))
 
-        query = query.offset(skip).limit(limit)
-        result = await self.session.exec(query)
-        return list(result.all())
+        return await paginate_keyset(
+            self.read_session, query, ANNOUNCEMENT_ORDER, limit, cursor, descending=True, offset=skip)
@@ -3,6 +3,7 @@ from typing import Optional
 
 from unisphere.models.user_model import User
 from unisphere.schemas.user_schema import (
+    Token,
     UserCreate,
     UserLogin,
     UserResponse,
@@ -39,10 +40,20 @@ class AuthServiceInterface(ABC):
         pass
 
     @abstractmethod
-    async def create_tokens(self, user: User) -> dict:
+    async def create_tokens(self, user: User, family: Optional[str] = None) -> dict:
         """Create access and refresh tokens"""
         pass
 
+    @abstractmethod
+    async def refresh_tokens(self, refresh_token: str) -> Token:
+        """Exchange a refresh token for a new token pair"""
+        pass
+
+    @abstractmethod
+    async def revoke_tokens(self, access_payload: Optional[dict], refresh_token: Optional[str] = None) -> None:
+        """Revoke an access token and optionally its refresh token family"""
+        pass
+
     @abstractmethod
     async def verify_token(self, token: str) -> Optional[dict]:
         """Verify JWT token"""
@@ -52,3 +63,8 @@ class AuthServiceInterface(ABC):
     async def update_user_profile(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
         """Update user profile"""
         pass
+
+    @abstractmethod
+    async def deactivate_user(self, user_id: int) -> bool:
+        """Deactivate a user and revoke their tokens"""
+        pass
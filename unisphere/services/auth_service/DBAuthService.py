@@ -1,12 +1,14 @@
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-import bcrypt
 import jwt
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from unisphere.core.config import get_settings
+from unisphere.core.password_hasher import password_hasher
 from unisphere.models.user_model import User
 from unisphere.schemas.user_schema import (
     Token,
@@ -16,23 +18,32 @@ from unisphere.schemas.user_schema import (
     UserUpdate,
 )
 from unisphere.services.auth_service.AuthServiceInterface import AuthServiceInterface
+from unisphere.services.auth_service.PrincipalCache import PrincipalCache
+from unisphere.services.auth_service.TokenStore import (TokenStore,
+                                                        memory_token_store)
 
 
 class DBAuthService(AuthServiceInterface):
     """Database implementation of authentication service"""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        principal_cache: Optional[PrincipalCache] = None,
+        token_store: Optional[TokenStore] = None
+    ):
         self.session = session
         self.settings = get_settings()
+        self.principal_cache = principal_cache or PrincipalCache()
+        self.token_store = token_store or memory_token_store
 
-    def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    async def _hash_password(self, password: str) -> str:
+        """Hash password using bcrypt, off the event loop"""
+        return await password_hasher.hash(password)
 
     async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify password against hash"""
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        """Verify password against hash, off the event loop"""
+        return await password_hasher.verify(plain_password, hashed_password)
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
@@ -46,14 +57,20 @@ class DBAuthService(AuthServiceInterface):
         result = await self.session.exec(statement)
         return result.first()
 
-    async def create_tokens(self, user: User) -> dict:
-        """Create access and refresh tokens"""
+    async def create_tokens(self, user: User, family: Optional[str] = None) -> dict:
+        """Create access and refresh tokens
+
+        family ties rotated refresh tokens to the login that started them.
+        """
         # Access token
         access_token_expires = timedelta(
             minutes=self.settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token_payload = {
             "sub": str(user.id),
             "email": user.email,
+            "role": user.role,
+            "ver": user.token_version,
+            "jti": uuid.uuid4().hex,
             "exp": datetime.utcnow() + access_token_expires,
             "type": "access"
         }
@@ -66,9 +83,14 @@ class DBAuthService(AuthServiceInterface):
         # Refresh token
         refresh_token_expires = timedelta(
             minutes=self.settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+        refresh_jti = uuid.uuid4().hex
+        family = family or uuid.uuid4().hex
         refresh_token_payload = {
             "sub": str(user.id),
             "email": user.email,
+            "ver": user.token_version,
+            "jti": refresh_jti,
+            "fam": family,
             "exp": datetime.utcnow() + refresh_token_expires,
             "type": "refresh"
         }
@@ -77,6 +99,8 @@ class DBAuthService(AuthServiceInterface):
             self.settings.JWT_SECRET_KEY,
             algorithm=self.settings.JWT_ALGORITHM
         )
+        await self.token_store.issue_refresh(
+            refresh_jti, family, time.time() + refresh_token_expires.total_seconds())
 
         return {
             "access_token": access_token,
@@ -104,9 +128,11 @@ class DBAuthService(AuthServiceInterface):
         existing_user = await self.get_user_by_email(user_data.email)
         if existing_user:
             raise ValueError("User with this email already exists")
+        # End the read transaction so the pooled connection is not held while hashing
+        await self.session.commit()
 
         # Hash password
-        hashed_password = self._hash_password(user_data.password)
+        hashed_password = await self._hash_password(user_data.password)
 
         # Create user
         db_user = User(
@@ -143,6 +169,8 @@ class DBAuthService(AuthServiceInterface):
         user = await self.get_user_by_email(login_data.email)
         if not user:
             raise ValueError("Invalid email or password")
+        # End the read transaction so the pooled connection is not held while hashing
+        await self.session.commit()
 
         # Verify password
         if not await self.verify_password(login_data.password, user.password_hash):
@@ -182,6 +210,10 @@ class DBAuthService(AuthServiceInterface):
             if not update_data:
                 return user  # Return user as-is if nothing to update
 
+            # A role change must not survive in tokens issued before it
+            if "role" in update_data and update_data["role"] != user.role:
+                user.token_version += 1
+
             for field, value in update_data.items():
                 setattr(user, field, value)
 
@@ -192,9 +224,55 @@ class DBAuthService(AuthServiceInterface):
             self.session.add(user)
             await self.session.commit()
             await self.session.refresh(user)
+            await self.principal_cache.invalidate(user_id)
 
             return user
 
         except Exception as e:
             await self.session.rollback()
             raise e  # Re-raise instead of returning None to see the actual error
+
+    async def deactivate_user(self, user_id: int) -> bool:
+        """Deactivate a user and revoke their tokens"""
+        user = await self.get_user_by_id(user_id)
+        if not user:
+            return False
+
+        user.is_active = False
+        user.token_version += 1
+        user.updated_at = datetime.now()
+        self.session.add(user)
+        await self.session.commit()
+        await self.principal_cache.invalidate(user_id)
+        return True
+
+    async def refresh_tokens(self, refresh_token: str) -> Token:
+        """Exchange a refresh token for a new token pair
+
+        Each refresh token works once. Reusing one means it was stolen or
+        replayed, so the whole family is revoked and the user must log in.
+        """
+        payload = await self.verify_token(refresh_token)
+        if payload is None or payload.get("type") != "refresh" or "jti" not in payload:
+            raise ValueError("Invalid or expired refresh token")
+
+        family = payload["fam"]
+        if not await self.token_store.consume_refresh(payload["jti"], family):
+            await self.token_store.revoke_family(family, payload["exp"])
+            raise ValueError("Refresh token has already been used")
+
+        user = await self.get_user_by_id(int(payload["sub"]))
+        if not user or not user.is_active or user.token_version != payload.get("ver"):
+            await self.token_store.revoke_family(family, payload["exp"])
+            raise ValueError("Refresh token has been revoked")
+
+        return Token(**await self.create_tokens(user, family=family))
+
+    async def revoke_tokens(self, access_payload: Optional[dict], refresh_token: Optional[str] = None) -> None:
+        """Revoke an access token and, if given, its refresh token family"""
+        if access_payload and "jti" in access_payload:
+            await self.token_store.revoke(access_payload["jti"], access_payload["exp"])
+        if refresh_token:
+            payload = await self.verify_token(refresh_token)
+            if payload and payload.get("type") == "refresh" and "fam" in payload:
+                await self.token_store.revoke_family(payload["fam"], payload["exp"])
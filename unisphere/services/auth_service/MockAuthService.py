@@ -1,10 +1,12 @@
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 
-import bcrypt
 import jwt
 
 from unisphere.core.config import get_settings
+from unisphere.core.password_hasher import password_hasher
 from unisphere.models.user_model import User
 from unisphere.schemas.user_schema import (
     Token,
@@ -14,6 +16,7 @@ from unisphere.schemas.user_schema import (
     UserUpdate,
 )
 from unisphere.services.auth_service.AuthServiceInterface import AuthServiceInterface
+from unisphere.services.auth_service.TokenStore import MemoryTokenStore
 
 
 class MockAuthService(AuthServiceInterface):
@@ -23,15 +26,15 @@ class MockAuthService(AuthServiceInterface):
         self.users: Dict[str, User] = {}
         self.user_id_counter = 1
         self.settings = get_settings()
+        self.token_store = MemoryTokenStore()
 
-    def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    async def _hash_password(self, password: str) -> str:
+        """Hash password using bcrypt, off the event loop"""
+        return await password_hasher.hash(password)
 
     async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify password against hash"""
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        """Verify password against hash, off the event loop"""
+        return await password_hasher.verify(plain_password, hashed_password)
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
@@ -44,7 +47,7 @@ class MockAuthService(AuthServiceInterface):
                 return user
         return None
 
-    async def create_tokens(self, user: User) -> dict:
+    async def create_tokens(self, user: User, family: Optional[str] = None) -> dict:
         """Create access and refresh tokens"""
         # Access token
         access_token_expires = timedelta(
@@ -52,6 +55,9 @@ class MockAuthService(AuthServiceInterface):
         access_token_payload = {
             "sub": str(user.id),
             "email": user.email,
+            "role": user.role,
+            "ver": user.token_version,
+            "jti": uuid.uuid4().hex,
             "exp": datetime.utcnow() + access_token_expires,
             "type": "access"
         }
@@ -64,9 +70,14 @@ class MockAuthService(AuthServiceInterface):
         # Refresh token
         refresh_token_expires = timedelta(
             minutes=self.settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+        refresh_jti = uuid.uuid4().hex
+        family = family or uuid.uuid4().hex
         refresh_token_payload = {
             "sub": str(user.id),
             "email": user.email,
+            "ver": user.token_version,
+            "jti": refresh_jti,
+            "fam": family,
             "exp": datetime.utcnow() + refresh_token_expires,
             "type": "refresh"
         }
@@ -75,6 +86,8 @@ class MockAuthService(AuthServiceInterface):
             self.settings.JWT_SECRET_KEY,
             algorithm=self.settings.JWT_ALGORITHM
         )
+        await self.token_store.issue_refresh(
+            refresh_jti, family, time.time() + refresh_token_expires.total_seconds())
 
         return {
             "access_token": access_token,
@@ -103,7 +116,7 @@ class MockAuthService(AuthServiceInterface):
             raise ValueError("User with this email already exists")
 
         # Hash password
-        hashed_password = self._hash_password(user_data.password)
+        hashed_password = await self._hash_password(user_data.password)
 
         # Create user
         user = User(
@@ -185,3 +198,39 @@ class MockAuthService(AuthServiceInterface):
         except Exception as e:
             print(f"Error updating user profile: {e}")
             return None
+
+    async def deactivate_user(self, user_id: int) -> bool:
+        """Deactivate a user in mock storage"""
+        user = await self.get_user_by_id(user_id)
+        if not user:
+            return False
+        user.is_active = False
+        user.token_version += 1
+        return True
+
+    async def refresh_tokens(self, refresh_token: str) -> Token:
+        """Exchange a refresh token for a new token pair in mock storage"""
+        payload = await self.verify_token(refresh_token)
+        if payload is None or payload.get("type") != "refresh" or "jti" not in payload:
+            raise ValueError("Invalid or expired refresh token")
+
+        family = payload["fam"]
+        if not await self.token_store.consume_refresh(payload["jti"], family):
+            await self.token_store.revoke_family(family, payload["exp"])
+            raise ValueError("Refresh token has already been used")
+
+        user = await self.get_user_by_id(int(payload["sub"]))
+        if not user or not user.is_active or user.token_version != payload.get("ver"):
+            await self.token_store.revoke_family(family, payload["exp"])
+            raise ValueError("Refresh token has been revoked")
+
+        return Token(**await self.create_tokens(user, family=family))
+
+    async def revoke_tokens(self, access_payload: Optional[dict], refresh_token: Optional[str] = None) -> None:
+        """Revoke tokens in mock storage"""
+        if access_payload and "jti" in access_payload:
+            await self.token_store.revoke(access_payload["jti"], access_payload["exp"])
+        if refresh_token:
+            payload = await self.verify_token(refresh_token)
+            if payload and payload.get("type") == "refresh" and "fam" in payload:
+                await self.token_store.revoke_family(payload["fam"], payload["exp"])
@@ -0,0 +1,86 @@
+from typing import AsyncIterator, Optional
+
+import redis.asyncio as redis
+
+from unisphere import models
+from unisphere.core.cache import LocalTTLCache
+from unisphere.core.config import get_settings
+from unisphere.schemas.user_schema import User as SchemaUser
+
+settings = get_settings()
+
+# Shared by every request in this worker process
+local_principals = LocalTTLCache(
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+class PrincipalCache:
+    """Authenticated users keyed by user id and token version
+
+    A token only hits the cache when its "ver" claim matches the cached
+    version, so bumping User.token_version revokes outstanding tokens.
+    The in-process tier bounds staleness on other workers to its TTL; the
+    optional Redis tier is shared and dropped immediately on invalidate().
+    """
+
+    def __init__(
+        self,
+        local: Optional[LocalTTLCache] = local_principals,
+        redis_client: Optional[redis.Redis] = None
+    ):
+        self.local = local
+        self.redis = redis_client
+
+    @staticmethod
+    def _redis_key(user_id: int) -> str:
+        return f"auth:principal:{user_id}"
+
+    async def get(self, user_id: int, token_version: int) -> Optional[SchemaUser]:
+        """Get a cached user for a token version"""
+        if self.local is not None:
+            cached = self.local.get(user_id)
+            if cached is not None and cached[0] == token_version:
+                return cached[1]
+
+        if self.redis is None:
+            return None
+        raw = await self.redis.hgetall(self._redis_key(user_id))
+        if not raw or int(raw["version"]) != token_version:
+            return None
+        user = SchemaUser.model_validate_json(raw["user"])
+        if self.local is not None:
+            self.local.set(user_id, (token_version, user))
+        return user
+
+    async def set(self, user: SchemaUser, token_version: int) -> None:
+        """Cache a user loaded from the database"""
+        if self.local is not None:
+            self.local.set(user.id, (token_version, user))
+        if self.redis is not None:
+            key = self._redis_key(user.id)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping={
+                    "version": token_version, "user": user.model_dump_json()})
+                pipe.expire(key, settings.AUTH_PRINCIPAL_CACHE_REDIS_TTL_SECONDS)
+                await pipe.execute()
+
+    async def invalidate(self, user_id: int) -> None:
+        """Drop a user after a profile change or deactivation"""
+        if self.local is not None:
+            self.local.pop(user_id)
+        if self.redis is not None:
+            await self.redis.delete(self._redis_key(user_id))
+
+
+async def get_principal_cache() -> AsyncIterator[PrincipalCache]:
+    """Dependency that yields the principal cache for the configured backend"""
+    backend = settings.AUTH_PRINCIPAL_CACHE_BACKEND
+    if backend == "none":
+        yield PrincipalCache(local=None)
+    elif backend == "redis":
+        async for redis_client in models.get_redis():
+            yield PrincipalCache(redis_client=redis_client)
+    else:
+        yield PrincipalCache()
@@ -0,0 +1,131 @@
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, Tuple
+
+import redis.asyncio as redis
+
+from unisphere import models
+from unisphere.core.config import get_settings
+
+settings = get_settings()
+
+
+def _seconds_until(expires_at: float) -> int:
+    return max(1, int(expires_at - time.time()) + 1)
+
+
+class TokenStore(ABC):
+    """Server-side state for revocable JWTs
+
+    Access tokens are denylisted by jti until they expire. Refresh tokens
+    are allow-listed by jti and consumed on use, so each one rotates exactly
+    once; presenting a consumed refresh token revokes its whole family.
+    """
+
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """Denylist a token until its exp claim"""
+        pass
+
+    @abstractmethod
+    async def is_revoked(self, jti: str) -> bool:
+        """Whether a token has been denylisted"""
+        pass
+
+    @abstractmethod
+    async def issue_refresh(self, jti: str, family: str, expires_at: float) -> None:
+        """Allow a newly issued refresh token to be used once"""
+        pass
+
+    @abstractmethod
+    async def consume_refresh(self, jti: str, family: str) -> bool:
+        """Use up a refresh token; False when it was already used or revoked"""
+        pass
+
+    @abstractmethod
+    async def revoke_family(self, family: str, expires_at: float) -> None:
+        """Refuse every refresh token descended from the same login"""
+        pass
+
+
+class MemoryTokenStore(TokenStore):
+    """Per-process token store for development and tests"""
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._refresh: Dict[str, Tuple[str, float]] = {}
+        self._revoked_families: Dict[str, float] = {}
+
+    @staticmethod
+    def _purge(entries: Dict) -> None:
+        now = time.time()
+        for key in [key for key, value in entries.items()
+                    if (value[1] if isinstance(value, tuple) else value) <= now]:
+            del entries[key]
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        self._purge(self._revoked)
+        self._revoked[jti] = expires_at
+
+    async def is_revoked(self, jti: str) -> bool:
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    async def issue_refresh(self, jti: str, family: str, expires_at: float) -> None:
+        self._purge(self._refresh)
+        self._refresh[jti] = (family, expires_at)
+
+    async def consume_refresh(self, jti: str, family: str) -> bool:
+        entry = self._refresh.pop(jti, None)
+        if entry is None or entry[1] <= time.time():
+            return False
+        return self._revoked_families.get(family, 0) <= time.time()
+
+    async def revoke_family(self, family: str, expires_at: float) -> None:
+        self._purge(self._revoked_families)
+        self._revoked_families[family] = expires_at
+
+    def clear(self) -> None:
+        self._revoked.clear()
+        self._refresh.clear()
+        self._revoked_families.clear()
+
+
+class RedisTokenStore(TokenStore):
+    """Token store shared by every worker; each check is a single O(1) command"""
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        await self.redis.set(f"auth:revoked:{jti}", 1, ex=_seconds_until(expires_at))
+
+    async def is_revoked(self, jti: str) -> bool:
+        return bool(await self.redis.exists(f"auth:revoked:{jti}"))
+
+    async def issue_refresh(self, jti: str, family: str, expires_at: float) -> None:
+        await self.redis.set(f"auth:refresh:{jti}", family, ex=_seconds_until(expires_at))
+
+    async def consume_refresh(self, jti: str, family: str) -> bool:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.getdel(f"auth:refresh:{jti}")
+            pipe.exists(f"auth:refresh_family_revoked:{family}")
+            stored_family, family_revoked = await pipe.execute()
+        return stored_family == family and not family_revoked
+
+    async def revoke_family(self, family: str, expires_at: float) -> None:
+        await self.redis.set(
+            f"auth:refresh_family_revoked:{family}", 1, ex=_seconds_until(expires_at))
+
+
+# Used when AUTH_TOKEN_STORE_BACKEND is "memory"
+memory_token_store = MemoryTokenStore()
+
+
+async def get_token_store() -> AsyncIterator[TokenStore]:
+    """Dependency that yields the token store for the configured backend"""
+    if settings.AUTH_TOKEN_STORE_BACKEND == "redis":
+        async for redis_client in models.get_redis():
+            yield RedisTokenStore(redis_client)
+    else:
+        yield memory_token_store
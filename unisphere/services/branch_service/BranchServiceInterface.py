@@ -1,4 +1,4 @@
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 from typing import List, Optional
 
 from unisphere.schemas.branch_schema import (BranchCreateSchema, BranchSchema,
@@ -6,9 +6,10 @@ from unisphere.schemas.branch_schema import (BranchCreateSchema, BranchSchema,
 from unisphere.schemas.branch_translation_schema import (
     BranchTranslationCreateSchema, BranchTranslationSchema,
     BranchTranslationUpdateSchema)
+from unisphere.services.bulk_crud import BulkCRUDInterface
 
 
-class BranchServiceInterface(ABC):
+class BranchServiceInterface(BulkCRUDInterface):
     # ==============================
     # Branch CRUD
     # ==============================
@@ -5,23 +5,32 @@ from fastapi import HTTPException, status
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache, cached, invalidates
 from unisphere.models.branch_model import BranchModel, BranchTranslationModel
 from unisphere.schemas.branch_schema import (BranchCreateSchema, BranchSchema,
                                              BranchUpdateSchema)
 from unisphere.schemas.branch_translation_schema import (
     BranchTranslationCreateSchema, BranchTranslationSchema,
     BranchTranslationUpdateSchema)
+from unisphere.services.bulk_crud import BulkCRUDService
 
 from .BranchServiceInterface import BranchServiceInterface
 
 
-class DBBranchService(BranchServiceInterface):
-    def __init__(self, session: AsyncSession):
+class DBBranchService(BulkCRUDService, BranchServiceInterface):
+    bulk_model = BranchModel
+    bulk_schema = BranchSchema
+    bulk_key = ("branch_code",)
+    bulk_tags = ("branches",)
+
+    def __init__(self, session: AsyncSession, cache: Optional[TaggedCache] = None):
         self.session = session
+        self.cache = cache
 
     # ==============================
     # Branch CRUD
     # ==============================
+    @invalidates("branches")
     async def create_branch(self, data: BranchCreateSchema) -> BranchSchema:
         branch = BranchModel.from_orm(data)
         self.session.add(branch)
@@ -29,12 +38,14 @@ class DBBranchService(BranchServiceInterface):
         await self.session.refresh(branch)
         return BranchSchema.from_orm(branch)
 
+    @cached("branches")
     async def get_branch(self, branch_id: int) -> BranchSchema:
         branch = await self.session.get(BranchModel, branch_id)
         if not branch:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Branch not found")
         return BranchSchema.from_orm(branch)
 
+    @invalidates("branches")
     async def update_branch(self, branch_id: int, data: BranchUpdateSchema) -> BranchSchema:
         branch = await self.session.get(BranchModel, branch_id)
         if not branch:
@@ -48,6 +59,7 @@ class DBBranchService(BranchServiceInterface):
         await self.session.refresh(branch)
         return BranchSchema.from_orm(branch)
 
+    @invalidates("branches")
     async def delete_branch(self, branch_id: int) -> None:
         branch = await self.session.get(BranchModel, branch_id)
         if not branch:
@@ -56,6 +68,7 @@ class DBBranchService(BranchServiceInterface):
         await self.session.delete(branch)
         await self.session.commit()
 
+    @cached("branches")
     async def list_branches(self, status: Optional[str] = None) -> List[BranchSchema]:
         query = select(BranchModel)
         if status:
@@ -68,6 +81,7 @@ class DBBranchService(BranchServiceInterface):
     # ==============================
     # Branch Translation CRUD
     # ==============================
+    @invalidates("branches")
     async def create_translation(self, data: BranchTranslationCreateSchema) -> BranchTranslationSchema:
         translation = BranchTranslationModel.from_orm(data)
         self.session.add(translation)
@@ -75,6 +89,7 @@ class DBBranchService(BranchServiceInterface):
         await self.session.refresh(translation)
         return BranchTranslationSchema.from_orm(translation)
 
+    @cached("branches")
     async def get_translation(self, branch_id: int, language_code: str) -> BranchTranslationSchema:
         query = select(BranchTranslationModel).where(
             BranchTranslationModel.branch_id == branch_id,
@@ -86,6 +101,7 @@ class DBBranchService(BranchServiceInterface):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Translation not found")
         return BranchTranslationSchema.from_orm(translation)
 
+    @invalidates("branches")
     async def update_translation(
         self, branch_id: int, language_code: str, data: BranchTranslationUpdateSchema
     ) -> BranchTranslationSchema:
@@ -106,6 +122,7 @@ class DBBranchService(BranchServiceInterface):
         await self.session.refresh(translation)
         return BranchTranslationSchema.from_orm(translation)
 
+    @invalidates("branches")
     async def delete_translation(self, branch_id: int, language_code: str) -> None:
         query = select(BranchTranslationModel).where(
             BranchTranslationModel.branch_id == branch_id,
@@ -119,6 +136,7 @@ class DBBranchService(BranchServiceInterface):
         await self.session.delete(translation)
         await self.session.commit()
 
+    @cached("branches")
     async def list_translations(self, branch_id: int) -> List[BranchTranslationSchema]:
         query = select(BranchTranslationModel).where(BranchTranslationModel.branch_id == branch_id)
         result = await self.session.execute(query)
@@ -0,0 +1,252 @@
+"""Batched create, update and delete shared by the catalog services
+
+A service lists its table, response schema and natural key as class
+attributes and inherits bulk_create, bulk_update and bulk_delete. Each call
+is one transaction with a fixed number of statements whatever the batch
+size: foreign keys and natural keys are checked with one query each, then
+rows go in with a single INSERT ... ON CONFLICT DO NOTHING RETURNING, are
+updated in one flush, or removed with one DELETE ... RETURNING. Items that
+fail a check are reported in their result and the others still go through.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Set, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import delete, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere.core.cache import TaggedCache
+from unisphere.schemas.bulk_schema import BulkItemResult, BulkResult, BulkUpdateItem
+
+
+class BulkCRUDInterface(ABC):
+    @abstractmethod
+    async def bulk_create(self, items: Sequence[BaseModel]) -> BulkResult:
+        pass
+
+    @abstractmethod
+    async def bulk_update(self, items: Sequence[BulkUpdateItem]) -> BulkResult:
+        pass
+
+    @abstractmethod
+    async def bulk_delete(self, ids: Sequence[int]) -> BulkResult:
+        pass
+
+
+class BulkCRUDService(BulkCRUDInterface):
+    bulk_model: ClassVar[Type[SQLModel]]
+    bulk_schema: ClassVar[Type[BaseModel]]
+    # Unique columns new rows are matched on, e.g. ("faculty_code",)
+    bulk_key: ClassVar[Tuple[str, ...]]
+    # Cache tags dropped after a batch that changed anything
+    bulk_tags: ClassVar[Tuple[str, ...]] = ()
+    # Referencing tables _before_bulk_delete empties, so they do not block a delete
+    bulk_delete_clears: ClassVar[Tuple[str, ...]] = ()
+
+    session: AsyncSession
+    cache: Optional[TaggedCache]
+
+    # ----------------------
+    # Hooks
+    # ----------------------
+    async def _after_bulk_update(self, changed: Dict[int, Set[str]]) -> None:
+        """Called before commit with the fields each updated row changed"""
+
+    async def _before_bulk_delete(self, ids: List[int]) -> None:
+        """Called with the rows about to be deleted, to clear bulk_delete_clears"""
+
+    # ----------------------
+    # Bulk operations
+    # ----------------------
+    async def bulk_create(self, items: Sequence[BaseModel]) -> BulkResult:
+        table = self.bulk_model.__table__
+        pk = self._pk()
+        results: Dict[int, BulkItemResult] = {}
+        rows = {index: self._row(item) for index, item in enumerate(items)}
+        for index, error in (await self._missing_references(rows)).items():
+            results[index] = BulkItemResult(index=index, status="invalid", error=error)
+
+        pending = {index: row for index, row in rows.items() if index not in results}
+        if pending:
+            dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+            statement = (
+                dialect.insert(table)
+                .values(list(pending.values()))
+                .on_conflict_do_nothing()
+                .returning(*table.columns)
+            )
+            created = {self._key(row): row for row in (await self.session.exec(statement)).mappings().all()}
+            for index, row in pending.items():
+                # The first of several items with one key is the one that went in
+                inserted = created.pop(self._key(row), None)
+                if inserted is None:
+                    results[index] = BulkItemResult(
+                        index=index, status="conflict", error=f"{self._describe_key(row)} already exists")
+                else:
+                    results[index] = BulkItemResult(
+                        index=index, id=inserted[pk.name], status="created",
+                        data=self.bulk_schema.model_validate(dict(inserted)))
+        return await self._finish(results)
+
+    async def bulk_update(self, items: Sequence[BulkUpdateItem]) -> BulkResult:
+        pk = self._pk()
+        ids = {item.id for item in items}
+        found = {
+            getattr(obj, pk.name): obj
+            for obj in (await self.session.exec(select(self.bulk_model).where(pk.in_(ids)))).all()
+        }
+        results: Dict[int, BulkItemResult] = {}
+        merged: Dict[int, Dict[str, Any]] = {}
+        changes: Dict[int, Dict[str, Any]] = {}
+        seen: Set[int] = set()
+        for index, item in enumerate(items):
+            obj = found.get(item.id)
+            if obj is None:
+                results[index] = BulkItemResult(index=index, id=item.id, status="not_found")
+            elif item.id in seen:
+                results[index] = BulkItemResult(
+                    index=index, id=item.id, status="conflict", error="Updated more than once in this batch")
+            else:
+                seen.add(item.id)
+                changes[index] = item.data.model_dump(exclude_unset=True)
+                merged[index] = {**obj.model_dump(), **changes[index]}
+
+        for index, error in (await self._missing_references(
+                {i: changes[i] for i in merged})).items():
+            results[index] = BulkItemResult(index=index, id=items[index].id, status="invalid", error=error)
+        for index, error in (await self._key_conflicts(
+                {i: row for i, row in merged.items() if i not in results and self._changes_key(changes[i])},
+                {i: items[i].id for i in merged})).items():
+            results[index] = BulkItemResult(index=index, id=items[index].id, status="conflict", error=error)
+
+        changed: Dict[int, Set[str]] = {}
+        for index in merged:
+            if index in results:
+                continue
+            obj = found[items[index].id]
+            for field, value in changes[index].items():
+                setattr(obj, field, value)
+            self.session.add(obj)
+            changed[items[index].id] = set(changes[index])
+        await self.session.flush()
+        if changed:
+            await self._after_bulk_update(changed)
+        for index in merged:
+            if index not in results:
+                obj = found[items[index].id]
+                results[index] = BulkItemResult(
+                    index=index, id=items[index].id, status="updated", data=self.bulk_schema.model_validate(obj))
+        return await self._finish(results)
+
+    async def bulk_delete(self, ids: Sequence[int]) -> BulkResult:
+        pk = self._pk()
+        existing = set((await self.session.exec(select(pk).where(pk.in_(set(ids))))).all())
+        referenced = await self._referencing_tables(existing)
+
+        deletable = existing - referenced.keys()
+        deleted: Set[int] = set()
+        if deletable:
+            await self._before_bulk_delete(sorted(deletable))
+            result = await self.session.exec(delete(self.bulk_model).where(pk.in_(deletable)).returning(pk))
+            deleted = set(result.scalars().all())
+
+        results: Dict[int, BulkItemResult] = {}
+        for index, id_ in enumerate(ids):
+            if id_ in referenced:
+                results[index] = BulkItemResult(
+                    index=index, id=id_, status="conflict", error=f"Still referenced by {referenced[id_]}")
+            elif id_ in deleted:
+                # Only the first mention of an id deletes it
+                deleted.discard(id_)
+                results[index] = BulkItemResult(index=index, id=id_, status="deleted")
+            else:
+                results[index] = BulkItemResult(index=index, id=id_, status="not_found")
+        return await self._finish(results)
+
+    # ----------------------
+    # Helpers
+    # ----------------------
+    def _pk(self):
+        (pk,) = self.bulk_model.__table__.primary_key.columns
+        return pk
+
+    def _row(self, item: BaseModel) -> Dict[str, Any]:
+        """Column values for a new row, with the model's defaults filled in"""
+        return self.bulk_model.model_validate(item.model_dump()).model_dump(exclude={self._pk().name})
+
+    def _key(self, row: Any) -> tuple:
+        return tuple(row[column] for column in self.bulk_key)
+
+    def _describe_key(self, row: Dict[str, Any]) -> str:
+        return ", ".join(f"{column} {row[column]!r}" for column in self.bulk_key)
+
+    def _changes_key(self, changes: Dict[str, Any]) -> bool:
+        return bool(set(self.bulk_key) & changes.keys())
+
+    async def _missing_references(self, rows: Dict[int, Dict[str, Any]]) -> Dict[int, str]:
+        """Rows pointing at parents that do not exist, one query per foreign key"""
+        errors: Dict[int, str] = {}
+        for fk in self.bulk_model.__table__.foreign_keys:
+            name = fk.parent.name
+            values = {row[name] for row in rows.values() if row.get(name) is not None}
+            if not values:
+                continue
+            known = set((await self.session.exec(select(fk.column).where(fk.column.in_(values)))).all())
+            for index, row in rows.items():
+                if index not in errors and row.get(name) is not None and row[name] not in known:
+                    errors[index] = f"{fk.column.table.name} {row[name]} not found ({name})"
+        return errors
+
+    async def _key_conflicts(self, rows: Dict[int, Dict[str, Any]], ids: Dict[int, int]) -> Dict[int, str]:
+        """Updates that would give a row another row's natural key"""
+        if not rows:
+            return {}
+        pk = self._pk()
+        table = self.bulk_model.__table__
+        columns = [table.c[column] for column in self.bulk_key]
+        keys = {self._key(row) for row in rows.values()}
+        if len(columns) == 1:
+            match = columns[0].in_([key for (key,) in keys])
+        else:
+            match = tuple_(*columns).in_(keys)
+        taken = {
+            tuple(row[1:]): row[0]
+            for row in (await self.session.exec(select(pk, *columns).where(match))).all()
+        }
+        errors: Dict[int, str] = {}
+        claimed: Dict[tuple, int] = {}
+        for index, row in rows.items():
+            key = self._key(row)
+            owner = taken.get(key, claimed.get(key))
+            if owner is not None and owner != ids[index]:
+                errors[index] = f"{self._describe_key(row)} already exists"
+            else:
+                claimed[key] = ids[index]
+        return errors
+
+    async def _referencing_tables(self, ids: Set[int]) -> Dict[int, str]:
+        """Rows other tables still point at, one query per referencing foreign key"""
+        referenced: Dict[int, str] = {}
+        if not ids:
+            return referenced
+        table = self.bulk_model.__table__
+        for other in SQLModel.metadata.sorted_tables:
+            if other.name in self.bulk_delete_clears:
+                continue
+            for fk in other.foreign_keys:
+                if fk.column.table is not table:
+                    continue
+                result = await self.session.exec(select(fk.parent).where(fk.parent.in_(ids)).distinct())
+                for id_ in result.all():
+                    referenced.setdefault(id_, other.name)
+        return referenced
+
+    async def _finish(self, results: Dict[int, BulkItemResult]) -> BulkResult:
+        ordered = [results[index] for index in sorted(results)]
+        succeeded = sum(1 for r in ordered if r.status in ("created", "updated", "deleted"))
+        await self.session.commit()
+        if succeeded and self.cache and self.bulk_tags:
+            await self.cache.invalidate(*self.bulk_tags)
+        return BulkResult(succeeded=succeeded, failed=len(ordered) - succeeded, results=ordered)
@@ -0,0 +1,348 @@
+"""Bulk imports of sections, enrollments and instructor assignments
+
+Rows are streamed in as CSV (with a header line) or NDJSON and handled a
+chunk at a time: validated, resolved against the database with one query
+per lookup, written, and committed. Writes are upserts on each table's
+natural key, so rerunning an import, or the rest of one that stopped half
+way, is safe. On asyncpg a chunk is COPYed into a temporary table and
+merged with INSERT ... SELECT ... ON CONFLICT; other drivers get an
+executemany of the same upsert.
+"""
+import codecs
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (AsyncIterable, AsyncIterator, Callable, Dict, List,
+                    Optional, Tuple, Type, Union)
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import or_, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere.core.cache import TaggedCache
+from unisphere.core.config import get_settings
+from unisphere.models.course_model import CourseModel
+from unisphere.models.section_instructor import SectionInstructorModel
+from unisphere.models.section_model import SectionModel
+from unisphere.models.user_enroll_model import UserEnrollModel
+from unisphere.models.user_model import User
+from unisphere.schemas.import_schema import (ImportReportSchema, ImportRowError,
+                                             MembershipImportRow, SectionImportRow)
+
+logger = logging.getLogger(__name__)
+
+# A parsed row, or the reason the line could not be parsed
+Record = Tuple[int, Union[dict, str]]
+
+
+@dataclass(frozen=True)
+class ImportTarget:
+    model: Type[SQLModel]
+    row: Type[BaseModel]
+    columns: Tuple[str, ...]
+    key: Tuple[str, ...]
+    # Columns an existing row takes from the import; none means keep the existing row
+    update: Tuple[str, ...] = ()
+
+
+TARGETS: Dict[str, ImportTarget] = {
+    "sections": ImportTarget(
+        SectionModel, SectionImportRow,
+        ("course_id", "section_code", "student_limit", "status"),
+        ("course_id", "section_code"), ("student_limit", "status")),
+    "enrollments": ImportTarget(
+        UserEnrollModel, MembershipImportRow,
+        ("user_id", "section_id", "created_at"), ("user_id", "section_id")),
+    "instructors": ImportTarget(
+        SectionInstructorModel, MembershipImportRow,
+        ("section_id", "user_id", "created_at"), ("section_id", "user_id")),
+}
+FORMATS = ("csv", "ndjson")
+
+
+@dataclass(frozen=True)
+class ImportProgress:
+    rows: int
+    written: int
+    failed: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """UTF-8 lines of a byte stream, without line endings or a leading BOM"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending.rstrip("\r"):
+        yield pending.rstrip("\r")
+
+
+async def read_csv(lines: AsyncIterable[str]) -> AsyncIterator[Record]:
+    """Rows of a CSV stream keyed by its header; blank values are left out"""
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    number = start = 0
+    async for line in lines:
+        number += 1
+        if not record:
+            start = number
+        record.append(line)
+        text_ = line if len(record) == 1 else "\n".join(record)
+        if text_.count('"') % 2:
+            # A quoted value runs on to the next line
+            continue
+        record = []
+        if not text_.strip():
+            continue
+        try:
+            values = next(csv.reader([text_]))
+        except csv.Error as e:
+            yield start, f"Malformed CSV: {e}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, f"Expected {len(header)} values, got {len(values)}"
+            continue
+        yield start, {name: value.strip() for name, value in zip(header, values) if value.strip()}
+    if record:
+        yield start, "Unterminated quoted value"
+
+
+async def read_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[Record]:
+    number = 0
+    async for line in lines:
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        yield number, row if isinstance(row, dict) else "Expected a JSON object"
+
+
+def read_records(chunks: AsyncIterable[bytes], format: str) -> AsyncIterator[Record]:
+    if format not in FORMATS:
+        raise ValueError(f"Unknown import format {format!r}, expected one of {', '.join(FORMATS)}")
+    reader = read_csv if format == "csv" else read_ndjson
+    return reader(iter_lines(chunks))
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors(include_url=False)
+    )
+
+
+class BulkImportService:
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: Optional[TaggedCache] = None,
+        chunk_size: Optional[int] = None,
+        max_errors: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self.session = session
+        self.cache = cache
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.max_errors = settings.IMPORT_MAX_REPORTED_ERRORS if max_errors is None else max_errors
+
+    async def run(
+        self,
+        kind: str,
+        records: AsyncIterable[Record],
+        progress: Optional[Callable[[ImportProgress], None]] = None,
+    ) -> ImportReportSchema:
+        """Import every record, a chunk per transaction, and report what failed"""
+        if kind not in TARGETS:
+            raise ValueError(f"Unknown import {kind!r}, expected one of {', '.join(TARGETS)}")
+        target = TARGETS[kind]
+        started = time.perf_counter()
+        rows = written = failed = 0
+        errors: List[ImportRowError] = []
+
+        async def flush(chunk: List[Record]) -> None:
+            nonlocal written, failed
+            chunk_written, chunk_errors = await self._import_chunk(kind, target, chunk)
+            written += chunk_written
+            failed += len(chunk_errors)
+            errors.extend(chunk_errors[:max(self.max_errors - len(errors), 0)])
+            if progress:
+                progress(ImportProgress(rows, written, failed, time.perf_counter() - started))
+
+        chunk: List[Record] = []
+        async for record in records:
+            chunk.append(record)
+            rows += 1
+            if len(chunk) >= self.chunk_size:
+                await flush(chunk)
+                chunk = []
+        if chunk:
+            await flush(chunk)
+
+        return ImportReportSchema(
+            kind=kind,
+            rows=rows,
+            written=written,
+            unchanged=rows - written - failed,
+            failed=failed,
+            errors=errors,
+            errors_truncated=failed > len(errors),
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    async def _import_chunk(
+        self, kind: str, target: ImportTarget, chunk: List[Record]
+    ) -> Tuple[int, List[ImportRowError]]:
+        errors: List[ImportRowError] = []
+        parsed: List[Tuple[int, BaseModel]] = []
+        for line, row in chunk:
+            if isinstance(row, str):
+                errors.append(ImportRowError(line=line, error=row))
+                continue
+            try:
+                parsed.append((line, target.row.model_validate(row)))
+            except ValidationError as e:
+                errors.append(ImportRowError(line=line, error=_validation_message(e)))
+
+        if kind == "sections":
+            values = await self._resolve_sections(parsed, errors)
+        else:
+            values = await self._resolve_memberships(parsed, errors)
+
+        # Postgres refuses to upsert one key twice in a statement; the last row wins
+        unique = list({tuple(v[c] for c in target.key): v for v in values}.values())
+        written = await self._upsert(target, unique) if unique else 0
+        await self.session.commit()
+        if self.cache and unique:
+            if kind == "enrollments":
+                await self.cache.invalidate(*{f"timetable:user:{v['user_id']}" for v in unique})
+            elif kind == "sections":
+                await self.cache.invalidate("timetables")
+        errors.sort(key=lambda e: e.line)
+        return written, errors
+
+    async def _resolve_sections(
+        self, parsed: List[Tuple[int, SectionImportRow]], errors: List[ImportRowError]
+    ) -> List[dict]:
+        course_ids = {row.course_id for _, row in parsed}
+        known = set((await self.session.exec(
+            select(CourseModel.course_id).where(CourseModel.course_id.in_(course_ids)))).all()) if course_ids else set()
+        values = []
+        for line, row in parsed:
+            if row.course_id not in known:
+                errors.append(ImportRowError(line=line, error=f"Course {row.course_id} not found"))
+                continue
+            values.append(row.model_dump())
+        return values
+
+    async def _resolve_memberships(
+        self, parsed: List[Tuple[int, MembershipImportRow]], errors: List[ImportRowError]
+    ) -> List[dict]:
+        """Turn emails and section codes into ids, one query per kind of lookup"""
+        user_ids = {row.user_id for _, row in parsed if row.user_id is not None}
+        emails = {row.email for _, row in parsed if row.user_id is None}
+        section_ids = {row.section_id for _, row in parsed if row.section_id is not None}
+        codes = {(row.course_id, row.section_code) for _, row in parsed if row.section_id is None}
+
+        users: Dict[Union[int, str], int] = {}
+        if user_ids:
+            result = await self.session.exec(select(User.id).where(User.id.in_(user_ids)))
+            users.update((user_id, user_id) for user_id in result.all())
+        if emails:
+            result = await self.session.exec(select(User.email, User.id).where(User.email.in_(emails)))
+            users.update(result.all())
+        sections: Dict[Union[int, Tuple[int, str]], int] = {}
+        if section_ids:
+            result = await self.session.exec(
+                select(SectionModel.section_id).where(SectionModel.section_id.in_(section_ids)))
+            sections.update((section_id, section_id) for section_id in result.all())
+        if codes:
+            result = await self.session.exec(
+                select(SectionModel.course_id, SectionModel.section_code, SectionModel.section_id)
+                .where(tuple_(SectionModel.course_id, SectionModel.section_code).in_(codes)))
+            sections.update(((course_id, code), section_id) for course_id, code, section_id in result.all())
+
+        created_at = datetime.now(timezone.utc)
+        values = []
+        for line, row in parsed:
+            user_key = row.user_id if row.user_id is not None else row.email
+            section_key = row.section_id if row.section_id is not None else (row.course_id, row.section_code)
+            if user_key not in users:
+                errors.append(ImportRowError(line=line, error=f"User {user_key} not found"))
+            elif section_key not in sections:
+                label = section_key if row.section_id is not None else f"{row.section_code} of course {row.course_id}"
+                errors.append(ImportRowError(line=line, error=f"Section {label} not found"))
+            else:
+                values.append({"user_id": users[user_key], "section_id": sections[section_key],
+                               "created_at": created_at})
+        return values
+
+    async def _upsert(self, target: ImportTarget, values: List[dict]) -> int:
+        """Insert new rows and update changed ones; returns how many rows that touched"""
+        connection = await self.session.connection()
+        if connection.dialect.driver == "asyncpg":
+            return await self._copy_upsert(target, values)
+
+        table = target.model.__table__
+        dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(table)
+        if target.update:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(target.key),
+                set_={c: statement.excluded[c] for c in target.update},
+                where=or_(*(table.c[c].is_distinct_from(statement.excluded[c]) for c in target.update)),
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=list(target.key))
+        result = await self.session.exec(statement, params=[{c: v[c] for c in target.columns} for v in values])
+        return result.rowcount
+
+    async def _copy_upsert(self, target: ImportTarget, values: List[dict]) -> int:
+        table = target.model.__tablename__
+        staging = f"import_{table}"
+        columns = ", ".join(target.columns)
+        connection = await self.session.connection()
+        # Through SQLAlchemy, so the chunk's transaction is open before COPY runs on the raw connection
+        await connection.execute(text(
+            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA"))
+        raw = (await connection.get_raw_connection()).driver_connection
+        await raw.copy_records_to_table(
+            staging, records=[tuple(v[c] for c in target.columns) for v in values], columns=list(target.columns))
+
+        conflict = f"ON CONFLICT ({', '.join(target.key)}) DO NOTHING"
+        if target.update:
+            assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in target.update)
+            current = ", ".join(f"{table}.{c}" for c in target.update)
+            excluded = ", ".join(f"EXCLUDED.{c}" for c in target.update)
+            conflict = (f"ON CONFLICT ({', '.join(target.key)}) DO UPDATE SET {assignments} "
+                        f"WHERE ({current}) IS DISTINCT FROM ({excluded})")
+        result = await connection.execute(text(
+            f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} {conflict}"))
+        return result.rowcount
+
+
+def log_progress(kind: str) -> Callable[[ImportProgress], None]:
+    def report(progress: ImportProgress) -> None:
+        logger.info("Import %s: %d rows, %d written, %d failed, %.0f rows/s",
+                    kind, progress.rows, progress.written, progress.failed, progress.rows_per_second)
+    return report
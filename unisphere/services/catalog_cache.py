@@ -0,0 +1,39 @@
+from typing import AsyncIterator, Optional
+
+from unisphere import models
+from unisphere.core.cache import LocalTTLCache, TaggedCache
+from unisphere.core.config import Settings, get_settings
+
+settings = get_settings()
+
+
+def user_entry_ttl(settings: Settings) -> Optional[float]:
+    """TTL for a student's own cached timetable, None for the catalog default
+
+    An enrollment only drops the entries of the worker that handled it when
+    each worker keeps its own memory cache, so keep them briefly there.
+    """
+    if settings.CATALOG_CACHE_BACKEND == "memory" and settings.WEB_CONCURRENCY > 1:
+        return settings.CATALOG_CACHE_LOCAL_TTL_SECONDS
+    return None
+
+
+USER_ENTRY_TTL = user_entry_ttl(settings)
+
+# Shared by every request in this worker process
+catalog_cache = TaggedCache(
+    LocalTTLCache(maxsize=settings.CATALOG_CACHE_MAX_ENTRIES, ttl=settings.CATALOG_CACHE_TTL_SECONDS),
+    prefix="catalog",
+)
+
+
+async def get_catalog_cache() -> AsyncIterator[Optional[TaggedCache]]:
+    """Dependency that yields the catalog cache for the configured backend"""
+    backend = settings.CATALOG_CACHE_BACKEND
+    if backend == "none":
+        yield None
+    elif backend == "redis":
+        async for redis_client in models.get_redis():
+            yield catalog_cache.with_redis(redis_client, settings.CATALOG_CACHE_LOCAL_TTL_SECONDS)
+    else:
+        yield catalog_cache
@@ -0,0 +1,189 @@
+"""Timetable clash detection over weekly slots
+
+Overlaps are found with a sweep line: slots sorted by (day, start) are
+visited in order while a heap holds the ones still running, so every
+overlapping pair is reported in O(n log n + pairs) instead of comparing
+every pair of slots. A student's own slots for a semester are kept, sorted, in
+the catalog cache under the same tags as their timetable.
+"""
+import heapq
+from collections import defaultdict
+from datetime import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere.core.cache import TaggedCache, cached
+from unisphere.models.course_model import CourseModel
+from unisphere.models.schedule_model import SectionScheduleModel
+from unisphere.models.section_model import SectionModel
+from unisphere.models.user_enroll_model import UserEnrollModel
+from unisphere.schemas.clash_schema import (ClashSchema, ClashSlotSchema,
+                                            SemesterClashReportSchema)
+from unisphere.services.catalog_cache import USER_ENTRY_TTL
+
+
+class Slot(NamedTuple):
+    # Field order is the sweep order
+    day_id: int
+    start_time: time
+    end_time: time
+    section_id: int
+    schedule_id: int
+    room: Optional[str] = None
+
+
+SLOT_COLUMNS = (
+    SectionScheduleModel.day_id,
+    SectionScheduleModel.start_time,
+    SectionScheduleModel.end_time,
+    SectionScheduleModel.section_id,
+    SectionScheduleModel.schedule_id,
+    SectionScheduleModel.room,
+)
+
+
+def sweep(slots: Iterable[Slot]) -> Iterator[Tuple[Slot, Slot]]:
+    """Every pair of overlapping slots of different sections
+
+    Slots that only touch (one ends as the next starts) do not clash.
+    """
+    running: List[Tuple[time, int, Slot]] = []
+    day = None
+    for order, slot in enumerate(sorted(slots)):
+        if slot.day_id != day:
+            running.clear()
+            day = slot.day_id
+        while running and running[0][0] <= slot.start_time:
+            heapq.heappop(running)
+        for _, _, other in running:
+            if other.section_id != slot.section_id:
+                yield other, slot
+        heapq.heappush(running, (slot.end_time, order, slot))
+
+
+def _clash(kind: str, first: Slot, second: Slot, user_id: Optional[int] = None) -> ClashSchema:
+    return ClashSchema(
+        kind=kind,
+        user_id=user_id,
+        room=first.room if kind == "room" else None,
+        first=ClashSlotSchema(**first._asdict()),
+        second=ClashSlotSchema(**second._asdict()),
+    )
+
+
+class ClashService:
+    def __init__(self, session: AsyncSession, cache: Optional[TaggedCache] = None):
+        self.session = session
+        self.cache = cache
+
+    @cached("timetables", "timetable:user:{user_id}", ttl=USER_ENTRY_TTL)
+    async def user_slots(self, user_id: int, semester_id: int) -> Tuple[Slot, ...]:
+        """Weekly slots of the sections the user is enrolled in that semester, in sweep order"""
+        enrolled = (
+            select(UserEnrollModel.section_id)
+            .join(SectionModel, SectionModel.section_id == UserEnrollModel.section_id)
+            .join(CourseModel, CourseModel.course_id == SectionModel.course_id)
+            .where(UserEnrollModel.user_id == user_id, CourseModel.semester_id == semester_id)
+        )
+        result = await self.session.exec(
+            select(*SLOT_COLUMNS).where(SectionScheduleModel.section_id.in_(enrolled)))
+        return tuple(sorted(Slot(*row) for row in result.all()))
+
+    @cached("timetables")
+    async def section_slots(self, section_id: int) -> Tuple[Slot, ...]:
+        result = await self.session.exec(
+            select(*SLOT_COLUMNS).where(SectionScheduleModel.section_id == section_id))
+        return tuple(sorted(Slot(*row) for row in result.all()))
+
+    async def check_conflicts(self, user_id: int, section_id: int) -> List[ClashSchema]:
+        """Clashes that enrolling user_id in section_id would add to their timetable that semester"""
+        candidate = await self.section_slots(section_id)
+        if not candidate:
+            return []
+        semester_id = (await self.session.exec(
+            select(CourseModel.semester_id)
+            .join(SectionModel, SectionModel.course_id == CourseModel.course_id)
+            .where(SectionModel.section_id == section_id))).one()
+        existing = [s for s in await self.user_slots(user_id, semester_id) if s.section_id != section_id]
+        return [
+            _clash("student", first, second, user_id)
+            for first, second in sweep([*existing, *candidate])
+            if (first.section_id == section_id) != (second.section_id == section_id)
+        ]
+
+    async def check_room(
+        self,
+        room: str,
+        day_id: int,
+        start_time: time,
+        end_time: time,
+        section_id: int,
+        schedule_id: Optional[int] = None
+    ) -> List[ClashSchema]:
+        """Other slots booked into room that overlap, within the same semester"""
+        semester_id = (
+            select(CourseModel.semester_id)
+            .join(SectionModel, SectionModel.course_id == CourseModel.course_id)
+            .where(SectionModel.section_id == section_id)
+            .scalar_subquery()
+        )
+        query = (
+            select(*SLOT_COLUMNS)
+            .join(SectionModel, SectionModel.section_id == SectionScheduleModel.section_id)
+            .join(CourseModel, CourseModel.course_id == SectionModel.course_id)
+            .where(
+                SectionScheduleModel.room == room,
+                SectionScheduleModel.day_id == day_id,
+                SectionScheduleModel.start_time < end_time,
+                SectionScheduleModel.end_time > start_time,
+                SectionScheduleModel.section_id != section_id,
+                CourseModel.semester_id == semester_id,
+            )
+        )
+        if schedule_id is not None:
+            query = query.where(SectionScheduleModel.schedule_id != schedule_id)
+        booked = [Slot(*row) for row in (await self.session.exec(query)).all()]
+        slot = Slot(day_id, start_time, end_time, section_id, schedule_id or 0, room)
+        return [_clash("room", other, slot) for other in sorted(booked)]
+
+    async def check_semester(self, semester_id: int) -> SemesterClashReportSchema:
+        """Every room and student clash of a semester, from two queries and one sweep per group"""
+        sections = (
+            select(SectionModel.section_id)
+            .join(CourseModel, CourseModel.course_id == SectionModel.course_id)
+            .where(CourseModel.semester_id == semester_id)
+        )
+        slots = [Slot(*row) for row in (await self.session.exec(
+            select(*SLOT_COLUMNS).where(SectionScheduleModel.section_id.in_(sections)))).all()]
+        enrollments = (await self.session.exec(
+            select(UserEnrollModel.user_id, UserEnrollModel.section_id)
+            .where(UserEnrollModel.section_id.in_(sections))
+            .distinct())).all()
+
+        by_room: Dict[str, List[Slot]] = defaultdict(list)
+        by_section: Dict[int, List[Slot]] = defaultdict(list)
+        for slot in slots:
+            by_section[slot.section_id].append(slot)
+            if slot.room:
+                by_room[slot.room].append(slot)
+        by_user: Dict[int, List[Slot]] = defaultdict(list)
+        for user_id, section_id in enrollments:
+            by_user[user_id].extend(by_section.get(section_id, ()))
+
+        return SemesterClashReportSchema(
+            semester_id=semester_id,
+            slots_checked=len(slots),
+            enrollments_checked=len(enrollments),
+            room_clashes=[
+                _clash("room", first, second)
+                for room in sorted(by_room)
+                for first, second in sweep(by_room[room])
+            ],
+            student_clashes=[
+                _clash("student", first, second, user_id)
+                for user_id in sorted(by_user)
+                for first, second in sweep(by_user[user_id])
+            ],
+        )
@@ -1,4 +1,4 @@
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 from typing import List, Optional
 
 from unisphere.schemas.course_schema import (CourseCreateSchema, CourseSchema,
@@ -7,9 +7,10 @@ from unisphere.schemas.course_translation_schema import (
     CourseTranslationCreateSchema, CourseTranslationSchema,
     CourseTranslationUpdateSchema)
 from unisphere.schemas.user_enroll_schema import UserEnrollSchema
+from unisphere.services.bulk_crud import BulkCRUDInterface
 
 
-class CourseServiceInterface(ABC):
+class CourseServiceInterface(BulkCRUDInterface):
     @abstractmethod
     async def get_courses_by_semester(self, semester_id: int) -> List[CourseSchema]:
         pass
@@ -19,7 +20,7 @@ class CourseServiceInterface(ABC):
         pass
 
     @abstractmethod
-    async def enroll_user_to_course(self, user_id: int, course_id: int) -> UserEnrollSchema:
+    async def enroll_user_to_course(self, user_id: int, course_id: int, section_id: int) -> UserEnrollSchema:
         pass
 
     @abstractmethod
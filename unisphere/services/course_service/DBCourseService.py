@@ -1,10 +1,13 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
 from fastapi import HTTPException, status
+from sqlalchemy import delete
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache, cached, invalidates
 from unisphere.models.course_model import CourseModel, CourseTranslationModel
+from unisphere.models.section_model import SectionModel
 from unisphere.models.user_enroll_model import UserEnrollModel
 from unisphere.schemas.course_schema import (CourseCreateSchema, CourseSchema,
                                              CourseUpdateSchema)
@@ -12,49 +15,96 @@ from unisphere.schemas.course_translation_schema import (
     CourseTranslationCreateSchema, CourseTranslationSchema,
     CourseTranslationUpdateSchema)
 from unisphere.schemas.user_enroll_schema import UserEnrollSchema
+from unisphere.services.bulk_crud import BulkCRUDService
+from unisphere.services.clash_service import ClashService
+from unisphere.services.occurrence_service import OccurrenceService
 
 from .CourseServiceInterface import CourseServiceInterface
 
 
-class DBCourseService(CourseServiceInterface):
-    def __init__(self, session: AsyncSession):
+class DBCourseService(BulkCRUDService, CourseServiceInterface):
+    bulk_model = CourseModel
+    bulk_schema = CourseSchema
+    bulk_key = ("course_code",)
+    bulk_tags = ("courses", "timetables")
+
+    def __init__(self, session: AsyncSession, cache: Optional[TaggedCache] = None):
         self.session = session
+        self.cache = cache
+        self.occurrences = OccurrenceService(session)
+
+    async def _after_bulk_update(self, changed: Dict[int, Set[str]]) -> None:
+        moved = [course_id for course_id, fields in changed.items() if "semester_id" in fields]
+        if moved:
+            await self._refresh_occurrences(moved)
+
+    async def _refresh_occurrences(self, course_ids: List[int]) -> None:
+        """Re-expand the sections of courses that moved to another semester"""
+        sections = await self.session.exec(
+            select(SectionModel.section_id).where(SectionModel.course_id.in_(course_ids)))
+        await self.occurrences.refresh_sections(sections.all())
 
     # ----------------------
     # Course CRUD
     # ----------------------
+    @cached("courses")
     async def get_courses_by_semester(self, semester_id: int) -> List[CourseSchema]:
         query = select(CourseModel).where(CourseModel.semester_id == semester_id)
         result = await self.session.exec(query)
         return [CourseSchema.model_validate(c) for c in result.all()]
 
     async def get_user_courses(self, user_id: int, semester_id: Optional[int] = None) -> List[CourseSchema]:
-        query = select(CourseModel).join(UserEnrollModel).where(UserEnrollModel.user_id == user_id)
+        enrolled = (
+            select(SectionModel.course_id)
+            .join(UserEnrollModel, UserEnrollModel.section_id == SectionModel.section_id)
+            .where(UserEnrollModel.user_id == user_id)
+        )
+        query = select(CourseModel).where(CourseModel.course_id.in_(enrolled))
         if semester_id:
             query = query.where(CourseModel.semester_id == semester_id)
         result = await self.session.exec(query)
         return [CourseSchema.model_validate(c) for c in result.all()]
 
-    async def enroll_user_to_course(self, user_id: int, course_id: int) -> UserEnrollSchema:
-        enroll = UserEnrollModel(user_id=user_id, course_id=course_id, section_id=1)
+    @invalidates("timetable:user:{user_id}")
+    async def enroll_user_to_course(self, user_id: int, course_id: int, section_id: int) -> UserEnrollSchema:
+        section = (await self.session.exec(select(SectionModel).where(
+            SectionModel.section_id == section_id,
+            SectionModel.course_id == course_id
+        ))).first()
+        if not section:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found in this course")
+        existing = (await self.session.exec(select(UserEnrollModel).where(
+            UserEnrollModel.user_id == user_id,
+            UserEnrollModel.section_id == section_id
+        ))).first()
+        if existing:
+            return UserEnrollSchema.model_validate(existing)
+        clashes = await ClashService(self.session, self.cache).check_conflicts(user_id, section_id)
+        if clashes:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail={
+                "message": "Section clashes with the student's timetable",
+                "clashes": [c.model_dump(mode="json") for c in clashes],
+            })
+        enroll = UserEnrollModel(user_id=user_id, section_id=section_id)
         self.session.add(enroll)
         await self.session.commit()
         await self.session.refresh(enroll)
         return UserEnrollSchema.model_validate(enroll)
 
+    @invalidates("timetable:user:{user_id}")
     async def withdraw_user_from_course(self, user_id: int, course_id: int) -> bool:
-        query = select(UserEnrollModel).where(
+        sections = select(SectionModel.section_id).where(SectionModel.course_id == course_id)
+        result = await self.session.exec(delete(UserEnrollModel).where(
             UserEnrollModel.user_id == user_id,
-            UserEnrollModel.course_id == course_id
-        )
-        result = await self.session.exec(query)
-        enrollment = result.first()
-        if not enrollment:
+            UserEnrollModel.section_id.in_(sections)
+        ))
+        if result.rowcount == 0:
+            await self.session.rollback()
             return False
-        await self.session.delete(enrollment)
         await self.session.commit()
         return True
 
+    @invalidates("courses")
     async def create_course(self, course_data: CourseCreateSchema) -> CourseSchema:
         course = CourseModel(**course_data.model_dump())
         self.session.add(course)
@@ -62,19 +112,25 @@ class DBCourseService(CourseServiceInterface):
         await self.session.refresh(course)
         return CourseSchema.model_validate(course)
 
+    @invalidates("courses", "timetables")
     async def update_course(self, course_id: int, course_data: CourseUpdateSchema) -> CourseSchema:
         query = select(CourseModel).where(CourseModel.course_id == course_id)
         result = await self.session.exec(query)
         course = result.first()
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
-        for key, value in course_data.model_dump(exclude_unset=True).items():
+        update_data = course_data.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
             setattr(course, key, value)
         self.session.add(course)
+        if "semester_id" in update_data:
+            # Its sections now meet within the other semester's dates
+            await self._refresh_occurrences([course_id])
         await self.session.commit()
         await self.session.refresh(course)
         return CourseSchema.model_validate(course)
 
+    @invalidates("courses")
     async def delete_course(self, course_id: int) -> bool:
         query = select(CourseModel).where(CourseModel.course_id == course_id)
         result = await self.session.exec(query)
@@ -88,6 +144,7 @@ class DBCourseService(CourseServiceInterface):
     # ----------------------
     # Course Translation CRUD
     # ----------------------
+    @invalidates("courses")
     async def create_translation(self, data: CourseTranslationCreateSchema) -> CourseTranslationSchema:
         translation = CourseTranslationModel.from_orm(data)
         self.session.add(translation)
@@ -95,6 +152,7 @@ class DBCourseService(CourseServiceInterface):
         await self.session.refresh(translation)
         return CourseTranslationSchema.model_validate(translation)
 
+    @cached("courses")
     async def get_translation(self, course_id: int, language_code: str) -> CourseTranslationSchema:
         query = select(CourseTranslationModel).where(
             CourseTranslationModel.course_id == course_id,
@@ -106,6 +164,7 @@ class DBCourseService(CourseServiceInterface):
             raise HTTPException(status_code=404, detail="Translation not found")
         return CourseTranslationSchema.model_validate(translation)
 
+    @invalidates("courses")
     async def update_translation(
         self, course_id: int, language_code: str, data: CourseTranslationUpdateSchema
     ) -> CourseTranslationSchema:
@@ -124,6 +183,7 @@ class DBCourseService(CourseServiceInterface):
         await self.session.refresh(translation)
         return CourseTranslationSchema.model_validate(translation)
 
+    @invalidates("courses")
     async def delete_translation(self, course_id: int, language_code: str) -> bool:
         query = select(CourseTranslationModel).where(
             CourseTranslationModel.course_id == course_id,
@@ -137,6 +197,7 @@ class DBCourseService(CourseServiceInterface):
         await self.session.commit()
         return True
 
+    @cached("courses")
     async def list_translations(self, course_id: int) -> List[CourseTranslationSchema]:
         query = select(CourseTranslationModel).where(CourseTranslationModel.course_id == course_id)
         result = await self.session.exec(query)
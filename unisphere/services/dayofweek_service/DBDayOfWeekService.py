@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException, status
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache, cached, invalidates
 from unisphere.models.day_of_week_model import DayModel, DayTranslationModel
 from unisphere.schemas.day_of_week_schema import (DayOfWeekCreateSchema,
                                                   DayOfWeekSchema,
@@ -11,17 +12,28 @@ from unisphere.schemas.day_of_week_schema import (DayOfWeekCreateSchema,
 from unisphere.schemas.day_of_week_translation_schema import (
     DayTranslationCreateSchema, DayTranslationSchema,
     DayTranslationUpdateSchema)
+from unisphere.services.bulk_crud import BulkCRUDService
 
 from .DayOfWeekService import DayOfWeekServiceInterface
 
+# The days of the week are seeded once and practically never change
+DAYS_CACHE_TTL_SECONDS = 24 * 3600
 
-class DBDayOfWeekService(DayOfWeekServiceInterface):
-    def __init__(self, session: AsyncSession):
+
+class DBDayOfWeekService(BulkCRUDService, DayOfWeekServiceInterface):
+    bulk_model = DayModel
+    bulk_schema = DayOfWeekSchema
+    bulk_key = ("day_code",)
+    bulk_tags = ("days",)
+
+    def __init__(self, session: AsyncSession, cache: Optional[TaggedCache] = None):
         self.session = session
+        self.cache = cache
 
     # ----------------------
     # Day CRUD
     # ----------------------
+    @invalidates("days")
     async def create_day(self, data: DayOfWeekCreateSchema) -> DayOfWeekSchema:
         day = DayModel(**data.model_dump())
         self.session.add(day)
@@ -29,6 +41,7 @@ class DBDayOfWeekService(DayOfWeekServiceInterface):
         await self.session.refresh(day)
         return DayOfWeekSchema.model_validate(day)
 
+    @cached("days", ttl=DAYS_CACHE_TTL_SECONDS)
     async def get_day(self, day_id: int) -> DayOfWeekSchema:
         query = select(DayModel).where(DayModel.day_id == day_id)
         result = await self.session.exec(query)
@@ -37,6 +50,7 @@ class DBDayOfWeekService(DayOfWeekServiceInterface):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Day not found")
         return DayOfWeekSchema.model_validate(day)
 
+    @invalidates("days")
     async def update_day(self, day_id: int, data: DayOfWeekUpdateSchema) -> DayOfWeekSchema:
         query = select(DayModel).where(DayModel.day_id == day_id)
         result = await self.session.exec(query)
@@ -50,6 +64,7 @@ class DBDayOfWeekService(DayOfWeekServiceInterface):
         await self.session.refresh(day)
         return DayOfWeekSchema.model_validate(day)
 
+    @invalidates("days")
     async def delete_day(self, day_id: int) -> bool:
         query = select(DayModel).where(DayModel.day_id == day_id)
         result = await self.session.exec(query)
@@ -60,6 +75,7 @@ class DBDayOfWeekService(DayOfWeekServiceInterface):
         await self.session.commit()
         return True
 
+    @cached("days", ttl=DAYS_CACHE_TTL_SECONDS)
     async def list_days(self) -> List[DayOfWeekSchema]:
         query = select(DayModel)
         result = await self.session.exec(query)
@@ -68,6 +84,7 @@ class DBDayOfWeekService(DayOfWeekServiceInterface):
     # ----------------------
     # Day Translation CRUD
     # ----------------------
+    @invalidates("days")
     async def create_translation(self, data: DayTranslationCreateSchema) -> DayTranslationSchema:
         translation = DayTranslationModel(**data.model_dump())
         self.session.add(translation)
@@ -75,6 +92,7 @@ class DBDayOfWeekService(DayOfWeekServiceInterface):
         await self.session.refresh(translation)
         return DayTranslationSchema.model_validate(translation)
 
+    @cached("days", ttl=DAYS_CACHE_TTL_SECONDS)
     async def get_translation(self, day_id: int, language_code: str) -> DayTranslationSchema:
         query = select(DayTranslationModel).where(
             DayTranslationModel.day_id == day_id,
@@ -86,6 +104,7 @@ class DBDayOfWeekService(DayOfWeekServiceInterface):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Translation not found")
         return DayTranslationSchema.model_validate(translation)
 
+    @invalidates("days")
     async def update_translation(self, day_id: int, language_code: str, data: DayTranslationUpdateSchema) -> DayTranslationSchema:
         query = select(DayTranslationModel).where(
             DayTranslationModel.day_id == day_id,
@@ -102,6 +121,7 @@ class DBDayOfWeekService(DayOfWeekServiceInterface):
         await self.session.refresh(translation)
         return DayTranslationSchema.model_validate(translation)
 
+    @invalidates("days")
     async def delete_translation(self, day_id: int, language_code: str) -> bool:
         query = select(DayTranslationModel).where(
             DayTranslationModel.day_id == day_id,
@@ -115,6 +135,7 @@ class DBDayOfWeekService(DayOfWeekServiceInterface):
         await self.session.commit()
         return True
 
+    @cached("days", ttl=DAYS_CACHE_TTL_SECONDS)
     async def list_translations(self, day_id: int) -> List[DayTranslationSchema]:
         query = select(DayTranslationModel).where(DayTranslationModel.day_id == day_id)
         result = await self.session.exec(query)
@@ -1,4 +1,4 @@
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 from typing import List
 
 from unisphere.schemas.day_of_week_schema import (DayOfWeekCreateSchema,
@@ -7,9 +7,10 @@ from unisphere.schemas.day_of_week_schema import (DayOfWeekCreateSchema,
 from unisphere.schemas.day_of_week_translation_schema import (
     DayTranslationCreateSchema, DayTranslationSchema,
     DayTranslationUpdateSchema)
+from unisphere.services.bulk_crud import BulkCRUDInterface
 
 
-class DayOfWeekServiceInterface(ABC):
+class DayOfWeekServiceInterface(BulkCRUDInterface):
 
     # --- Day CRUD ---
     @abstractmethod
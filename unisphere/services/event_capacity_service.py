@@ -0,0 +1,359 @@
+import asyncio
+import logging
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, List, Optional, Tuple
+
+import redis.asyncio as redis
+from sqlalchemy import delete, func, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere import models
+from unisphere.core.config import get_settings
+from unisphere.models.event_model import Event, EventRegistration
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "event:registrations:pending"
+# Entries flush_pending has taken off the queue but not yet finished writing
+PROCESSING_KEY = "event:registrations:processing"
+
+# KEYS: seats, registered, waitlist, waiting, pending, notes
+# ARGV: event_id, user_id, notes
+ADMIT_SCRIPT = """
+if redis.call('SISMEMBER', KEYS[2], ARGV[2]) == 1 then
+    return 'already_registered'
+end
+local seats = redis.call('GET', KEYS[1])
+if not seats then
+    return 'not_primed'
+end
+if ARGV[3] ~= '' then
+    redis.call('HSET', KEYS[6], ARGV[2], ARGV[3])
+end
+if tonumber(seats) == 0 then
+    if redis.call('SADD', KEYS[4], ARGV[2]) == 1 then
+        redis.call('RPUSH', KEYS[3], ARGV[2])
+    end
+    return 'waitlisted'
+end
+if tonumber(seats) > 0 then
+    redis.call('DECR', KEYS[1])
+end
+redis.call('SADD', KEYS[2], ARGV[2])
+redis.call('RPUSH', KEYS[5], ARGV[1] .. ':' .. ARGV[2])
+return 'admitted'
+"""
+
+# KEYS: seats, registered, waitlist, waiting, pending, notes, processing
+# ARGV: event_id, user_id
+# Returns {released, still_pending, promoted_user_id}
+RELEASE_SCRIPT = """
+redis.call('HDEL', KEYS[6], ARGV[2])
+if redis.call('SREM', KEYS[4], ARGV[2]) == 1 then
+    redis.call('LREM', KEYS[3], 0, ARGV[2])
+    return {1, 1, ''}
+end
+if redis.call('SREM', KEYS[2], ARGV[2]) == 0 then
+    return {0, 0, ''}
+end
+local entry = ARGV[1] .. ':' .. ARGV[2]
+local still_pending = redis.call('LREM', KEYS[5], 0, entry)
+if still_pending == 0 then
+    -- Being written right now; flush_pending undoes it once it commits
+    still_pending = redis.call('LREM', KEYS[7], 0, entry)
+end
+local promoted = redis.call('LPOP', KEYS[3])
+if promoted then
+    redis.call('SREM', KEYS[4], promoted)
+    redis.call('SADD', KEYS[2], promoted)
+    redis.call('RPUSH', KEYS[5], ARGV[1] .. ':' .. promoted)
+    return {1, still_pending, promoted}
+end
+if tonumber(redis.call('GET', KEYS[1]) or '-1') >= 0 then
+    redis.call('INCR', KEYS[1])
+end
+return {1, still_pending, ''}
+"""
+
+# KEYS: seats, registered
+# ARGV: seats, registered user ids...
+PRIME_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+for i = 2, #ARGV, 1000 do
+    redis.call('SADD', KEYS[2], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+end
+redis.call('SET', KEYS[1], ARGV[1])
+return 1
+"""
+
+# KEYS: seats, registered, waitlist, waiting, pending
+# ARGV: event_id, max_capacity (-1 when unlimited)
+# Returns the promoted user ids, or false when the event is not primed
+RESIZE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+local seats = tonumber(ARGV[2])
+if seats >= 0 then
+    seats = math.max(0, seats - redis.call('SCARD', KEYS[2]))
+end
+local promoted = {}
+while seats ~= 0 do
+    local user_id = redis.call('LPOP', KEYS[3])
+    if not user_id then
+        break
+    end
+    redis.call('SREM', KEYS[4], user_id)
+    redis.call('SADD', KEYS[2], user_id)
+    redis.call('RPUSH', KEYS[5], ARGV[1] .. ':' .. user_id)
+    promoted[#promoted + 1] = user_id
+    if seats > 0 then
+        seats = seats - 1
+    end
+end
+redis.call('SET', KEYS[1], seats)
+return promoted
+"""
+
+# KEYS: pending, processing
+# ARGV: batch_size
+CLAIM_SCRIPT = """
+local entries = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #entries > 0 then
+    redis.call('LTRIM', KEYS[1], #entries, -1)
+    redis.call('RPUSH', KEYS[2], unpack(entries))
+end
+return entries
+"""
+
+# KEYS: processing
+# ARGV: entries...
+# Returns the entries a release took back while they were being written
+SETTLE_SCRIPT = """
+local cancelled = {}
+for _, entry in ipairs(ARGV) do
+    if redis.call('LREM', KEYS[1], 1, entry) == 0 then
+        cancelled[#cancelled + 1] = entry
+    end
+end
+return cancelled
+"""
+
+# KEYS: pending, processing
+# ARGV: entries...
+RESTORE_SCRIPT = """
+for i = #ARGV, 1, -1 do
+    if redis.call('LREM', KEYS[2], 1, ARGV[i]) == 1 then
+        redis.call('LPUSH', KEYS[1], ARGV[i])
+    end
+end
+return 1
+"""
+
+
+class AdmissionResult(str, Enum):
+    ADMITTED = "admitted"
+    WAITLISTED = "waitlisted"
+    ALREADY_REGISTERED = "already_registered"
+    NOT_PRIMED = "not_primed"
+
+
+class RedisCapacityEngine:
+    """Redis-fronted seat counters and FIFO waitlists for high-demand events
+
+    Admission runs as a single Lua script, so the seat counter, the registered
+    set and the waitlist change atomically without touching the events row.
+    Admitted registrations are queued and written behind to
+    event_registrations in batches by flush_pending(), which parks each
+    batch on a processing list until it is written so a release can still
+    take an in-flight registration back.
+    """
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self._admit = redis_client.register_script(ADMIT_SCRIPT)
+        self._release = redis_client.register_script(RELEASE_SCRIPT)
+        self._prime = redis_client.register_script(PRIME_SCRIPT)
+        self._resize = redis_client.register_script(RESIZE_SCRIPT)
+        self._claim = redis_client.register_script(CLAIM_SCRIPT)
+        self._settle = redis_client.register_script(SETTLE_SCRIPT)
+        self._restore = redis_client.register_script(RESTORE_SCRIPT)
+
+    @staticmethod
+    def _keys(event_id: int) -> List[str]:
+        prefix = f"event:{event_id}"
+        return [
+            f"{prefix}:seats",
+            f"{prefix}:registered",
+            f"{prefix}:waitlist",
+            f"{prefix}:waiting",
+            PENDING_KEY,
+            f"{prefix}:notes",
+            PROCESSING_KEY,
+        ]
+
+    async def prime(self, event: Event, registered_user_ids: List[int]) -> bool:
+        """Load an event's capacity state from the database, once"""
+        if event.max_capacity:
+            seats = max(0, event.max_capacity - event.registration_count)
+        else:
+            seats = -1  # Unlimited capacity
+        keys = self._keys(event.id)[:2]
+        primed = await self._prime(keys=keys, args=[seats, *registered_user_ids])
+        return bool(primed)
+
+    async def resize(self, event_id: int, max_capacity: Optional[int]) -> Optional[List[int]]:
+        """Apply a new capacity to a primed event, promoting from the waitlist
+
+        Free seats are counted against everyone admitted, written or not, and
+        handed to the head of the waitlist before any new admission. Returns
+        the promoted user ids, or None when the event is not primed.
+        """
+        promoted = await self._resize(
+            keys=self._keys(event_id)[:5], args=[event_id, max_capacity or -1])
+        return None if promoted is None else [int(user_id) for user_id in promoted]
+
+    async def admit(self, event_id: int, user_id: int, notes: Optional[str] = None) -> AdmissionResult:
+        """Take a seat or join the waitlist"""
+        result = await self._admit(
+            keys=self._keys(event_id), args=[event_id, user_id, notes or ""])
+        if isinstance(result, bytes):
+            result = result.decode()
+        return AdmissionResult(result)
+
+    async def release(self, event_id: int, user_id: int) -> Tuple[bool, bool, Optional[int]]:
+        """Give a seat back, promoting the head of the waitlist
+
+        Returns (released, still_pending, promoted_user_id). still_pending is
+        true when the registration never reached the database, or is being
+        written and will be removed again by the flush writing it.
+        """
+        released, still_pending, promoted = await self._release(
+            keys=self._keys(event_id), args=[event_id, user_id])
+        return bool(released), bool(still_pending), int(promoted) if promoted else None
+
+    async def waitlist_position(self, event_id: int, user_id: int) -> Optional[int]:
+        """1-based position on the waitlist, or None when not waiting"""
+        position = await self.redis.lpos(self._keys(event_id)[2], user_id)
+        return None if position is None else position + 1
+
+    async def forget(self, event_id: int) -> None:
+        """Drop an event's seat state and waitlist"""
+        keys = self._keys(event_id)
+        await self.redis.delete(*keys[:4], keys[5])
+
+    async def flush_pending(self, session: AsyncSession, batch_size: int = 500) -> int:
+        """Write a batch of admitted registrations to the database
+
+        Returns the number of queue entries consumed. Entries are pushed back
+        to the head of the queue if the write fails, and registrations
+        released while they were being written are deleted again.
+        """
+        queues = [PENDING_KEY, PROCESSING_KEY]
+        entries = await self._claim(keys=queues, args=[batch_size])
+        if not entries:
+            return 0
+
+        try:
+            await self._write_registrations(session, self._pairs(entries))
+        except Exception:
+            await session.rollback()
+            await self._restore(keys=queues, args=entries)
+            raise
+        cancelled = await self._settle(keys=queues[1:], args=entries)
+        if cancelled:
+            await self._delete_registrations(session, self._pairs(cancelled))
+        return len(entries)
+
+    @staticmethod
+    def _pairs(entries: List) -> List[Tuple[int, int]]:
+        pairs = []
+        for entry in entries:
+            if isinstance(entry, bytes):
+                entry = entry.decode()
+            event_id, user_id = entry.split(":")
+            pairs.append((int(event_id), int(user_id)))
+        return pairs
+
+    @staticmethod
+    def _recount(event_ids, updated_at: datetime):
+        registered = (
+            select(func.count())
+            .select_from(EventRegistration)
+            .where(EventRegistration.event_id == Event.id)
+            .scalar_subquery()
+        )
+        return (
+            update(Event)
+            .where(Event.id.in_(event_ids))
+            .values(registration_count=registered, updated_at=updated_at)
+        )
+
+    async def _write_registrations(self, session: AsyncSession, pairs: List[Tuple[int, int]]) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for event_id, user_id in pairs:
+                pipe.hget(self._keys(event_id)[5], user_id)
+            notes = await pipe.execute()
+
+        event_ids = {event_id for event_id, _ in pairs}
+        existing = await session.exec(select(Event.id).where(Event.id.in_(event_ids)))
+        live_events = set(existing.all())
+        registered_at = datetime.now()
+        rows = [
+            {"event_id": event_id, "user_id": user_id,
+                "notes": note, "registered_at": registered_at}
+            for (event_id, user_id), note in zip(pairs, notes)
+            if event_id in live_events
+        ]
+        if rows:
+            dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+            await session.exec(
+                dialect.insert(EventRegistration)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["event_id", "user_id"])
+            )
+            await session.exec(self._recount(live_events, registered_at))
+        await session.commit()
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for event_id, user_id in pairs:
+                pipe.hdel(self._keys(event_id)[5], user_id)
+            await pipe.execute()
+
+    async def _delete_registrations(self, session: AsyncSession, pairs: List[Tuple[int, int]]) -> None:
+        await session.exec(
+            delete(EventRegistration)
+            .where(tuple_(EventRegistration.event_id, EventRegistration.user_id).in_(pairs))
+        )
+        await session.exec(self._recount({event_id for event_id, _ in pairs}, datetime.now()))
+        await session.commit()
+
+
+async def get_capacity_engine() -> AsyncIterator[Optional[RedisCapacityEngine]]:
+    """Dependency that yields the Redis capacity engine when it is enabled"""
+    if get_settings().EVENT_CAPACITY_BACKEND != "redis":
+        yield None
+        return
+    async for redis_client in models.get_redis():
+        yield RedisCapacityEngine(redis_client)
+
+
+async def run_write_behind(interval: float, batch_size: int) -> None:
+    """Flush admitted registrations to the database until cancelled"""
+    async for redis_client in models.get_redis():
+        engine = RedisCapacityEngine(redis_client)
+        while True:
+            try:
+                async for session in models.get_session():
+                    while await engine.flush_pending(session, batch_size) == batch_size:
+                        pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to flush pending event registrations")
+            await asyncio.sleep(interval)
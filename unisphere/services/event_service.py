@@ -1,35 +1,118 @@
+import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from sqlmodel import select
+from sqlalchemy import delete, func, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import exists, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from unisphere.models.event_model import Event, EventRegistration
+from unisphere import models
+from unisphere.core.conditional import ListVersion
+from unisphere.models.event_model import EVENT_STATUSES, Event, EventRegistration
 from unisphere.schemas.event_schema import EventCreate, EventUpdate
+from unisphere.services.aggregates import count_where, inline, paginate_keyset
+from unisphere.services.event_capacity_service import (AdmissionResult,
+                                                       RedisCapacityEngine)
+
+logger = logging.getLogger(__name__)
+
+# Listing order; matches the ix_events_date_id index
+EVENT_ORDER = (Event.date, Event.id)
 
 
 class EventService:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        capacity_engine: Optional[RedisCapacityEngine] = None,
+        read_session: Optional[AsyncSession] = None
+    ):
         self.session = session
+        self.capacity_engine = capacity_engine
+        # Listings may be served by a read replica
+        self.read_session = read_session or session
+
+    @staticmethod
+    def _filtered(query, category: Optional[str], status: Optional[str]):
+        if category:
+            query = query.where(Event.category == category)
+        if status:
+            query = query.where(Event.status == inline(status, EVENT_STATUSES))
+        return query
 
     async def get_events(
         self,
         skip: int = 0,
         limit: int = 100,
         category: Optional[str] = None,
-        status: Optional[str] = None
-    ) -> List[Event]:
-        """Get all events with filters"""
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Event], Optional[str]]:
+        """Get events with filters, ordered by (date, id), and the next page's cursor"""
         query = select(Event)
 
-        if category:
-            query = query.where(Event.category == category)
-        if status:
-            query = query.where(Event.status == status)
+        query = self._filtered(query, category, status)
+
+        return await paginate_keyset(
+            self.read_session, query, EVENT_ORDER, limit, cursor, offset=skip)
+
+    async def get_events_with_user_state(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[Event, bool, bool]], Optional[str]]:
+        """Get events with the user's registration state in a single query
+
+        Returns (event, is_registered, is_full) tuples so the listing does not
+        need a per-event lookup for either flag, plus the next page's cursor.
+        """
+        is_registered = (
+            exists()
+            .where(
+                EventRegistration.event_id == Event.id,
+                EventRegistration.user_id == user_id
+            )
+            .label("is_registered")
+        )
+        query = select(Event, is_registered)
+
+        query = self._filtered(query, category, status)
 
-        query = query.offset(skip).limit(limit)
-        result = await self.session.exec(query)
-        return list(result.all())
+        rows, next_cursor = await paginate_keyset(
+            self.read_session, query, EVENT_ORDER, limit, cursor, offset=skip)
+        return [
+            (event, bool(registered), self._is_full(event))
+            for event, registered in rows
+        ], next_cursor
+
+    async def get_events_version(
+        self,
+        user_id: int,
+        category: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> ListVersion:
+        """Version key of get_events_with_user_state under the same filters
+
+        Registration counts bump updated_at, so is_full is covered; the
+        caller's own registrations (count and newest id) cover is_registered.
+        """
+        own = EventRegistration.user_id == user_id
+        query = self._filtered(
+            select(
+                func.count(Event.id),
+                func.max(Event.updated_at),
+                select(func.count()).select_from(EventRegistration).where(own).scalar_subquery(),
+                select(func.max(EventRegistration.id)).where(own).scalar_subquery(),
+            ),
+            category, status)
+        count, last_modified, registrations, newest_registration = (
+            await self.read_session.exec(query)).one()
+        return ListVersion(count, last_modified, (registrations, newest_registration))
 
     async def get_event_by_id(self, event_id: int) -> Optional[Event]:
         """Get event by ID"""
@@ -62,6 +145,11 @@ class EventService:
         self.session.add(event)
         await self.session.commit()
         await self.session.refresh(event)
+
+        if self.capacity_engine and "max_capacity" in update_data:
+            # Seats a larger capacity frees go to the waitlist before new admissions.
+            # An event that is not primed yet picks the capacity up when it is.
+            await self.capacity_engine.resize(event_id, event.max_capacity)
         return event
 
     async def delete_event(self, event_id: int) -> bool:
@@ -85,15 +173,15 @@ class EventService:
 
         await self.session.delete(event)
         await self.session.commit()
+
+        if self.capacity_engine:
+            await self.capacity_engine.forget(event_id)
         return True
 
     async def get_event_registration_count(self, event_id: int) -> int:
         """Get registration count for an event"""
-        statement = select(EventRegistration).where(
-            EventRegistration.event_id == event_id)
-        result = await self.session.exec(statement)
-        registrations = result.all()
-        return len(registrations)
+        return await count_where(
+            self.session, EventRegistration, EventRegistration.event_id == event_id)
 
     async def is_user_registered(self, event_id: int, user_id: int) -> bool:
         """Check if user is registered for an event"""
@@ -111,18 +199,30 @@ class EventService:
         user_id: int,
         notes: Optional[str] = None
     ) -> Optional[EventRegistration]:
-        """Register a user for an event"""
-        # Get event to check capacity
-        event = await self.get_event_by_id(event_id)
-        if not event:
-            return None
-
-        # Check if already registered
-        if await self.is_user_registered(event_id, user_id):
-            return None
-
-        # Check if event is full
-        if event.max_capacity and event.registration_count >= event.max_capacity:
+        """Register a user for an event
+
+        The seat is reserved with a single conditional UPDATE, so concurrent
+        registrations can never push registration_count past max_capacity.
+        A duplicate registration violates the (event_id, user_id) unique
+        constraint and rolls the reservation back with the same transaction.
+        Returns None if the event does not exist, is full, or the user is
+        already registered.
+        """
+        reserve = (
+            update(Event)
+            .where(
+                Event.id == event_id,
+                or_(
+                    Event.max_capacity.is_(None),
+                    Event.registration_count < Event.max_capacity
+                )
+            )
+            .values(registration_count=Event.registration_count + 1, updated_at=datetime.now())
+            .returning(Event.id)
+        )
+        result = await self.session.exec(reserve)
+        if result.first() is None:
+            await self.session.rollback()
             return None
 
         registration = EventRegistration(
@@ -130,47 +230,80 @@ class EventService:
             user_id=user_id,
             notes=notes
         )
-
-        # Update registration count
-        event.registration_count += 1
-
         self.session.add(registration)
-        self.session.add(event)
-        await self.session.commit()
-        await self.session.refresh(registration)
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            return None
         return registration
 
-    async def unregister_user_from_event(self, event_id: int, user_id: int) -> bool:
-        """Unregister a user from an event"""
-        # Get event to update count
+    async def admit_user_to_event(
+        self,
+        event_id: int,
+        user_id: int,
+        notes: Optional[str] = None
+    ) -> Optional[AdmissionResult]:
+        """Register through the Redis capacity engine
+
+        The seat is taken (or the user waitlisted) in Redis only; the
+        registration row is written behind in batches. Returns None if the
+        event does not exist.
+        """
+        result = await self.capacity_engine.admit(event_id, user_id, notes)
+        if result is not AdmissionResult.NOT_PRIMED:
+            return result
+
         event = await self.get_event_by_id(event_id)
         if not event:
-            return False
-
-        statement = select(EventRegistration).where(
-            EventRegistration.event_id == event_id,
-            EventRegistration.user_id == user_id
+            return None
+        registered = await self.session.exec(
+            select(EventRegistration.user_id).where(
+                EventRegistration.event_id == event_id)
         )
-        result = await self.session.exec(statement)
-        registration = result.first()
+        await self.capacity_engine.prime(event, list(registered.all()))
+        return await self.capacity_engine.admit(event_id, user_id, notes)
 
-        if not registration:
+    async def unregister_user_from_event(self, event_id: int, user_id: int) -> bool:
+        """Unregister a user from an event"""
+        if self.capacity_engine:
+            released, still_pending, _ = await self.capacity_engine.release(event_id, user_id)
+            if released and still_pending:
+                # Never reached the database
+                return True
+
+        result = await self.session.exec(
+            delete(EventRegistration).where(
+                EventRegistration.event_id == event_id,
+                EventRegistration.user_id == user_id
+            )
+        )
+        if result.rowcount == 0:
+            await self.session.rollback()
             return False
 
-        # Update registration count
-        event.registration_count = max(0, event.registration_count - 1)
-
-        await self.session.delete(registration)
-        self.session.add(event)
+        # Release the seat in the same transaction
+        await self.session.exec(
+            update(Event)
+            .where(Event.id == event_id, Event.registration_count > 0)
+            .values(registration_count=Event.registration_count - 1, updated_at=datetime.now())
+        )
         await self.session.commit()
         return True
 
+    @staticmethod
+    def _is_full(event: Event) -> bool:
+        """Check capacity on an already loaded event"""
+        if not event.max_capacity:
+            return False
+        return event.registration_count >= event.max_capacity
+
     async def is_event_full(self, event_id: int) -> bool:
         """Check if event has reached maximum capacity"""
         event = await self.get_event_by_id(event_id)
-        if not event or not event.max_capacity:
+        if not event:
             return False
-        return event.registration_count >= event.max_capacity
+        return self._is_full(event)
 
     async def get_available_spots(self, event_id: int) -> Optional[int]:
         """Get number of available spots for an event"""
@@ -188,28 +321,61 @@ class EventService:
             return False
 
         # Count actual registrations
-        statement = select(EventRegistration).where(
-            EventRegistration.event_id == event_id)
-        result = await self.session.exec(statement)
-        actual_count = len(result.all())
+        actual_count = await self.get_event_registration_count(event_id)
 
         # Update if different
         if event.registration_count != actual_count:
             event.registration_count = actual_count
+            event.updated_at = datetime.now()
             self.session.add(event)
             await self.session.commit()
             await self.session.refresh(event)
 
         return True
 
+    async def reconcile_registration_counts(self, chunk_size: int = 5000) -> List[int]:
+        """Correct drifted registration_count values with set-based UPDATEs
+
+        Walks the events table in primary-key ranges of chunk_size. Each range
+        is a single UPDATE ... RETURNING of the rows whose stored count differs
+        from the real one, committed on its own so long runs never hold locks
+        on the whole table. Returns the ids of the corrected events.
+        """
+        max_id = (await self.session.exec(select(func.max(Event.id)))).one()
+        if max_id is None:
+            return []
+
+        actual_count = (
+            select(func.count())
+            .select_from(EventRegistration)
+            .where(EventRegistration.event_id == Event.id)
+            .scalar_subquery()
+        )
+        drifted: List[int] = []
+        for lower in range(0, max_id + 1, chunk_size):
+            result = await self.session.exec(
+                update(Event)
+                .where(
+                    Event.id >= lower,
+                    Event.id < lower + chunk_size,
+                    Event.registration_count != actual_count
+                )
+                .values(registration_count=actual_count, updated_at=datetime.now())
+                .returning(Event.id)
+            )
+            drifted.extend(result.scalars().all())
+            await self.session.commit()
+        return drifted
+
     async def sync_all_registration_counts(self) -> int:
-        """Sync registration_count for all events"""
-        events = await self.get_events(skip=0, limit=1000)  # Get all events
-        synced_count = 0
+        """Sync registration_count for all events, returning how many were corrected"""
+        return len(await self.reconcile_registration_counts())
 
-        for event in events:
-            if event.id:
-                await self.sync_registration_count(event.id)
-                synced_count += 1
 
-        return synced_count
+async def reconcile_registration_counts_job(chunk_size: int = 5000) -> List[int]:
+    """Background job: reconcile every event's registration_count"""
+    async for session in models.get_session():
+        drifted = await EventService(session).reconcile_registration_counts(chunk_size)
+        logger.info("Corrected registration_count on %d events", len(drifted))
+        return drifted
+    return []
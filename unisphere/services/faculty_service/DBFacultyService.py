@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache, cached, invalidates
 from unisphere.models.faculty_model import (FacultyModel,
                                             FacultyTranslationModel)
 from unisphere.schemas.faculty_schema import (FacultyCreateSchema,
@@ -12,17 +13,25 @@ from unisphere.schemas.faculty_schema import (FacultyCreateSchema,
 from unisphere.schemas.faculty_translation_schema import (
     FacultyTranslationCreateSchema, FacultyTranslationSchema,
     FacultyTranslationUpdateSchema)
+from unisphere.services.bulk_crud import BulkCRUDService
 
 from .FacultyServiceInterface import FacultyServiceInterface
 
 
-class DBFacultyService(FacultyServiceInterface):
-    def __init__(self, session: AsyncSession):
+class DBFacultyService(BulkCRUDService, FacultyServiceInterface):
+    bulk_model = FacultyModel
+    bulk_schema = FacultySchema
+    bulk_key = ("faculty_code",)
+    bulk_tags = ("faculties",)
+
+    def __init__(self, session: AsyncSession, cache: Optional[TaggedCache] = None):
         self.session = session
+        self.cache = cache
 
     # ==============================
     # Faculty CRUD
     # ==============================
+    @invalidates("faculties")
     async def create_faculty(self, data: FacultyCreateSchema) -> FacultySchema:
         faculty = FacultyModel.from_orm(data)
         self.session.add(faculty)
@@ -30,12 +39,14 @@ class DBFacultyService(FacultyServiceInterface):
         await self.session.refresh(faculty)
         return FacultySchema.from_orm(faculty)
 
+    @cached("faculties")
     async def get_faculty(self, faculty_id: int) -> FacultySchema:
         faculty = await self.session.get(FacultyModel, faculty_id)
         if not faculty:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found")
         return FacultySchema.from_orm(faculty)
 
+    @invalidates("faculties")
     async def update_faculty(self, faculty_id: int, data: FacultyUpdateSchema) -> FacultySchema:
         faculty = await self.session.get(FacultyModel, faculty_id)
         if not faculty:
@@ -49,6 +60,7 @@ class DBFacultyService(FacultyServiceInterface):
         await self.session.refresh(faculty)
         return FacultySchema.from_orm(faculty)
 
+    @invalidates("faculties")
     async def delete_faculty(self, faculty_id: int) -> None:
         faculty = await self.session.get(FacultyModel, faculty_id)
         if not faculty:
@@ -57,6 +69,7 @@ class DBFacultyService(FacultyServiceInterface):
         await self.session.delete(faculty)
         await self.session.commit()
 
+    @cached("faculties")
     async def list_faculties(self, status: Optional[str] = None) -> List[FacultySchema]:
         query = select(FacultyModel)
         if status:
@@ -68,6 +81,7 @@ class DBFacultyService(FacultyServiceInterface):
     # ==============================
     # Faculty Translation CRUD
     # ==============================
+    @invalidates("faculties")
     async def create_translation(self, data: FacultyTranslationCreateSchema) -> FacultyTranslationSchema:
         translation = FacultyTranslationModel.from_orm(data)
         self.session.add(translation)
@@ -75,6 +89,7 @@ class DBFacultyService(FacultyServiceInterface):
         await self.session.refresh(translation)
         return FacultyTranslationSchema.from_orm(translation)
 
+    @cached("faculties")
     async def get_translation(self, faculty_id: int, language_code: str) -> FacultyTranslationSchema:
         query = select(FacultyTranslationModel).where(
             FacultyTranslationModel.faculty_id == faculty_id,
@@ -86,6 +101,7 @@ class DBFacultyService(FacultyServiceInterface):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Translation not found")
         return FacultyTranslationSchema.from_orm(translation)
 
+    @invalidates("faculties")
     async def update_translation(
         self, faculty_id: int, language_code: str, data: FacultyTranslationUpdateSchema
     ) -> FacultyTranslationSchema:
@@ -106,6 +122,7 @@ class DBFacultyService(FacultyServiceInterface):
         await self.session.refresh(translation)
         return FacultyTranslationSchema.from_orm(translation)
 
+    @invalidates("faculties")
     async def delete_translation(self, faculty_id: int, language_code: str) -> None:
         query = select(FacultyTranslationModel).where(
             FacultyTranslationModel.faculty_id == faculty_id,
@@ -119,6 +136,7 @@ class DBFacultyService(FacultyServiceInterface):
         await self.session.delete(translation)
         await self.session.commit()
 
+    @cached("faculties")
     async def list_translations(self, faculty_id: int) -> List[FacultyTranslationSchema]:
         query = select(FacultyTranslationModel).where(FacultyTranslationModel.faculty_id == faculty_id)
         result = await self.session.execute(query)
@@ -1,4 +1,4 @@
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 from typing import List, Optional
 
 from unisphere.schemas.faculty_schema import (FacultyCreateSchema,
@@ -7,9 +7,10 @@ from unisphere.schemas.faculty_schema import (FacultyCreateSchema,
 from unisphere.schemas.faculty_translation_schema import (
     FacultyTranslationCreateSchema, FacultyTranslationSchema,
     FacultyTranslationUpdateSchema)
+from unisphere.services.bulk_crud import BulkCRUDInterface
 
 
-class FacultyServiceInterface(ABC):
+class FacultyServiceInterface(BulkCRUDInterface):
     # ==============================
     # Faculty CRUD
     # ==============================
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import os
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageOps
+
+from unisphere.core.config import get_settings
+from unisphere.services.storage_service.LocalStorageBackend import LocalStorageBackend
+from unisphere.services.storage_service.StorageBackendInterface import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+def render_derivative(source: str, target: str, width: int, image_format: str, quality: int) -> None:
+    """Write a copy of source scaled down to width (runs in a worker process)"""
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        temp = f"{target}.{uuid.uuid4().hex}.part"
+        image.save(temp, format=image_format.upper(), quality=quality)
+    os.replace(temp, target)
+
+
+class ImageDerivativeService:
+    """Resized copies of uploaded images, rendered in a process pool
+
+    Derivatives live in uploads/derivatives/<width>/<image path>.<format>.
+    They are created eagerly after upload and lazily on first request, and
+    the least recently served ones are evicted once the directory grows past
+    max_bytes. Originals are read from the storage backend; when it is not
+    local disk they are copied to uploads/derivatives/originals/ first and
+    evicted like the derivatives.
+    """
+
+    def __init__(
+        self,
+        upload_dir: Optional[str] = None,
+        widths: Optional[List[int]] = None,
+        image_format: Optional[str] = None,
+        quality: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ):
+        self.upload_dir = Path(upload_dir or settings.UPLOAD_DIR)
+        self.derivatives_dir = self.upload_dir / "derivatives"
+        self.originals_dir = self.derivatives_dir / "originals"
+        self.widths = sorted(widths or settings.IMAGE_DERIVATIVE_WIDTHS)
+        self.image_format = image_format or settings.IMAGE_DERIVATIVE_FORMAT
+        self.quality = quality or settings.IMAGE_DERIVATIVE_QUALITY
+        self.max_bytes = max_bytes or settings.IMAGE_DERIVATIVE_CACHE_MAX_BYTES
+        self._executor = executor
+        self._inflight: Dict[Path, asyncio.Future] = {}
+        self._fetching: Dict[Path, asyncio.Task] = {}
+        self._cache_bytes: Optional[int] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=settings.IMAGE_DERIVATIVE_WORKERS)
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def nearest_width(self, requested: int) -> Optional[int]:
+        """Smallest derivative at least as wide as requested; None means the original"""
+        for width in self.widths:
+            if width >= requested:
+                return width
+        return None
+
+    async def _source(self, image_path: str, storage: StorageBackend) -> Optional[Path]:
+        if not image_path.startswith("uploads/images/"):
+            return None
+        key = image_path[len("uploads/"):]
+        if ".." in PurePosixPath(key).parts:
+            return None
+        if isinstance(storage, LocalStorageBackend):
+            try:
+                source = storage.path(key)
+            except ValueError:
+                return None
+            return source if source.is_file() else None
+
+        source = self.originals_dir / key
+        if source.is_file():
+            os.utime(source)
+            return source
+        # Concurrent requests for the same original share one download
+        task = self._fetching.get(source)
+        if task is None:
+            task = asyncio.create_task(self._fetch(storage, key, source))
+            self._fetching[source] = task
+            task.add_done_callback(lambda _: self._fetching.pop(source, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, storage: StorageBackend, key: str, source: Path) -> Optional[Path]:
+        if await storage.stat(key) is None:
+            return None
+        data = await storage.read(key)
+        await asyncio.to_thread(self._write_original, source, data)
+        await self._account(len(data))
+        return source
+
+    @staticmethod
+    def _write_original(source: Path, data: bytes) -> None:
+        source.parent.mkdir(parents=True, exist_ok=True)
+        temp = source.with_name(f"{source.name}.{uuid.uuid4().hex}.part")
+        temp.write_bytes(data)
+        os.replace(temp, source)
+
+    def _target(self, image_path: str, width: int) -> Path:
+        relative = Path(image_path[len("uploads/images/"):])
+        return self.derivatives_dir / str(width) / relative.with_suffix(f".{self.image_format}")
+
+    async def derivative_for(
+        self, image_path: str, requested_width: int, storage: StorageBackend
+    ) -> Optional[Path]:
+        """
+        File to serve for an image at a requested width
+
+        Returns the nearest derivative, rendering it if missing, the original
+        when no derivative is wide enough, or None if the image does not exist.
+        """
+        source = await self._source(image_path, storage)
+        if source is None:
+            return None
+        width = self.nearest_width(requested_width)
+        if width is None:
+            return source
+
+        target = self._target(image_path, width)
+        if target.exists():
+            # mtime doubles as last-served time for eviction
+            os.utime(target)
+            return target
+        await self._render(source, target, width)
+        return target
+
+    async def generate_all(self, image_path: str, storage: StorageBackend) -> None:
+        """Render every derivative of a new upload"""
+        try:
+            source = await self._source(image_path, storage)
+            if source is None:
+                return
+            await asyncio.gather(*(
+                self._render(source, self._target(image_path, width), width)
+                for width in self.widths
+            ))
+        except Exception:
+            logger.exception("Failed to render derivatives for %s", image_path)
+
+    async def discard_orphans(self, image_path: str, storage: StorageBackend) -> None:
+        """Drop the derivatives of an image whose original is gone"""
+        if not image_path.startswith("uploads/images/") or await storage.exists(image_path[len("uploads/"):]):
+            return
+        for width in self.widths:
+            await asyncio.to_thread(self._target(image_path, width).unlink, missing_ok=True)
+        if ".." not in PurePosixPath(image_path).parts:
+            original = self.originals_dir / image_path[len("uploads/"):]
+            await asyncio.to_thread(original.unlink, missing_ok=True)
+
+    async def _render(self, source: Path, target: Path, width: int) -> None:
+        # Concurrent requests for the same derivative share one render
+        future = self._inflight.get(target)
+        if future is None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor, render_derivative,
+                str(source), str(target), width, self.image_format, self.quality)
+            self._inflight[target] = future
+            future.add_done_callback(lambda _: self._inflight.pop(target, None))
+            await future
+            await self._account(target.stat().st_size)
+        else:
+            await future
+
+    async def _account(self, added: int) -> None:
+        if self._cache_bytes is None:
+            self._cache_bytes = await asyncio.to_thread(self._disk_usage)
+        else:
+            self._cache_bytes += added
+        if self._cache_bytes > self.max_bytes:
+            self._cache_bytes = await asyncio.to_thread(self.evict, int(self.max_bytes * 0.9))
+
+    def _disk_usage(self) -> int:
+        return sum(path.stat().st_size for path in self.derivatives_dir.rglob("*") if path.is_file())
+
+    def evict(self, target_bytes: int) -> int:
+        """Delete least recently served derivatives until at most target_bytes remain"""
+        files = [(path.stat(), path) for path in self.derivatives_dir.rglob("*") if path.is_file()]
+        total = sum(stat.st_size for stat, _ in files)
+        for stat, path in sorted(files, key=lambda item: item[0].st_mtime):
+            if total <= target_bytes:
+                break
+            try:
+                path.unlink()
+                total -= stat.st_size
+            except OSError:
+                pass
+        return total
+
+
+image_derivatives = ImageDerivativeService()
+
+
+def get_image_derivative_service() -> ImageDerivativeService:
+    return image_derivatives
@@ -0,0 +1,171 @@
+"""Materialized section occurrences
+
+section_occurrences holds every dated meeting of a section between its
+semester's start_date and end_date, expanded by services.recurrence. It is
+refreshed incrementally: a changed slot or rule replaces only its own rows,
+and a changed semester window replaces the rows of that semester's
+sections. None of these methods commit; callers refresh inside the
+transaction that made the change.
+"""
+import logging
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere.models.course_model import CourseModel
+from unisphere.models.day_of_week_model import DayModel
+from unisphere.models.schedule_model import (SectionOccurrenceModel,
+                                             SectionRRuleModel,
+                                             SectionScheduleModel)
+from unisphere.models.section_model import SectionModel
+from unisphere.models.semester_model import SemesterModel
+from unisphere.services.recurrence import (RecurrenceError, compile_rule,
+                                           weekday_of, weekly_slot)
+
+logger = logging.getLogger(__name__)
+
+# Keeps IN lists and INSERT batches well under SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+Window = Tuple[date, date]
+
+
+def _chunks(items: Sequence, size: int = CHUNK_SIZE) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def schedule_occurrences(schedule: SectionScheduleModel, day_code: str, window: Window) -> List[dict]:
+    try:
+        rule = weekly_slot(weekday_of(day_code), schedule.start_time, schedule.end_time)
+    except RecurrenceError as e:
+        logger.warning("Schedule %s not expanded: %s", schedule.schedule_id, e)
+        return []
+    return [
+        {"section_id": schedule.section_id, "schedule_id": schedule.schedule_id,
+         "starts_at": starts_at, "ends_at": ends_at}
+        for starts_at, ends_at in rule.between(*window)
+    ]
+
+
+def rrule_occurrences(rrule: SectionRRuleModel, window: Window) -> List[dict]:
+    try:
+        rule = compile_rule(rrule.rrule)
+    except RecurrenceError as e:
+        # Rules are validated on write; this is a row from before that
+        logger.warning("RRule %s not expanded: %s", rrule.rrule_id, e)
+        return []
+    return [
+        {"section_id": rrule.section_id, "rrule_id": rrule.rrule_id,
+         "starts_at": starts_at, "ends_at": ends_at}
+        for starts_at, ends_at in rule.between(*window)
+    ]
+
+
+class OccurrenceService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def semester_windows(self, section_ids: Iterable[int]) -> Dict[int, Window]:
+        """(start_date, end_date) of each section's semester"""
+        windows = {}
+        for chunk in _chunks(list(section_ids)):
+            result = await self.session.exec(
+                select(SectionModel.section_id, SemesterModel.start_date, SemesterModel.end_date)
+                .join(CourseModel, CourseModel.course_id == SectionModel.course_id)
+                .join(SemesterModel, SemesterModel.semester_id == CourseModel.semester_id)
+                .where(SectionModel.section_id.in_(chunk))
+            )
+            windows.update((section_id, (start, end)) for section_id, start, end in result.all())
+        return windows
+
+    async def _insert(self, rows: List[dict]) -> int:
+        for chunk in _chunks(rows):
+            await self.session.exec(insert(SectionOccurrenceModel), params=chunk)
+        return len(rows)
+
+    async def clear_schedule(self, schedule: SectionScheduleModel) -> None:
+        await self.session.exec(delete(SectionOccurrenceModel).where(
+            SectionOccurrenceModel.section_id == schedule.section_id,
+            SectionOccurrenceModel.schedule_id == schedule.schedule_id))
+
+    async def clear_rrule(self, rrule: SectionRRuleModel) -> None:
+        await self.session.exec(delete(SectionOccurrenceModel).where(
+            SectionOccurrenceModel.section_id == rrule.section_id,
+            SectionOccurrenceModel.rrule_id == rrule.rrule_id))
+
+    async def clear_sections(self, section_ids: Iterable[int]) -> None:
+        for chunk in _chunks(list(section_ids)):
+            await self.session.exec(delete(SectionOccurrenceModel).where(
+                SectionOccurrenceModel.section_id.in_(chunk)))
+
+    async def refresh_schedule(self, schedule: SectionScheduleModel) -> int:
+        """Replace the occurrences of one weekly slot; returns how many were written"""
+        await self.clear_schedule(schedule)
+        window = (await self.semester_windows([schedule.section_id])).get(schedule.section_id)
+        if window is None:
+            return 0
+        day_code = (await self.session.exec(
+            select(DayModel.day_code).where(DayModel.day_id == schedule.day_id))).first()
+        if day_code is None:
+            return 0
+        return await self._insert(schedule_occurrences(schedule, day_code, window))
+
+    async def refresh_rrule(self, rrule: SectionRRuleModel) -> int:
+        """Replace the occurrences of one RRULE; returns how many were written"""
+        await self.clear_rrule(rrule)
+        window = (await self.semester_windows([rrule.section_id])).get(rrule.section_id)
+        if window is None:
+            return 0
+        return await self._insert(rrule_occurrences(rrule, window))
+
+    async def refresh_sections(self, section_ids: Iterable[int]) -> int:
+        """Re-expand every slot and rule of these sections; returns how many were written"""
+        section_ids = list(section_ids)
+        windows = await self.semester_windows(section_ids)
+        await self.clear_sections(section_ids)
+
+        rows: List[dict] = []
+        for chunk in _chunks(list(windows)):
+            schedules = await self.session.exec(
+                select(SectionScheduleModel, DayModel.day_code)
+                .join(DayModel, DayModel.day_id == SectionScheduleModel.day_id)
+                .where(SectionScheduleModel.section_id.in_(chunk))
+            )
+            for schedule, day_code in schedules.all():
+                rows.extend(schedule_occurrences(schedule, day_code, windows[schedule.section_id]))
+            rrules = await self.session.exec(
+                select(SectionRRuleModel).where(SectionRRuleModel.section_id.in_(chunk)))
+            for rrule in rrules.all():
+                rows.extend(rrule_occurrences(rrule, windows[rrule.section_id]))
+        return await self._insert(rows)
+
+    async def refresh_semester(self, semester_id: int) -> int:
+        """Re-expand every section of a semester, e.g. after its dates change"""
+        result = await self.session.exec(
+            select(SectionModel.section_id)
+            .join(CourseModel, CourseModel.course_id == SectionModel.course_id)
+            .where(CourseModel.semester_id == semester_id)
+        )
+        return await self.refresh_sections(result.all())
+
+    async def list_occurrences(
+        self,
+        section_ids: Sequence[int],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[SectionOccurrenceModel]:
+        """Occurrences of these sections starting in [start, end), ordered by start"""
+        occurrences: List[SectionOccurrenceModel] = []
+        for chunk in _chunks(list(section_ids)):
+            query = select(SectionOccurrenceModel).where(SectionOccurrenceModel.section_id.in_(chunk))
+            if start is not None:
+                query = query.where(SectionOccurrenceModel.starts_at >= start)
+            if end is not None:
+                query = query.where(SectionOccurrenceModel.starts_at < end)
+            occurrences.extend((await self.session.exec(query)).all())
+        occurrences.sort(key=lambda o: (o.starts_at, o.section_id))
+        return occurrences
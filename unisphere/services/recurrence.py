@@ -0,0 +1,244 @@
+"""Expansion of weekly slots and RRULEs into dated occurrences
+
+Rules are compiled once per distinct string and kept in an LRU cache.
+Expansion is ordinal arithmetic: every weekday of a rule is an arithmetic
+progression of day ordinals, so a semester window is a handful of range()
+slices instead of a walk over its days.
+
+The supported RRULE subset is what a class timetable needs: FREQ=DAILY or
+WEEKLY with INTERVAL, BYDAY (no ordinals), BYHOUR, BYMINUTE, COUNT, UNTIL
+and WKST, plus optional DTSTART, DTEND or DURATION, and EXDATE lines; a
+date-only EXDATE (VALUE=DATE) drops every occurrence on that day.
+Times are wall-clock times; TZID parameters and a trailing Z are ignored.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from itertools import product
+from math import ceil, lcm
+from typing import List, Optional, Tuple
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+DURATION_PATTERN = re.compile(
+    r"^P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$")
+
+Occurrence = Tuple[datetime, datetime]
+
+
+class RecurrenceError(ValueError):
+    """A rule or day code this engine cannot expand"""
+
+
+def weekday_of(day_code: str) -> int:
+    """Monday-based weekday of a day code such as MO, MON or Monday"""
+    prefix = day_code.strip().upper()[:2]
+    if prefix not in WEEKDAYS:
+        raise RecurrenceError(f"Day code {day_code!r} is not a weekday")
+    return WEEKDAYS.index(prefix)
+
+
+def _weekday_of_ordinal(ordinal: int) -> int:
+    # date.fromordinal(1) is Monday, 0001-01-01
+    return (ordinal - 1) % 7
+
+
+def _parse_datetime(value: str) -> datetime:
+    value = value.removesuffix("Z")
+    try:
+        if "T" in value:
+            return datetime.strptime(value, "%Y%m%dT%H%M%S")
+        return datetime.strptime(value, "%Y%m%d")
+    except ValueError as e:
+        raise RecurrenceError(f"Invalid date-time {value!r}") from e
+
+
+def _parse_duration(value: str) -> timedelta:
+    match = DURATION_PATTERN.match(value)
+    if not match or value in ("P", "PT"):
+        raise RecurrenceError(f"Invalid DURATION {value!r}")
+    return timedelta(**{k: int(v) for k, v in match.groupdict().items() if v})
+
+
+def _parse_ints(name: str, value: str, low: int, high: int) -> Tuple[int, ...]:
+    try:
+        numbers = tuple(sorted({int(v) for v in value.split(",")}))
+    except ValueError as e:
+        raise RecurrenceError(f"Invalid {name} {value!r}") from e
+    if not all(low <= n <= high for n in numbers):
+        raise RecurrenceError(f"{name} must be between {low} and {high}")
+    return numbers
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    freq: str
+    interval: int = 1
+    weekdays: Tuple[int, ...] = ()
+    hours: Tuple[int, ...] = ()
+    minutes: Tuple[int, ...] = ()
+    duration: timedelta = timedelta()
+    dtstart: Optional[datetime] = None
+    until: Optional[datetime] = None
+    count: Optional[int] = None
+    exdates: frozenset = frozenset()
+    # Date-only EXDATEs, matched against the day of each occurrence
+    exdays: frozenset = frozenset()
+    week_start: int = 0
+
+    def _progressions(self, anchor: int) -> List[Tuple[int, int]]:
+        """(first ordinal, step) of every progression of days the rule produces"""
+        if self.freq == "WEEKLY":
+            weekdays = self.weekdays or (_weekday_of_ordinal(anchor),)
+            week_start = anchor - (_weekday_of_ordinal(anchor) - self.week_start) % 7
+            return [(week_start + (w - self.week_start) % 7, 7 * self.interval) for w in weekdays]
+        if not self.weekdays:
+            return [(anchor, self.interval)]
+        # Days of the DAILY progression on weekday w recur every lcm(interval, 7) days
+        step = lcm(self.interval, 7)
+        progressions = []
+        for k in range(step // self.interval):
+            ordinal = anchor + k * self.interval
+            if _weekday_of_ordinal(ordinal) in self.weekdays:
+                progressions.append((ordinal, step))
+        return progressions
+
+    def between(self, start: date, end: date) -> List[Occurrence]:
+        """Occurrences starting on or between start and end, in order"""
+        anchor = self.dtstart or datetime.combine(start, time.min)
+        times = [
+            time(hour, minute, anchor.second)
+            for hour, minute in product(self.hours or (anchor.hour,), self.minutes or (anchor.minute,))
+        ]
+        last = end.toordinal()
+        if self.until is not None:
+            last = min(last, self.until.toordinal())
+
+        if self.count is None:
+            # Skip straight to the first day of each progression inside the window
+            low = max(start.toordinal(), anchor.toordinal())
+            ordinals = [
+                o
+                for first, step in self._progressions(anchor.toordinal())
+                for o in range(first + max(0, ceil((low - first) / step)) * step, last + 1, step)
+            ]
+        else:
+            # COUNT is counted from DTSTART, so no progression needs more than count
+            # days after its first one, which may fall before DTSTART
+            ordinals = [
+                o
+                for first, step in self._progressions(anchor.toordinal())
+                for o in range(first, min(last + 1, first + (self.count + 1) * step), step)
+            ]
+
+        starts = sorted(
+            datetime.combine(date.fromordinal(o), t)
+            for o in ordinals
+            for t in times
+        )
+        starts = [s for s in starts if s >= anchor and (self.until is None or s <= self.until)]
+        if self.count is not None:
+            starts = starts[:self.count]
+        low, high = datetime.combine(start, time.min), datetime.combine(end, time.max)
+        return [
+            (s, s + self.duration)
+            for s in starts
+            if low <= s <= high and s not in self.exdates and s.date() not in self.exdays
+        ]
+
+
+@lru_cache(maxsize=4096)
+def compile_rule(text: str) -> CompiledRule:
+    """Parse an RRULE string, optionally with DTSTART/DTEND/DURATION/EXDATE lines"""
+    properties: dict = {}
+    exdates: set = set()
+    exdays: set = set()
+    for line in text.strip().splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        name, _, value = line.partition(":") if ":" in line else ("RRULE", "", line)
+        name = name.split(";")[0].upper()
+        if name == "EXDATE":
+            for v in value.split(","):
+                if "T" in v:
+                    exdates.add(_parse_datetime(v))
+                else:
+                    exdays.add(_parse_datetime(v).date())
+        elif name in ("RRULE", "DTSTART", "DTEND", "DURATION"):
+            if name in properties:
+                raise RecurrenceError(f"More than one {name}")
+            properties[name] = value.strip()
+        else:
+            raise RecurrenceError(f"Unsupported property {name}")
+    if "RRULE" not in properties:
+        raise RecurrenceError("Missing RRULE")
+
+    parts = {}
+    for part in properties["RRULE"].split(";"):
+        key, sep, value = part.partition("=")
+        if not sep:
+            raise RecurrenceError(f"Invalid rule part {part!r}")
+        parts[key.upper()] = value.upper()
+
+    freq = parts.pop("FREQ", None)
+    if freq not in ("DAILY", "WEEKLY"):
+        raise RecurrenceError(f"FREQ={freq} is not supported")
+    rule = {"freq": freq}
+    if "INTERVAL" in parts:
+        rule["interval"] = _parse_ints("INTERVAL", parts.pop("INTERVAL"), 1, 366)[0]
+    if "BYDAY" in parts:
+        days = parts.pop("BYDAY").split(",")
+        if any(day not in WEEKDAYS for day in days):
+            raise RecurrenceError("BYDAY must list plain weekday codes")
+        rule["weekdays"] = tuple(sorted({WEEKDAYS.index(day) for day in days}))
+    if "BYHOUR" in parts:
+        rule["hours"] = _parse_ints("BYHOUR", parts.pop("BYHOUR"), 0, 23)
+    if "BYMINUTE" in parts:
+        rule["minutes"] = _parse_ints("BYMINUTE", parts.pop("BYMINUTE"), 0, 59)
+    if "WKST" in parts:
+        week_start = parts.pop("WKST")
+        if week_start not in WEEKDAYS:
+            raise RecurrenceError(f"Invalid WKST {week_start!r}")
+        rule["week_start"] = WEEKDAYS.index(week_start)
+    if "COUNT" in parts and "UNTIL" in parts:
+        raise RecurrenceError("COUNT and UNTIL cannot both be set")
+    if "COUNT" in parts:
+        rule["count"] = _parse_ints("COUNT", parts.pop("COUNT"), 1, 10_000)[0]
+    if "UNTIL" in parts:
+        until = parts.pop("UNTIL")
+        # A date-only UNTIL includes that whole day
+        rule["until"] = _parse_datetime(until) + (timedelta() if "T" in until else timedelta(days=1, microseconds=-1))
+    if parts:
+        raise RecurrenceError(f"Unsupported rule parts: {', '.join(sorted(parts))}")
+
+    if "DTSTART" in properties:
+        rule["dtstart"] = _parse_datetime(properties["DTSTART"])
+    if "DTEND" in properties and "DURATION" in properties:
+        raise RecurrenceError("DTEND and DURATION cannot both be set")
+    if "DTEND" in properties:
+        if "dtstart" not in rule:
+            raise RecurrenceError("DTEND needs DTSTART")
+        rule["duration"] = _parse_datetime(properties["DTEND"]) - rule["dtstart"]
+    elif "DURATION" in properties:
+        rule["duration"] = _parse_duration(properties["DURATION"])
+    if rule.get("duration", timedelta()) < timedelta():
+        raise RecurrenceError("Occurrences cannot end before they start")
+    rule["exdates"] = frozenset(exdates)
+    rule["exdays"] = frozenset(exdays)
+    return CompiledRule(**rule)
+
+
+@lru_cache(maxsize=4096)
+def weekly_slot(weekday: int, start_time: time, end_time: time) -> CompiledRule:
+    """A section_schedules row as a rule: every week on weekday, start_time to end_time"""
+    duration = datetime.combine(date.min, end_time) - datetime.combine(date.min, start_time)
+    if duration < timedelta():
+        # The slot runs past midnight
+        duration += timedelta(days=1)
+    return CompiledRule(
+        freq="WEEKLY", weekdays=(weekday,), hours=(start_time.hour,),
+        minutes=(start_time.minute,), duration=duration)
+
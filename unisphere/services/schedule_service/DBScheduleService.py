@@ -1,24 +1,48 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException, status
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache, invalidates
 from unisphere.models.schedule_model import SectionScheduleModel
 from unisphere.schemas.schedule_schema import (SectionScheduleCreateSchema,
                                                SectionScheduleSchema,
                                                SectionScheduleUpdateSchema)
+from unisphere.services.clash_service import ClashService
+from unisphere.services.occurrence_service import OccurrenceService
 
 from .ScheduleServiceInterface import ScheduleServiceInterface
 
 
 class DBScheduleService(ScheduleServiceInterface):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: Optional[TaggedCache] = None):
         self.session = session
+        self.cache = cache
+        self.occurrences = OccurrenceService(session)
+        self.clashes = ClashService(session, cache)
 
+    async def _check_room(self, schedule: SectionScheduleModel) -> None:
+        if not schedule.room:
+            return
+        clashes = await self.clashes.check_room(
+            schedule.room, schedule.day_id, schedule.start_time, schedule.end_time,
+            schedule.section_id, schedule.schedule_id)
+        if clashes:
+            detail = {
+                "message": f"Room {schedule.room} is already booked at this time",
+                "clashes": [c.model_dump(mode="json") for c in clashes],
+            }
+            await self.session.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+    @invalidates("timetables")
     async def create_schedule(self, data: SectionScheduleCreateSchema) -> SectionScheduleSchema:
         schedule = SectionScheduleModel(**data.model_dump())
+        await self._check_room(schedule)
         self.session.add(schedule)
+        await self.session.flush()
+        await self.occurrences.refresh_schedule(schedule)
         await self.session.commit()
         await self.session.refresh(schedule)
         return SectionScheduleSchema.model_validate(schedule)
@@ -28,6 +52,7 @@ class DBScheduleService(ScheduleServiceInterface):
         result = await self.session.exec(query)
         return [SectionScheduleSchema.model_validate(s) for s in result.all()]
 
+    @invalidates("timetables")
     async def update_schedule(self, schedule_id: int, data: SectionScheduleUpdateSchema) -> SectionScheduleSchema:
         query = select(SectionScheduleModel).where(SectionScheduleModel.schedule_id == schedule_id)
         result = await self.session.exec(query)
@@ -36,17 +61,21 @@ class DBScheduleService(ScheduleServiceInterface):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
         for key, value in data.model_dump(exclude_unset=True).items():
             setattr(schedule, key, value)
+        await self._check_room(schedule)
         self.session.add(schedule)
+        await self.occurrences.refresh_schedule(schedule)
         await self.session.commit()
         await self.session.refresh(schedule)
         return SectionScheduleSchema.model_validate(schedule)
 
+    @invalidates("timetables")
     async def delete_schedule(self, schedule_id: int) -> bool:
         query = select(SectionScheduleModel).where(SectionScheduleModel.schedule_id == schedule_id)
         result = await self.session.exec(query)
         schedule = result.first()
         if not schedule:
             return False
+        await self.occurrences.clear_schedule(schedule)
         await self.session.delete(schedule)
         await self.session.commit()
         return True
@@ -1,13 +1,15 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
 from fastapi import HTTPException, status
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache, invalidates
 from unisphere.models.schedule_model import SectionRRuleModel
 from unisphere.models.section_instructor import SectionInstructorModel
 from unisphere.models.section_model import SectionModel
+from unisphere.schemas.schedule_schema import SectionOccurrenceSchema
 from unisphere.schemas.section_instructor_schema import (
     SectionInstructorCreateSchema, SectionInstructorSchema)
 from unisphere.schemas.section_rrule_schema import (SectionRRuleCreateSchema,
@@ -16,13 +18,32 @@ from unisphere.schemas.section_rrule_schema import (SectionRRuleCreateSchema,
 from unisphere.schemas.section_schema import (SectionCreateSchema,
                                               SectionSchema,
                                               SectionUpdateSchema)
+from unisphere.services.bulk_crud import BulkCRUDService
+from unisphere.services.occurrence_service import OccurrenceService
+from unisphere.services.recurrence import RecurrenceError, compile_rule
 
 from .SectionServiceInterface import SectionServiceInterface
 
 
-class DBSectionService(SectionServiceInterface):
-    def __init__(self, session: AsyncSession):
+class DBSectionService(BulkCRUDService, SectionServiceInterface):
+    bulk_model = SectionModel
+    bulk_schema = SectionSchema
+    bulk_key = ("course_id", "section_code")
+    bulk_tags = ("timetables",)
+    bulk_delete_clears = ("section_occurrences",)
+
+    def __init__(self, session: AsyncSession, cache: Optional[TaggedCache] = None):
         self.session = session
+        self.cache = cache
+        self.occurrences = OccurrenceService(session)
+
+    async def _after_bulk_update(self, changed: Dict[int, Set[str]]) -> None:
+        moved = [section_id for section_id, fields in changed.items() if "course_id" in fields]
+        if moved:
+            await self.occurrences.refresh_sections(moved)
+
+    async def _before_bulk_delete(self, ids: List[int]) -> None:
+        await self.occurrences.clear_sections(ids)
 
     # ----------------------
     # Section CRUD
@@ -42,25 +63,32 @@ class DBSectionService(SectionServiceInterface):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
         return SectionSchema.model_validate(section)
 
+    @invalidates("timetables")
     async def update_section(self, section_id: int, data: SectionUpdateSchema) -> SectionSchema:
         query = select(SectionModel).where(SectionModel.section_id == section_id)
         result = await self.session.exec(query)
         section = result.first()
         if not section:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
-        for key, value in data.model_dump(exclude_unset=True).items():
+        update_data = data.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
             setattr(section, key, value)
         self.session.add(section)
+        if "course_id" in update_data:
+            # Another course may belong to another semester
+            await self.occurrences.refresh_sections([section_id])
         await self.session.commit()
         await self.session.refresh(section)
         return SectionSchema.model_validate(section)
 
+    @invalidates("timetables")
     async def delete_section(self, section_id: int) -> bool:
         query = select(SectionModel).where(SectionModel.section_id == section_id)
         result = await self.session.exec(query)
         section = result.first()
         if not section:
             return False
+        await self.occurrences.clear_sections([section_id])
         await self.session.delete(section)
         await self.session.commit()
         return True
@@ -101,48 +129,76 @@ class DBSectionService(SectionServiceInterface):
         await self.session.commit()
         return True
 
-# ----------------------
-# Section RRule CRUD
-# ----------------------
-async def create_rrule(self, data: SectionRRuleCreateSchema) -> SectionRRuleSchema:
-    rrule = SectionRRuleModel(**data.model_dump())
-    self.session.add(rrule)
-    await self.session.commit()
-    await self.session.refresh(rrule)
-    return SectionRRuleSchema.model_validate(rrule)
-
-async def get_rrule(self, rrule_id: int) -> SectionRRuleSchema:
-    query = select(SectionRRuleModel).where(SectionRRuleModel.rrule_id == rrule_id)
-    result = await self.session.exec(query)
-    rrule = result.first()
-    if not rrule:
-        raise HTTPException(status_code=404, detail="RRule not found")
-    return SectionRRuleSchema.model_validate(rrule)
-
-async def update_rrule(self, rrule_id: int, data: SectionRRuleUpdateSchema) -> SectionRRuleSchema:
-    query = select(SectionRRuleModel).where(SectionRRuleModel.rrule_id == rrule_id)
-    result = await self.session.exec(query)
-    rrule = result.first()
-    if not rrule:
-        raise HTTPException(status_code=404, detail="RRule not found")
-    for key, value in data.model_dump(exclude_unset=True).items():
-        setattr(rrule, key, value)
-    self.session.add(rrule)
-    await self.session.commit()
-    await self.session.refresh(rrule)
-    return SectionRRuleSchema.model_validate(rrule)
-
-async def delete_rrule(self, rrule_id: int) -> bool:
-    query = select(SectionRRuleModel).where(SectionRRuleModel.rrule_id == rrule_id)
-    result = await self.session.exec(query)
-    rrule = result.first()
-    if not rrule:
-        return False
-    await self.session.delete(rrule)
-    await self.session.commit()
-    return True
-
-async def list_rrules(self, section_id: int) -> list[SectionRRuleSchema]:
-    query = select(SectionRRuleModel).where(SectionRRuleModel.section_id == section_id)
-    result = await self.session.exec(query)
-    return [SectionRRuleSchema.model_validate(r) for r in result.all()]
\ No newline at end of file
+    # ----------------------
+    # Section RRule CRUD
+    # ----------------------
+    @invalidates("timetables")
+    async def create_rrule(self, data: SectionRRuleCreateSchema) -> SectionRRuleSchema:
+        _validate_rrule(data.rrule)
+        rrule = SectionRRuleModel(**data.model_dump())
+        self.session.add(rrule)
+        await self.session.flush()
+        await self.occurrences.refresh_rrule(rrule)
+        await self.session.commit()
+        await self.session.refresh(rrule)
+        return SectionRRuleSchema.model_validate(rrule)
+
+    async def get_rrule(self, rrule_id: int) -> SectionRRuleSchema:
+        query = select(SectionRRuleModel).where(SectionRRuleModel.rrule_id == rrule_id)
+        result = await self.session.exec(query)
+        rrule = result.first()
+        if not rrule:
+            raise HTTPException(status_code=404, detail="RRule not found")
+        return SectionRRuleSchema.model_validate(rrule)
+
+    @invalidates("timetables")
+    async def update_rrule(self, rrule_id: int, data: SectionRRuleUpdateSchema) -> SectionRRuleSchema:
+        _validate_rrule(data.rrule)
+        query = select(SectionRRuleModel).where(SectionRRuleModel.rrule_id == rrule_id)
+        result = await self.session.exec(query)
+        rrule = result.first()
+        if not rrule:
+            raise HTTPException(status_code=404, detail="RRule not found")
+        for key, value in data.model_dump(exclude_unset=True).items():
+            setattr(rrule, key, value)
+        self.session.add(rrule)
+        await self.occurrences.refresh_rrule(rrule)
+        await self.session.commit()
+        await self.session.refresh(rrule)
+        return SectionRRuleSchema.model_validate(rrule)
+
+    @invalidates("timetables")
+    async def delete_rrule(self, rrule_id: int) -> bool:
+        query = select(SectionRRuleModel).where(SectionRRuleModel.rrule_id == rrule_id)
+        result = await self.session.exec(query)
+        rrule = result.first()
+        if not rrule:
+            return False
+        await self.occurrences.clear_rrule(rrule)
+        await self.session.delete(rrule)
+        await self.session.commit()
+        return True
+
+    async def list_rrules(self, section_id: int) -> list[SectionRRuleSchema]:
+        query = select(SectionRRuleModel).where(SectionRRuleModel.section_id == section_id)
+        result = await self.session.exec(query)
+        return [SectionRRuleSchema.model_validate(r) for r in result.all()]
+
+    # ----------------------
+    # Section occurrences
+    # ----------------------
+    async def list_occurrences(
+        self,
+        section_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[SectionOccurrenceSchema]:
+        occurrences = await self.occurrences.list_occurrences([section_id], start, end)
+        return [SectionOccurrenceSchema.model_validate(o) for o in occurrences]
+
+
+def _validate_rrule(rrule: str) -> None:
+    try:
+        compile_rule(rrule)
+    except RecurrenceError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
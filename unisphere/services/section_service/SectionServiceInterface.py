@@ -1,6 +1,8 @@
-from abc import ABC, abstractmethod
+from abc import abstractmethod
+from datetime import datetime
 from typing import List, Optional
 
+from unisphere.schemas.schedule_schema import SectionOccurrenceSchema
 from unisphere.schemas.section_instructor_schema import (
     SectionInstructorCreateSchema, SectionInstructorSchema)
 from unisphere.schemas.section_rrule_schema import (SectionRRuleCreateSchema,
@@ -9,9 +11,10 @@ from unisphere.schemas.section_rrule_schema import (SectionRRuleCreateSchema,
 from unisphere.schemas.section_schema import (SectionCreateSchema,
                                               SectionSchema,
                                               SectionUpdateSchema)
+from unisphere.services.bulk_crud import BulkCRUDInterface
 
 
-class SectionServiceInterface(ABC):
+class SectionServiceInterface(BulkCRUDInterface):
     @abstractmethod
     async def create_section(self, data: SectionCreateSchema) -> SectionSchema:
         pass
@@ -64,4 +67,14 @@ class SectionServiceInterface(ABC):
 
     @abstractmethod
     async def list_rrules(self, section_id: int) -> list[SectionRRuleSchema]:
-        pass
\ No newline at end of file
+        pass
+
+    # --- Section occurrences ---
+    @abstractmethod
+    async def list_occurrences(
+        self,
+        section_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[SectionOccurrenceSchema]:
+        pass
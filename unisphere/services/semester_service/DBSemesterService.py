@@ -1,20 +1,36 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
 from fastapi import HTTPException
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from unisphere.core.cache import TaggedCache, cached, invalidates
 from unisphere.models.semester_model import SemesterModel
 from unisphere.schemas import semester_schema
+from unisphere.services.bulk_crud import BulkCRUDService
+from unisphere.services.occurrence_service import OccurrenceService
 
 from .SemesterServiceInterface import SemesterServiceInterface
 
 
-class DBSemesterService(SemesterServiceInterface):
-    def __init__(self, session: AsyncSession):
+class DBSemesterService(BulkCRUDService, SemesterServiceInterface):
+    bulk_model = SemesterModel
+    bulk_schema = semester_schema.SemesterSchema
+    bulk_key = ("semester_code",)
+    bulk_tags = ("semesters", "courses")
+
+    def __init__(self, session: AsyncSession, cache: Optional[TaggedCache] = None):
         self.session = session
+        self.cache = cache
+
+    async def _after_bulk_update(self, changed: Dict[int, Set[str]]) -> None:
+        occurrences = OccurrenceService(self.session)
+        for semester_id, fields in changed.items():
+            if {"start_date", "end_date"} & fields:
+                await occurrences.refresh_semester(semester_id)
 
+    @cached("semesters")
     async def get_all_semesters(self, include_archived: bool = False) -> List[SemesterModel]:
         query = select(SemesterModel)
         if not include_archived:
@@ -22,6 +38,7 @@ class DBSemesterService(SemesterServiceInterface):
         result = await self.session.exec(query)
         return result.all()
 
+    @cached("semesters")
     async def get_semester_by_id(self, semester_id: int) -> SemesterModel:
         result = await self.session.exec(select(SemesterModel).where(SemesterModel.semester_id == semester_id))
         semester = result.first()
@@ -29,6 +46,7 @@ class DBSemesterService(SemesterServiceInterface):
             raise HTTPException(status_code=404, detail="Semester not found")
         return semester
 
+    @invalidates("semesters")
     async def create_semester(self, semester_create: semester_schema.SemesterCreateSchema) -> SemesterModel:
         new_semester = SemesterModel(**semester_create.model_dump())
         self.session.add(new_semester)
@@ -36,6 +54,7 @@ class DBSemesterService(SemesterServiceInterface):
         await self.session.refresh(new_semester)
         return new_semester
 
+    @invalidates("semesters")
     async def update_semester(self, semester_id: int, semester_update: semester_schema.SemesterUpdateSchema) -> SemesterModel:
         result = await self.session.exec(select(SemesterModel).where(SemesterModel.semester_id == semester_id))
         semester = result.first()
@@ -47,10 +66,13 @@ class DBSemesterService(SemesterServiceInterface):
             setattr(semester, field, value)
 
         self.session.add(semester)
+        if {"start_date", "end_date"} & update_data.keys():
+            await OccurrenceService(self.session).refresh_semester(semester_id)
         await self.session.commit()
         await self.session.refresh(semester)
         return semester
 
+    @invalidates("semesters", "courses")
     async def delete_semester(self, semester_id: int) -> SemesterModel:
         result = await self.session.exec(select(SemesterModel).where(SemesterModel.semester_id == semester_id))
         semester = result.first()
@@ -61,6 +83,7 @@ class DBSemesterService(SemesterServiceInterface):
         await self.session.commit()
         return semester
 
+    @invalidates("semesters")
     async def archive_semester(self, semester_id: int, archived_at: Optional[datetime] = None) -> SemesterModel:
         result = await self.session.exec(select(SemesterModel).where(SemesterModel.semester_id == semester_id))
         semester = result.first()
@@ -72,3 +95,10 @@ class DBSemesterService(SemesterServiceInterface):
         await self.session.commit()
         await self.session.refresh(semester)
         return semester
+
+    @invalidates("timetables")
+    async def refresh_occurrences(self, semester_id: int) -> int:
+        await self.get_semester_by_id(semester_id)
+        written = await OccurrenceService(self.session).refresh_semester(semester_id)
+        await self.session.commit()
+        return written
@@ -1,13 +1,14 @@
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 from datetime import datetime
 from typing import List, Optional
 
 from unisphere.schemas.semester_schema import (SemesterCreateSchema,
                                                SemesterSchema,
                                                SemesterUpdateSchema)
+from unisphere.services.bulk_crud import BulkCRUDInterface
 
 
-class SemesterServiceInterface(ABC):
+class SemesterServiceInterface(BulkCRUDInterface):
     @abstractmethod
     async def create_semester(self, semester_create: SemesterCreateSchema) -> SemesterSchema:
         """
@@ -52,3 +53,11 @@ class SemesterServiceInterface(ABC):
         Archive a semester by setting its archived_at datetime.
         """
         pass
+
+    @abstractmethod
+    async def refresh_occurrences(self, semester_id: int) -> int:
+        """
+        Re-expand the schedules and rules of every section in the semester.
+        Returns the number of occurrences written.
+        """
+        pass
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+import aiofiles  # type: ignore[import-untyped]
+import aiofiles.os  # type: ignore[import-untyped]
+
+from unisphere.services.storage_service.SignedUploadBackend import SignedUploadBackend
+from unisphere.services.storage_service.StorageBackendInterface import StoredObject
+
+COPY_CHUNK_SIZE = 256 * 1024
+
+
+class LocalStorageBackend(SignedUploadBackend):
+    """Objects as files under a directory, served by the /uploads mount
+
+    Multipart parts are kept in .multipart/<upload_id>/ until completed.
+    """
+
+    def __init__(self, root: str = "uploads"):
+        self.root = Path(root)
+        self.root.mkdir(exist_ok=True)
+        self.multipart_dir = self.root / ".multipart"
+
+    def path(self, key: str) -> Path:
+        """File for a key, refusing keys that leave the root"""
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()) or path == self.root.resolve():
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    async def write(self, key: str, chunks: AsyncIterable[bytes], content_type: str) -> int:
+        path = self.path(key)
+        await aiofiles.os.makedirs(path.parent, exist_ok=True)
+        temp_path = path.with_name(f".{uuid.uuid4()}.part")
+        size = 0
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    await f.write(chunk)
+            await aiofiles.os.replace(temp_path, path)
+        except BaseException:
+            await self._remove(temp_path)
+            raise
+        return size
+
+    async def move(self, source: str, destination: str) -> None:
+        path = self.path(destination)
+        await aiofiles.os.makedirs(path.parent, exist_ok=True)
+        await aiofiles.os.replace(self.path(source), path)
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            result = await aiofiles.os.stat(self.path(key))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return StoredObject(key=key, size=result.st_size, modified=result.st_mtime)
+
+    async def read(self, key: str, start: int = 0, length: Optional[int] = None) -> bytes:
+        async with aiofiles.open(self.path(key), 'rb') as f:
+            await f.seek(start)
+            return await f.read(-1 if length is None else length)
+
+    async def delete(self, key: str) -> bool:
+        return await self._remove(self.path(key))
+
+    @staticmethod
+    async def _remove(path: Path) -> bool:
+        try:
+            await aiofiles.os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    async def list(self, prefix: str) -> AsyncIterator[StoredObject]:
+        for item in await asyncio.to_thread(self._walk, prefix):
+            yield item
+
+    def _walk(self, prefix: str) -> List[StoredObject]:
+        directory = self.root / prefix.rsplit("/", 1)[0] if "/" in prefix else self.root
+        items = []
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = Path(root) / name
+                key = path.relative_to(self.root).as_posix()
+                if key.startswith(prefix):
+                    result = path.stat()
+                    items.append(StoredObject(key=key, size=result.st_size, modified=result.st_mtime))
+        return items
+
+    def public_url(self, key: str, base_url: str) -> str:
+        return f"{base_url.rstrip('/')}/uploads/{key}"
+
+    def _part_path(self, upload_id: str, part_number: int) -> Path:
+        return self.multipart_dir / uuid.UUID(upload_id).hex / f"{part_number:05d}"
+
+    async def create_multipart(self, key: str, content_type: str) -> str:
+        self.path(key)
+        upload_id = uuid.uuid4().hex
+        directory = self.multipart_dir / upload_id
+        await aiofiles.os.makedirs(directory)
+        async with aiofiles.open(directory / "key", 'w') as f:
+            await f.write(key)
+        return upload_id
+
+    async def _check_upload(self, key: str, upload_id: str) -> Path:
+        directory = self.multipart_dir / uuid.UUID(upload_id).hex
+        try:
+            async with aiofiles.open(directory / "key") as f:
+                if await f.read() == key:
+                    return directory
+        except FileNotFoundError:
+            pass
+        raise ValueError("Unknown multipart upload")
+
+    async def write_part(
+        self, key: str, upload_id: str, part_number: int, chunks: AsyncIterable[bytes]
+    ) -> str:
+        await self._check_upload(key, upload_id)
+        digest = hashlib.md5()
+
+        async def hashed() -> AsyncIterator[bytes]:
+            async for chunk in chunks:
+                digest.update(chunk)
+                yield chunk
+
+        part_key = self._part_path(upload_id, part_number).relative_to(self.root).as_posix()
+        await self.write(part_key, hashed(), "application/octet-stream")
+        return f'"{digest.hexdigest()}"'
+
+    async def complete_multipart(self, key: str, upload_id: str, parts: List[Tuple[int, str]]) -> None:
+        directory = await self._check_upload(key, upload_id)
+
+        async def assembled() -> AsyncIterator[bytes]:
+            for part_number, etag in sorted(parts):
+                digest = hashlib.md5()
+                try:
+                    async with aiofiles.open(self._part_path(upload_id, part_number), 'rb') as f:
+                        while chunk := await f.read(COPY_CHUNK_SIZE):
+                            digest.update(chunk)
+                            yield chunk
+                except FileNotFoundError:
+                    raise ValueError(f"Part {part_number} was not uploaded") from None
+                if f'"{digest.hexdigest()}"' != etag:
+                    raise ValueError(f"ETag mismatch for part {part_number}")
+
+        await self.write(key, assembled(), "application/octet-stream")
+        await asyncio.to_thread(shutil.rmtree, directory, True)
+
+    async def abort_multipart(self, key: str, upload_id: str) -> None:
+        directory = await self._check_upload(key, upload_id)
+        await asyncio.to_thread(shutil.rmtree, directory, True)
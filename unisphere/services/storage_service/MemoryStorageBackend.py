@@ -0,0 +1,84 @@
+import hashlib
+import time
+import uuid
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+from unisphere.services.storage_service.SignedUploadBackend import SignedUploadBackend
+from unisphere.services.storage_service.StorageBackendInterface import StoredObject
+
+
+class MemoryStorageBackend(SignedUploadBackend):
+    """Per-process object store for development and tests"""
+
+    def __init__(self):
+        self.objects: Dict[str, Tuple[bytes, float]] = {}
+        self.uploads: Dict[str, Tuple[str, Dict[int, bytes]]] = {}
+
+    async def write(self, key: str, chunks: AsyncIterable[bytes], content_type: str) -> int:
+        data = b"".join([chunk async for chunk in chunks])
+        self.objects[key] = (data, time.time())
+        return len(data)
+
+    async def move(self, source: str, destination: str) -> None:
+        self.objects[destination] = self.objects.pop(source)
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        entry = self.objects.get(key)
+        if entry is None:
+            return None
+        return StoredObject(key=key, size=len(entry[0]), modified=entry[1])
+
+    async def read(self, key: str, start: int = 0, length: Optional[int] = None) -> bytes:
+        data = self.objects[key][0]
+        return data[start:] if length is None else data[start:start + length]
+
+    async def delete(self, key: str) -> bool:
+        return self.objects.pop(key, None) is not None
+
+    async def list(self, prefix: str) -> AsyncIterator[StoredObject]:
+        for key in [key for key in self.objects if key.startswith(prefix)]:
+            item = await self.stat(key)
+            if item is not None:
+                yield item
+
+    def public_url(self, key: str, base_url: str) -> str:
+        return f"{base_url.rstrip('/')}/uploads/{key}"
+
+    async def create_multipart(self, key: str, content_type: str) -> str:
+        upload_id = uuid.uuid4().hex
+        self.uploads[upload_id] = (key, {})
+        return upload_id
+
+    def _parts(self, key: str, upload_id: str) -> Dict[int, bytes]:
+        upload = self.uploads.get(upload_id)
+        if upload is None or upload[0] != key:
+            raise ValueError("Unknown multipart upload")
+        return upload[1]
+
+    async def write_part(
+        self, key: str, upload_id: str, part_number: int, chunks: AsyncIterable[bytes]
+    ) -> str:
+        parts = self._parts(key, upload_id)
+        data = b"".join([chunk async for chunk in chunks])
+        parts[part_number] = data
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    async def complete_multipart(self, key: str, upload_id: str, parts: List[Tuple[int, str]]) -> None:
+        uploaded = self._parts(key, upload_id)
+        data = []
+        for part_number, etag in sorted(parts):
+            if part_number not in uploaded:
+                raise ValueError(f"Part {part_number} was not uploaded")
+            if f'"{hashlib.md5(uploaded[part_number]).hexdigest()}"' != etag:
+                raise ValueError(f"ETag mismatch for part {part_number}")
+            data.append(uploaded[part_number])
+        self.objects[key] = (b"".join(data), time.time())
+        del self.uploads[upload_id]
+
+    async def abort_multipart(self, key: str, upload_id: str) -> None:
+        self._parts(key, upload_id)
+        del self.uploads[upload_id]
+
+    def clear(self) -> None:
+        self.objects.clear()
+        self.uploads.clear()
@@ -0,0 +1,155 @@
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+from unisphere.core.config import get_settings
+from unisphere.schemas.upload_schema import PresignedRequest
+from unisphere.services.storage_service.StorageBackendInterface import StorageBackend, StoredObject
+
+try:
+    import boto3
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+except ImportError:  # pragma: no cover - optional dependency
+    boto3 = None
+
+settings = get_settings()
+
+
+class S3StorageBackend(StorageBackend):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, R2, ...)
+
+    boto3 is blocking, so every call runs in a worker thread. Writes larger
+    than one part go through a multipart upload, so memory use stays at one
+    part regardless of the file size.
+    """
+
+    def __init__(self, bucket: Optional[str] = None, client: Any = None, part_size: Optional[int] = None):
+        if client is None:
+            if boto3 is None:
+                raise RuntimeError("UPLOAD_STORAGE_BACKEND=s3 requires boto3 (install the s3 extra)")
+            client = boto3.client(
+                "s3",
+                endpoint_url=settings.S3_ENDPOINT_URL or None,
+                region_name=settings.S3_REGION or None,
+                aws_access_key_id=settings.S3_ACCESS_KEY_ID or None,
+                aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY or None,
+                config=Config(signature_version="s3v4"),
+            )
+        self.client = client
+        self.bucket = bucket or settings.S3_BUCKET
+        self.part_size = part_size or settings.UPLOAD_MULTIPART_PART_SIZE
+
+    async def _call(self, method: str, **kwargs) -> Any:
+        return await asyncio.to_thread(getattr(self.client, method), Bucket=self.bucket, **kwargs)
+
+    async def write(self, key: str, chunks: AsyncIterable[bytes], content_type: str) -> int:
+        buffer = bytearray()
+        size = 0
+        upload_id = None
+        parts = []
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                size += len(chunk)
+                if len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        upload_id = await self.create_multipart(key, content_type)
+                    parts.append(await self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer)))
+                    buffer.clear()
+            if upload_id is None:
+                await self._call("put_object", Key=key, Body=bytes(buffer), ContentType=content_type)
+                return size
+            if buffer:
+                parts.append(await self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer)))
+            await self.complete_multipart(key, upload_id, parts)
+        except BaseException:
+            if upload_id is not None:
+                await self.abort_multipart(key, upload_id)
+            raise
+        return size
+
+    async def _upload_part(self, key: str, upload_id: str, part_number: int, body: bytes) -> Tuple[int, str]:
+        response = await self._call(
+            "upload_part", Key=key, UploadId=upload_id, PartNumber=part_number, Body=body)
+        return part_number, response["ETag"]
+
+    async def move(self, source: str, destination: str) -> None:
+        await self._call("copy_object", Key=destination, CopySource={"Bucket": self.bucket, "Key": source})
+        await self._call("delete_object", Key=source)
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            response = await self._call("head_object", Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return StoredObject(
+            key=key, size=response["ContentLength"], modified=response["LastModified"].timestamp())
+
+    async def read(self, key: str, start: int = 0, length: Optional[int] = None) -> bytes:
+        end = "" if length is None else start + length - 1
+        response = await self._call("get_object", Key=key, Range=f"bytes={start}-{end}")
+        return await asyncio.to_thread(response["Body"].read)
+
+    async def delete(self, key: str) -> bool:
+        if await self.stat(key) is None:
+            return False
+        await self._call("delete_object", Key=key)
+        return True
+
+    async def list(self, prefix: str) -> AsyncIterator[StoredObject]:
+        token = None
+        while True:
+            kwargs = {"Prefix": prefix}
+            if token:
+                kwargs["ContinuationToken"] = token
+            response = await self._call("list_objects_v2", **kwargs)
+            for item in response.get("Contents", []):
+                yield StoredObject(
+                    key=item["Key"], size=item["Size"], modified=item["LastModified"].timestamp())
+            token = response.get("NextContinuationToken")
+            if not token:
+                return
+
+    def public_url(self, key: str, base_url: str) -> str:
+        if settings.S3_PUBLIC_URL:
+            return f"{settings.S3_PUBLIC_URL.rstrip('/')}/{key}"
+        return f"{self.client.meta.endpoint_url.rstrip('/')}/{self.bucket}/{key}"
+
+    async def presign_upload(
+        self, key: str, content_type: str, max_size: int, expires_in: int
+    ) -> PresignedRequest:
+        # A POST policy, unlike a presigned PUT, lets S3 enforce the size limit
+        post = await asyncio.to_thread(
+            self.client.generate_presigned_post,
+            Bucket=self.bucket, Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, max_size]],
+            ExpiresIn=expires_in,
+        )
+        return PresignedRequest(url=post["url"], method="POST", fields=post["fields"])
+
+    async def create_multipart(self, key: str, content_type: str) -> str:
+        response = await self._call("create_multipart_upload", Key=key, ContentType=content_type)
+        return response["UploadId"]
+
+    async def presign_part(
+        self, key: str, upload_id: str, part_number: int, max_size: int, expires_in: int
+    ) -> PresignedRequest:
+        url = await asyncio.to_thread(
+            self.client.generate_presigned_url, "upload_part",
+            Params={"Bucket": self.bucket, "Key": key, "UploadId": upload_id, "PartNumber": part_number},
+            ExpiresIn=expires_in,
+        )
+        return PresignedRequest(url=url, method="PUT")
+
+    async def complete_multipart(self, key: str, upload_id: str, parts: List[Tuple[int, str]]) -> None:
+        await self._call(
+            "complete_multipart_upload", Key=key, UploadId=upload_id,
+            MultipartUpload={"Parts": [
+                {"PartNumber": part_number, "ETag": etag} for part_number, etag in sorted(parts)]},
+        )
+
+    async def abort_multipart(self, key: str, upload_id: str) -> None:
+        await self._call("abort_multipart_upload", Key=key, UploadId=upload_id)
@@ -0,0 +1,88 @@
+import time
+from abc import abstractmethod
+from typing import AsyncIterable, AsyncIterator, Optional
+
+import jwt
+
+from unisphere.core.config import get_settings
+from unisphere.schemas.upload_schema import PresignedRequest
+from unisphere.services.storage_service.StorageBackendInterface import StorageBackend
+
+settings = get_settings()
+
+UPLOAD_TOKEN_TYPE = "storage_upload"
+
+
+class UploadTooLargeError(ValueError):
+    """More bytes were sent than the presigned request allows"""
+
+
+class UploadAlreadyUsedError(ValueError):
+    """A presigned single-request upload was sent again"""
+
+
+async def limit_size(chunks: AsyncIterable[bytes], max_size: int) -> AsyncIterator[bytes]:
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            raise UploadTooLargeError(f"Upload exceeds {max_size} bytes")
+        yield chunk
+
+
+class SignedUploadBackend(StorageBackend):
+    """Backend without native presigning, served by PUT /v1/upload/storage/{token}
+
+    The token is a short-lived JWT naming the key (and multipart part) it may
+    write and the maximum size, so the bytes still pass through the app but
+    no session or user lookup is needed to accept them.
+    """
+
+    def _presign(self, claims: dict, content_type: str, expires_in: int) -> PresignedRequest:
+        token = jwt.encode(
+            {**claims, "type": UPLOAD_TOKEN_TYPE, "exp": int(time.time()) + expires_in},
+            settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+        return PresignedRequest(
+            url=f"/v1/upload/storage/{token}", method="PUT",
+            headers={"Content-Type": content_type})
+
+    async def presign_upload(
+        self, key: str, content_type: str, max_size: int, expires_in: int
+    ) -> PresignedRequest:
+        return self._presign({"key": key, "max": max_size}, content_type, expires_in)
+
+    async def presign_part(
+        self, key: str, upload_id: str, part_number: int, max_size: int, expires_in: int
+    ) -> PresignedRequest:
+        return self._presign(
+            {"key": key, "upload_id": upload_id, "part": part_number, "max": max_size},
+            "application/octet-stream", expires_in)
+
+    @staticmethod
+    def verify_upload_token(token: str) -> dict:
+        """Claims of a presigned upload token; raises jwt.InvalidTokenError"""
+        claims = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        if claims.get("type") != UPLOAD_TOKEN_TYPE:
+            raise jwt.InvalidTokenError("Not an upload token")
+        return claims
+
+    async def receive(self, claims: dict, chunks: AsyncIterable[bytes], content_type: str) -> Optional[str]:
+        """Store the body of a presigned request; returns the part ETag for multipart uploads
+
+        A single-request upload only writes once, so its object cannot be
+        replaced after it has been checked.
+        """
+        limited = limit_size(chunks, claims["max"])
+        if "upload_id" in claims:
+            return await self.write_part(claims["key"], claims["upload_id"], claims["part"], limited)
+        if await self.exists(claims["key"]):
+            raise UploadAlreadyUsedError("Upload URL was already used")
+        await self.write(claims["key"], limited, content_type)
+        return None
+
+    @abstractmethod
+    async def write_part(
+        self, key: str, upload_id: str, part_number: int, chunks: AsyncIterable[bytes]
+    ) -> str:
+        """Store one part of a multipart upload and return its ETag"""
+        pass
@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+from unisphere.schemas.upload_schema import PresignedRequest
+
+
+@dataclass
+class StoredObject:
+    key: str
+    size: int
+    modified: float
+
+
+class StorageBackend(ABC):
+    """Object storage for uploads, addressed by keys such as "images/<name>"
+
+    Clients can upload straight to storage: presign_upload() for a single
+    request, or create_multipart() and presign_part() for large files, whose
+    parts are then stitched together by complete_multipart().
+    """
+
+    @abstractmethod
+    async def write(self, key: str, chunks: AsyncIterable[bytes], content_type: str) -> int:
+        """Stream chunks into key, replacing it only once complete; returns the size"""
+        pass
+
+    @abstractmethod
+    async def move(self, source: str, destination: str) -> None:
+        """Rename an object"""
+        pass
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        """Size and modification time of an object, or None if missing"""
+        pass
+
+    async def exists(self, key: str) -> bool:
+        return await self.stat(key) is not None
+
+    @abstractmethod
+    async def read(self, key: str, start: int = 0, length: Optional[int] = None) -> bytes:
+        """Read a byte range of an object"""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """Delete an object; False if it did not exist"""
+        pass
+
+    @abstractmethod
+    def list(self, prefix: str) -> AsyncIterator[StoredObject]:
+        """Objects whose key starts with prefix"""
+        pass
+
+    @abstractmethod
+    def public_url(self, key: str, base_url: str) -> str:
+        """URL clients download an object from"""
+        pass
+
+    @abstractmethod
+    async def presign_upload(
+        self, key: str, content_type: str, max_size: int, expires_in: int
+    ) -> PresignedRequest:
+        """Request a client can send to upload key directly"""
+        pass
+
+    @abstractmethod
+    async def create_multipart(self, key: str, content_type: str) -> str:
+        """Start a multipart upload and return its id"""
+        pass
+
+    @abstractmethod
+    async def presign_part(
+        self, key: str, upload_id: str, part_number: int, max_size: int, expires_in: int
+    ) -> PresignedRequest:
+        """Request a client can send to upload one part; the response carries its ETag"""
+        pass
+
+    @abstractmethod
+    async def complete_multipart(self, key: str, upload_id: str, parts: List[Tuple[int, str]]) -> None:
+        """Assemble uploaded (part number, ETag) pairs into key"""
+        pass
+
+    @abstractmethod
+    async def abort_multipart(self, key: str, upload_id: str) -> None:
+        """Discard a multipart upload and its parts"""
+        pass
@@ -0,0 +1,94 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import and_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere.core.cache import TaggedCache, cached
+from unisphere.models.course_model import CourseModel, CourseTranslationModel
+from unisphere.models.day_of_week_model import DayModel, DayTranslationModel
+from unisphere.models.schedule_model import (SectionOccurrenceModel,
+                                             SectionScheduleModel)
+from unisphere.models.section_model import SectionModel
+from unisphere.models.user_enroll_model import UserEnrollModel
+from unisphere.schemas.timetable_schema import (TimetableEntrySchema,
+                                                TimetableWeekSchema)
+from unisphere.services.catalog_cache import USER_ENTRY_TTL
+
+# Invalidated with the catalog data a timetable is built from: "courses" for
+# course codes and translations, "days" for day names, "semesters" for term
+# dates, "timetables" for sections, slots and rules, and the per-user tag
+# for the student's own enrollments
+TIMETABLE_TAGS = ("courses", "days", "semesters", "timetables", "timetable:user:{user_id}")
+
+
+def week_start(week: Optional[str] = None, today: Optional[date] = None) -> date:
+    """Monday of an ISO week such as 2025-W03, or of the current week"""
+    if week is None:
+        today = today or date.today()
+        return today - timedelta(days=today.weekday())
+    try:
+        year, number = week.upper().split("-W")
+        return date.fromisocalendar(int(year), int(number), 1)
+    except ValueError as e:
+        raise ValueError(f"Invalid week {week!r}, expected e.g. 2025-W03") from e
+
+
+class TimetableService:
+    def __init__(self, session: AsyncSession, cache: Optional[TaggedCache] = None):
+        self.session = session
+        self.cache = cache
+
+    @cached(*TIMETABLE_TAGS, ttl=USER_ENTRY_TTL)
+    async def get_week(self, user_id: int, monday: date, language_code: str = "en") -> TimetableWeekSchema:
+        """A student's meetings from monday to the following Sunday, in one query
+
+        Reads the materialized section_occurrences, so RRULE meetings and
+        the semester's first and last weeks come out right.
+        """
+        start = datetime.combine(monday, time.min)
+        enrolled = select(UserEnrollModel.section_id).where(UserEnrollModel.user_id == user_id)
+        query = (
+            select(
+                SectionOccurrenceModel.occurrence_id,
+                SectionOccurrenceModel.starts_at,
+                SectionOccurrenceModel.ends_at,
+                SectionModel.section_id,
+                SectionModel.section_code,
+                CourseModel.course_id,
+                CourseModel.course_code,
+                CourseTranslationModel.subject_name,
+                SectionScheduleModel.schedule_id,
+                SectionScheduleModel.note,
+                DayModel.day_id,
+                DayModel.day_code,
+                DayTranslationModel.day_name,
+            )
+            .join(SectionModel, SectionModel.section_id == SectionOccurrenceModel.section_id)
+            .join(CourseModel, CourseModel.course_id == SectionModel.course_id)
+            .outerjoin(CourseTranslationModel, and_(
+                CourseTranslationModel.course_id == CourseModel.course_id,
+                CourseTranslationModel.language_code == language_code))
+            .outerjoin(SectionScheduleModel,
+                       SectionScheduleModel.schedule_id == SectionOccurrenceModel.schedule_id)
+            .outerjoin(DayModel, DayModel.day_id == SectionScheduleModel.day_id)
+            .outerjoin(DayTranslationModel, and_(
+                DayTranslationModel.day_id == DayModel.day_id,
+                DayTranslationModel.language_code == language_code))
+            .where(
+                SectionOccurrenceModel.section_id.in_(enrolled),
+                SectionOccurrenceModel.starts_at >= start,
+                SectionOccurrenceModel.starts_at < start + timedelta(days=7),
+            )
+            .order_by(SectionOccurrenceModel.starts_at, SectionModel.section_id)
+        )
+        result = await self.session.exec(query)
+        year, number, _ = monday.isocalendar()
+        return TimetableWeekSchema(
+            week=f"{year}-W{number:02}",
+            start_date=monday,
+            end_date=monday + timedelta(days=6),
+            language_code=language_code,
+            entries=[TimetableEntrySchema(**row._mapping) for row in result.all()],
+        )
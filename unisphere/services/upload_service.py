@@ -1,116 +1,429 @@
+import asyncio
+import hashlib
+import logging
+import math
+import mimetypes
+import re
+import time
 import uuid
-from pathlib import Path
-from typing import Optional
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import AsyncIterator, Iterable, List, Optional
 
-import aiofiles  # type: ignore[import-untyped]
 from fastapi import UploadFile
+from sqlalchemy import delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from unisphere import models
+from unisphere.core.config import get_settings
+from unisphere.models.stored_file_model import StoredFile, StoredFileRef
+from unisphere.schemas.upload_schema import CompletedPart, DirectUploadResponse, PresignedPart
+from unisphere.services.storage_service.LocalStorageBackend import LocalStorageBackend
+from unisphere.services.storage_service.MemoryStorageBackend import MemoryStorageBackend
+from unisphere.services.storage_service.S3StorageBackend import S3StorageBackend
+from unisphere.services.storage_service.StorageBackendInterface import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+
+# Leading bytes of each accepted format and the extension it is stored under
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+IMAGE_CONTENT_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+# images/ab/cd/<sha256>.<ext>
+CONTENT_ADDRESSED_NAME = re.compile(r"^([0-9a-f]{64})\.[a-z]+$")
+
+# Direct uploads land here and are moved under images/ once checked; the
+# dot keeps them off the /uploads mount, and unfinished ones are collected
+DIRECT_UPLOAD_PREFIX = ".incoming/"
+
+# Keys handed out by start_direct_upload
+DIRECT_UPLOAD_KEY = re.compile(r"^\.incoming/[0-9a-f]{32}\.(jpg|png|gif|webp)$")
+
+
+class FileTooLargeError(ValueError):
+    """Upload exceeded the size limit"""
+
+
+def detect_image_extension(head: bytes) -> Optional[str]:
+    """Identify an image from its magic bytes"""
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
 
 
 class UploadService:
-    def __init__(self, upload_dir: str = "uploads"):
-        self.upload_dir = Path(upload_dir)
-        self.upload_dir.mkdir(exist_ok=True)
+    """Stores uploaded images under the "images/" prefix of a storage backend
 
-        # Create subdirectories
+    In "uuid" storage mode every upload gets a fresh name. In "content" mode
+    files are named by their sha256 digest in a two-level sharded layout, so
+    identical uploads share one file, and a stored_files row counts the
+    references to it. Without a backend, files go to upload_dir on local disk.
+    """
+
+    def __init__(
+        self,
+        upload_dir: str = "uploads",
+        session: Optional[AsyncSession] = None,
+        storage_mode: Optional[str] = None,
+        storage: Optional[StorageBackend] = None
+    ):
+        self.upload_dir = Path(upload_dir)
         self.images_dir = self.upload_dir / "images"
-        self.images_dir.mkdir(exist_ok=True)
+        if storage is None:
+            storage = LocalStorageBackend(upload_dir)
+            self.images_dir.mkdir(exist_ok=True)
+        self.storage = storage
+
+        self.session = session
+        self.storage_mode = storage_mode or get_settings().UPLOAD_STORAGE_MODE
+        if self.storage_mode == "content" and session is None:
+            raise ValueError("Content-addressed storage needs a database session")
 
     def _validate_image_file(self, file: UploadFile) -> bool:
         """Validate if the uploaded file is a valid image"""
+        return self._validate_image_name(file.filename or "", file.content_type)
+
+    @staticmethod
+    def _validate_image_name(filename: str, content_type: Optional[str]) -> bool:
+        """Check the client's filename extension and MIME type"""
         # Check file extension
         allowed_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
-        file_extension = Path(file.filename or "").suffix.lower()
+        file_extension = Path(filename).suffix.lower()
 
         if file_extension not in allowed_extensions:
             return False
 
         # Check MIME type
-        allowed_mime_types = {
-            'image/jpeg', 'image/jpg', 'image/png',
-            'image/gif', 'image/webp'
-        }
-
-        if file.content_type not in allowed_mime_types:
+        if content_type not in IMAGE_CONTENT_TYPES:
             return False
 
         return True
 
-    def _generate_filename(self, original_filename: str) -> str:
-        """Generate a unique filename"""
-        file_extension = Path(original_filename).suffix.lower()
-        unique_id = str(uuid.uuid4())
-        return f"{unique_id}{file_extension}"
+    @staticmethod
+    def _key(image_path: str) -> Optional[str]:
+        """Map "uploads/..." to a storage key, refusing traversal"""
+        if not image_path.startswith("uploads/"):
+            return None
+        key = image_path[len("uploads/"):]
+        if not key or ".." in PurePosixPath(key).parts or key.startswith("/"):
+            return None
+        return key
 
-    async def save_image(self, file: UploadFile, max_size_mb: int = 10) -> Optional[str]:
+    async def save_image(
+        self, file: UploadFile, max_size: Optional[int] = None, owner_id: Optional[int] = None
+    ) -> Optional[str]:
         """
-        Save uploaded image file to server
+        Stream uploaded image file to server
+
+        The file is copied in CHUNK_SIZE pieces, so at most one chunk is held
+        in memory. The first chunk must carry image magic bytes, and the copy
+        stops as soon as the size limit is passed. Data goes to a temporary
+        file that is renamed into place only once complete.
 
         Args:
             file: The uploaded file
-            max_size_mb: Maximum file size in MB
+            max_size: Maximum file size in bytes (default Settings.MAX_FILE_SIZE)
+            owner_id: User the reference is recorded for (content mode)
 
         Returns:
-            Relative path to saved file or None if failed
+            Relative path to saved file
         """
         if not self._validate_image_file(file):
             raise ValueError("Invalid image file type")
+        if max_size is None:
+            max_size = get_settings().MAX_FILE_SIZE
 
-        # Check file size
-        file_content = await file.read()
-        file_size_mb = len(file_content) / (1024 * 1024)
-
-        if file_size_mb > max_size_mb:
-            raise ValueError(f"File size exceeds {max_size_mb}MB limit")
+        first_chunk = await file.read(CHUNK_SIZE)
+        extension = detect_image_extension(first_chunk)
+        if extension is None:
+            raise ValueError("File content is not a supported image")
+        content_type = mimetypes.guess_type(f"image{extension}")[0]
+        digest = hashlib.sha256()
 
-        # Reset file pointer
-        await file.seek(0)
-
-        # Generate unique filename
-        filename = self._generate_filename(file.filename or "image")
-        file_path = self.images_dir / filename
+        async def chunks() -> AsyncIterator[bytes]:
+            chunk, size = first_chunk, 0
+            while chunk:
+                size += len(chunk)
+                if size > max_size:
+                    raise FileTooLargeError(
+                        f"File size exceeds {max_size // (1024 * 1024)}MB limit")
+                digest.update(chunk)
+                yield chunk
+                chunk = await file.read(CHUNK_SIZE)
 
         try:
-            # Save file
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+            if self.storage_mode == "content":
+                temp_key = f"images/.{uuid.uuid4()}.part"
+                size = await self.storage.write(temp_key, chunks(), content_type)
+                try:
+                    return await self._store_by_digest(temp_key, digest.hexdigest(), extension, size, owner_id)
+                except BaseException:
+                    await self.storage.delete(temp_key)
+                    raise
+
+            # Extension follows the content, not the client's filename
+            key = f"images/{uuid.uuid4()}{extension}"
+            await self.storage.write(key, chunks(), content_type)
 
             # Return relative path for URL construction
-            return f"uploads/images/{filename}"
+            return f"uploads/{key}"
 
+        except ValueError:
+            raise
         except Exception as e:
-            # Clean up if file was partially created
-            if file_path.exists():
-                file_path.unlink()
             raise RuntimeError(f"Failed to save file: {str(e)}") from e
 
-    def delete_image(self, image_path: str) -> bool:
+    async def _store_by_digest(
+        self, temp_key: str, digest: str, extension: str, size: int, owner_id: Optional[int]
+    ) -> str:
+        """Publish a finished upload under its digest and record the owner's reference"""
+        if owner_id is None:
+            raise ValueError("Content-addressed uploads need an owner")
+        key = f"images/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+        image_path = f"uploads/{key}"
+
+        now = datetime.utcnow()
+        dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        upsert = dialect.insert(StoredFile).values(
+            digest=digest, path=image_path, size=size, ref_count=0,
+            created_at=now, updated_at=now,
+        )
+        reference = dialect.insert(StoredFileRef).values(digest=digest, owner_id=owner_id, created_at=now)
+        try:
+            await self.session.exec(upsert.on_conflict_do_update(
+                index_elements=["digest"], set_={"updated_at": now}))
+            # Uploading the same content twice is still one reference
+            added = await self.session.exec(reference.on_conflict_do_nothing(
+                index_elements=["digest", "owner_id"]).returning(StoredFileRef.ref_id))
+            if added.first() is not None:
+                await self.session.exec(
+                    update(StoredFile).where(StoredFile.digest == digest)
+                    .values(ref_count=StoredFile.ref_count + 1))
+            # The row stays locked until commit, so a concurrent delete of the
+            # last reference cannot remove the file between this check and commit
+            if await self.storage.exists(key):
+                await self.storage.delete(temp_key)
+            else:
+                await self.storage.move(temp_key, key)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return image_path
+
+    async def delete_image(self, image_path: str, owner_id: Optional[int] = None) -> bool:
         """
         Delete image file from server
 
+        Content-addressed files are shared, so only owner_id's own reference
+        is released, and the file is unlinked when the last one goes.
+        Deleting again, or deleting a file owner_id holds no reference to,
+        changes nothing and returns False.
+
         Args:
             image_path: Relative path to the image file (e.g., "uploads/images/filename.jpg")
+            owner_id: User releasing the reference (content mode)
 
         Returns:
             True if deleted successfully, False otherwise
         """
-        try:
-            # Ensure path is within upload directory
-            if not image_path.startswith("uploads/"):
-                return False
-
-            # Convert relative path to absolute path based on upload directory
-            # Remove "uploads/" prefix and construct full path
-            relative_to_upload = image_path[8:]  # Remove "uploads/" prefix
-            file_path = self.upload_dir / relative_to_upload
+        key = self._key(image_path)
+        if key is None:
+            return False
 
-            if file_path.exists() and file_path.is_file():
-                file_path.unlink()
+        if self.session is not None and self.storage_mode == "content":
+            stored = (await self.session.exec(
+                select(StoredFile.digest).where(StoredFile.path == image_path))).first()
+            if stored is not None:
+                released = await self.session.exec(
+                    delete(StoredFileRef)
+                    .where(StoredFileRef.digest == stored, StoredFileRef.owner_id == owner_id)
+                    .returning(StoredFileRef.ref_id)
+                )
+                if released.first() is None:
+                    await self.session.rollback()
+                    return False
+                result = await self.session.exec(
+                    update(StoredFile)
+                    .where(StoredFile.digest == stored)
+                    .values(ref_count=StoredFile.ref_count - 1, updated_at=datetime.utcnow())
+                    .returning(StoredFile.ref_count)
+                )
+                if result.one()[0] <= 0:
+                    await self.session.exec(delete(StoredFile).where(StoredFile.digest == stored))
+                    await self.storage.delete(key)
+                await self.session.commit()
                 return True
-            return False
+            # Not tracked: stored before content addressing was enabled
+            await self.session.rollback()
 
-        except OSError:
-            return False
+        return await self.storage.delete(key)
+
+    async def collect_garbage(self, grace_seconds: float = 3600) -> int:
+        """
+        Remove uploads nothing refers to
+
+        Deletes direct uploads that were never completed, and in "content"
+        mode also rows left at zero references, files in the sharded layout
+        without a row, and abandoned .part files. Files younger than
+        grace_seconds are left alone so in-flight uploads are not touched;
+        keep it above UPLOAD_PRESIGN_EXPIRE_SECONDS.
+
+        Returns:
+            Number of files removed
+        """
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        async for item in self.storage.list(DIRECT_UPLOAD_PREFIX):
+            if item.modified < cutoff and await self.storage.delete(item.key):
+                removed += 1
+        if self.storage_mode != "content":
+            return removed
+
+        orphaned_rows = await self.session.exec(
+            select(StoredFile.path).where(StoredFile.ref_count <= 0))
+        for image_path in orphaned_rows.all():
+            result = await self.session.exec(
+                delete(StoredFile)
+                .where(StoredFile.path == image_path, StoredFile.ref_count <= 0)
+                .returning(StoredFile.digest)
+            )
+            if result.first() is not None:
+                key = self._key(image_path)
+                if key is not None and await self.storage.delete(key):
+                    removed += 1
+            await self.session.commit()
+
+        candidates = await self._stale_keys(cutoff)
+        temp_keys = [key for key in candidates if key.endswith(".part")]
+        by_digest = {
+            CONTENT_ADDRESSED_NAME.match(PurePosixPath(key).name).group(1): key
+            for key in candidates if not key.endswith(".part")
+        }
+        if by_digest:
+            tracked = await self.session.exec(
+                select(StoredFile.digest).where(StoredFile.digest.in_(by_digest)))
+            for digest in tracked.all():
+                del by_digest[digest]
+        for key in temp_keys + list(by_digest.values()):
+            if await self.storage.delete(key):
+                removed += 1
+        return removed
+
+    async def _stale_keys(self, cutoff: float) -> List[str]:
+        """Temp files and sharded files last modified before cutoff"""
+        stale = []
+        async for item in self.storage.list("images/"):
+            parts = item.key.split("/")
+            if not (parts[-1].endswith(".part") or (len(parts) == 4 and CONTENT_ADDRESSED_NAME.match(parts[-1]))):
+                continue
+            if item.modified < cutoff:
+                stale.append(item.key)
+        return stale
+
+    async def start_direct_upload(self, filename: str, content_type: str, size: int) -> DirectUploadResponse:
+        """
+        Presign an upload that goes straight to storage
+
+        Files up to UPLOAD_MULTIPART_PART_SIZE get one request; larger ones
+        get a multipart upload with one presigned request per part.
+        """
+        if not self._validate_image_name(filename, content_type):
+            raise ValueError("Invalid image file type")
+        settings = get_settings()
+        if size > settings.MAX_FILE_SIZE:
+            raise FileTooLargeError(
+                f"File size exceeds {settings.MAX_FILE_SIZE // (1024 * 1024)}MB limit")
+
+        key = f"{DIRECT_UPLOAD_PREFIX}{uuid.uuid4().hex}{IMAGE_CONTENT_TYPES[content_type]}"
+        expires_in = settings.UPLOAD_PRESIGN_EXPIRE_SECONDS
+        part_size = settings.UPLOAD_MULTIPART_PART_SIZE
+        if size <= part_size:
+            upload = await self.storage.presign_upload(key, content_type, settings.MAX_FILE_SIZE, expires_in)
+            return DirectUploadResponse(key=key, expires_in=expires_in, upload=upload)
+
+        upload_id = await self.storage.create_multipart(key, content_type)
+        parts = [
+            PresignedPart(
+                part_number=part_number,
+                request=await self.storage.presign_part(key, upload_id, part_number, part_size, expires_in))
+            for part_number in range(1, math.ceil(size / part_size) + 1)
+        ]
+        return DirectUploadResponse(
+            key=key, expires_in=expires_in, upload_id=upload_id, part_size=part_size, parts=parts)
+
+    async def finish_direct_upload(
+        self,
+        key: str,
+        upload_id: Optional[str] = None,
+        parts: Iterable[CompletedPart] = (),
+        owner_id: Optional[int] = None
+    ) -> str:
+        """
+        Complete a direct upload and check what arrived
+
+        Objects that are too large or are not images are deleted. The
+        checked object is then moved out of the staging prefix, so a presigned
+        request sent again cannot replace it: under images/ with the same name,
+        or in "content" mode hashed and published under its digest like any
+        other upload, with a reference recorded for owner_id.
+
+        Returns:
+            Relative path to the stored file
+        """
+        if not DIRECT_UPLOAD_KEY.match(key):
+            raise ValueError("Invalid upload key")
+        if upload_id is not None:
+            await self.storage.complete_multipart(
+                key, upload_id, [(part.part_number, part.etag) for part in parts])
+
+        stored = await self.storage.stat(key)
+        if stored is None:
+            raise ValueError("Upload not found")
+        max_size = get_settings().MAX_FILE_SIZE
+        if stored.size > max_size:
+            await self.storage.delete(key)
+            raise FileTooLargeError(f"File size exceeds {max_size // (1024 * 1024)}MB limit")
+        extension = PurePosixPath(key).suffix
+        if detect_image_extension(await self.storage.read(key, 0, 16)) != extension:
+            await self.storage.delete(key)
+            raise ValueError("File content is not a supported image")
+
+        if self.storage_mode == "content":
+            digest = hashlib.sha256()
+            for start in range(0, stored.size, CHUNK_SIZE):
+                digest.update(await self.storage.read(key, start, CHUNK_SIZE))
+            try:
+                return await self._store_by_digest(key, digest.hexdigest(), extension, stored.size, owner_id)
+            except BaseException:
+                await self.storage.delete(key)
+                raise
+
+        final_key = f"images/{PurePosixPath(key).name}"
+        if await self.storage.exists(final_key):
+            await self.storage.delete(key)
+            raise ValueError("Upload already completed")
+        await self.storage.move(key, final_key)
+        return f"uploads/{final_key}"
 
     def get_image_url(self, image_path: str, base_url: str) -> str:
         """
@@ -123,4 +436,40 @@ class UploadService:
         Returns:
             Full URL to the image
         """
-        return f"{base_url.rstrip('/')}/{image_path}"
+        key = self._key(image_path)
+        if key is None:
+            return f"{base_url.rstrip('/')}/{image_path}"
+        return self.storage.public_url(key, base_url)
+
+
+_storage_backend: Optional[StorageBackend] = None
+
+
+def get_storage_backend() -> StorageBackend:
+    """Process-wide storage backend selected by UPLOAD_STORAGE_BACKEND"""
+    global _storage_backend
+    if _storage_backend is None:
+        settings = get_settings()
+        if settings.UPLOAD_STORAGE_BACKEND == "s3":
+            _storage_backend = S3StorageBackend()
+        elif settings.UPLOAD_STORAGE_BACKEND == "memory":
+            _storage_backend = MemoryStorageBackend()
+        else:
+            _storage_backend = LocalStorageBackend(settings.UPLOAD_DIR)
+    return _storage_backend
+
+
+async def run_upload_gc(interval: float, grace_seconds: float) -> None:
+    """Collect abandoned and unreferenced uploads until cancelled"""
+    while True:
+        try:
+            async for session in models.get_session():
+                service = UploadService(session=session, storage=get_storage_backend())
+                removed = await service.collect_garbage(grace_seconds)
+                if removed:
+                    logger.info("Removed %d unreferenced uploads", removed)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Failed to collect unreferenced uploads")
+        await asyncio.sleep(interval)
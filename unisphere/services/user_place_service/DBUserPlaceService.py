@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from sqlalchemy import desc
 from sqlmodel import select
@@ -8,11 +8,17 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from unisphere.models.user_place_model import UserPlace
 from unisphere.schemas.user_place_schema import (UserPlaceCreate,
                                                  UserPlaceResponse)
+from unisphere.services.aggregates import count_where, encode_cursor, paginate_keyset, paginate_with_total
+
+# Listing order, most recently updated first; matches ix_user_places_user_updated_id
+PLACE_ORDER = (UserPlace.updated_at, UserPlace.id)
 
 
 class DBUserPlaceService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
         self.db = db
+        # Listings may be served by a read replica
+        self.read_db = read_db or db
 
     async def create_place(self, data: UserPlaceCreate, user_id: int) -> UserPlaceResponse:
         place = UserPlace(
@@ -33,21 +39,27 @@ class DBUserPlaceService:
         await self.db.refresh(place)
         return UserPlaceResponse.model_validate(place)
 
-    async def list_my_places(self, user_id: int, limit: int, offset: int) -> Tuple[List[UserPlaceResponse], int]:
-        result = await self.db.exec(
-            select(UserPlace)
-            .where(UserPlace.user_id == user_id)
-            .order_by(desc(UserPlace.updated_at))  # type: ignore[arg-type]
-            .offset(offset)
-            .limit(limit)
-        )
-        rows = result.all()
-
-        count_result = await self.db.exec(
-            select(UserPlace).where(UserPlace.user_id == user_id)
-        )
-        total = len(count_result.all())
-        return [UserPlaceResponse.model_validate(r) for r in rows], total
+    async def list_my_places(
+        self, user_id: int, limit: int, offset: int, cursor: Optional[str] = None
+    ) -> Tuple[List[UserPlaceResponse], int, Optional[str]]:
+        """Most recently updated places first, with the total and the next page's cursor"""
+        statement = select(UserPlace).where(UserPlace.user_id == user_id)
+        if cursor is None:
+            # Offset pages keep the single round trip for page and total
+            rows, total = await paginate_with_total(
+                self.read_db,
+                statement.order_by(*(desc(column) for column in PLACE_ORDER)),  # type: ignore[arg-type]
+                limit,
+                offset,
+            )
+            next_cursor = None
+            if rows and offset + len(rows) < total:
+                next_cursor = encode_cursor([rows[-1].updated_at, rows[-1].id])
+        else:
+            rows, next_cursor = await paginate_keyset(
+                self.read_db, statement, PLACE_ORDER, limit, cursor, descending=True)
+            total = await count_where(self.read_db, UserPlace, UserPlace.user_id == user_id)
+        return [UserPlaceResponse.model_validate(r) for r in rows], total, next_cursor
 
     async def delete_place(self, place_id: int, user_id: int) -> bool:
         result = await self.db.exec(